@@ -0,0 +1,31 @@
+"""
+Offline benchmark suite for curllm
+
+Drives ``CurllmExecutor.execute_workflow`` against local HTML fixtures and
+a mock LLM; see ``benchmarks.harness``.
+
+Usage:
+    python -m benchmarks --concurrency 1,2,4 --jobs 8
+    python -m benchmarks --save-baseline benchmarks/baselines/main.json
+    python -m benchmarks --baseline benchmarks/baselines/main.json --tolerance 0.2
+"""
+
+from benchmarks.harness import (
+    FixtureServer,
+    MockLLMServer,
+    compare_reports,
+    format_report,
+    load_report,
+    run_benchmark,
+    save_report,
+)
+
+__all__ = [
+    'FixtureServer',
+    'MockLLMServer',
+    'compare_reports',
+    'format_report',
+    'load_report',
+    'run_benchmark',
+    'save_report',
+]
@@ -0,0 +1,76 @@
+"""Command line entry point: python -m benchmarks"""
+
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.harness import compare_reports, format_report, load_report, load_scenarios, run_benchmark, save_report
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Offline curllm benchmark (fixture sites + mock LLM)",
+    )
+    parser.add_argument("--scenario", action="append", dest="scenarios",
+                        help=f"Scenario to run (repeatable; default: all of {', '.join(load_scenarios())})")
+    parser.add_argument("--concurrency", default="1,2,4", help="Comma-separated concurrency levels")
+    parser.add_argument("--jobs", type=int, default=8, help="Jobs per scenario and level")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured jobs per scenario")
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="Mock LLM base latency per call")
+    parser.add_argument("--llm-ms-per-kchar", type=float, default=2.0,
+                        help="Mock LLM extra latency per 1000 prompt characters")
+    parser.add_argument("--out", help="Report path (default: benchmarks/results/bench-<timestamp>.json)")
+    parser.add_argument("--save-baseline", help="Also write the report to this baseline path")
+    parser.add_argument("--baseline", help="Compare against this baseline; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    try:
+        levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    except ValueError:
+        parser.error("--concurrency must be a comma-separated list of integers")
+    # Fail before the (long) run, not after it
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = load_report(args.baseline)
+        except FileNotFoundError:
+            parser.error(f"baseline {args.baseline} not found; record one first with --save-baseline {args.baseline}")
+        except ValueError as e:
+            parser.error(f"baseline {args.baseline}: {e}")
+
+    report = run_benchmark(
+        scenarios=args.scenarios,
+        concurrency=levels,
+        jobs_per_level=args.jobs,
+        warmup=args.warmup,
+        llm_latency_ms=args.llm_latency_ms,
+        llm_ms_per_kchar=args.llm_ms_per_kchar,
+    )
+    out = save_report(report, args.out or RESULTS_DIR / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    print(format_report(report))
+    print(f"\nReport: {out}")
+    if args.save_baseline:
+        print(f"Baseline: {save_report(report, args.save_baseline)}")
+
+    if baseline is not None:
+        regressions = compare_reports(report, baseline, tolerance=args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for r in regressions:
+                print(json.dumps(r))
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,523 @@
+"""
+Benchmark harness - offline end-to-end runs against fixture sites and a mock LLM
+
+Serves the HTML fixtures in ``benchmarks/fixtures`` from a local HTTP
+server, points the executor at an Ollama-compatible mock LLM with a
+deterministic latency model, and drives ``CurllmExecutor.execute_workflow``
+at several concurrency levels. Every job runs under a ``StageRecorder``,
+so the report has per-stage timings (browser_setup, page_open,
+context_extraction, llm_wait, extraction), prompt sizes, peak RSS of the
+process tree and jobs/sec. Reports are JSON and can be compared against a
+stored baseline. Baselines are machine-specific and not committed: record
+one with ``--save-baseline`` (``make benchmark-baseline``) before comparing.
+
+Usage:
+    from benchmarks.harness import run_benchmark, compare_reports, save_report, load_report
+
+    report = run_benchmark(scenarios=["products"], concurrency=(1, 4), jobs_per_level=8)
+    save_report(report, "benchmarks/baselines/local.json")
+    regressions = compare_reports(report, load_report("benchmarks/baselines/main.json"), tolerance=0.2)
+
+    # or from the shell
+    python -m benchmarks --save-baseline benchmarks/baselines/main.json
+    python -m benchmarks --concurrency 1,2,4 --jobs 8 --baseline benchmarks/baselines/main.json
+"""
+
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+REPORT_VERSION = 1
+
+# Metrics compared against a baseline: (path, higher_is_better, noise floor)
+COMPARED_METRICS = (
+    ("jobs_per_sec", True, 0.0),
+    ("latency_ms.p50", False, 5.0),
+    ("latency_ms.p95", False, 5.0),
+    ("prompt_chars.mean", False, 1.0),
+    ("peak_rss_mb", False, 1.0),
+)
+STAGE_NOISE_FLOOR_MS = 5.0
+
+
+def load_scenarios(path: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    """Scenario definitions (fixture, instruction, mock LLM answer)"""
+    return json.loads((path or FIXTURES_DIR / "scenarios.json").read_text(encoding="utf-8"))
+
+
+class _ThreadedServer:
+    """aiohttp application served from its own loop thread"""
+
+    def __init__(self, app: web.Application, host: str = "127.0.0.1"):
+        self.app = app
+        self.host = host
+        self.url = ""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> str:
+        """Start serving on a free port; returns the base URL"""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        async def _serve():
+            self._runner = web.AppRunner(self.app, access_log=None)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, self.host, 0)
+            await site.start()
+            port = self._runner.addresses[0][1]
+            self.url = f"http://{self.host}:{port}"
+
+        def _run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(_serve())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        ready.wait(10)
+        return self.url
+
+    def stop(self):
+        if self._loop is None:
+            return
+        if self._runner is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+class FixtureServer(_ThreadedServer):
+    """Serves the fixture directory; counts requests per path"""
+
+    def __init__(self, fixtures_dir: Path = FIXTURES_DIR):
+        self.fixtures_dir = Path(fixtures_dir)
+        self.requests: Dict[str, int] = {}
+        app = web.Application()
+        app.router.add_get("/{name:.*}", self._handle)
+        super().__init__(app)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        name = request.match_info["name"] or "index.html"
+        self.requests[name] = self.requests.get(name, 0) + 1
+        path = (self.fixtures_dir / name).resolve()
+        if self.fixtures_dir.resolve() not in path.parents or not path.is_file() or path.suffix != ".html":
+            return web.Response(status=404, text="not found")
+        return web.Response(body=path.read_bytes(), content_type="text/html", charset="utf-8")
+
+
+class MockLLMServer(_ThreadedServer):
+    """
+    Ollama-compatible mock (``/api/generate``, ``/api/chat``, ``/api/tags``).
+
+    The answer is the ``llm_response`` of the first scenario whose
+    ``match`` string appears in the prompt (default: an empty ``complete``
+    action). Latency = ``base_latency_ms + ms_per_kchar * prompt_chars / 1000``,
+    a stand-in for prompt evaluation cost that grows with prompt size.
+    """
+
+    DEFAULT_RESPONSE = {"type": "complete", "extracted_data": {}}
+
+    def __init__(
+        self,
+        scenarios: Optional[Dict[str, Dict[str, Any]]] = None,
+        base_latency_ms: float = 50.0,
+        ms_per_kchar: float = 2.0,
+        model: str = "bench-mock",
+    ):
+        self.scenarios = scenarios if scenarios is not None else load_scenarios()
+        self.base_latency_ms = base_latency_ms
+        self.ms_per_kchar = ms_per_kchar
+        self.model = model
+        self.stats = {"requests": 0, "prompt_chars": 0, "max_prompt_chars": 0, "matched": {}}
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/api/generate", self._generate)
+        app.router.add_post("/api/chat", self._chat)
+        app.router.add_get("/api/tags", self._tags)
+        super().__init__(app)
+
+    def answer(self, prompt: str) -> str:
+        """Response text for a prompt (also updates stats)"""
+        self.stats["requests"] += 1
+        self.stats["prompt_chars"] += len(prompt)
+        self.stats["max_prompt_chars"] = max(self.stats["max_prompt_chars"], len(prompt))
+        for name, scenario in self.scenarios.items():
+            if scenario.get("match") and scenario["match"] in prompt:
+                self.stats["matched"][name] = self.stats["matched"].get(name, 0) + 1
+                return json.dumps(scenario.get("llm_response") or self.DEFAULT_RESPONSE)
+        return json.dumps(self.DEFAULT_RESPONSE)
+
+    def latency(self, prompt: str) -> float:
+        """Simulated seconds for a prompt"""
+        return (self.base_latency_ms + self.ms_per_kchar * len(prompt) / 1000.0) / 1000.0
+
+    async def _generate(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        prompt = str(data.get("prompt") or "")
+        text = self.answer(prompt)
+        await asyncio.sleep(self.latency(prompt))
+        return web.json_response({
+            "model": data.get("model") or self.model,
+            "created_at": datetime.now().isoformat(),
+            "response": text,
+            "done": True,
+            "prompt_eval_count": len(prompt) // 4,
+            "eval_count": len(text) // 4,
+        })
+
+    async def _chat(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        messages = data.get("messages") or []
+        prompt = "\n".join(str(m.get("content") or "") for m in messages)
+        text = self.answer(prompt)
+        await asyncio.sleep(self.latency(prompt))
+        return web.json_response({
+            "model": data.get("model") or self.model,
+            "created_at": datetime.now().isoformat(),
+            "message": {"role": "assistant", "content": text},
+            "done": True,
+        })
+
+    async def _tags(self, request: web.Request) -> web.Response:
+        return web.json_response({"models": [{"name": self.model, "size": 0, "digest": "mock"}]})
+
+
+class RSSSampler:
+    """Samples RSS of this process and its children (the browsers) in a thread"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> int:
+        """Current RSS of the process tree in bytes"""
+        try:
+            import psutil
+        except ImportError:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        proc = psutil.Process()
+        total = proc.memory_info().rss
+        for child in proc.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self.sample())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RSSSampler":
+        self.peak_bytes = self.sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="RSSSampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self.peak_bytes = max(self.peak_bytes, self.sample())
+        return False
+
+    @property
+    def peak_mb(self) -> float:
+        return round(self.peak_bytes / (1024 * 1024), 1)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize_level(jobs: List[Dict[str, Any]], wall_s: float, peak_rss_mb: float) -> Dict[str, Any]:
+    """
+    Aggregate per-job measurements of one concurrency level.
+
+    Args:
+        jobs: [{"ms": float, "ok": bool, "stages": StageRecorder.summary()}, ...]
+        wall_s: Wall time of the whole level
+        peak_rss_mb: Peak RSS of the process tree during the level
+
+    Returns:
+        Level summary (jobs_per_sec, latency_ms, stages, prompt_chars, ...)
+    """
+    n = len(jobs) or 1
+    latencies = [j["ms"] for j in jobs]
+    stages: Dict[str, Dict[str, float]] = {}
+    for job in jobs:
+        for name, s in job["stages"].get("stages", {}).items():
+            agg = stages.setdefault(name, {"calls": 0.0, "self_ms": 0.0, "total_ms": 0.0, "max_ms": 0.0})
+            agg["calls"] += s["count"]
+            agg["self_ms"] += s["self_ms"]
+            agg["total_ms"] += s["total_ms"]
+            agg["max_ms"] = max(agg["max_ms"], s["max_ms"])
+    # Per-job means, so levels with different job counts compare
+    for agg in stages.values():
+        for key in ("calls", "self_ms", "total_ms"):
+            agg[key] = round(agg[key] / n, 2 if key == "calls" else 1)
+    prompt_chars = [j["stages"].get("counters", {}).get("llm_wait.prompt_chars", 0) for j in jobs]
+    accounted = sum(s["self_ms"] for s in stages.values())
+    return {
+        "jobs": len(jobs),
+        "ok": sum(1 for j in jobs if j["ok"]),
+        "wall_s": round(wall_s, 3),
+        "jobs_per_sec": round(len(jobs) / wall_s, 3) if wall_s > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies), 1) if latencies else 0.0,
+            "p50": round(_percentile(latencies, 50), 1),
+            "p95": round(_percentile(latencies, 95), 1),
+            "max": round(max(latencies), 1) if latencies else 0.0,
+        },
+        "stages": stages,
+        "unaccounted_ms": round(max(0.0, statistics.mean(latencies) - accounted), 1) if latencies else 0.0,
+        "prompt_chars": {
+            "mean": round(statistics.mean(prompt_chars), 1) if prompt_chars else 0.0,
+            "max": max(prompt_chars) if prompt_chars else 0,
+        },
+        "peak_rss_mb": peak_rss_mb,
+        "errors": [j["error"] for j in jobs if j.get("error")][:5],
+    }
+
+
+async def _run_job(executor, instruction: str, url: str) -> Dict[str, Any]:
+    from curllm_core.stage_timer import StageRecorder
+
+    error = None
+    with StageRecorder() as rec:
+        t0 = time.perf_counter()
+        try:
+            res = await executor.execute_workflow(instruction=instruction, url=url)
+            ok = bool(isinstance(res, dict) and res.get("success", True) and not res.get("error"))
+            if not ok and isinstance(res, dict):
+                error = str(res.get("error") or res.get("reason") or "unsuccessful")
+        except Exception as e:
+            ok, error = False, f"{type(e).__name__}: {e}"
+        ms = (time.perf_counter() - t0) * 1000
+    return {"ms": ms, "ok": ok, "error": error, "stages": rec.summary()}
+
+
+async def run_level(executor, instruction: str, url: str, jobs: int, concurrency: int) -> Dict[str, Any]:
+    """Run `jobs` identical jobs with at most `concurrency` in flight"""
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _limited():
+        async with sem:
+            return await _run_job(executor, instruction, url)
+
+    with RSSSampler() as rss:
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(_limited() for _ in range(jobs)))
+        wall = time.perf_counter() - t0
+    return summarize_level(list(results), wall, rss.peak_mb)
+
+
+def _environment() -> Dict[str, Any]:
+    commit = ""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except Exception:
+        pass
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def run_benchmark(
+    scenarios: Optional[Iterable[str]] = None,
+    concurrency: Iterable[int] = (1, 2, 4),
+    jobs_per_level: int = 8,
+    warmup: int = 1,
+    llm_latency_ms: float = 50.0,
+    llm_ms_per_kchar: float = 2.0,
+) -> Dict[str, Any]:
+    """
+    Run the benchmark and return the report.
+
+    Args:
+        scenarios: Scenario names from fixtures/scenarios.json (default: all)
+        concurrency: Concurrency levels to measure
+        jobs_per_level: Jobs per scenario and level
+        warmup: Unmeasured jobs per scenario before the first level
+        llm_latency_ms: Mock LLM base latency per call
+        llm_ms_per_kchar: Mock LLM extra latency per 1000 prompt characters
+
+    Returns:
+        Report dict: {"version", "created_at", "environment", "settings", "results": {scenario: {level: summary}}}
+    """
+    defined = load_scenarios()
+    names = list(scenarios or defined)
+    unknown = [n for n in names if n not in defined]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)} (known: {', '.join(defined)})")
+    levels = sorted({max(1, int(c)) for c in concurrency})
+
+    with FixtureServer() as site, MockLLMServer(defined, llm_latency_ms, llm_ms_per_kchar) as llm:
+        from curllm_core.config import config
+        from curllm_core.executor import CurllmExecutor, LLMConfig
+
+        # Measure the pipeline, not the cache: every run must reach the (mock) LLM.
+        # Components that read the host from config go to the mock as well.
+        config.ollama_host = llm.url
+        config.llm_cache_enabled = False
+        llm_config = LLMConfig(provider=f"ollama/{llm.model}", base_url=llm.url, timeout=60)
+
+        async def _all():
+            executor = CurllmExecutor(llm_config)
+            results: Dict[str, Dict[str, Any]] = {}
+            try:
+                for name in names:
+                    scenario = defined[name]
+                    url = f"{site.url}/{scenario['fixture']}"
+                    for _ in range(max(0, warmup)):
+                        await _run_job(executor, scenario["instruction"], url)
+                    results[name] = {}
+                    for level in levels:
+                        logger.info(f"Benchmark {name}: {jobs_per_level} jobs at concurrency {level}")
+                        results[name][str(level)] = await run_level(
+                            executor, scenario["instruction"], url, jobs_per_level, level
+                        )
+            finally:
+                await executor.aclose()
+            return results
+
+        results = asyncio.run(_all())
+        mock_stats = dict(llm.stats)
+
+    return {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "settings": {
+            "scenarios": names,
+            "concurrency": levels,
+            "jobs_per_level": jobs_per_level,
+            "warmup": warmup,
+            "llm_latency_ms": llm_latency_ms,
+            "llm_ms_per_kchar": llm_ms_per_kchar,
+        },
+        "mock_llm": mock_stats,
+        "results": results,
+    }
+
+
+def _lookup(summary: Dict[str, Any], path: str) -> Optional[float]:
+    node: Any = summary
+    for part in path.split("."):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return float(node) if isinstance(node, (int, float)) else None
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Find metrics that got worse than the baseline by more than `tolerance`.
+
+    Only scenario/level pairs present in both reports are compared. Stage
+    self times and latencies below a small noise floor are ignored.
+
+    Returns:
+        [{"scenario", "concurrency", "metric", "baseline", "current", "change"}, ...]
+    """
+    regressions = []
+    for scenario, levels in (current.get("results") or {}).items():
+        for level, cur in levels.items():
+            base = ((baseline.get("results") or {}).get(scenario) or {}).get(level)
+            if not base:
+                continue
+            metrics = list(COMPARED_METRICS)
+            for stage_name in cur.get("stages", {}):
+                metrics.append((f"stages.{stage_name}.self_ms", False, STAGE_NOISE_FLOOR_MS))
+            for path, higher_is_better, floor in metrics:
+                b, c = _lookup(base, path), _lookup(cur, path)
+                if b is None or c is None or b <= floor:
+                    continue
+                change = (c - b) / b
+                worse = -change if higher_is_better else change
+                if worse > tolerance:
+                    regressions.append({
+                        "scenario": scenario,
+                        "concurrency": int(level),
+                        "metric": path,
+                        "baseline": b,
+                        "current": c,
+                        "change": round(change, 3),
+                    })
+    return regressions
+
+
+def save_report(report: Dict[str, Any], path) -> Path:
+    """Write a report as pretty JSON (creates the directory)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+    return path
+
+
+def load_report(path) -> Dict[str, Any]:
+    """Read a report written by save_report"""
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if report.get("version") != REPORT_VERSION:
+        raise ValueError(f"Unsupported benchmark report version: {report.get('version')}")
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Plain-text table of the main numbers"""
+    stage_names = ("browser_setup", "page_open", "context_extraction", "llm_wait", "extraction")
+    header = f"{'scenario':<14}{'conc':>5}{'ok':>6}{'jobs/s':>9}{'p50 ms':>9}{'p95 ms':>9}" + "".join(
+        f"{n[:10]:>12}" for n in stage_names
+    ) + f"{'prompt':>10}{'rss MB':>9}"
+    lines = [header, "-" * len(header)]
+    for scenario, levels in report.get("results", {}).items():
+        for level, s in sorted(levels.items(), key=lambda kv: int(kv[0])):
+            stages = s.get("stages", {})
+            lines.append(
+                f"{scenario:<14}{level:>5}{s['ok']:>3}/{s['jobs']:<2}{s['jobs_per_sec']:>9.2f}"
+                f"{s['latency_ms']['p50']:>9.0f}{s['latency_ms']['p95']:>9.0f}"
+                + "".join(f"{stages.get(n, {}).get('self_ms', 0):>12.0f}" for n in stage_names)
+                + f"{s['prompt_chars']['mean']:>10.0f}{s['peak_rss_mb']:>9.0f}"
+            )
+    return "\n".join(lines)
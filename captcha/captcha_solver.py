@@ -13,7 +13,7 @@ import time
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Tuple, List, Union
 
 import cv2
 import numpy as np
@@ -21,6 +21,8 @@ from PIL import Image, ImageEnhance
 from playwright.async_api import Page, Frame, ElementHandle
 import requests
 
+from curllm_core.vision_pool import get_vision_pool
+
 # For audio CAPTCHA
 try:
     import speech_recognition as sr
@@ -114,18 +116,19 @@ class SlidingPuzzleSolver:
                 logger.error("Could not find puzzle element")
                 return False
             
-            # Step 2: Take screenshot of the puzzle
-            timestamp = int(time.time())
-            screenshot_path = self.config.screenshot_dir / f"puzzle_{timestamp}.png"
-            await puzzle_element.screenshot(path=str(screenshot_path))
-            logger.info(f"Saved puzzle screenshot: {screenshot_path}")
+            # Step 2: Take screenshot of the puzzle (kept in memory, saved only for debugging)
+            screenshot = await puzzle_element.screenshot(type="png")
+            if self.config.debug_mode:
+                screenshot_path = self.config.screenshot_dir / f"puzzle_{int(time.time())}.png"
+                screenshot_path.write_bytes(screenshot)
+                logger.info(f"Saved puzzle screenshot: {screenshot_path}")
             
             # Step 3: Analyze the puzzle
-            solution = await self.analyze_puzzle(screenshot_path)
+            solution = await self.analyze_puzzle(screenshot)
             
             if not solution:
                 logger.warning("Could not analyze puzzle locally, trying alternative methods...")
-                return await self.solve_with_2captcha(context, screenshot_path)
+                return await self.solve_with_2captcha(context, screenshot)
             
             # Step 4: Execute the solution
             return await self.execute_sliding_solution(context, puzzle_element, solution)
@@ -134,53 +137,16 @@ class SlidingPuzzleSolver:
             logger.error(f"Error solving sliding puzzle: {e}")
             return False
     
-    async def analyze_puzzle(self, image_path: Path) -> Optional[Dict[str, Any]]:
+    async def analyze_puzzle(self, image: Union[bytes, Path]) -> Optional[Dict[str, Any]]:
         """
         Analyze sliding puzzle image to find the correct position
-        Uses computer vision to detect the gap and the piece
+        Uses computer vision (in the curllm vision worker pool) to detect the gap and the piece
         """
         try:
-            # Load image
-            img = cv2.imread(str(image_path))
-            if img is None:
-                return None
-                
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            
-            # Edge detection to find the puzzle piece and gap
-            edges = cv2.Canny(gray, 50, 150)
-            
-            # Find contours
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            # Sort contours by area to find the main elements
-            contours = sorted(contours, key=cv2.contourArea, reverse=True)[:2]
-            
-            if len(contours) >= 2:
-                # Assume first contour is background, second is the piece
-                piece_contour = contours[1]
-                x, y, w, h = cv2.boundingRect(piece_contour)
-                
-                # Use template matching to find where piece should go
-                template = gray[y:y+h, x:x+w]
-                result = cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED)
-                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-                
-                # Calculate distance to slide
-                slide_distance = max_loc[0] - x
-                
-                logger.info(f"Detected slide distance: {slide_distance}px")
-                
-                return {
-                    'type': 'slide',
-                    'distance': slide_distance,
-                    'start_x': x,
-                    'start_y': y,
-                    'target_x': max_loc[0],
-                    'target_y': max_loc[1]
-                }
-                
+            solution = await get_vision_pool().analyze_puzzle(image)
+            if solution:
+                logger.info(f"Detected slide distance: {solution['distance']}px")
+            return solution
         except Exception as e:
             logger.error(f"Error analyzing puzzle: {e}")
             
@@ -334,7 +300,7 @@ class SlidingPuzzleSolver:
     async def solve_with_2captcha(
         self,
         context: Any,
-        image_path: Path
+        image: Union[bytes, Path]
     ) -> bool:
         """Fallback to 2captcha service if local solving fails"""
         if not TWOCAPTCHA_SUPPORT or not self.config.use_2captcha:
@@ -345,12 +311,13 @@ class SlidingPuzzleSolver:
             solver = TwoCaptcha(self.config.api_key_2captcha)
             
             # Send image to 2captcha
-            with open(image_path, 'rb') as f:
-                result = solver.coordinates(
-                    f.read(),
-                    lang='pl',
-                    hint_text='Przesuń element układanki w odpowiednie miejsce'
-                )
+            if isinstance(image, Path):
+                image = image.read_bytes()
+            result = solver.coordinates(
+                image,
+                lang='pl',
+                hint_text='Przesuń element układanki w odpowiednie miejsce'
+            )
                 
             if result and 'code' in result:
                 # Parse coordinates from result
@@ -12,18 +12,25 @@ Usage:
     # Legacy code - use v1
     from curllm_core.v1 import FormOrchestrator, deterministic_form_fill
 """
+# Config is loaded eagerly (cheap, and ``curllm_core.config`` must stay the
+# Config instance); everything else is imported on first attribute access.
 from .config import Config, config
-from .executor import CurllmExecutor
-from .server import app, run_server
-from .llm_config import LLMConfig, LLMPresets
-from .llm_factory import setup_llm, create_llm_client
+from .lazy_imports import lazy_exports
 
-# Streamware component architecture
-from . import streamware
-
-# Versioned APIs
-from . import v1  # Legacy (deprecated)
-from . import v2  # LLM-driven (recommended)
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "CurllmExecutor": ".executor:CurllmExecutor",
+    "LLMConfig": ".llm_config:LLMConfig",
+    "LLMPresets": ".llm_config:LLMPresets",
+    "setup_llm": ".llm_factory:setup_llm",
+    "create_llm_client": ".llm_factory:create_llm_client",
+    "app": ".server:app",
+    "run_server": ".server:run_server",
+    # Streamware component architecture
+    "streamware": ".streamware",
+    # Versioned APIs
+    "v1": ".v1",  # Legacy (deprecated)
+    "v2": ".v2",  # LLM-driven (recommended)
+})
 
 __all__ = [
     # Core
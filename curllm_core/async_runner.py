@@ -0,0 +1,275 @@
+"""
+Async Job Runner for the API Server
+
+Runs all executor jobs on one long-lived asyncio event loop in a background
+thread, instead of creating a fresh loop per HTTP request. Sync (Flask)
+handlers submit coroutines and block on the result, so browsers, pooled LLM
+sessions and caches living on the loop can be reused across requests.
+
+Usage:
+    from curllm_core.async_runner import get_async_runner, ServerBusyError
+
+    runner = get_async_runner()
+    try:
+        result = runner.run(lambda: executor.execute_workflow(instruction=..., url=...))
+    except ServerBusyError as e:
+        # respond 429 with e.queue_depth / e.retry_after
+        ...
+
+    # On shutdown: stop admitting jobs and wait for in-flight ones
+    runner.drain(timeout=30, finalizer=executor.aclose)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ServerBusyError(Exception):
+    """Raised when a job cannot be admitted (queue full or server draining)."""
+
+    def __init__(self, message: str, queue_depth: int = 0, retry_after: int = 1):
+        super().__init__(message)
+        self.queue_depth = queue_depth
+        self.retry_after = retry_after
+
+
+class AsyncJobRunner:
+    """
+    Long-lived event loop with bounded concurrency and admission control.
+
+    At most ``max_concurrency`` jobs run at once; up to ``max_queue`` more may
+    wait for a slot. Anything beyond that is rejected with ServerBusyError so
+    the HTTP layer can answer 429 instead of piling up threads.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_queue: int = 16,
+        name: str = "curllm-async-runner",
+    ):
+        """
+        Initialize runner.
+
+        Args:
+            max_concurrency: Maximum number of jobs executing concurrently
+            max_queue: Maximum number of admitted jobs waiting for a slot
+            name: Name of the background loop thread
+        """
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_queue = max(0, int(max_queue))
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._running = 0
+        self._draining = False
+        self._stats: Dict[str, Any] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "total_time": 0.0,
+        }
+
+    # ------------------------------------------------------------------ loop
+
+    def start(self) -> "AsyncJobRunner":
+        """Start the background event loop thread (idempotent)."""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            ready = threading.Event()
+
+            def _serve():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                self._loop = loop
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                ready.set()
+                try:
+                    loop.run_forever()
+                finally:
+                    loop.run_until_complete(loop.shutdown_asyncgens())
+                    loop.close()
+
+            self._draining = False
+            self._thread = threading.Thread(target=_serve, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            logger.info(
+                f"Async runner started (concurrency={self.max_concurrency}, queue={self.max_queue})"
+            )
+        return self
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runner's event loop (starts the runner if needed)."""
+        if self._loop is None or self._thread is None or not self._thread.is_alive():
+            self.start()
+        return self._loop  # type: ignore[return-value]
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of admitted jobs waiting for a free slot."""
+        return max(0, self._pending - self._running)
+
+    # ---------------------------------------------------------------- submit
+
+    def submit(self, coro_factory: Callable[[], Awaitable[Any]]) -> Future:
+        """
+        Admit a job and schedule it on the runner loop.
+
+        Args:
+            coro_factory: Zero-arg callable returning the coroutine to run.
+                          Called on the loop thread once the job is admitted.
+
+        Returns:
+            concurrent.futures.Future with the job result
+
+        Raises:
+            ServerBusyError: If the server is draining or the queue is full
+        """
+        with self._cond:
+            if self._draining:
+                self._stats["rejected"] += 1
+                raise ServerBusyError("Server is shutting down", self.queue_depth, retry_after=5)
+            if self._pending >= self.max_concurrency + self.max_queue:
+                self._stats["rejected"] += 1
+                depth = self.queue_depth
+                raise ServerBusyError(
+                    f"Server busy: {depth} jobs queued", depth, retry_after=self._retry_after_hint()
+                )
+            self._pending += 1
+            self._stats["submitted"] += 1
+
+        fut = asyncio.run_coroutine_threadsafe(self._run_job(coro_factory), self.loop)
+        fut.add_done_callback(self._on_done)
+        return fut
+
+    def run(self, coro_factory: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """Submit a job and block the calling thread until it finishes."""
+        return self.submit(coro_factory).result(timeout=timeout)
+
+    async def _run_job(self, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+        assert self._semaphore is not None
+        async with self._semaphore:
+            with self._cond:
+                self._running += 1
+            started = time.monotonic()
+            try:
+                return await coro_factory()
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._stats["total_time"] += time.monotonic() - started
+
+    def _on_done(self, fut: Future):
+        with self._cond:
+            self._pending -= 1
+            if fut.cancelled() or fut.exception() is not None:
+                self._stats["failed"] += 1
+            else:
+                self._stats["completed"] += 1
+            self._cond.notify_all()
+
+    def _retry_after_hint(self) -> int:
+        """Rough seconds until a slot frees up, based on average job time."""
+        done = self._stats["completed"] + self._stats["failed"]
+        avg = (self._stats["total_time"] / done) if done else 5.0
+        waves = (self.queue_depth // self.max_concurrency) + 1
+        return max(1, int(avg * waves))
+
+    # ----------------------------------------------------------------- drain
+
+    def drain(
+        self,
+        timeout: Optional[float] = 30.0,
+        finalizer: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> bool:
+        """
+        Stop admitting jobs, wait for in-flight jobs, then stop the loop.
+
+        Args:
+            timeout: Seconds to wait for in-flight jobs (None = forever)
+            finalizer: Optional coroutine factory run on the loop before it
+                       stops (e.g. ``executor.aclose``)
+
+        Returns:
+            True if all jobs finished before the timeout
+        """
+        with self._cond:
+            self._draining = True
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            drained = self._pending == 0
+
+        if not drained:
+            logger.warning(f"Async runner drain timed out with {self._pending} jobs in flight")
+
+        loop, thread = self._loop, self._thread
+        if loop is not None and thread is not None and thread.is_alive():
+            if finalizer is not None:
+                try:
+                    asyncio.run_coroutine_threadsafe(finalizer(), loop).result(timeout=10)
+                except Exception as e:
+                    logger.warning(f"Async runner finalizer failed: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=10)
+        self._loop = None
+        self._thread = None
+        return drained
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get runner statistics.
+
+        Returns:
+            Dictionary with running/queued counts, limits and job counters
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "running": self._running,
+                "queued": self.queue_depth,
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "draining": self._draining,
+            })
+        stats["total_time"] = round(stats["total_time"], 3)
+        return stats
+
+
+# Global runner instance
+_global_runner: Optional[AsyncJobRunner] = None
+
+
+def get_async_runner() -> AsyncJobRunner:
+    """
+    Get or create the global async runner.
+
+    Limits come from ``config.server_max_concurrency`` and
+    ``config.server_max_queue`` on first call.
+    """
+    global _global_runner
+
+    if _global_runner is None:
+        from .config import config
+        _global_runner = AsyncJobRunner(
+            max_concurrency=config.server_max_concurrency,
+            max_queue=config.server_max_queue,
+        )
+
+    return _global_runner
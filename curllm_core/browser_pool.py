@@ -0,0 +1,329 @@
+"""
+Warm Browser Pool
+
+Keeps pre-launched Chromium instances alive between executor runs and hands
+out fresh, isolated contexts on them. Browsers are grouped by launch profile
+(stealth flags + proxy), since those are fixed at launch time; storage state
+(cookies/localStorage for a storage key or SessionManager session) is loaded
+per context, so runs never share state.
+
+A browser is recycled after ``max_uses`` contexts or when the total RSS of
+Chromium processes exceeds ``max_memory_mb``.
+
+Usage:
+    from curllm_core.browser_pool import get_browser_pool
+
+    pool = get_browser_pool()
+    await pool.start(stealth_config, config)       # optional pre-warm
+    context = await pool.new_context(stealth_mode, storage_key, headers,
+                                     stealth_config, config, proxy_config, session_id)
+    ...
+    await context.close()                          # returns the browser to the pool
+    print(pool.get_stats())                        # hits, misses, launch times, recycles
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .browser_setup import (
+    _ensure_playwright_browsers,
+    build_launch_args,
+    launch_chromium,
+    new_configured_context,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+@dataclass
+class PooledBrowser:
+    """A launched browser and its usage counters."""
+
+    browser: Any
+    profile: str
+    launched_at: float = field(default_factory=time.time)
+    uses: int = 0
+    active: int = 0
+    last_used: float = field(default_factory=time.time)
+    retiring: bool = False
+
+
+def profile_key(launch_args: Dict[str, Any]) -> str:
+    """Stable key for browsers that can serve the same launch arguments."""
+    return json.dumps(
+        {"args": sorted(launch_args.get("args", [])), "proxy": launch_args.get("proxy"),
+         "headless": launch_args.get("headless")},
+        sort_keys=True,
+    )
+
+
+class BrowserPool:
+    """
+    Pool of warm Chromium browsers with context recycling.
+
+    Contexts are always new; only the browser process is reused.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_uses: int = 50,
+        max_memory_mb: int = 2048,
+        max_contexts_per_browser: int = 4,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            size: Maximum number of browsers kept alive (all profiles)
+            max_uses: Contexts served by a browser before it is recycled
+            max_memory_mb: Recycle on release when Chromium RSS exceeds this (0 = off)
+            max_contexts_per_browser: Concurrent contexts before another browser is launched
+        """
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.max_memory_mb = max_memory_mb
+        self.max_contexts_per_browser = max(1, max_contexts_per_browser)
+        self._playwright = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._browsers: List[PooledBrowser] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._stats: Dict[str, Any] = {
+            "hits": 0,
+            "misses": 0,
+            "launches": 0,
+            "launch_time_total": 0.0,
+            "launch_time_max": 0.0,
+            "recycles": 0,
+            "evictions": 0,
+        }
+
+    async def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None:
+                # Previous loop is gone (e.g. loop-per-request server); its
+                # browsers cannot be driven from here anymore.
+                logger.warning("Browser pool bound to a different event loop, starting fresh")
+                self._browsers = []
+                self._playwright = None
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            _ensure_playwright_browsers()
+            self._playwright = await async_playwright().start()
+
+    async def start(self, stealth_config, config, warm: Optional[int] = None):
+        """
+        Pre-launch browsers for the default (non-stealth, config proxy) profile.
+
+        Args:
+            stealth_config: StealthConfig instance
+            config: Application config
+            warm: Number of browsers to launch (default: pool size)
+        """
+        await self._ensure_started()
+        launch_args = build_launch_args(False, stealth_config, config, None)
+        key = profile_key(launch_args)
+        async with self._lock:
+            target = min(self.size, warm if warm is not None else self.size)
+            while sum(1 for b in self._browsers if b.profile == key) < target:
+                self._browsers.append(await self._launch(launch_args, key))
+
+    async def _launch(self, launch_args: Dict[str, Any], key: str) -> PooledBrowser:
+        started = time.monotonic()
+        browser = await launch_chromium(self._playwright, launch_args)
+        elapsed = time.monotonic() - started
+        self._stats["launches"] += 1
+        self._stats["launch_time_total"] += elapsed
+        self._stats["launch_time_max"] = max(self._stats["launch_time_max"], elapsed)
+        logger.info(f"Browser pool launched browser in {elapsed:.2f}s")
+        return PooledBrowser(browser=browser, profile=key)
+
+    async def _acquire(self, launch_args: Dict[str, Any]) -> PooledBrowser:
+        key = profile_key(launch_args)
+        async with self._lock:
+            candidates = [
+                b for b in self._browsers
+                if b.profile == key and not b.retiring and b.browser.is_connected()
+                and b.active < self.max_contexts_per_browser
+            ]
+            if candidates:
+                pooled = min(candidates, key=lambda b: b.active)
+                self._stats["hits"] += 1
+            else:
+                self._stats["misses"] += 1
+                await self._evict_idle(reserve=1)
+                pooled = await self._launch(launch_args, key)
+                self._browsers.append(pooled)
+            pooled.active += 1
+            pooled.uses += 1
+            pooled.last_used = time.time()
+            if pooled.uses >= self.max_uses:
+                pooled.retiring = True
+            return pooled
+
+    async def _evict_idle(self, reserve: int = 0):
+        """Close least recently used idle browsers so the pool stays within size."""
+        idle = sorted((b for b in self._browsers if b.active == 0), key=lambda b: b.last_used)
+        while len(self._browsers) + reserve > self.size and idle:
+            victim = idle.pop(0)
+            self._browsers.remove(victim)
+            self._stats["evictions"] += 1
+            await self._close_browser(victim)
+
+    async def _close_browser(self, pooled: PooledBrowser):
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled browser: {e}")
+
+    async def _release(self, pooled: PooledBrowser):
+        async with self._lock:
+            pooled.active = max(0, pooled.active - 1)
+            pooled.last_used = time.time()
+            if not pooled.retiring and self.max_memory_mb and self._chromium_rss_mb() > self.max_memory_mb:
+                logger.info("Browser pool memory threshold exceeded, recycling browser")
+                pooled.retiring = True
+            if pooled.retiring and pooled.active == 0 and pooled in self._browsers:
+                self._browsers.remove(pooled)
+                self._stats["recycles"] += 1
+                await self._close_browser(pooled)
+
+    def _chromium_rss_mb(self) -> float:
+        if not PSUTIL_AVAILABLE:
+            return 0.0
+        try:
+            total = 0
+            for child in psutil.Process().children(recursive=True):
+                try:
+                    if "chrom" in child.name().lower() or "headless" in child.name().lower():
+                        total += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return total / (1024 * 1024)
+        except Exception:
+            return 0.0
+
+    async def new_context(
+        self,
+        stealth_mode: bool,
+        storage_key: Optional[str],
+        headers: Optional[Dict[str, str]],
+        stealth_config,
+        config,
+        proxy_config: Optional[Dict] = None,
+        session_id: Optional[str] = None,
+    ):
+        """
+        Get an isolated context on a warm browser for the requested profile.
+
+        Same signature as ``browser_setup.setup_playwright``. The returned
+        context has no ``_curllm_browser``/``_curllm_playwright`` attributes,
+        so callers' existing cleanup only closes the context, which hands the
+        browser back to the pool.
+        """
+        await self._ensure_started()
+        launch_args = build_launch_args(stealth_mode, stealth_config, config, proxy_config)
+        pooled = await self._acquire(launch_args)
+        try:
+            context = await new_configured_context(
+                pooled.browser,
+                stealth_mode,
+                storage_key,
+                headers,
+                stealth_config,
+                config,
+                proxy_config,
+                session_id,
+            )
+        except Exception:
+            pooled.retiring = True
+            await self._release(pooled)
+            raise
+
+        loop = asyncio.get_running_loop()
+        released = {"done": False}
+
+        def _on_close(*_):
+            if not released["done"]:
+                released["done"] = True
+                loop.create_task(self._release(pooled))
+
+        context.on("close", _on_close)
+        setattr(context, "_curllm_browser_pool", self)
+        return context
+
+    async def close(self):
+        """Close all pooled browsers and stop Playwright."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        browsers, self._browsers = self._browsers, []
+        for pooled in browsers:
+            await self._close_browser(pooled)
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with hit/miss counters, launch timings and pool occupancy
+        """
+        stats = dict(self._stats)
+        launches = stats["launches"]
+        lookups = stats["hits"] + stats["misses"]
+        stats["launch_time_avg"] = round(stats["launch_time_total"] / launches, 3) if launches else 0.0
+        stats["launch_time_total"] = round(stats["launch_time_total"], 3)
+        stats["launch_time_max"] = round(stats["launch_time_max"], 3)
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["browsers"] = len(self._browsers)
+        stats["active_contexts"] = sum(b.active for b in self._browsers)
+        return stats
+
+
+# Global pool instance
+_global_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Get or create the global browser pool.
+
+    Sizing is read from CURLLM_BROWSER_POOL_SIZE, CURLLM_BROWSER_POOL_MAX_USES,
+    CURLLM_BROWSER_POOL_MAX_MEMORY_MB and CURLLM_BROWSER_POOL_CONTEXTS.
+    """
+    global _global_pool
+
+    if _global_pool is None:
+        _global_pool = BrowserPool(
+            size=int(os.getenv("CURLLM_BROWSER_POOL_SIZE", "2")),
+            max_uses=int(os.getenv("CURLLM_BROWSER_POOL_MAX_USES", "50")),
+            max_memory_mb=int(os.getenv("CURLLM_BROWSER_POOL_MAX_MEMORY_MB", "2048")),
+            max_contexts_per_browser=int(os.getenv("CURLLM_BROWSER_POOL_CONTEXTS", "4")),
+        )
+
+    return _global_pool
+
+
+async def close_browser_pool():
+    """Close the global browser pool if it was used."""
+    if _global_pool is not None:
+        await _global_pool.close()
@@ -85,11 +85,22 @@ async def setup_browser(
     config,
     proxy_config: Optional[Dict] = None,
     session_id: Optional[str] = None,
+    browser_pool=None,
 ):
     if use_browserless:
         import websockets
         ws = await websockets.connect(browserless_url)
         return BrowserlessContext(ws)
+    if browser_pool is not None:
+        return await browser_pool.new_context(
+            stealth_mode,
+            storage_key,
+            headers,
+            stealth_config,
+            config,
+            proxy_config,
+            session_id,
+        )
     return await setup_playwright(
         stealth_mode,
         storage_key,
@@ -135,22 +146,7 @@ def _ensure_playwright_browsers():
             print(f"⚠️ Failed to auto-install Playwright: {e}")
 
 
-async def setup_playwright(
-    stealth_mode: bool,
-    storage_key: Optional[str],
-    headers: Optional[Dict[str, str]],
-    stealth_config,
-    config,
-    proxy_config: Optional[Dict] = None,
-    session_id: Optional[str] = None,
-):
-    from playwright.async_api import async_playwright
-    
-    # Auto-install browsers if missing
-    _ensure_playwright_browsers()
-    
-    session_mgr = SessionManager()
-    playwright = await async_playwright().start()
+def build_launch_args(stealth_mode: bool, stealth_config, config, proxy_config: Optional[Dict] = None) -> Dict:
     launch_args = {
         "headless": bool(config.headless),
         "args": [
@@ -174,10 +170,13 @@ async def setup_playwright(
             launch_args["proxy"] = proxy_settings
     elif config.proxy:
         launch_args["proxy"] = {"server": config.proxy}
-    
+    return launch_args
+
+
+async def launch_chromium(playwright, launch_args: Dict):
     # Try to launch, with retry after auto-install on failure
     try:
-        browser = await playwright.chromium.launch(**launch_args)
+        return await playwright.chromium.launch(**launch_args)
     except Exception as e:
         if "Executable doesn't exist" in str(e):
             print("🔧 Browser missing, forcing reinstall...")
@@ -188,10 +187,11 @@ async def setup_playwright(
                 capture_output=True,
                 timeout=300
             )
-            browser = await playwright.chromium.launch(**launch_args)
-        else:
-            raise
+            return await playwright.chromium.launch(**launch_args)
+        raise
+
 
+def resolve_storage_path(session_mgr: SessionManager, storage_key: Optional[str], session_id: Optional[str]) -> Optional[Path]:
     storage_path = None
     if session_id:
         storage_path = session_mgr.get_session_path(session_id)
@@ -216,6 +216,22 @@ async def setup_playwright(
                 except Exception:
                     pass
         storage_path = storage_dir / f"{storage_key}.json"
+    return storage_path
+
+
+async def new_configured_context(
+    browser,
+    stealth_mode: bool,
+    storage_key: Optional[str],
+    headers: Optional[Dict[str, str]],
+    stealth_config,
+    config,
+    proxy_config: Optional[Dict] = None,
+    session_id: Optional[str] = None,
+):
+    """Create an isolated context on an already launched browser."""
+    session_mgr = SessionManager()
+    storage_path = resolve_storage_path(session_mgr, storage_key, session_id)
 
     vw = 1366 + int(random.random() * 700)
     vh = 768 + int(random.random() * 400)
@@ -245,9 +261,43 @@ async def setup_playwright(
     context = await browser.new_context(**context_args)
     if stealth_mode:
         await stealth_config.apply_to_context(context)
-    setattr(context, "_curllm_browser", browser)
-    setattr(context, "_curllm_playwright", playwright)
+    if getattr(config, "page_library_enabled", True):
+        from curllm_core.page_library import install_page_library
+        await install_page_library(context)
     setattr(context, "_curllm_storage_path", str(storage_path) if storage_path else None)
     setattr(context, "_curllm_session_id", session_id)
     setattr(context, "_curllm_session_manager", session_mgr)
     return context
+
+
+async def setup_playwright(
+    stealth_mode: bool,
+    storage_key: Optional[str],
+    headers: Optional[Dict[str, str]],
+    stealth_config,
+    config,
+    proxy_config: Optional[Dict] = None,
+    session_id: Optional[str] = None,
+):
+    from playwright.async_api import async_playwright
+    
+    # Auto-install browsers if missing
+    _ensure_playwright_browsers()
+    
+    playwright = await async_playwright().start()
+    launch_args = build_launch_args(stealth_mode, stealth_config, config, proxy_config)
+    browser = await launch_chromium(playwright, launch_args)
+
+    context = await new_configured_context(
+        browser,
+        stealth_mode,
+        storage_key,
+        headers,
+        stealth_config,
+        config,
+        proxy_config,
+        session_id,
+    )
+    setattr(context, "_curllm_browser", browser)
+    setattr(context, "_curllm_playwright", playwright)
+    return context
@@ -49,8 +49,29 @@ class Config:
     proxy: Optional[str] = (os.getenv("CURLLM_PROXY") or os.getenv("HTTPS_PROXY") or os.getenv("HTTP_PROXY") or None)
     validation_enabled: bool = os.getenv("CURLLM_VALIDATION", "true").lower() == "true"
     llm_timeout: int = int(os.getenv("CURLLM_LLM_TIMEOUT", "300"))
+    # Keep the Ollama model resident between agent steps ("" = server default of 5m)
+    ollama_keep_alive: str = os.getenv("CURLLM_OLLAMA_KEEP_ALIVE", "30m")
+    # Prompt/response cache around setup_llm() clients (memory LRU + on-disk SQLite tier)
+    llm_cache_enabled: bool = os.getenv("CURLLM_LLM_CACHE", "false").lower() in ["true", "1", "yes"]
     hierarchical_planner_chars: int = int(os.getenv("CURLLM_HIERARCHICAL_PLANNER_CHARS", "25000"))
     
+    # API server execution: "async" (one long-lived loop, bounded concurrency) or "loop_per_request" (legacy)
+    server_mode: str = os.getenv("CURLLM_SERVER_MODE", "async").lower()
+    server_max_concurrency: int = int(os.getenv("CURLLM_SERVER_MAX_CONCURRENCY", "4"))
+    server_max_queue: int = int(os.getenv("CURLLM_SERVER_MAX_QUEUE", "16"))
+    server_drain_timeout: float = float(os.getenv("CURLLM_SERVER_DRAIN_TIMEOUT", "60"))
+
+    # Durable job queue behind /api/jobs (workers run on the async runner loop; 0 workers = submit only)
+    job_db: str = os.getenv("CURLLM_JOB_DB", "")
+    job_workers: int = int(os.getenv("CURLLM_JOB_WORKERS", "2"))
+    job_lease_seconds: float = float(os.getenv("CURLLM_JOB_LEASE_SECONDS", "120"))
+    job_max_attempts: int = int(os.getenv("CURLLM_JOB_MAX_ATTEMPTS", "3"))
+    job_max_per_domain: int = int(os.getenv("CURLLM_JOB_MAX_PER_DOMAIN", "2"))
+    job_timeout: float = float(os.getenv("CURLLM_JOB_TIMEOUT", "900"))
+    
+    # Warm browser pool (reuses launched Chromium across runs; best with server_mode=async)
+    browser_pool_enabled: bool = os.getenv("CURLLM_BROWSER_POOL", "false").lower() in ["true", "1", "yes"]
+    
     # Vision-based form analysis
     vision_form_analysis: bool = os.getenv("CURLLM_VISION_FORM_ANALYSIS", "auto").lower() in ["true", "1", "yes", "auto"]
     vision_model: str = os.getenv("CURLLM_VISION_MODEL", "") or os.getenv("CURLLM_MODEL", "qwen2.5:7b")
@@ -87,8 +108,43 @@ class Config:
     planner_max_chars: int = int(os.getenv("CURLLM_PLANNER_MAX_CHARS", os.getenv("CURLLM_PLANNER_BASE_CHARS", "8000")))
     planner_growth_per_step: int = int(os.getenv("CURLLM_PLANNER_GROWTH_PER_STEP", "2000"))
     planner_max_cap: int = int(os.getenv("CURLLM_PLANNER_MAX_CAP", "20000"))
+    # Token budget of the packed page context (0 = char limits above / 4)
+    planner_context_tokens: int = int(os.getenv("CURLLM_PLANNER_CONTEXT_TOKENS", "0"))
     stall_limit: int = int(os.getenv("CURLLM_STALL_LIMIT", "5"))
     
+    # Screenshot pipeline: format (png|jpeg|webp), capture mode (viewport|full_page),
+    # skipping of perceptually identical frames and size/age bounded retention (0 = off)
+    screenshot_format: str = os.getenv("CURLLM_SCREENSHOT_FORMAT", "png").lower()
+    screenshot_quality: int = int(os.getenv("CURLLM_SCREENSHOT_QUALITY", "80"))
+    screenshot_mode: str = os.getenv("CURLLM_SCREENSHOT_MODE", "viewport").lower()
+    screenshot_dedup: bool = os.getenv("CURLLM_SCREENSHOT_DEDUP", "true").lower() in ["true", "1", "yes"]
+    screenshot_dedup_distance: int = int(os.getenv("CURLLM_SCREENSHOT_DEDUP_DISTANCE", "2"))
+    screenshot_max_total_mb: int = int(os.getenv("CURLLM_SCREENSHOT_MAX_TOTAL_MB", "0"))
+    screenshot_max_age_days: int = int(os.getenv("CURLLM_SCREENSHOT_MAX_AGE_DAYS", "0"))
+    
+    # Proxy pool: quarantine after N consecutive failures (bans quarantine at once, period
+    # doubles per strike), health/rotation state write interval, public list refresh interval
+    proxy_quarantine_seconds: float = float(os.getenv("CURLLM_PROXY_QUARANTINE_SECONDS", "300"))
+    proxy_fail_threshold: int = int(os.getenv("CURLLM_PROXY_FAIL_THRESHOLD", "2"))
+    proxy_state_flush_seconds: float = float(os.getenv("CURLLM_PROXY_STATE_FLUSH_SECONDS", "30"))
+    proxy_list_ttl: float = float(os.getenv("CURLLM_PROXY_LIST_TTL", "3600"))
+    
+    # Off-loop vision analysis (VisionAnalyzer, puzzle solver): worker processes
+    # (0 = background thread), analyses allowed to wait, longest analysed side (0 = full size)
+    vision_workers: int = int(os.getenv("CURLLM_VISION_WORKERS", "2"))
+    vision_max_queue: int = int(os.getenv("CURLLM_VISION_MAX_QUEUE", "8"))
+    vision_max_side: int = int(os.getenv("CURLLM_VISION_MAX_SIDE", "1280"))
+    
+    # Preloaded in-page JS library (functions/js) installed once per browser context
+    page_library_enabled: bool = os.getenv("CURLLM_PAGE_LIBRARY", "true").lower() in ["true", "1", "yes"]
+    
+    # Extraction race: run read-only extractors concurrently, first valid result wins
+    extractor_race_enabled: bool = os.getenv("CURLLM_EXTRACTOR_RACE", "false").lower() in ["true", "1", "yes"]
+    extractor_race_timeout: float = float(os.getenv("CURLLM_EXTRACTOR_RACE_TIMEOUT", "20"))
+    # Sequential extractor chain before the planner (DSL executor, LLM-guided,
+    # dynamic and iterative extractors); also runs as the race's fallback
+    extractor_chain_enabled: bool = os.getenv("CURLLM_EXTRACTOR_CHAIN", "false").lower() in ["true", "1", "yes"]
+    
     # LLM-Guided Extractor (LLM makes decisions at each atomic step)
     llm_guided_extractor_enabled: bool = os.getenv("CURLLM_LLM_GUIDED_EXTRACTOR", "true").lower() in ["true", "1", "yes"]
     
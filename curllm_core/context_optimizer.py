@@ -41,7 +41,8 @@ def optimize_context(
     optimized = dict(page_context)
     
     # Progressive DOM reduction
-    if step > 1 and "dom_preview" in optimized:
+    # (a serialized/incremental dom_preview string is already budgeted)
+    if step > 1 and isinstance(optimized.get("dom_preview"), list):
         original_count = len(optimized.get("dom_preview", []))
         max_elements = 200 if step > 2 else 300
         optimized["dom_preview"] = truncate_dom(
@@ -192,7 +193,7 @@ def prioritize_form_context(
     }
     
     # Filter DOM to only form-related elements
-    if "dom_preview" in page_context:
+    if isinstance(page_context.get("dom_preview"), list):
         form_context["dom_preview"] = filter_form_elements(
             page_context.get("dom_preview", [])
         )
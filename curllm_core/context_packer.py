@@ -0,0 +1,250 @@
+"""
+Context Packer - token-budgeted page context for the planner prompt
+
+Replaces "json.dumps(indent=2) then cut at N chars" (which usually yields
+half-truncated, invalid JSON) with a packer that ranks page-context
+sections by relevance to the task, fits them into a token budget by
+trimming lists and strings at element boundaries, and always emits compact,
+well-formed JSON. Whatever was trimmed or left out is reported.
+
+Usage:
+    from curllm_core.context_packer import pack_context
+
+    packed = pack_context(page_context, instruction, budget_tokens=2000)
+    prompt = f"Page Context: {packed.text}"   # json.loads(packed.text) always works
+    print(packed.tokens, packed.dropped)      # {"dom_preview": "120/300 items", "text": "dropped"}
+
+    # Exact counts with a real tokenizer
+    packed = pack_context(page_context, instruction, 2000, count_tokens=lambda s: len(enc.encode(s)))
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARK = "…"
+
+# Whole words (English inflections allowed): "form" must not match "information"/"platform"
+FORM_KEYWORDS = ("form", "contact", "login", "log in", "sign up", "signup")
+# Word stems: "submit" matches "submitting", "formularz" matches "formularza"
+FORM_STEMS = ("fill", "submit", "register", "formularz", "wypełni", "wypelni")
+EXTRACT_KEYWORDS = (
+    "extract", "product", "produkt", "price", "cen", "link", "article", "artyku", "offer", "ofert",
+    "zlecen", "email", "phone", "telefon", "list", "lista", "find", "znajdź", "znajdz",
+)
+
+_FORM_RE = re.compile(
+    r"\b(?:(?:" + "|".join(map(re.escape, FORM_KEYWORDS)) + r")(?:s|ed|ing)?\b"
+    r"|(?:" + "|".join(map(re.escape, FORM_STEMS)) + r"))"
+)
+# Extraction keywords are stems: matched at the start of a word
+_EXTRACT_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, EXTRACT_KEYWORDS)) + r")")
+
+# Section priorities per task kind (higher = packed first); url/title always lead
+SECTION_PRIORITIES: Dict[str, Dict[str, int]] = {
+    "form": {
+        "forms": 100, "interactive": 90, "tool_history": 85, "form_fields": 80, "headings": 50,
+        "dom_preview": 45, "text": 40, "iframes": 30, "links": 20, "article_candidates": 10,
+    },
+    "extract": {
+        "tool_history": 100, "product_candidates": 95, "article_candidates": 90, "links": 85,
+        "headings": 70, "text": 65, "dom_preview": 55, "interactive": 45, "iframes": 25, "forms": 15,
+    },
+    "navigate": {
+        "tool_history": 100, "interactive": 85, "headings": 75, "links": 70, "text": 60,
+        "forms": 55, "dom_preview": 50, "article_candidates": 40, "iframes": 25,
+    },
+}
+LEADING_SECTIONS = ("url", "title")
+DEFAULT_PRIORITY = 30
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def compact_json(value: Any) -> str:
+    """Whitespace-free JSON (non-ASCII kept as is)."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def prune_empty(obj: Any) -> Any:
+    """Drop None values and empty lists/dicts recursively."""
+    if isinstance(obj, dict):
+        pruned = {k: prune_empty(v) for k, v in obj.items()}
+        return {k: v for k, v in pruned.items() if v is not None and not (isinstance(v, (list, dict)) and len(v) == 0)}
+    if isinstance(obj, list):
+        pruned_list = [prune_empty(x) for x in obj]
+        return [x for x in pruned_list if x is not None and not (isinstance(x, (list, dict)) and len(x) == 0)]
+    return obj
+
+
+def task_kind(instruction: Optional[str]) -> str:
+    """Classify an instruction as "form", "extract" or "navigate"."""
+    low = (instruction or "").lower()
+    if _FORM_RE.search(low):
+        return "form"
+    if _EXTRACT_RE.search(low):
+        return "extract"
+    return "navigate"
+
+
+@dataclass
+class PackedContext:
+    """Result of ``pack_context``."""
+    text: str
+    tokens: int
+    budget: int
+    original_tokens: int
+    kind: str
+    sections: List[str] = field(default_factory=list)
+    dropped: Dict[str, str] = field(default_factory=dict)
+
+
+class _Packer:
+    def __init__(self, count_tokens: Callable[[str], int]):
+        self.count = count_tokens
+
+    def cost(self, value: Any) -> int:
+        return self.count(compact_json(value))
+
+    def fit(self, value: Any, budget: int) -> Tuple[Any, Optional[str]]:
+        """
+        Shrink ``value`` to at most ``budget`` tokens.
+
+        Returns:
+            (value, note) - note describes the trimming (None if untouched);
+            value is None if not even a minimal form fits
+        """
+        if self.cost(value) <= budget:
+            return value, None
+        if isinstance(value, str):
+            return self._fit_str(value, budget)
+        if isinstance(value, list):
+            return self._fit_list(value, budget)
+        if isinstance(value, dict):
+            return self._fit_dict(value, budget)
+        return None, None
+
+    def _fit_str(self, value: str, budget: int) -> Tuple[Optional[str], Optional[str]]:
+        lo, hi = 0, len(value)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.cost(value[:mid] + TRUNCATION_MARK) <= budget:
+                lo = mid
+            else:
+                hi = mid - 1
+        if lo == 0:
+            return None, None
+        return value[:lo] + TRUNCATION_MARK, f"{lo}/{len(value)} chars"
+
+    def _fit_list(self, value: list, budget: int) -> Tuple[Optional[list], Optional[str]]:
+        # Largest prefix of whole items that fits (page order ~ relevance order)
+        lo, hi = 0, len(value)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.cost(value[:mid]) <= budget:
+                lo = mid
+            else:
+                hi = mid - 1
+        if lo == 0:
+            # Not even one whole item: keep a shrunk first item
+            first, _ = self.fit(value[0], budget - self.cost([]) - 1) if value else (None, None)
+            if first is None:
+                return None, None
+            return [first], f"1/{len(value)} items (first trimmed)"
+        return value[:lo], f"{lo}/{len(value)} items"
+
+    def _fit_dict(self, value: dict, budget: int) -> Tuple[Optional[dict], Optional[str]]:
+        # Members in order until the first that does not fit; the cost is
+        # tracked per member (one serialization each) instead of re-serializing
+        # the accumulated dict, which made trimming large dicts quadratic
+        out: Dict[str, Any] = {}
+        used = self.cost({})
+        values_trimmed = False
+        for key, item in value.items():
+            key_cost = self.count(compact_json(str(key)) + ":,")
+            remaining = budget - used - key_cost
+            packed, note = self.fit(item, remaining) if remaining > 0 else (None, None)
+            if packed is None:
+                break
+            out[key] = packed
+            used += key_cost + self.cost(packed)
+            values_trimmed = values_trimmed or note is not None
+        # Per-member estimates are not strictly additive
+        while out and self.cost(out) > budget:
+            out.popitem()
+        if not out:
+            return None, None
+        if len(out) == len(value) and not values_trimmed:
+            return out, None
+        note = f"{len(out)}/{len(value)} keys"
+        return out, note + " (values trimmed)" if values_trimmed else note
+
+
+def pack_context(
+    page_context: Dict[str, Any],
+    instruction: Optional[str],
+    budget_tokens: int,
+    count_tokens: Optional[Callable[[str], int]] = None,
+) -> PackedContext:
+    """
+    Pack page context into a token budget as compact, valid JSON.
+
+    Sections are added in order of relevance to the task (forms first for
+    form tasks, candidates/links first for extraction); a section that does
+    not fit whole is trimmed (list prefix, string cut, dict members) into
+    the remaining budget, or dropped.
+
+    Args:
+        page_context: Page context from extract_page_context / progressive context
+        instruction: Task instruction (selects the section ranking)
+        budget_tokens: Maximum tokens of the serialized context
+        count_tokens: Tokenizer-backed counter (default: ~4 chars per token estimate)
+
+    Returns:
+        PackedContext with the JSON text, token counts and the dropped/trimmed sections
+    """
+    packer = _Packer(count_tokens or estimate_tokens)
+    context = prune_empty(page_context if isinstance(page_context, dict) else {})
+    kind = task_kind(instruction)
+    priorities = SECTION_PRIORITIES[kind]
+    original_tokens = packer.cost(context)
+
+    def rank(item: Tuple[int, str]) -> Tuple[int, int, int]:
+        index, key = item
+        lead = LEADING_SECTIONS.index(key) if key in LEADING_SECTIONS else len(LEADING_SECTIONS)
+        return (lead, -priorities.get(key, DEFAULT_PRIORITY), index)
+
+    ordered = [key for _, key in sorted(enumerate(context), key=rank)]
+    packed: Dict[str, Any] = {}
+    dropped: Dict[str, str] = {}
+    for key in ordered:
+        remaining = budget_tokens - packer.cost({**packed, key: None})
+        value, note = packer.fit(context[key], remaining + packer.cost(None)) if remaining > 0 else (None, None)
+        if value is None:
+            dropped[key] = "dropped"
+            continue
+        packed[key] = value
+        if note:
+            dropped[key] = note
+
+    text = compact_json(packed)
+    # Per-section estimates are not strictly additive; shed lowest-ranked sections if over
+    while packed and packer.count(text) > budget_tokens:
+        key = next(reversed(packed))
+        del packed[key]
+        dropped[key] = "dropped"
+        text = compact_json(packed)
+    return PackedContext(
+        text=text,
+        tokens=packer.count(text),
+        budget=budget_tokens,
+        original_tokens=original_tokens,
+        kind=kind,
+        sections=list(packed),
+        dropped=dropped,
+    )
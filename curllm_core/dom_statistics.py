@@ -15,6 +15,8 @@ from typing import Dict, List, Any, Optional
 from collections import defaultdict
 import statistics
 
+from curllm_core.page_library import call_page_function
+
 
 class DOMStatistics:
     """
@@ -49,10 +51,8 @@ class DOMStatistics:
             "statistical_insights": {}
         }
         
-        # Gather statistics from page (async methods)
-        await self._gather_depth_stats(page)
-        await self._gather_feature_stats(page)
-        await self._gather_class_patterns(page)
+        # Gather statistics from page (one call into the page library)
+        await self._gather_stats(page)
         
         # Calculate statistical properties
         stats["depth_distribution"] = dict(self.depth_map)
@@ -73,121 +73,25 @@ class DOMStatistics:
         
         return stats
     
-    async def _gather_depth_stats(self, page):
-        """Gather element count statistics per depth level"""
-        # Use JavaScript to analyze DOM depth
-        script = """
-        const stats = {
-            depthMap: {},
-            textLengthByDepth: {}
-        };
-        
-        function analyzeDepth(element, depth = 0) {
-            stats.depthMap[depth] = (stats.depthMap[depth] || 0) + 1;
-            
-            // Text length statistics
-            const textLength = (element.textContent || '').trim().length;
-            if (!stats.textLengthByDepth[depth]) {
-                stats.textLengthByDepth[depth] = [];
-            }
-            if (textLength > 0 && textLength < 500) {
-                stats.textLengthByDepth[depth].push(textLength);
-            }
-            
-            // Recurse
-            for (const child of element.children) {
-                analyzeDepth(child, depth + 1);
-            }
-        }
-        
-        analyzeDepth(document.body);
-        return stats;
-        """
-        
+    async def _gather_stats(self, page):
+        """Gather depth, feature and class statistics (page library: domStatistics)"""
         try:
-            result = await page.evaluate(script)
-            self.depth_map = defaultdict(int, {int(k): v for k, v in result['depthMap'].items()})
-            self.text_length_by_depth = defaultdict(list, {
-                int(k): v for k, v in result['textLengthByDepth'].items()
-            })
+            result = await call_page_function(page, "domStatistics")
         except Exception:
-            pass
-    
-    async def _gather_feature_stats(self, page):
-        """Gather price/link/image statistics per depth"""
-        script = """
-        const stats = {
-            prices: {},
-            links: {},
-            images: {}
-        };
-        
-        function getDepth(element) {
-            let depth = 0;
-            let current = element;
-            while (current && current !== document.body) {
-                depth++;
-                current = current.parentElement;
-            }
-            return depth;
-        }
+            return
         
-        // Price patterns (no hard-coded selectors!)
-        const pricePattern = /\\d+[,.]?\\d*\\s*(?:zł|PLN|€|\\$)/;
-        document.querySelectorAll('*').forEach(el => {
-            const text = el.textContent || '';
-            if (text.match(pricePattern) && text.length < 100) {
-                const depth = getDepth(el);
-                stats.prices[depth] = (stats.prices[depth] || 0) + 1;
-            }
-        });
-        
-        // Links
-        document.querySelectorAll('a[href]').forEach(el => {
-            const depth = getDepth(el);
-            stats.links[depth] = (stats.links[depth] || 0) + 1;
-        });
+        depth = result.get('depth') or {}
+        self.depth_map = defaultdict(int, {int(k): v for k, v in depth.get('depthMap', {}).items()})
+        self.text_length_by_depth = defaultdict(list, {
+            int(k): v for k, v in depth.get('textLengthByDepth', {}).items()
+        })
         
-        // Images
-        document.querySelectorAll('img[src]').forEach(el => {
-            const depth = getDepth(el);
-            stats.images[depth] = (stats.images[depth] || 0) + 1;
-        });
-        
-        return stats;
-        """
+        features = result.get('features') or {}
+        self.price_depth_map = defaultdict(int, {int(k): v for k, v in features.get('prices', {}).items()})
+        self.link_depth_map = defaultdict(int, {int(k): v for k, v in features.get('links', {}).items()})
+        self.image_depth_map = defaultdict(int, {int(k): v for k, v in features.get('images', {}).items()})
         
-        try:
-            result = await page.evaluate(script)
-            self.price_depth_map = defaultdict(int, {int(k): v for k, v in result['prices'].items()})
-            self.link_depth_map = defaultdict(int, {int(k): v for k, v in result['links'].items()})
-            self.image_depth_map = defaultdict(int, {int(k): v for k, v in result['images'].items()})
-        except Exception:
-            pass
-    
-    async def _gather_class_patterns(self, page):
-        """Find repeating class patterns (potential product containers)"""
-        script = """
-        const classFreq = {};
-        
-        document.querySelectorAll('*').forEach(el => {
-            if (el.className && typeof el.className === 'string') {
-                const classes = el.className.split(' ').filter(c => c.length > 0);
-                const firstClass = classes[0];
-                if (firstClass) {
-                    classFreq[firstClass] = (classFreq[firstClass] || 0) + 1;
-                }
-            }
-        });
-        
-        return classFreq;
-        """
-        
-        try:
-            result = await page.evaluate(script)
-            self.class_frequency = defaultdict(int, result)
-        except Exception:
-            pass
+        self.class_frequency = defaultdict(int, result.get('classes') or {})
     
     def _calculate_optimal_depths(self) -> Dict[str, Any]:
         """
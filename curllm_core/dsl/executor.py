@@ -132,12 +132,15 @@ class DSLExecutor:
         url: str,
         instruction: str,
         strategy: DSLStrategy = None,
-        max_fallbacks: int = 3
+        max_fallbacks: int = 3,
+        skip_algorithms: Optional[List[str]] = None
     ) -> ExecutionResult:
         """
         Execute extraction/form filling for URL.
         
         If no strategy provided, looks up from knowledge base.
+        Algorithms in ``skip_algorithms`` (e.g. ones that already ran in the
+        extraction race on this page) are left out of the fallback order.
         """
         start_time = time.time()
         fallbacks_tried = []
@@ -155,8 +158,26 @@ class DSLExecutor:
         
         # 2. Get algorithm order
         algorithms = self._get_algorithm_order(strategy, url, task)
+        if skip_algorithms:
+            skipped = [a for a in algorithms if a in skip_algorithms]
+            algorithms = [a for a in algorithms if a not in skip_algorithms]
+            if skipped:
+                self._log(f"⏭️ Skipping already tried algorithms: {skipped}")
         self._log(f"🔧 Algorithm order: {algorithms}")
         
+        if not algorithms:
+            return ExecutionResult(
+                success=False,
+                data=None,
+                strategy_used=strategy,
+                algorithm_used="none",
+                execution_time_ms=int((time.time() - start_time) * 1000),
+                validation_score=0.0,
+                issues=["All algorithms were already tried"],
+                suggestions=[],
+                fallbacks_tried=[]
+            )
+        
         # 3. Try algorithms in order
         result_data = None
         algorithm_used = None
@@ -250,7 +271,7 @@ class DSLExecutor:
             error_message="; ".join(issues[:3]) if issues else "",
         )
         
-        self.kb.record_execution(record)
+        self.kb.record_execution(record, defer=True)
         
         # 6. Save successful strategy to DSL file
         if success and algorithm_used:
@@ -8,17 +8,33 @@ Stores:
 4. Extraction strategies
 
 Uses SQLite for persistence, JSON for export.
+
+All KnowledgeBase instances for the same file share one long-lived
+connection per process (WAL journal, busy timeout), so parallel runs and
+worker processes can read while another one writes. Executions recorded
+with ``defer=True`` are queued and written in one short transaction; best
+strategies and algorithm rankings are served from an in-memory cache that
+is invalidated by local writes and by commits from other processes.
 """
 
+import atexit
 import json
+import multiprocessing.util
+import os
 import sqlite3
+import threading
+import time
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from urllib.parse import urlparse
 import fnmatch
 
+# Deferred executions are written once this many are queued ...
+BATCH_SIZE = int(os.getenv("CURLLM_DSL_KB_BATCH_SIZE", "32"))
+# ... or once the oldest one is this old (seconds)
+FLUSH_INTERVAL = float(os.getenv("CURLLM_DSL_KB_FLUSH_INTERVAL", "2.0"))
 
 @dataclass
 class StrategyRecord:
@@ -44,6 +60,65 @@ class StrategyRecord:
             self.domain = urlparse(self.url).netloc
 
 
+class _SharedDB:
+    """One connection, write queue and cache per database file and process."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.pending: List["StrategyRecord"] = []
+        self.pending_since = 0.0
+        self.cache: Dict[Tuple, Any] = {}
+        self.data_version: Optional[int] = None
+        self.initialized = False
+
+    def check_external_writes(self):
+        """Drop the cache if another connection committed since the last read."""
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self.data_version:
+            self.cache.clear()
+            self.data_version = version
+
+    def invalidate(self, domain: str, task: str):
+        """Drop cached entries a write to (domain, task) can change."""
+        for key in list(self.cache):
+            _, k_domain, k_task = key
+            if k_domain in (domain, None) and k_task in (task, None):
+                del self.cache[key]
+
+
+_shared_lock = threading.Lock()
+_shared: Dict[Tuple[str, int], _SharedDB] = {}
+
+
+def _shared_db(path: Path) -> _SharedDB:
+    # Keyed by pid: a connection inherited through fork must not be reused
+    key = (str(path.resolve()), os.getpid())
+    with _shared_lock:
+        db = _shared.get(key)
+        if db is None:
+            db = _shared[key] = _SharedDB(path)
+            # multiprocessing workers exit via os._exit and skip atexit
+            multiprocessing.util.Finalize(None, KnowledgeBase._flush_pending, args=(db,), exitpriority=10)
+        return db
+
+
+@atexit.register
+def _flush_all():
+    with _shared_lock:
+        dbs = [db for (_, pid), db in _shared.items() if pid == os.getpid()]
+    for db in dbs:
+        try:
+            KnowledgeBase._flush_pending(db)
+        except Exception:
+            pass
+
+
 class KnowledgeBase:
     """
     Knowledge base for algorithm performance and strategies.
@@ -58,119 +133,233 @@ class KnowledgeBase:
     def __init__(self, db_path: str = "dsl/knowledge.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._init_db()
+        self._db = _shared_db(self.db_path)
+        with self._db.lock:
+            if not self._db.initialized:
+                self._init_db()
+                self._db.initialized = True
     
     def _init_db(self):
         """Initialize SQLite database."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS strategies (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url_pattern TEXT NOT NULL,
-                    domain TEXT NOT NULL,
-                    task TEXT NOT NULL,
-                    algorithm TEXT NOT NULL,
-                    selector TEXT,
-                    fields_json TEXT,
-                    success_count INTEGER DEFAULT 0,
-                    failure_count INTEGER DEFAULT 0,
-                    avg_items INTEGER DEFAULT 0,
-                    avg_time_ms INTEGER DEFAULT 0,
-                    last_used TEXT,
-                    dsl_file TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(domain, task, algorithm, selector)
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS executions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url TEXT NOT NULL,
-                    domain TEXT NOT NULL,
-                    task TEXT NOT NULL,
-                    algorithm TEXT NOT NULL,
-                    selector TEXT,
-                    success INTEGER NOT NULL,
-                    items_extracted INTEGER DEFAULT 0,
-                    execution_time_ms INTEGER DEFAULT 0,
-                    error_message TEXT,
-                    timestamp TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_strategies_domain 
-                ON strategies(domain, task)
-            """)
-            
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_executions_domain 
-                ON executions(domain, task)
-            """)
+        conn = self._db.conn
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS strategies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url_pattern TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                task TEXT NOT NULL,
+                algorithm TEXT NOT NULL,
+                selector TEXT,
+                fields_json TEXT,
+                success_count INTEGER DEFAULT 0,
+                failure_count INTEGER DEFAULT 0,
+                avg_items INTEGER DEFAULT 0,
+                avg_time_ms INTEGER DEFAULT 0,
+                last_used TEXT,
+                dsl_file TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(domain, task, algorithm, selector)
+            )
+        """)
+        
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS executions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                task TEXT NOT NULL,
+                algorithm TEXT NOT NULL,
+                selector TEXT,
+                success INTEGER NOT NULL,
+                items_extracted INTEGER DEFAULT 0,
+                execution_time_ms INTEGER DEFAULT 0,
+                error_message TEXT,
+                timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_strategies_domain 
+            ON strategies(domain, task)
+        """)
+        
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_executions_domain 
+            ON executions(domain, task)
+        """)
     
-    def record_execution(self, record: StrategyRecord) -> int:
-        """Record a strategy execution."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Insert execution record
-            cursor = conn.execute("""
-                INSERT INTO executions 
-                (url, domain, task, algorithm, selector, success, items_extracted, 
-                 execution_time_ms, error_message, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                record.url,
-                record.domain,
-                record.task,
-                record.algorithm,
-                record.selector,
-                1 if record.success else 0,
-                record.items_extracted,
-                record.execution_time_ms,
-                record.error_message,
-                record.timestamp,
-            ))
-            
-            execution_id = cursor.lastrowid
-            
-            # Update or insert strategy stats
-            fields_json = json.dumps(record.fields) if record.fields else "{}"
-            
-            conn.execute("""
-                INSERT INTO strategies 
-                (url_pattern, domain, task, algorithm, selector, fields_json,
-                 success_count, failure_count, avg_items, avg_time_ms, last_used, dsl_file)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(domain, task, algorithm, selector) DO UPDATE SET
-                    success_count = success_count + ?,
-                    failure_count = failure_count + ?,
-                    avg_items = (avg_items * (success_count + failure_count) + ?) / 
-                                (success_count + failure_count + 1),
-                    avg_time_ms = (avg_time_ms * (success_count + failure_count) + ?) / 
-                                  (success_count + failure_count + 1),
-                    last_used = ?
-            """, (
-                f"*{record.domain}/*",
-                record.domain,
-                record.task,
-                record.algorithm,
-                record.selector,
-                fields_json,
-                1 if record.success else 0,
-                0 if record.success else 1,
-                record.items_extracted,
-                record.execution_time_ms,
-                record.timestamp,
-                record.dsl_file,
-                # UPDATE values
-                1 if record.success else 0,
-                0 if record.success else 1,
-                record.items_extracted,
-                record.execution_time_ms,
-                record.timestamp,
-            ))
+    # =========================================================================
+    # WRITES
+    # =========================================================================
+    
+    def record_execution(self, record: StrategyRecord, defer: bool = False) -> Optional[int]:
+        """
+        Record a strategy execution.
+        
+        Args:
+            record: Execution to record
+            defer: Queue the record and write it with the next batch
+                   (BATCH_SIZE records, FLUSH_INTERVAL seconds, the next
+                   read, flush() or interpreter exit)
+        
+        Returns:
+            Execution id, or None for deferred records
+        """
+        if not defer:
+            return self.record_executions([record])[0]
+        db = self._db
+        with db.lock:
+            if not db.pending:
+                db.pending_since = time.monotonic()
+            db.pending.append(record)
+            due = len(db.pending) >= BATCH_SIZE or time.monotonic() - db.pending_since >= FLUSH_INTERVAL
+        if due:
+            self.flush()
+        return None
+    
+    def record_executions(self, records: List[StrategyRecord]) -> List[int]:
+        """Record several executions in one transaction (plus anything queued)."""
+        db = self._db
+        with db.lock:
+            queued, db.pending = db.pending, []
+            try:
+                ids = self._write_batch(db, queued + list(records))
+            except BaseException:
+                db.pending = queued + db.pending
+                raise
+        return ids[len(queued):]
+    
+    def flush(self):
+        """Write queued executions."""
+        self._flush_pending(self._db)
+    
+    @classmethod
+    def _flush_pending(cls, db: _SharedDB):
+        with db.lock:
+            if not db.pending:
+                return
+            batch, db.pending = db.pending, []
+            try:
+                cls._write_batch(db, batch)
+            except BaseException:
+                db.pending = batch + db.pending
+                raise
+    
+    @staticmethod
+    def _write_batch(db: _SharedDB, batch: List[StrategyRecord]) -> List[int]:
+        """
+        Insert executions and fold them into strategy stats.
+        
+        Records for the same (domain, task, algorithm, selector) are merged
+        into one upsert. Counters are updated relative to the stored values,
+        so concurrent writers from other processes compose correctly.
+        """
+        if not batch:
+            return []
+        merged: Dict[Tuple, Dict[str, Any]] = {}
+        for record in batch:
+            key = (record.domain, record.task, record.algorithm, record.selector)
+            m = merged.get(key)
+            if m is None:
+                m = merged[key] = {
+                    "record": record, "success": 0, "failure": 0,
+                    "items": 0, "time_ms": 0, "n": 0, "last_used": record.timestamp,
+                }
+            m["success" if record.success else "failure"] += 1
+            m["items"] += record.items_extracted
+            m["time_ms"] += record.execution_time_ms
+            m["n"] += 1
+            m["last_used"] = max(m["last_used"], record.timestamp)
+        
+        conn = db.conn
+        ids = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for record in batch:
+                cursor = conn.execute("""
+                    INSERT INTO executions 
+                    (url, domain, task, algorithm, selector, success, items_extracted, 
+                     execution_time_ms, error_message, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    record.url,
+                    record.domain,
+                    record.task,
+                    record.algorithm,
+                    record.selector,
+                    1 if record.success else 0,
+                    record.items_extracted,
+                    record.execution_time_ms,
+                    record.error_message,
+                    record.timestamp,
+                ))
+                ids.append(cursor.lastrowid)
             
-            return execution_id
+            for m in merged.values():
+                record = m["record"]
+                fields_json = json.dumps(record.fields) if record.fields else "{}"
+                conn.execute("""
+                    INSERT INTO strategies 
+                    (url_pattern, domain, task, algorithm, selector, fields_json,
+                     success_count, failure_count, avg_items, avg_time_ms, last_used, dsl_file)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(domain, task, algorithm, selector) DO UPDATE SET
+                        success_count = success_count + ?,
+                        failure_count = failure_count + ?,
+                        avg_items = (avg_items * (success_count + failure_count) + ?) / 
+                                    (success_count + failure_count + ?),
+                        avg_time_ms = (avg_time_ms * (success_count + failure_count) + ?) / 
+                                      (success_count + failure_count + ?),
+                        last_used = ?
+                """, (
+                    f"*{record.domain}/*",
+                    record.domain,
+                    record.task,
+                    record.algorithm,
+                    record.selector,
+                    fields_json,
+                    m["success"],
+                    m["failure"],
+                    m["items"] // m["n"],
+                    m["time_ms"] // m["n"],
+                    m["last_used"],
+                    record.dsl_file,
+                    # UPDATE values
+                    m["success"],
+                    m["failure"],
+                    m["items"],
+                    m["n"],
+                    m["time_ms"],
+                    m["n"],
+                    m["last_used"],
+                ))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        for domain, task, _, _ in merged:
+            db.invalidate(domain, task)
+        return ids
+    
+    # =========================================================================
+    # READS
+    # =========================================================================
+    
+    def _cached(self, key: Tuple, load):
+        """Read-through cache; sees queued and external writes."""
+        db = self._db
+        with db.lock:
+            self._flush_pending(db)
+            db.check_external_writes()
+            if key not in db.cache:
+                db.cache[key] = load()
+            return db.cache[key]
+    
+    def _query(self, sql: str, params=()) -> List[sqlite3.Row]:
+        db = self._db
+        with db.lock:
+            self._flush_pending(db)
+            return db.conn.execute(sql, params).fetchall()
     
     def get_best_strategy(
         self, 
@@ -185,10 +374,8 @@ class KnowledgeBase:
         """
         domain = urlparse(url).netloc
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
-            cursor = conn.execute("""
+        def _load():
+            row = self._db.conn.execute("""
                 SELECT 
                     *,
                     CAST(success_count AS FLOAT) / 
@@ -198,24 +385,25 @@ class KnowledgeBase:
                   AND success_count + failure_count >= 1
                 ORDER BY success_rate DESC, success_count DESC
                 LIMIT 1
-            """, (domain, task))
-            
-            row = cursor.fetchone()
-            
-            if row and row['success_rate'] >= min_success_rate:
-                return {
-                    'url_pattern': row['url_pattern'],
-                    'domain': row['domain'],
-                    'task': row['task'],
-                    'algorithm': row['algorithm'],
-                    'selector': row['selector'],
-                    'fields': json.loads(row['fields_json'] or '{}'),
-                    'success_rate': row['success_rate'],
-                    'use_count': row['success_count'] + row['failure_count'],
-                    'dsl_file': row['dsl_file'],
-                }
-            
-            return None
+            """, (domain, task)).fetchone()
+            if row is None:
+                return None
+            return {
+                'url_pattern': row['url_pattern'],
+                'domain': row['domain'],
+                'task': row['task'],
+                'algorithm': row['algorithm'],
+                'selector': row['selector'],
+                'fields': json.loads(row['fields_json'] or '{}'),
+                'success_rate': row['success_rate'],
+                'use_count': row['success_count'] + row['failure_count'],
+                'dsl_file': row['dsl_file'],
+            }
+        
+        best = self._cached(("best", domain, task), _load)
+        if best and best['success_rate'] >= min_success_rate:
+            return dict(best, fields=dict(best['fields']))
+        return None
     
     def get_algorithm_rankings(self, domain: str = None, task: str = None) -> List[Dict]:
         """
@@ -223,9 +411,7 @@ class KnowledgeBase:
         
         Optionally filter by domain and/or task.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
+        def _load():
             query = """
                 SELECT 
                     algorithm,
@@ -249,9 +435,10 @@ class KnowledgeBase:
             
             query += " GROUP BY algorithm ORDER BY success_rate DESC"
             
-            cursor = conn.execute(query, params)
-            
-            return [dict(row) for row in cursor.fetchall()]
+            return [dict(row) for row in self._db.conn.execute(query, params).fetchall()]
+        
+        rankings = self._cached(("rank", domain or None, task or None), _load)
+        return [dict(r) for r in rankings]
     
     def find_matching_strategies(
         self, 
@@ -265,45 +452,40 @@ class KnowledgeBase:
         """
         domain = urlparse(url).netloc
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
-            query = """
-                SELECT 
-                    *,
-                    CAST(success_count AS FLOAT) / 
-                        NULLIF(success_count + failure_count, 0) AS success_rate
-                FROM strategies
-                WHERE domain = ?
-            """
-            params = [domain]
-            
-            if task:
-                query += " AND task = ?"
-                params.append(task)
-            
-            query += " ORDER BY success_rate DESC, last_used DESC"
-            
-            cursor = conn.execute(query, params)
-            
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'url_pattern': row['url_pattern'],
-                    'domain': row['domain'],
-                    'task': row['task'],
-                    'algorithm': row['algorithm'],
-                    'selector': row['selector'],
-                    'fields': json.loads(row['fields_json'] or '{}'),
-                    'success_rate': row['success_rate'],
-                    'success_count': row['success_count'],
-                    'failure_count': row['failure_count'],
-                    'avg_items': row['avg_items'],
-                    'avg_time_ms': row['avg_time_ms'],
-                    'dsl_file': row['dsl_file'],
-                })
-            
-            return results
+        query = """
+            SELECT 
+                *,
+                CAST(success_count AS FLOAT) / 
+                    NULLIF(success_count + failure_count, 0) AS success_rate
+            FROM strategies
+            WHERE domain = ?
+        """
+        params = [domain]
+        
+        if task:
+            query += " AND task = ?"
+            params.append(task)
+        
+        query += " ORDER BY success_rate DESC, last_used DESC"
+        
+        results = []
+        for row in self._query(query, params):
+            results.append({
+                'url_pattern': row['url_pattern'],
+                'domain': row['domain'],
+                'task': row['task'],
+                'algorithm': row['algorithm'],
+                'selector': row['selector'],
+                'fields': json.loads(row['fields_json'] or '{}'),
+                'success_rate': row['success_rate'],
+                'success_count': row['success_count'],
+                'failure_count': row['failure_count'],
+                'avg_items': row['avg_items'],
+                'avg_time_ms': row['avg_time_ms'],
+                'dsl_file': row['dsl_file'],
+            })
+        
+        return results
     
     def suggest_algorithms(self, url: str, task: str) -> List[str]:
         """
@@ -359,63 +541,55 @@ class KnowledgeBase:
         parser = DSLParser()
         created_files = []
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
-            cursor = conn.execute("""
-                SELECT * FROM strategies
-                WHERE success_count > 0
-                ORDER BY domain, task
-            """)
+        rows = self._query("""
+            SELECT * FROM strategies
+            WHERE success_count > 0
+            ORDER BY domain, task
+        """)
+        
+        for row in rows:
+            strategy = DSLStrategy(
+                url_pattern=row['url_pattern'],
+                task=row['task'],
+                algorithm=row['algorithm'],
+                selector=row['selector'] or "",
+                fields=json.loads(row['fields_json'] or '{}'),
+                success_rate=row['success_count'] / max(
+                    row['success_count'] + row['failure_count'], 1
+                ),
+                use_count=row['success_count'] + row['failure_count'],
+                last_used=row['last_used'] or "",
+            )
             
-            for row in cursor.fetchall():
-                strategy = DSLStrategy(
-                    url_pattern=row['url_pattern'],
-                    task=row['task'],
-                    algorithm=row['algorithm'],
-                    selector=row['selector'] or "",
-                    fields=json.loads(row['fields_json'] or '{}'),
-                    success_rate=row['success_count'] / max(
-                        row['success_count'] + row['failure_count'], 1
-                    ),
-                    use_count=row['success_count'] + row['failure_count'],
-                    last_used=row['last_used'] or "",
-                )
-                
-                filepath = parser.save_strategy(strategy, directory)
-                created_files.append(filepath)
+            filepath = parser.save_strategy(strategy, directory)
+            created_files.append(filepath)
         
         return created_files
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get overall knowledge base statistics."""
-        with sqlite3.connect(self.db_path) as conn:
-            stats = {}
-            
-            # Total strategies
-            cursor = conn.execute("SELECT COUNT(*) FROM strategies")
-            stats['total_strategies'] = cursor.fetchone()[0]
-            
-            # Total executions
-            cursor = conn.execute("SELECT COUNT(*) FROM executions")
-            stats['total_executions'] = cursor.fetchone()[0]
-            
-            # Unique domains
-            cursor = conn.execute("SELECT COUNT(DISTINCT domain) FROM strategies")
-            stats['unique_domains'] = cursor.fetchone()[0]
-            
-            # Overall success rate
-            cursor = conn.execute("""
-                SELECT 
-                    SUM(success_count) as successes,
-                    SUM(failure_count) as failures
-                FROM strategies
-            """)
-            row = cursor.fetchone()
-            total = (row[0] or 0) + (row[1] or 0)
-            stats['overall_success_rate'] = (row[0] or 0) / max(total, 1)
-            
-            # Top algorithms
-            stats['top_algorithms'] = self.get_algorithm_rankings()[:5]
-            
-            return stats
+        stats = {}
+        
+        # Total strategies
+        stats['total_strategies'] = self._query("SELECT COUNT(*) FROM strategies")[0][0]
+        
+        # Total executions
+        stats['total_executions'] = self._query("SELECT COUNT(*) FROM executions")[0][0]
+        
+        # Unique domains
+        stats['unique_domains'] = self._query("SELECT COUNT(DISTINCT domain) FROM strategies")[0][0]
+        
+        # Overall success rate
+        row = self._query("""
+            SELECT 
+                SUM(success_count) as successes,
+                SUM(failure_count) as failures
+            FROM strategies
+        """)[0]
+        total = (row[0] or 0) + (row[1] or 0)
+        stats['overall_success_rate'] = (row[0] or 0) / max(total, 1)
+        
+        # Top algorithms
+        stats['top_algorithms'] = self.get_algorithm_rankings()[:5]
+        
+        return stats
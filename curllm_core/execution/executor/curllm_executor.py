@@ -8,6 +8,8 @@ from curllm_core.config import config
 from curllm_core.logger import RunLogger
 from curllm_core.llm_factory import setup_llm as setup_llm_factory
 from curllm_core.llm_config import LLMConfig
+from curllm_core.http_pool import get_http_pool, close_http_pool
+from curllm_core.llm_cache import get_cache_stats
 from curllm_core.agent_factory import create_agent as create_agent_factory
 from curllm_core.vision import VisionAnalyzer
 from curllm_core.captcha import CaptchaSolver
@@ -15,8 +17,9 @@ from curllm_core.stealth import StealthConfig
 from curllm_core.runtime import parse_runtime_from_instruction
 from curllm_core.headers import normalize_headers
 from curllm_core.browser_setup import setup_browser
+from curllm_core.browser_pool import get_browser_pool, close_browser_pool
 from curllm_core.wordpress import WordPressAutomation
-from curllm_core.proxy import resolve_proxy
+from curllm_core.proxy import report_proxy_outcome, resolve_proxy
 from curllm_core.page_context import extract_page_context
 from curllm_core.actions import execute_action
 from curllm_core.result_evaluator import evaluate_run_success
@@ -36,6 +39,7 @@ from curllm_core.navigation import open_page_with_prechecks as _open_page_with_p
 from curllm_core.rerun_cmd import build_rerun_curl as _build_rerun_curl_func
 from curllm_core.task_runner import run_task as _run_task
 from curllm_core.result_store import apply_diff_and_store as _apply_diff_and_store
+from curllm_core.stage_timer import stage
 
 
 class CurllmExecutor:
@@ -73,6 +77,18 @@ class CurllmExecutor:
     def _setup_llm(self, llm_config: Optional[LLMConfig] = None) -> Any:
         return setup_llm_factory(llm_config)
 
+    async def aclose(self):
+        """Release pooled LLM HTTP connections and warm browsers bound to the running event loop."""
+        await close_http_pool()
+        if config.browser_pool_enabled:
+            await close_browser_pool()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
     async def execute_workflow(
         self,
         instruction: str,
@@ -332,6 +348,8 @@ class CurllmExecutor:
                 run_logger=run_logger,
                 runtime=runtime,
             )
+            # Pooled proxies learn from the navigation outcome (status, latency, block page)
+            report_proxy_outcome(resolved_proxy, (result.get("meta") or {}).get("navigation"), host)
 
             if browser_context is not None:
                 try:
@@ -453,6 +471,16 @@ class CurllmExecutor:
                     run_logger.log_text(f"**Extracted Items:** {len(final_data)} items")
                     run_logger.log_code("json", json.dumps(final_data[:5], indent=2, ensure_ascii=False))
             
+            try:
+                run_logger.log_kv("llm.http_pool", json.dumps(get_http_pool().get_stats()))
+                if config.browser_pool_enabled:
+                    run_logger.log_kv("browser_pool", json.dumps(get_browser_pool().get_stats()))
+                cache_stats = get_cache_stats(self.llm)
+                if cache_stats is not None:
+                    run_logger.log_kv("llm.cache", json.dumps(cache_stats))
+            except Exception:
+                pass
+
             # Log full result JSON
             run_logger.log_text("\n### Full Response JSON\n")
             run_logger.log_code("json", json.dumps(res, indent=2, ensure_ascii=False, default=str))
@@ -517,22 +545,27 @@ class CurllmExecutor:
                 "hints": hints,
                 "suggested_commands": suggested,
             }
+        finally:
+            # Flush buffered log output and stitch the TOC before the path is used
+            run_logger.close()
 
     def _create_agent(self, browser_context, instruction: str, visual_mode: bool):
         return create_agent_factory(browser_context, self.llm, instruction, config.max_steps, visual_mode)
 
     async def _setup_browser(self, stealth_mode: bool, storage_key: Optional[str] = None, headers: Optional[Dict[str, str]] = None, proxy_config: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None):
-        return await setup_browser(
-            use_browserless=config.use_browserless,
-            browserless_url=config.browserless_url,
-            stealth_mode=stealth_mode,
-            storage_key=storage_key,
-            headers=headers,
-            stealth_config=self.stealth_config,
-            config=config,
-            proxy_config=proxy_config,
-            session_id=session_id,
-        )
+        with stage("browser_setup"):
+            return await setup_browser(
+                use_browserless=config.use_browserless,
+                browserless_url=config.browserless_url,
+                stealth_mode=stealth_mode,
+                storage_key=storage_key,
+                headers=headers,
+                stealth_config=self.stealth_config,
+                config=config,
+                proxy_config=proxy_config,
+                session_id=session_id,
+                browser_pool=get_browser_pool() if config.browser_pool_enabled else None,
+            )
 
     # browserless setup handled in browser_setup.setup_browser
 
@@ -547,23 +580,31 @@ class CurllmExecutor:
         run_logger: RunLogger,
         runtime: Dict[str, Any],
     ) -> Dict:
-        return await _run_task(
-            self,
-            agent,
-            instruction,
-            url,
-            visual_mode,
-            stealth_mode,
-            captcha_solver,
-            run_logger,
-            runtime,
-        )
+        # Self time of this stage = extractors, DOM queries and actions
+        with stage("extraction"):
+            return await _run_task(
+                self,
+                agent,
+                instruction,
+                url,
+                visual_mode,
+                stealth_mode,
+                captcha_solver,
+                run_logger,
+                runtime,
+            )
 
-    async def _take_screenshot(self, page, step: int, target_dir: Optional[Path] = None) -> str:
-        return await _take_screenshot_func(page, step, target_dir)
+    async def _take_screenshot(self, page, step: int, target_dir: Optional[Path] = None, **options) -> str:
+        return await _take_screenshot_func(page, step, target_dir, **options)
 
-    async def _extract_page_context(self, page, include_dom: bool = False, dom_max_chars: int = 20000, form_focused: bool = False) -> Dict:
-        return await extract_page_context(page, include_dom=include_dom, dom_max_chars=dom_max_chars, form_focused=form_focused)
+    async def _analyze_screenshot(self, image, captcha_solver: bool = False) -> Dict[str, Any]:
+        """Run VisionAnalyzer on screenshot bytes (or a path) in the vision worker pool."""
+        analysis = await self.vision_analyzer.analyze(image)
+        summary = f"forms={analysis['num_forms']} captcha={analysis['has_captcha']} images={analysis['has_images']}"
+        return {**analysis, "summary": summary}
+
+    async def _extract_page_context(self, page, include_dom: bool = False, dom_max_chars: int = 20000, form_focused: bool = False, stats: Optional[Dict[str, Any]] = None, tracker=None) -> Dict:
+        return await extract_page_context(page, include_dom=include_dom, dom_max_chars=dom_max_chars, form_focused=form_focused, stats=stats, tracker=tracker)
 
     async def _generate_action(self, instruction: str, page_context: Dict, step: int, run_logger: RunLogger | None = None, runtime: Dict[str, Any] | None = None) -> Dict:
         from .llm_planner import generate_action
@@ -717,20 +758,21 @@ class CurllmExecutor:
         result: Dict[str, Any],
         lower_instr: str,
     ):
-        return await _open_page_with_prechecks_func(
-            agent,
-            url,
-            instruction,
-            stealth_mode,
-            captcha_solver,
-            runtime,
-            run_logger,
-            result,
-            lower_instr,
-            self._setup_browser,
-            self.captcha_solver,
-            self._build_rerun_curl,
-        )
+        with stage("page_open"):
+            return await _open_page_with_prechecks_func(
+                agent,
+                url,
+                instruction,
+                stealth_mode,
+                captcha_solver,
+                runtime,
+                run_logger,
+                result,
+                lower_instr,
+                self._setup_browser,
+                self.captcha_solver,
+                self._build_rerun_curl,
+            )
 
     async def _multi_stage_product_extract(self, instruction: str, page, run_logger: RunLogger | None):
         return await _multi_stage_product_extract_func(instruction, page, run_logger)
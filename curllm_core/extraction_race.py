@@ -0,0 +1,294 @@
+"""
+Extraction Race - run cheap deterministic extractors concurrently
+
+Instead of trying extraction strategies one after another (each failure
+adding its full latency), the race starts every eligible strategy at once
+on the same page. All racers only read the page (``page.evaluate``), so
+they can share it safely. The first result that passes deterministic
+validation wins and the remaining racers are cancelled.
+
+Which strategies enter the race is decided per domain from the DSL
+knowledge base: strategies that keep failing on a domain are left out,
+the rest are ordered by their success rate there. Every finished racer
+is recorded back into the knowledge base, so the policy keeps learning.
+
+Usage:
+    race = ExtractionRace(page, instruction, kb_path=config.dsl_knowledge_db, run_logger=run_logger)
+    outcome = await race.run(page.url)
+    if outcome:
+        result["data"] = outcome.to_data()
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Read-only strategies eligible for the race, in default priority order
+RACE_STRATEGIES = (
+    "statistical_containers",
+    "dynamic_detector",
+    "pattern_detection",
+    "fallback_links",
+)
+
+# Leave a strategy out once it failed this often on a domain without a success
+EXCLUDE_AFTER_FAILURES = 3
+
+RACE_TASK = "extract_products"
+
+
+@dataclass
+class RaceOutcome:
+    """Winning strategy of an extraction race"""
+
+    strategy: str
+    items: List[Dict[str, Any]]
+    score: float
+    elapsed_ms: int
+    selector: str = ""
+    # strategy -> {"status": won|invalid|empty|error|cancelled, "ms": int}
+    racers: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def to_data(self) -> Dict[str, Any]:
+        """Result payload in the shape the extractor chain returns"""
+        data = {
+            "items": self.items,
+            "count": len(self.items),
+            "algorithm": self.strategy,
+            "validation_score": self.score,
+            "race": self.racers,
+        }
+        if self.selector:
+            data["selector"] = self.selector
+        return data
+
+
+class ExtractionRace:
+    """
+    Race read-only extraction strategies on one page.
+
+    Args:
+        page: Playwright page (only evaluated, never navigated or clicked)
+        instruction: User instruction
+        kb_path: DSL knowledge base used for the per-domain policy
+        run_logger: Optional RunLogger
+        strategies: Candidate strategies (default RACE_STRATEGIES)
+        timeout: Overall race timeout in seconds
+        min_score: Minimum validation score for a result to win
+    """
+
+    def __init__(
+        self,
+        page,
+        instruction: str,
+        kb_path: Optional[str] = None,
+        run_logger=None,
+        strategies: Optional[List[str]] = None,
+        timeout: float = 20.0,
+        min_score: float = 0.5,
+    ):
+        self.page = page
+        self.instruction = instruction
+        self.run_logger = run_logger
+        self.strategies = list(strategies or RACE_STRATEGIES)
+        self.timeout = timeout
+        self.min_score = min_score
+        self.kb_path = kb_path
+        self.kb = None
+        if kb_path:
+            try:
+                from curllm_core.dsl.knowledge_base import KnowledgeBase
+                self.kb = KnowledgeBase(kb_path)
+            except Exception as e:
+                logger.debug(f"Knowledge base unavailable for race policy: {e}")
+        self._dsl = None
+        self.racers: Dict[str, Dict[str, Any]] = {}
+        self._runners: Dict[str, Callable[[str], Awaitable[Any]]] = {
+            "statistical_containers": lambda url: self._run_dsl("statistical_containers", url),
+            "pattern_detection": lambda url: self._run_dsl("pattern_detection", url),
+            "fallback_links": lambda url: self._run_dsl("fallback_links", url),
+            "dynamic_detector": self._run_dynamic,
+        }
+
+    def _log(self, msg: str):
+        if self.run_logger:
+            self.run_logger.log_text(msg)
+
+    # ------------------------------------------------------------------
+    # Policy
+    # ------------------------------------------------------------------
+    def select_strategies(self, url: str) -> List[str]:
+        """
+        Pick the racers for a domain.
+
+        Strategies with EXCLUDE_AFTER_FAILURES or more failures and no
+        success on the domain are dropped; the rest are ordered by their
+        domain success rate (unknown strategies keep their default
+        position after the proven ones). If the policy would drop every
+        strategy, all of them race.
+        """
+        candidates = [s for s in self.strategies if s in self._runners]
+        if not self.kb:
+            return candidates
+        try:
+            rankings = self.kb.get_algorithm_rankings(domain=urlparse(url).netloc, task=RACE_TASK)
+        except Exception as e:
+            logger.debug(f"Race policy lookup failed: {e}")
+            return candidates
+        stats = {r["algorithm"]: r for r in rankings}
+        kept = []
+        for name in candidates:
+            r = stats.get(name)
+            if r and not (r.get("total_success") or 0) and (r.get("total_failure") or 0) >= EXCLUDE_AFTER_FAILURES:
+                continue
+            kept.append(name)
+        if not kept:
+            return candidates
+
+        def _rank(name: str):
+            r = stats.get(name)
+            rate = r.get("success_rate") if r else None
+            return (0, -rate) if rate is not None else (1, candidates.index(name))
+
+        return sorted(kept, key=_rank)
+
+    # ------------------------------------------------------------------
+    # Racers (each returns (items, selector) or None)
+    # ------------------------------------------------------------------
+    def _dsl_executor(self):
+        if self._dsl is None:
+            from curllm_core.dsl.executor import DSLExecutor
+            from curllm_core.config import config
+            self._dsl = DSLExecutor(
+                page=self.page,
+                llm_client=None,
+                run_logger=None,
+                kb_path=self.kb_path or config.dsl_knowledge_db,
+                dsl_dir=config.dsl_directory,
+            )
+        return self._dsl
+
+    async def _run_dsl(self, algorithm: str, url: str):
+        from curllm_core.dsl.parser import DSLStrategy
+        strategy = DSLStrategy(task=RACE_TASK)
+        items = await self._dsl_executor()._execute_algorithm(algorithm, url, self.instruction, strategy)
+        return (items, strategy.selector) if items else None
+
+    async def _run_dynamic(self, url: str):
+        from curllm_core.detection import dynamic_extract
+        data = await dynamic_extract(self.page, self.instruction)
+        items = (data or {}).get("products") or []
+        selector = ((data or {}).get("container") or {}).get("selector", "")
+        return (items, selector) if items else None
+
+    async def _validate(self, items: Any) -> float:
+        """Deterministic score; the structure check alone must pass too"""
+        from curllm_core.dsl.validator import ResultValidator
+        validator = ResultValidator(None)
+        fields = ["name", "price", "url"]
+        structure = validator.validate_structure(items, fields, min_items=2)
+        if not structure.valid:
+            return 0.0
+        validation = await validator.validate(items, self.instruction, expected_fields=fields, min_items=2, use_llm=False)
+        return min(structure.score, validation.score) if validation.valid else 0.0
+
+    # ------------------------------------------------------------------
+    # Race
+    # ------------------------------------------------------------------
+    async def run(self, url: str) -> Optional[RaceOutcome]:
+        """
+        Run the race.
+
+        Returns:
+            RaceOutcome of the first valid result, or None if no racer
+            produced one (``self.racers`` then holds every racer's status)
+        """
+        started = time.monotonic()
+        names = self.select_strategies(url)
+        self.racers = {}
+        if not names:
+            return None
+        self._log(f"🏁 Extraction race: {', '.join(names)}")
+
+        async def _racer(name: str):
+            t0 = time.monotonic()
+            try:
+                found = await self._runners[name](url)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                return name, None, 0.0, int((time.monotonic() - t0) * 1000), f"error: {e}"
+            if not found:
+                return name, None, 0.0, int((time.monotonic() - t0) * 1000), "empty"
+            score = await self._validate(found[0])
+            status = "valid" if score >= self.min_score else "invalid"
+            return name, found, score, int((time.monotonic() - t0) * 1000), status
+
+        tasks = {asyncio.ensure_future(_racer(name)): name for name in names}
+        winner: Optional[RaceOutcome] = None
+        try:
+            pending = set(tasks)
+            deadline = started + self.timeout
+            while pending and winner is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name, found, score, ms, status = task.result()
+                    self.racers[name] = {"status": status, "ms": ms}
+                    if status == "valid" and winner is None:
+                        items, selector = found
+                        self.racers[name]["status"] = "won"
+                        winner = RaceOutcome(
+                            strategy=name,
+                            items=list(items),
+                            score=round(score, 3),
+                            elapsed_ms=int((time.monotonic() - started) * 1000),
+                            selector=selector or "",
+                            racers=self.racers,
+                        )
+                    self._record(url, name, status, ms, found)
+        finally:
+            for task, name in tasks.items():
+                if not task.done():
+                    task.cancel()
+                    self.racers.setdefault(name, {"status": "cancelled", "ms": int((time.monotonic() - started) * 1000)})
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self.kb:
+                try:
+                    self.kb.flush()
+                except Exception as e:
+                    logger.warning(f"Failed to write race results to the knowledge base: {e}")
+
+        if winner:
+            self._log(f"✅ Race won by {winner.strategy}: {len(winner.items)} items in {winner.elapsed_ms}ms (score {winner.score:.2f})")
+        else:
+            self._log(f"⚠️ Extraction race: no valid result ({self.racers})")
+        return winner
+
+    def _record(self, url: str, name: str, status: str, ms: int, found):
+        if not self.kb:
+            return
+        try:
+            from curllm_core.dsl.knowledge_base import StrategyRecord
+            items, selector = found if found else ([], "")
+            self.kb.record_execution(StrategyRecord(
+                url=url,
+                domain=urlparse(url).netloc,
+                task=RACE_TASK,
+                algorithm=name,
+                selector=selector or "",
+                fields={},
+                success=status == "valid",
+                items_extracted=len(items) if isinstance(items, list) else 0,
+                execution_time_ms=ms,
+                error_message="" if status == "valid" else status,
+            ), defer=True)
+        except Exception as e:
+            logger.warning(f"Failed to record race result for {name}: {e}")
@@ -0,0 +1,205 @@
+"""
+HTTP Session Pool for LLM Clients
+
+Shares one pooled, keep-alive aiohttp session between all built-in LLM
+clients instead of opening a new ClientSession (and TCP connection) for
+every call.
+
+Usage:
+    from curllm_core.http_pool import get_http_pool, close_http_pool
+
+    pool = get_http_pool()
+    data = await pool.post_json("http://localhost:11434/api/generate", payload, timeout=300)
+
+    # On shutdown (CurllmExecutor.aclose() does this for you)
+    await close_http_pool()
+
+    print(pool.get_stats())  # requests, connections_created, connections_reused, ...
+"""
+
+import asyncio
+import logging
+import os
+import weakref
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPSessionPool:
+    """
+    Pooled aiohttp session with per-host connection limits.
+
+    aiohttp sessions are bound to the event loop they were created on, so the
+    pool keeps one session per running loop. Connection reuse is tracked via
+    aiohttp tracing hooks.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 8,
+        keepalive_timeout: float = 60.0,
+    ):
+        """
+        Initialize session pool.
+
+        Args:
+            limit: Maximum number of open connections in total
+            limit_per_host: Maximum number of open connections per host
+            keepalive_timeout: Seconds an idle connection is kept open
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "sessions_created": 0,
+            "errors": 0,
+        }
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def _on_request_start(session, ctx, params):
+            self._stats["requests"] += 1
+
+        async def _on_connection_create_end(session, ctx, params):
+            self._stats["connections_created"] += 1
+
+        async def _on_connection_reuseconn(session, ctx, params):
+            self._stats["connections_reused"] += 1
+
+        async def _on_request_exception(session, ctx, params):
+            self._stats["errors"] += 1
+
+        trace.on_request_start.append(_on_request_start)
+        trace.on_connection_create_end.append(_on_connection_create_end)
+        trace.on_connection_reuseconn.append(_on_connection_reuseconn)
+        trace.on_request_exception.append(_on_request_exception)
+        return trace
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled session for the running event loop, creating it if needed.
+
+        Must be called from inside a coroutine.
+        """
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=[self._trace_config()],
+            )
+            self._sessions[loop] = session
+            self._stats["sessions_created"] += 1
+            logger.debug(
+                f"Created pooled HTTP session (limit={self.limit}, per_host={self.limit_per_host})"
+            )
+        return session
+
+    def post(self, url: str, timeout: Optional[float] = None, **kwargs):
+        """
+        Issue a POST on the pooled session.
+
+        Returns the aiohttp request context manager, use with ``async with``.
+
+        Args:
+            url: Target URL
+            timeout: Total timeout in seconds for this request
+            **kwargs: Passed through to ``ClientSession.post`` (json, headers, ...)
+        """
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        return self.get_session().post(url, **kwargs)
+
+    def get(self, url: str, timeout: Optional[float] = None, **kwargs):
+        """
+        Issue a GET on the pooled session.
+
+        Returns the aiohttp request context manager, use with ``async with``.
+        """
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        return self.get_session().get(url, **kwargs)
+
+    async def post_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        """POST a JSON payload and return the decoded JSON response."""
+        async with self.post(url, timeout=timeout, json=payload, headers=headers) as resp:
+            return await resp.json()
+
+    async def close(self):
+        """Close the session bound to the running event loop (if any)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with request and connection counters and reuse ratio
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        total = stats["connections_created"] + stats["connections_reused"]
+        stats["reuse_ratio"] = round(stats["connections_reused"] / total, 3) if total else 0.0
+        stats["open_sessions"] = sum(1 for s in self._sessions.values() if not s.closed)
+        return stats
+
+    def reset_stats(self):
+        """Reset all counters."""
+        for key in self._stats:
+            self._stats[key] = 0
+
+
+# Global pool instance
+_global_pool: Optional[HTTPSessionPool] = None
+
+
+def get_http_pool() -> HTTPSessionPool:
+    """
+    Get or create the global HTTP session pool.
+
+    Limits are read from CURLLM_HTTP_POOL_LIMIT, CURLLM_HTTP_POOL_PER_HOST
+    and CURLLM_HTTP_KEEPALIVE on first call.
+    """
+    global _global_pool
+
+    if _global_pool is None:
+        _global_pool = HTTPSessionPool(
+            limit=int(os.getenv("CURLLM_HTTP_POOL_LIMIT", "100")),
+            limit_per_host=int(os.getenv("CURLLM_HTTP_POOL_PER_HOST", "8")),
+            keepalive_timeout=float(os.getenv("CURLLM_HTTP_KEEPALIVE", "60")),
+        )
+
+    return _global_pool
+
+
+async def close_http_pool():
+    """Close the global pool's session for the running event loop."""
+    if _global_pool is not None:
+        await _global_pool.close()
@@ -19,6 +19,8 @@ Each step logs details and makes early decisions.
 import json
 from typing import Dict, List, Optional, Any
 
+from curllm_core.page_library import call_page_function
+
 # New LLM-based extraction (recommended)
 try:
     from .streamware.components.extraction import LLMIterativeExtractor, llm_extract_products
@@ -81,201 +83,7 @@ class IterativeExtractor:
         """
         self._log("Step 1: Quick Page Check", "Running fast indicators check...")
         
-        result = await self.page.evaluate("""
-            () => {
-                // Fast indicators check
-                const indicators = {
-                    has_prices: false,
-                    price_count: 0,
-                    has_product_links: false,
-                    product_link_count: 0,
-                    has_list_structure: false,
-                    has_add_to_cart: false,
-                    has_price_images: false,
-                    total_links: document.links.length,
-                    page_type: 'unknown'
-                };
-                
-                // Check for price patterns (fast regex) - TEXT prices
-                const pricePattern = /(\\d+[\\d\\s]*(?:[\\.,]\\d{2})?)\\s*(?:zł|PLN|€|\\$|USD|EUR)/i;
-                const bodyText = document.body?.innerText || '';
-                const priceMatches = bodyText.match(new RegExp(pricePattern, 'g'));
-                
-                if (priceMatches) {
-                    indicators.has_prices = true;
-                    indicators.price_count = priceMatches.length;
-                }
-                
-                // Check for IMAGE-based prices (common in Polish shops like gral.pl)
-                // Pattern: img.php?im=cb_ or similar dynamic price images
-                const priceImages = document.querySelectorAll('img[src*="cen"], img[src*="price"], img[src*="cb_"], img[src*="cn_"]');
-                if (priceImages.length > 0) {
-                    indicators.has_price_images = true;
-                    indicators.price_count = Math.max(indicators.price_count, priceImages.length);
-                    indicators.has_prices = true;
-                }
-                
-                // Check for "Cena" labels near images
-                const cenaLabels = document.querySelectorAll('*');
-                let cenaCount = 0;
-                for (const el of cenaLabels) {
-                    if (el.innerText && /cena\\s*(brutto|netto)?:?/i.test(el.innerText) && el.innerText.length < 50) {
-                        cenaCount++;
-                    }
-                }
-                if (cenaCount >= 3) {
-                    indicators.has_prices = true;
-                    indicators.price_count = Math.max(indicators.price_count, cenaCount);
-                }
-                
-                // Check for product-like links - multiple patterns
-                let productLinks = 0;
-                for (const link of document.links) {
-                    const href = link.href || '';
-                    const pathname = link.pathname || '';
-                    
-                    // Pattern 1: /12345 or _12345 (numeric product IDs with .html)
-                    if (/[_\\/]\\d{3,}\\.html?$/i.test(pathname)) {
-                        productLinks++;
-                    }
-                    // Pattern 1b: /123456789 (pure numeric ID, 6+ digits - ceneo.pl style)
-                    else if (/^\\/\\d{6,}$/.test(pathname)) {
-                        productLinks++;
-                    }
-                    // Pattern 1c: /offers/ID/ID (ceneo.pl offer links)
-                    else if (/^\\/offers\\/\\d+\\/\\d+/.test(pathname)) {
-                        productLinks++;
-                    }
-                    // Pattern 2: /product/ or /produkt/ in URL
-                    else if (/\\/(product|produkt|item|towar)\\//i.test(pathname)) {
-                        productLinks++;
-                    }
-                    // Pattern 3: Name+Product+Name_ID.html (gral.pl style)
-                    else if (/[A-Za-z]+\\+[A-Za-z]+.*_\\d+\\.html$/i.test(pathname)) {
-                        productLinks++;
-                    }
-                    // Pattern 4: ;123456 (ceneo.pl style - semicolon + numeric ID)
-                    else if (/;\\d{4,}/.test(pathname)) {
-                        productLinks++;
-                    }
-                    // Pattern 5: /p/123456 or /i/123456 (common e-commerce pattern)
-                    else if (/\\/[pi]\\/\\d+/i.test(pathname)) {
-                        productLinks++;
-                    }
-                }
-                indicators.product_link_count = productLinks;
-                indicators.has_product_links = productLinks > 0;
-                
-                // Check for "add to cart" buttons/links
-                const cartPatterns = ['koszyk', 'cart', 'dodaj', 'add', 'kupuj', 'buy'];
-                const buttons = document.querySelectorAll('button, a, input[type="submit"]');
-                let cartButtons = 0;
-                for (const btn of buttons) {
-                    const text = (btn.innerText || btn.value || btn.title || '').toLowerCase();
-                    if (cartPatterns.some(p => text.includes(p))) {
-                        cartButtons++;
-                    }
-                }
-                indicators.has_add_to_cart = cartButtons >= 3;
-                
-                // Check for list structure (dynamic detection)
-                // Look for repeating elements with similar structure (not hard-coded selectors)
-                const allElements = document.querySelectorAll('*');
-                const classCount = {};
-                
-                // Count elements with same class (potential list)
-                for (const el of allElements) {
-                    if (el.className && typeof el.className === 'string') {
-                        const firstClass = el.className.split(' ')[0];
-                        if (firstClass && /^[a-zA-Z][a-zA-Z0-9_-]*$/.test(firstClass)) {
-                            classCount[firstClass] = (classCount[firstClass] || 0) + 1;
-                        }
-                    }
-                }
-                
-                // If any class appears 5+ times, likely a list structure
-                indicators.has_list_structure = Object.values(classCount).some(count => count >= 5);
-                
-                // Check for REAL product containers (price + name together)
-                // Use dynamic link patterns - discovered from page structure
-                let realProductContainers = 0;
-                const potentialProducts = document.querySelectorAll('[class*="product"], [class*="item"], [class*="card"], [class*="box"], table tr');
-                
-                // Dynamic link check - analyze actual URL patterns on page
-                const checkProductLink = (el) => {
-                    const links = el.querySelectorAll('a[href]');
-                    for (const link of links) {
-                        const href = link.href || '';
-                        // Check for common product URL patterns dynamically
-                        if (/\\/[pi]\\/|product|produkt|item|towar|\\.html$|_\\d{4,}|[/]\\d{4,}/.test(href)) {
-                            return true;
-                        }
-                    }
-                    return false;
-                };
-                
-                // Dynamic price image check
-                const checkPriceImage = (el) => {
-                    const imgs = el.querySelectorAll('img');
-                    for (const img of imgs) {
-                        const src = img.src || '';
-                        if (/cb_|cena|price|_c\\d|_p\\d/i.test(src)) return true;
-                    }
-                    return false;
-                };
-                
-                for (const el of potentialProducts) {
-                    const text = el.textContent || '';
-                    const hasName = text.length > 20 && text.length < 500;
-                    const hasLink = checkProductLink(el);
-                    const hasPriceInEl = /\\d+[,.]\\d{2}/.test(text) || checkPriceImage(el);
-                    if (hasName && hasLink && hasPriceInEl) {
-                        realProductContainers++;
-                    }
-                }
-                indicators.real_product_containers = realProductContainers;
-                
-                // Determine page type with smarter heuristics
-                const hasRealProducts = realProductContainers >= 3;
-                const hasProductGrid = realProductContainers >= 5;
-                const hasShopFeatures = indicators.has_add_to_cart && indicators.has_product_links;
-                
-                // Check for cart/header prices (low count, no product structure)
-                const isCartOnly = indicators.price_count <= 2 && !hasRealProducts;
-                
-                // Check URL patterns for product pages
-                const url = window.location.href.toLowerCase();
-                const pathname = window.location.pathname;
-                const isProductUrl = /\\/(product|produkt|item|towar|prod_lista)s?/i.test(url) ||
-                                     /[\\?&](category|kategoria|cat|grp)[=]/i.test(url) ||
-                                     /[_\\/]\\d{3,}\\.html?$/i.test(pathname);
-                const isHomepage = pathname === '/' || pathname === '/index.html' || pathname === '/sklep.php';
-                
-                // Decision tree - more conservative
-                if (hasProductGrid) {
-                    // Found actual product containers
-                    indicators.page_type = 'product_listing';
-                } else if (hasRealProducts && isProductUrl) {
-                    indicators.page_type = 'product_listing';
-                } else if (isProductUrl && indicators.price_count >= 3) {
-                    indicators.page_type = 'product_listing';
-                } else if (isHomepage && !hasRealProducts) {
-                    // Homepage without real products - needs navigation
-                    indicators.page_type = 'homepage_shop';
-                    indicators.needs_navigation = true;
-                } else if (indicators.has_product_links && indicators.product_link_count >= 10 && !hasRealProducts) {
-                    // Many category links but no products
-                    indicators.page_type = 'category_index';
-                    indicators.needs_navigation = true;
-                } else if (indicators.price_count > 0 && hasRealProducts) {
-                    indicators.page_type = 'product_listing';
-                } else {
-                    indicators.page_type = 'other';
-                }
-                
-                return indicators;
-            }
-        """)
+        result = await call_page_function(self.page, "quickPageCheck")
         
         self._log("Quick Check Results", result)
         
@@ -0,0 +1,160 @@
+"""
+Job API - /api/jobs endpoints and worker lifecycle shared by both servers
+
+``curllm_core.server`` and ``curllm_server`` register the same blueprint,
+so submit/poll/cancel behave identically whichever app is running. The
+worker pool is started once at server startup (async server mode only),
+which also resumes jobs persisted by a previous run, and is stopped on
+shutdown so running jobs go back to the queue without losing an attempt.
+
+Usage:
+    app.register_blueprint(jobs_bp)
+    start_job_workers(run_job)      # at startup, async def run_job(payload)
+    ...
+    stop_job_workers(timeout=30)    # on shutdown (also registered atexit)
+"""
+
+import atexit
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from flask import Blueprint, request, jsonify
+
+from .async_runner import get_async_runner
+from .config import config
+from .job_queue import JobWorkerPool, get_job_queue, parse_job_request
+
+logger = logging.getLogger(__name__)
+
+jobs_bp = Blueprint('jobs', __name__)
+
+_workers: Optional[JobWorkerPool] = None
+_workers_lock = threading.Lock()
+
+
+def start_job_workers(handler: Callable[[Dict[str, Any]], Awaitable[Any]]) -> Optional[JobWorkerPool]:
+    """
+    Start the job workers on the async runner loop.
+
+    No-op unless ``config.server_mode`` is "async" and ``config.job_workers``
+    is positive; calling it again returns the running pool.
+
+    Args:
+        handler: ``async handler(payload) -> result`` running one job
+    """
+    global _workers
+    if config.server_mode != "async" or config.job_workers <= 0:
+        return None
+    with _workers_lock:
+        if _workers is None:
+            _workers = JobWorkerPool(
+                get_job_queue(),
+                handler=handler,
+                workers=config.job_workers,
+                job_timeout=config.job_timeout,
+            ).start(get_async_runner().start().loop)
+            atexit.register(stop_job_workers)
+    return _workers
+
+
+def stop_job_workers(timeout: Optional[float] = None) -> bool:
+    """
+    Stop the job workers (idempotent).
+
+    Jobs still running at the timeout (default ``config.server_drain_timeout``)
+    are handed back to the queue for the next start.
+
+    Returns:
+        True if every running job finished in time
+    """
+    global _workers
+    with _workers_lock:
+        workers, _workers = _workers, None
+    if workers is None:
+        return True
+    return workers.stop(timeout=config.server_drain_timeout if timeout is None else timeout)
+
+
+def get_job_workers() -> Optional[JobWorkerPool]:
+    """The running worker pool, if any"""
+    return _workers
+
+
+@jobs_bp.route('/api/jobs', methods=['POST'])
+def submit_jobs():
+    """Queue one job (the /api/execute body) or {"jobs": [...]}; returns 202"""
+    body = request.get_json(silent=True)
+    try:
+        req = parse_job_request(body)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    ids = get_job_queue().submit_many(
+        req["payloads"], priority=req["priority"], webhook=req["webhook"], max_attempts=req["max_attempts"]
+    )
+    if "jobs" not in body:
+        resp = jsonify({"job_id": ids[0], "status": "queued", "status_url": f"/api/jobs/{ids[0]}"})
+        resp.headers["Location"] = f"/api/jobs/{ids[0]}"
+    else:
+        resp = jsonify({"job_ids": ids, "status": "queued", "count": len(ids)})
+    resp.status_code = 202
+    return resp
+
+
+@jobs_bp.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Newest jobs first (?status=&domain=&limit=&offset=) with queue and worker stats"""
+    try:
+        limit = min(500, int(request.args.get('limit', 50)))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+    queue = get_job_queue()
+    out = queue.list(
+        status=request.args.get('status'),
+        domain=request.args.get('domain'),
+        limit=limit,
+        offset=offset,
+    )
+    out["stats"] = queue.stats()
+    workers = get_job_workers()
+    out["workers"] = workers.get_stats() if workers else None
+    return jsonify(out)
+
+
+@jobs_bp.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Job state without the result payload"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+@jobs_bp.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """200 with the result, 202 while pending, 409 if the job failed or was cancelled"""
+    job = get_job_queue().get(job_id, include_result=True)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job["status"] == "succeeded":
+        return jsonify(job["result"])
+    body = {"job_id": job_id, "status": job["status"], "error": job["error"]}
+    if job["status"] in ("queued", "running"):
+        resp = jsonify(body)
+        resp.status_code = 202
+        resp.headers["Retry-After"] = "5"
+        return resp
+    return jsonify(body), 409
+
+
+@jobs_bp.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a job that has not started yet"""
+    queue = get_job_queue()
+    if queue.cancel(job_id):
+        return jsonify({"job_id": job_id, "status": "cancelled"})
+    job = queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify({"error": f"Job is {job['status']}, only queued jobs can be cancelled"}), 409
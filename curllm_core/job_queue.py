@@ -0,0 +1,776 @@
+"""
+Job Queue - durable, asynchronous job submission for the API server
+
+``/api/execute`` holds the HTTP request open for the whole browser
+workflow. Jobs submitted to the queue are written to a SQLite file
+instead and picked up by a fixed pool of worker coroutines on the
+server's async runner loop; clients poll for status, fetch the result
+later or receive it on a webhook.
+
+Scheduling:
+    - higher ``priority`` first
+    - within a priority, round-robin across domains (the domain with the
+      fewest running jobs, then the one served longest ago), and at most
+      ``max_per_domain`` jobs of one domain run at a time
+    - FIFO within a domain
+
+A claimed job carries a lease that the worker extends while the job runs.
+If a worker (or the whole process) dies, the lease expires and the job is
+queued again until it runs out of attempts, so nothing is lost on restart.
+
+Usage:
+    from curllm_core.job_queue import get_job_queue, JobWorkerPool
+
+    queue = get_job_queue()
+    job_id = queue.submit({"url": "https://example.com", "data": "extract links"},
+                          priority=5, webhook="https://hooks.example.com/curllm")
+
+    workers = JobWorkerPool(queue, handler=run_job, workers=4).start(runner.loop)
+    queue.get(job_id)   # {"id", "status": queued|running|succeeded|failed|cancelled, ...}
+    workers.stop(timeout=30)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+FINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Retry delay after a failed attempt: RETRY_BACKOFF * 2**(attempt-1), capped
+RETRY_BACKOFF = 5.0
+MAX_RETRY_DELAY = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    domain TEXT NOT NULL DEFAULT '',
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL,
+    webhook TEXT,
+    webhook_status TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, priority, available_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (status, lease_expires);
+CREATE INDEX IF NOT EXISTS idx_jobs_domain ON jobs (status, domain);
+CREATE TABLE IF NOT EXISTS job_domains (
+    domain TEXT PRIMARY KEY,
+    last_served REAL NOT NULL
+);
+"""
+
+_JOB_COLUMNS = (
+    "id, status, priority, domain, payload, result, error, attempts, max_attempts, "
+    "lease_owner, lease_expires, available_at, webhook, webhook_status, created_at, "
+    "started_at, finished_at"
+)
+
+
+def _default_db_path() -> Path:
+    from curllm_core.llm_cache import _default_db_path as _cache_db_path
+    return _cache_db_path().parent / "jobs.db"
+
+
+def parse_job_request(data: Any, max_jobs: int = 1000) -> Dict[str, Any]:
+    """
+    Validate a ``POST /api/jobs`` body.
+
+    The body is either one job (the ``/api/execute`` fields) or
+    ``{"jobs": [...]}``; ``priority``, ``webhook`` and ``max_attempts``
+    apply to every job in the request.
+
+    Returns:
+        {"payloads": [...], "priority": int, "webhook": str|None, "max_attempts": int|None}
+
+    Raises:
+        ValueError: With a message suitable for a 400 response
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+    control = ("jobs", "priority", "webhook", "max_attempts")
+    if "jobs" in data:
+        payloads = data["jobs"]
+        if not isinstance(payloads, list) or not payloads:
+            raise ValueError("'jobs' must be a non-empty list")
+        if len(payloads) > max_jobs:
+            raise ValueError(f"At most {max_jobs} jobs per request")
+        if not all(isinstance(p, dict) for p in payloads):
+            raise ValueError("Every job must be a JSON object")
+    else:
+        payloads = [{k: v for k, v in data.items() if k not in control}]
+    try:
+        priority = int(data.get("priority") or 0)
+        max_attempts = int(data["max_attempts"]) if data.get("max_attempts") is not None else None
+    except (TypeError, ValueError):
+        raise ValueError("'priority' and 'max_attempts' must be integers")
+    webhook = data.get("webhook") or None
+    if webhook is not None:
+        parsed = urlparse(str(webhook))
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            raise ValueError("'webhook' must be an http(s) URL")
+    return {"payloads": payloads, "priority": priority, "webhook": webhook, "max_attempts": max_attempts}
+
+
+def job_domain(payload: Dict[str, Any]) -> str:
+    """Domain a job is scheduled under (empty for jobs without a URL)"""
+    url = str((payload or {}).get("url") or "")
+    try:
+        return (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+class JobQueue:
+    """
+    SQLite-backed job store with leases.
+
+    Every state change is one short ``BEGIN IMMEDIATE`` transaction, so
+    several threads (Flask request handlers, workers) and even several
+    server processes can share one file.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        max_per_domain: int = 2,
+        timeout: float = 10.0,
+        retry_backoff: float = RETRY_BACKOFF,
+    ):
+        """
+        Open (or create) the job store.
+
+        Args:
+            db_path: SQLite file (default: jobs.db next to the LLM cache)
+            lease_seconds: How long a claim is valid without a heartbeat
+            max_attempts: Default number of attempts per job
+            max_per_domain: Maximum running jobs per domain (0 = unlimited)
+            timeout: Seconds to wait for the database lock
+            retry_backoff: Base retry delay in seconds (0 = retry at once)
+        """
+        self.db_path = Path(db_path) if db_path else _default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.max_per_domain = max_per_domain
+        self.timeout = timeout
+        self.retry_backoff = max(0.0, retry_backoff)
+        self._local = threading.local()
+        self._listeners: List[Callable[[], None]] = []
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _tx(self):
+        return _Transaction(self._conn())
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Call `callback` (from the submitting thread) whenever jobs are queued"""
+        self._listeners.append(callback)
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"Job queue listener failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        webhook: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+    ) -> str:
+        """
+        Queue one job.
+
+        Args:
+            payload: JSON-serializable job arguments (``url`` decides the domain)
+            priority: Higher runs first
+            webhook: URL that receives the final job state as JSON POST
+            max_attempts: Attempts before the job fails (default: queue setting)
+
+        Returns:
+            Job id
+        """
+        return self.submit_many([payload], priority=priority, webhook=webhook, max_attempts=max_attempts)[0]
+
+    def submit_many(
+        self,
+        payloads: List[Dict[str, Any]],
+        priority: int = 0,
+        webhook: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+    ) -> List[str]:
+        """Queue several jobs in one transaction; returns their ids in order"""
+        now = time.time()
+        attempts = max(1, int(max_attempts or self.max_attempts))
+        rows = []
+        for payload in payloads:
+            rows.append((
+                uuid.uuid4().hex, "queued", int(priority), job_domain(payload),
+                json.dumps(payload, default=str), attempts, now, webhook, now,
+            ))
+        with self._tx() as conn:
+            conn.executemany(
+                "INSERT INTO jobs (id, status, priority, domain, payload, max_attempts, "
+                "available_at, webhook, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        self._notify()
+        return [r[0] for r in rows]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job; running and finished jobs are left alone"""
+        with self._tx() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id),
+            )
+        return cur.rowcount == 1
+
+    def retry_now(self, job_id: Optional[str] = None) -> int:
+        """Make queued jobs waiting out a retry backoff ready now (one job or all); returns the count"""
+        now = time.time()
+        sql = "UPDATE jobs SET available_at = ? WHERE status = 'queued' AND available_at > ?"
+        params: list = [now, now]
+        if job_id is not None:
+            sql += " AND id = ?"
+            params.append(job_id)
+        with self._tx() as conn:
+            cur = conn.execute(sql, params)
+        if cur.rowcount:
+            self._notify()
+        return cur.rowcount
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+    def claim(self, worker_id: str, lease_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Lease the next job for a worker.
+
+        Expired leases are recovered first, so a job whose worker died is
+        handed out again.
+
+        Returns:
+            The job (see ``get``) with its decoded payload, or None if
+            nothing is ready
+        """
+        now = time.time()
+        lease = lease_seconds or self.lease_seconds
+        cap = self.max_per_domain if self.max_per_domain > 0 else -1
+        with self._tx() as conn:
+            self._recover_expired(conn, now)
+            row = conn.execute(
+                """
+                WITH busy AS (
+                    SELECT domain, COUNT(*) AS n FROM jobs WHERE status = 'running' GROUP BY domain
+                )
+                SELECT j.id, j.domain FROM jobs j
+                LEFT JOIN busy b ON b.domain = j.domain
+                LEFT JOIN job_domains d ON d.domain = j.domain
+                WHERE j.status = 'queued' AND j.available_at <= ?
+                  AND (? < 0 OR j.domain = '' OR COALESCE(b.n, 0) < ?)
+                ORDER BY j.priority DESC, COALESCE(b.n, 0) ASC,
+                         COALESCE(d.last_served, 0) ASC, j.seq ASC
+                LIMIT 1
+                """,
+                (now, cap, cap),
+            ).fetchone()
+            if not row:
+                return None
+            job_id, domain = row
+            conn.execute(
+                "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, started_at = ? WHERE id = ?",
+                (worker_id, now + lease, now, job_id),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO job_domains (domain, last_served) VALUES (?, ?)",
+                (domain, now),
+            )
+        job = self.get(job_id, include_payload=True)
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: Optional[float] = None) -> bool:
+        """
+        Extend a lease.
+
+        Returns:
+            False if the worker no longer holds the job (lease expired and
+            the job was recovered, or it was finished elsewhere)
+        """
+        expires = time.time() + (lease_seconds or self.lease_seconds)
+        with self._tx() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (expires, job_id, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        """Store a job's result; False if the worker lost the lease"""
+        with self._tx() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = 'succeeded', result = ?, error = NULL, lease_owner = NULL, "
+                "lease_expires = NULL, finished_at = ? "
+                "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (json.dumps(result, default=str), time.time(), job_id, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> Optional[str]:
+        """
+        Record a failed attempt.
+
+        The job is queued again with exponential backoff while attempts
+        remain (and `retry` is set), otherwise it fails for good.
+
+        Returns:
+            New status ("queued" or "failed"), or None if the worker lost the lease
+        """
+        now = time.time()
+        with self._tx() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (job_id, worker_id),
+            ).fetchone()
+            if not row:
+                return None
+            status = self._after_attempt(conn, job_id, row[0], row[1], error, now, retry)
+        if status == "queued":
+            self._notify()
+        return status
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """Hand a job back without counting the attempt (graceful shutdown)"""
+        with self._tx() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = MAX(0, attempts - 1), lease_owner = NULL, "
+                "lease_expires = NULL, started_at = NULL, available_at = ? "
+                "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (time.time(), job_id, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def set_webhook_status(self, job_id: str, status: str):
+        """Remember how the webhook delivery went"""
+        with self._tx() as conn:
+            conn.execute("UPDATE jobs SET webhook_status = ? WHERE id = ?", (status, job_id))
+
+    def recover_expired(self) -> int:
+        """Requeue (or fail) running jobs whose lease expired; returns the count"""
+        with self._tx() as conn:
+            return self._recover_expired(conn, time.time())
+
+    def _recover_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        rows = conn.execute(
+            "SELECT id, attempts, max_attempts, lease_owner FROM jobs "
+            "WHERE status = 'running' AND lease_expires < ?",
+            (now,),
+        ).fetchall()
+        for job_id, attempts, max_attempts, owner in rows:
+            logger.warning(f"Job {job_id} lease held by {owner} expired, recovering")
+            self._after_attempt(conn, job_id, attempts, max_attempts, f"lease expired (worker {owner})", now, True)
+        return len(rows)
+
+    def _after_attempt(self, conn, job_id, attempts, max_attempts, error, now, retry) -> str:
+        if retry and attempts < max_attempts:
+            delay = min(MAX_RETRY_DELAY, self.retry_backoff * (2 ** max(0, attempts - 1)))
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', error = ?, lease_owner = NULL, lease_expires = NULL, "
+                "available_at = ? WHERE id = ?",
+                (error, now + delay, job_id),
+            )
+            return "queued"
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, lease_owner = NULL, lease_expires = NULL, "
+            "finished_at = ? WHERE id = ?",
+            (error, now, job_id),
+        )
+        return "failed"
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def get(self, job_id: str, include_payload: bool = False, include_result: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job.
+
+        Returns:
+            Job dict (status, priority, domain, attempts, timestamps, error,
+            ...) or None if unknown
+        """
+        row = self._conn().execute(
+            f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if not row:
+            return None
+        return self._row_to_job(row, include_payload, include_result)
+
+    def list(
+        self,
+        status: Optional[str] = None,
+        domain: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Newest jobs first, optionally filtered.
+
+        Returns:
+            {"jobs": [...], "total": int, "limit": int, "offset": int}
+        """
+        where, params = [], []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if domain:
+            where.append("domain = ?")
+            params.append(domain.lower())
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        conn = self._conn()
+        total = conn.execute(f"SELECT COUNT(*) FROM jobs{clause}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT {_JOB_COLUMNS} FROM jobs{clause} ORDER BY seq DESC LIMIT ? OFFSET ?",
+            params + [max(1, int(limit)), max(0, int(offset))],
+        ).fetchall()
+        return {
+            "jobs": [self._row_to_job(r) for r in rows],
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts per status plus queued/running counts per domain"""
+        conn = self._conn()
+        counts = {s: 0 for s in JOB_STATUSES}
+        for status, n in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[status] = n
+        domains: Dict[str, Dict[str, int]] = {}
+        for domain, status, n in conn.execute(
+            "SELECT domain, status, COUNT(*) FROM jobs WHERE status IN ('queued', 'running') "
+            "GROUP BY domain, status"
+        ):
+            domains.setdefault(domain, {"queued": 0, "running": 0})[status] = n
+        return {"counts": counts, "domains": domains}
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs older than `older_than` seconds; returns the count"""
+        cutoff = time.time() - older_than
+        with self._tx() as conn:
+            cur = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed', 'cancelled') AND finished_at < ?",
+                (cutoff,),
+            )
+        return cur.rowcount
+
+    @staticmethod
+    def _row_to_job(row, include_payload: bool = False, include_result: bool = False) -> Dict[str, Any]:
+        (job_id, status, priority, domain, payload, result, error, attempts, max_attempts,
+         lease_owner, lease_expires, available_at, webhook, webhook_status, created_at,
+         started_at, finished_at) = row
+        job = {
+            "id": job_id,
+            "status": status,
+            "priority": priority,
+            "domain": domain,
+            "attempts": attempts,
+            "max_attempts": max_attempts,
+            "error": error,
+            "worker": lease_owner,
+            "lease_expires": lease_expires,
+            "available_at": available_at,
+            "webhook": webhook,
+            "webhook_status": webhook_status,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "has_result": result is not None,
+        }
+        if include_payload:
+            job["payload"] = json.loads(payload)
+        if include_result:
+            job["result"] = json.loads(result) if result is not None else None
+        return job
+
+
+class _Transaction:
+    """``with`` block running one BEGIN IMMEDIATE transaction"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class JobWorkerPool:
+    """
+    Fixed number of worker coroutines draining a JobQueue.
+
+    Workers run on an existing event loop (the server's async runner
+    loop), so jobs share its browser pool and HTTP sessions. Database
+    calls go to a thread so they never block the loop.
+
+    Args:
+        queue: Job store
+        handler: ``async handler(payload) -> result`` (JSON-serializable)
+        workers: Number of concurrent jobs
+        job_timeout: Seconds before an attempt is cancelled (0 = none)
+        poll_interval: Seconds an idle worker sleeps when no submit wakes it
+        webhook_timeout: Seconds per webhook delivery attempt
+        webhook_attempts: Delivery attempts per webhook
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Callable[[Dict[str, Any]], Awaitable[Any]],
+        workers: int = 2,
+        job_timeout: float = 0,
+        poll_interval: float = 2.0,
+        webhook_timeout: float = 10.0,
+        webhook_attempts: int = 3,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.job_timeout = job_timeout
+        self.poll_interval = poll_interval
+        self.webhook_timeout = webhook_timeout
+        self.webhook_attempts = max(1, webhook_attempts)
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._current: Dict[str, str] = {}
+        self._stopping = False
+        self._stats = {"completed": 0, "failed": 0, "retried": 0, "lost": 0, "webhooks_failed": 0}
+        queue.add_listener(self.wake)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and not self._stopping
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> "JobWorkerPool":
+        """Start the workers on `loop` (which must be running in another thread)"""
+        if self._tasks:
+            return self
+
+        async def _spawn():
+            self._wake = asyncio.Event()
+            self._tasks = [
+                asyncio.ensure_future(self._worker(f"{self.worker_prefix}:{i}"))
+                for i in range(self.workers)
+            ]
+
+        self._loop = loop
+        self._stopping = False
+        asyncio.run_coroutine_threadsafe(_spawn(), loop).result(timeout=10)
+        logger.info(f"Job workers started: {self.workers} on {self.queue.db_path}")
+        return self
+
+    def wake(self):
+        """Wake idle workers (safe to call from any thread)"""
+        loop, event = self._loop, self._wake
+        if loop is not None and event is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(event.set)
+
+    def stop(self, timeout: Optional[float] = 30.0) -> bool:
+        """
+        Stop claiming, wait for running jobs, then cancel the rest.
+
+        Jobs still running at the timeout are handed back to the queue
+        without using up an attempt.
+
+        Returns:
+            True if every running job finished in time
+        """
+        loop = self._loop
+        if loop is None or not self._tasks or loop.is_closed():
+            return True
+        self._stopping = True
+        self.wake()
+
+        async def _stop():
+            done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            return not pending
+
+        try:
+            finished = asyncio.run_coroutine_threadsafe(_stop(), loop).result(
+                timeout=None if timeout is None else timeout + 10
+            )
+        except Exception as e:
+            logger.warning(f"Job workers did not stop cleanly: {e}")
+            finished = False
+        self._tasks = []
+        return finished
+
+    async def _worker(self, worker_id: str):
+        while not self._stopping:
+            try:
+                job = await asyncio.to_thread(self.queue.claim, worker_id)
+            except Exception as e:
+                logger.warning(f"Job claim failed: {e}")
+                job = None
+            if job is None:
+                await self._idle()
+                continue
+            await self._run(worker_id, job)
+
+    async def _idle(self):
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self, worker_id: str, job: Dict[str, Any]):
+        job_id = job["id"]
+        self._current[worker_id] = job_id
+        beat = asyncio.ensure_future(self._heartbeat(worker_id, job_id))
+        try:
+            coro = self.handler(job["payload"])
+            if self.job_timeout:
+                coro = asyncio.wait_for(coro, timeout=self.job_timeout)
+            result = await coro
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.queue.release, job_id, worker_id)
+            raise
+        except Exception as e:
+            error = "timeout" if isinstance(e, asyncio.TimeoutError) else f"{type(e).__name__}: {e}"
+            status = await asyncio.to_thread(self.queue.fail, job_id, worker_id, error)
+            if status == "queued":
+                self._stats["retried"] += 1
+                logger.info(f"Job {job_id} attempt {job['attempts']} failed, retrying: {error}")
+            elif status == "failed":
+                self._stats["failed"] += 1
+                logger.warning(f"Job {job_id} failed: {error}")
+                await self._deliver(job_id)
+            else:
+                self._stats["lost"] += 1
+        else:
+            if await asyncio.to_thread(self.queue.complete, job_id, worker_id, result):
+                self._stats["completed"] += 1
+                await self._deliver(job_id)
+            else:
+                self._stats["lost"] += 1
+                logger.warning(f"Job {job_id} finished after its lease was lost; result dropped")
+        finally:
+            beat.cancel()
+            self._current.pop(worker_id, None)
+
+    async def _heartbeat(self, worker_id: str, job_id: str):
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await asyncio.to_thread(self.queue.heartbeat, job_id, worker_id):
+                    logger.warning(f"Lost lease on job {job_id}")
+                    return
+            except Exception as e:
+                logger.debug(f"Job heartbeat failed: {e}")
+
+    async def _deliver(self, job_id: str):
+        job = await asyncio.to_thread(self.queue.get, job_id, False, True)
+        if not job or not job.get("webhook"):
+            return
+        from curllm_core.http_pool import get_http_pool
+        body = {k: job[k] for k in ("id", "status", "attempts", "error", "created_at", "finished_at", "result")}
+        status = "failed"
+        for attempt in range(self.webhook_attempts):
+            try:
+                async with get_http_pool().post(job["webhook"], timeout=self.webhook_timeout, json=body) as resp:
+                    if resp.status < 400:
+                        status = f"delivered ({resp.status})"
+                        break
+                    status = f"failed ({resp.status})"
+            except Exception as e:
+                status = f"failed ({type(e).__name__})"
+            if attempt + 1 < self.webhook_attempts:
+                await asyncio.sleep(min(30.0, 2.0 ** attempt))
+        if status.startswith("failed"):
+            self._stats["webhooks_failed"] += 1
+            logger.warning(f"Webhook for job {job_id} {status}")
+        await asyncio.to_thread(self.queue.set_webhook_status, job_id, status)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker counters and the jobs currently held"""
+        stats = dict(self._stats)
+        stats.update({
+            "workers": self.workers,
+            "running": self.running,
+            "busy": len(self._current),
+            "current": dict(self._current),
+        })
+        return stats
+
+
+# Global queue instance
+_global_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get or create the global job queue.
+
+    Settings come from ``config.job_db``, ``config.job_lease_seconds``,
+    ``config.job_max_attempts`` and ``config.job_max_per_domain``.
+    """
+    global _global_queue
+    if _global_queue is None:
+        from .config import config
+        _global_queue = JobQueue(
+            db_path=config.job_db or None,
+            lease_seconds=config.job_lease_seconds,
+            max_attempts=config.job_max_attempts,
+            max_per_domain=config.job_max_per_domain,
+        )
+    return _global_queue
@@ -0,0 +1,51 @@
+"""
+Lazy package exports (PEP 562)
+
+Lets a package ``__init__`` declare its public names without importing the
+modules behind them; each module is imported on first attribute access and
+the value is cached in the package namespace. Keeps ``import curllm_core``
+(and every CLI run or spawned worker) from loading Flask, the executor, all
+LLM orchestrators and optional SDKs up front.
+
+Usage:
+    # in a package __init__.py
+    from curllm_core.lazy_imports import lazy_exports
+
+    __getattr__, __dir__ = lazy_exports(__name__, {
+        "CurllmExecutor": ".executor:CurllmExecutor",  # attribute of a module
+        "v2": ".v2",                                     # the module itself
+    })
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build module-level ``__getattr__`` and ``__dir__`` for a package.
+
+    Args:
+        package: The package's ``__name__``
+        exports: Public name -> "module:attribute" or "module" (relative to the package or absolute)
+
+    Returns:
+        (__getattr__, __dir__) to assign in the package namespace
+    """
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, _, attr = target.partition(":")
+        module = importlib.import_module(module_name, package)
+        value = getattr(module, attr) if attr else module
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
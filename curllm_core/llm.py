@@ -1,14 +1,45 @@
 #!/usr/bin/env python3
-import aiohttp
 import base64
 from pathlib import Path
 
+from typing import Any, Dict, Optional
+
+from .config import config
+from .http_pool import get_http_pool
+from .stage_timer import current_recorder, stage
+
+_NS_PER_MS = 1_000_000
+
+
+def ollama_metrics(data: Any) -> Dict[str, float]:
+    """
+    Timing/token metrics from an Ollama /api/generate response.
+
+    Durations are reported by Ollama in nanoseconds; ``prompt_tokens`` counts
+    only the prompt tokens actually evaluated, so it drops when the server
+    reuses a cached prompt prefix. Empty dict if the server sent no metrics.
+    """
+    if not isinstance(data, dict) or "prompt_eval_count" not in data and "eval_count" not in data:
+        return {}
+    return {
+        "prompt_tokens": int(data.get("prompt_eval_count") or 0),
+        "prompt_eval_ms": (data.get("prompt_eval_duration") or 0) / _NS_PER_MS,
+        "eval_tokens": int(data.get("eval_count") or 0),
+        "eval_ms": (data.get("eval_duration") or 0) / _NS_PER_MS,
+        "load_ms": (data.get("load_duration") or 0) / _NS_PER_MS,
+        "total_ms": (data.get("total_duration") or 0) / _NS_PER_MS,
+    }
+
+
 class SimpleOllama:
     """Minimal async Ollama client used when langchain_ollama is unavailable"""
-    def __init__(self, base_url: str, model: str, num_ctx: int, num_predict: int, temperature: float, top_p: float, timeout: int = 300):
+    def __init__(self, base_url: str, model: str, num_ctx: int, num_predict: int, temperature: float, top_p: float, timeout: int = 300, keep_alive: Optional[str] = None):
         self.base_url = base_url.rstrip('/')
         self.model = model
         self.timeout = timeout
+        # How long Ollama keeps the model loaded after a call ("30m", "-1" = forever);
+        # options must stay identical between calls or the runner reloads the model
+        self.keep_alive = keep_alive if keep_alive is not None else (config.ollama_keep_alive or None)
         self.options = {
             "num_ctx": num_ctx,
             "num_predict": num_predict,
@@ -23,12 +54,20 @@ class SimpleOllama:
             "stream": False,
             "options": self.options,
         }
-        timeout_obj = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(timeout=timeout_obj) as session:
-            async with session.post(f"{self.base_url}/api/generate", json=payload) as resp:
-                data = await resp.json()
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+        with stage("llm_wait", prompt_chars=len(prompt or "")):
+            data = await get_http_pool().post_json(f"{self.base_url}/api/generate", payload, timeout=self.timeout)
         text = data.get("response", "") if isinstance(data, dict) else str(data)
-        return {"text": text}
+        result: Dict[str, Any] = {"text": text}
+        metrics = ollama_metrics(data)
+        if metrics:
+            result["metrics"] = metrics
+            rec = current_recorder()
+            if rec is not None:
+                for key in ("prompt_tokens", "prompt_eval_ms", "eval_tokens", "eval_ms", "load_ms"):
+                    rec.count(f"llm_wait.{key}", metrics[key])
+        return result
     
     async def ainvoke_with_image(self, prompt: str, image_path: str):
         """
@@ -54,11 +93,11 @@ class SimpleOllama:
             "stream": False,
             "options": self.options,
         }
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
         
-        timeout_obj = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(timeout=timeout_obj) as session:
-            async with session.post(f"{self.base_url}/api/generate", json=payload) as resp:
-                data = await resp.json()
+        with stage("llm_wait", prompt_chars=len(prompt or "")):
+            data = await get_http_pool().post_json(f"{self.base_url}/api/generate", payload, timeout=self.timeout)
         
         text = data.get("response", "") if isinstance(data, dict) else str(data)
         return {"text": text}
@@ -0,0 +1,391 @@
+"""
+LLM Prompt/Response Cache
+
+Transparent caching layer for any client returned by ``llm_factory.setup_llm``.
+Responses are content-addressed by a hash of (model, options, prompt) and kept
+in two tiers:
+
+- memory: small LRU (per process)
+- disk:   SQLite file under the workspace with TTL and total-size eviction
+
+Identical prompts issued concurrently are coalesced into one inference.
+
+Usage:
+    from curllm_core.llm_cache import CachedLLMClient, LLMResponseCache
+
+    llm = CachedLLMClient(setup_llm(), LLMResponseCache())
+    out = await llm.ainvoke(prompt)                      # cached
+    out = await llm.ainvoke(prompt, bypass_cache=True)   # always hits the model
+    print(llm.cache.get_stats())                         # hit rate etc.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _default_db_path() -> Path:
+    base = Path(os.getenv("CURLLM_WORKSPACE", "./workspace")) / "cache"
+    candidates = [
+        base,
+        Path(os.path.expanduser("~")) / ".cache" / "curllm" / "cache",
+        Path("/tmp/curllm/cache"),
+    ]
+    for cand in candidates:
+        try:
+            cand.mkdir(parents=True, exist_ok=True)
+            return cand / "llm_cache.db"
+        except Exception:
+            continue
+    return base / "llm_cache.db"
+
+
+def make_cache_key(model: str, options: Optional[Dict[str, Any]], prompt: str) -> str:
+    """Content-addressed key for one LLM call."""
+    h = hashlib.sha256()
+    h.update(str(model or "").encode("utf-8"))
+    h.update(b"\x00")
+    h.update(json.dumps(options or {}, sort_keys=True, default=str).encode("utf-8"))
+    h.update(b"\x00")
+    h.update(prompt.encode("utf-8", errors="replace"))
+    return h.hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier (memory LRU + SQLite) response cache.
+
+    Disk access runs in a worker thread so lookups never block the event loop.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        memory_items: int = 256,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_disk_mb: float = 256,
+        use_disk: bool = True,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            db_path: SQLite file for the disk tier (default: workspace/cache/llm_cache.db)
+            memory_items: Entries kept in the in-memory LRU
+            ttl_seconds: Entries older than this are treated as missing and purged
+            max_disk_mb: Disk tier is trimmed (least recently used first) above this size
+            use_disk: Disable to keep the cache purely in memory
+        """
+        self.memory_items = max(0, memory_items)
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes_since_trim = 0
+        self._stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "coalesced": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+        if use_disk:
+            self.db_path = Path(db_path) if db_path else _default_db_path()
+            try:
+                self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS llm_cache (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                    """
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)"
+                )
+                self._conn.commit()
+            except Exception as e:
+                logger.warning(f"LLM cache disk tier unavailable ({e}), using memory only")
+                self._conn = None
+        else:
+            self.db_path = None
+
+    # ---------------------------------------------------------------- memory
+
+    def _memory_get(self, key: str) -> Optional[Any]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        created, value = entry
+        if self.ttl_seconds and time.time() - created > self.ttl_seconds:
+            self._memory.pop(key, None)
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_put(self, key: str, value: Any, created: Optional[float] = None):
+        if self.memory_items <= 0:
+            return
+        self._memory[key] = (created or time.time(), value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------ disk
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        if self._conn is None:
+            return None
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            now = time.time()
+            if self.ttl_seconds and now - created > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        try:
+            return json.loads(value), created
+        except Exception:
+            return None
+
+    def _disk_put(self, key: str, value: Any):
+        if self._conn is None:
+            return
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return  # not serializable (e.g. a provider object) -> memory only
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload.encode("utf-8")), now, now),
+            )
+            self._conn.commit()
+            self._writes_since_trim += 1
+            if self._writes_since_trim >= 50:
+                self._writes_since_trim = 0
+                self._trim_locked()
+
+    def _trim_locked(self):
+        """Drop expired rows, then least recently used rows above the size cap."""
+        if self.ttl_seconds:
+            cur = self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._stats["evictions"] += cur.rowcount or 0
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total > self.max_disk_bytes:
+            excess = total - self.max_disk_bytes
+            freed = 0
+            victims = []
+            for key, size in self._conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at ASC"):
+                victims.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+            self._stats["evictions"] += len(victims)
+        self._conn.commit()
+
+    def trim(self):
+        """Run TTL/size eviction on the disk tier now."""
+        if self._conn is None:
+            return
+        with self._db_lock:
+            self._trim_locked()
+
+    # ------------------------------------------------------------------- api
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Look up a key in memory, then on disk (promoting disk hits to memory)."""
+        value = self._memory_get(key)
+        if value is not None:
+            self._stats["memory_hits"] += 1
+            return dict(value) if isinstance(value, dict) else value
+        hit = await asyncio.to_thread(self._disk_get, key) if self._conn is not None else None
+        if hit is not None:
+            value, created = hit
+            self._stats["disk_hits"] += 1
+            self._memory_put(key, value, created)
+            return dict(value) if isinstance(value, dict) else value
+        self._stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, value: Any):
+        """Store a response in both tiers."""
+        self._stats["stores"] += 1
+        self._memory_put(key, value)
+        if self._conn is not None:
+            await asyncio.to_thread(self._disk_put, key, value)
+
+    def record_bypass(self):
+        self._stats["bypassed"] += 1
+
+    def record_coalesced(self):
+        self._stats["coalesced"] += 1
+
+    def clear(self):
+        """Remove all entries from both tiers."""
+        self._memory.clear()
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with per-tier hits, misses and overall hit rate
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        stats["memory_entries"] = len(self._memory)
+        return stats
+
+
+class CachedLLMClient:
+    """
+    Wraps an LLM client and serves repeated prompts from LLMResponseCache.
+
+    Anything other than ``ainvoke``/``invoke`` (e.g. ``ainvoke_with_image``,
+    ``model``) is delegated to the wrapped client unchanged.
+    """
+
+    def __init__(self, client: Any, cache: LLMResponseCache):
+        self._client = client
+        self.cache = cache
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name in ("_client", "_inflight", "cache"):
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    @property
+    def wrapped(self) -> Any:
+        """The underlying (uncached) client."""
+        return self._client
+
+    def _key(self, prompt: str) -> str:
+        c = self._client
+        model = getattr(c, "model", None) or getattr(c, "model_name", "") or type(c).__name__
+        options = getattr(c, "options", None)
+        if not isinstance(options, dict):
+            options = {
+                k: getattr(c, k) for k in ("temperature", "top_p", "max_tokens", "num_ctx", "num_predict")
+                if isinstance(getattr(c, k, None), (int, float, str))
+            }
+        return make_cache_key(str(model), options, prompt)
+
+    async def ainvoke(self, prompt: str, *args, bypass_cache: bool = False, **kwargs) -> Any:
+        """
+        Invoke the model, using the cache unless ``bypass_cache`` is set.
+
+        Calls with extra positional/keyword arguments are never cached.
+        """
+        if bypass_cache or args or kwargs or not isinstance(prompt, str):
+            self.cache.record_bypass()
+            return await self._client.ainvoke(prompt, *args, **kwargs)
+
+        key = self._key(prompt)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.cache.record_coalesced()
+            return await asyncio.shield(pending)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await self._client.ainvoke(prompt)
+            fut.set_result(result)
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        # Server timings describe this call only, not later cache hits
+        stored = {k: v for k, v in result.items() if k != "metrics"} if isinstance(result, dict) else result
+        await self.cache.put(key, stored)
+        return result
+
+    def invoke(self, prompt: str, *args, bypass_cache: bool = False, **kwargs) -> Any:
+        """Sync variant; uses only the memory tier."""
+        if bypass_cache or args or kwargs or not isinstance(prompt, str):
+            self.cache.record_bypass()
+            return self._client.invoke(prompt, *args, **kwargs)
+        key = self._key(prompt)
+        cached = self.cache._memory_get(key)
+        if cached is not None:
+            self.cache._stats["memory_hits"] += 1
+            return cached
+        self.cache._stats["misses"] += 1
+        result = self._client.invoke(prompt)
+        self.cache._memory_put(key, result)
+        return result
+
+
+# Global cache instance (shared by all wrapped clients in the process)
+_global_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Get or create the global LLM response cache.
+
+    Configured from CURLLM_LLM_CACHE_MEMORY_ITEMS, CURLLM_LLM_CACHE_TTL,
+    CURLLM_LLM_CACHE_MAX_MB and CURLLM_LLM_CACHE_DISK on first call.
+    """
+    global _global_cache
+
+    if _global_cache is None:
+        _global_cache = LLMResponseCache(
+            memory_items=int(os.getenv("CURLLM_LLM_CACHE_MEMORY_ITEMS", "256")),
+            ttl_seconds=float(os.getenv("CURLLM_LLM_CACHE_TTL", str(7 * 24 * 3600))),
+            max_disk_mb=float(os.getenv("CURLLM_LLM_CACHE_MAX_MB", "256")),
+            use_disk=os.getenv("CURLLM_LLM_CACHE_DISK", "true").lower() in ["true", "1", "yes"],
+        )
+
+    return _global_cache
+
+
+def get_cache_stats(llm: Any) -> Optional[Dict[str, Any]]:
+    """Cache stats for a (possibly) cached client, None if it is not cached."""
+    cache = getattr(llm, "cache", None)
+    if isinstance(cache, LLMResponseCache):
+        return cache.get_stats()
+    return None
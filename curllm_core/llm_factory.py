@@ -3,7 +3,9 @@ import logging
 from typing import Optional, Any
 from .config import config
 from .llm import SimpleOllama
+from .http_pool import get_http_pool
 from .llm_config import LLMConfig
+from .stage_timer import stage
 
 logger = logging.getLogger(__name__)
 
@@ -24,18 +26,25 @@ def setup_llm(llm_config: Optional[LLMConfig] = None) -> Any:
         llm_config: Optional LLMConfig. If not provided, uses environment/config defaults.
     
     Returns:
-        LLM client instance with ainvoke() method
+        LLM client instance with ainvoke() method (wrapped in CachedLLMClient
+        when config.llm_cache_enabled)
     """
     if llm_config is None:
         # Check for new-style provider config
         provider_env = os.getenv("CURLLM_LLM_PROVIDER")
         if provider_env:
             llm_config = LLMConfig.from_env()
+            client = create_llm_client(llm_config)
         else:
             # Legacy mode: use ollama with config settings
-            return _setup_ollama_legacy()
+            client = _setup_ollama_legacy()
+    else:
+        client = create_llm_client(llm_config)
     
-    return create_llm_client(llm_config)
+    if config.llm_cache_enabled:
+        from .llm_cache import CachedLLMClient, get_llm_cache
+        client = CachedLLMClient(client, get_llm_cache())
+    return client
 
 
 def create_llm_client(llm_config: LLMConfig) -> Any:
@@ -124,6 +133,7 @@ def _create_ollama_client(llm_config: LLMConfig) -> SimpleOllama:
         temperature=llm_config.temperature,
         top_p=llm_config.top_p,
         timeout=llm_config.timeout,
+        keep_alive=llm_config.extra_params.get("keep_alive"),
     )
 
 
@@ -214,8 +224,6 @@ class OpenAICompatibleClient:
     
     async def ainvoke(self, prompt: str) -> dict:
         """Async invoke the LLM"""
-        import aiohttp
-        
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -228,10 +236,10 @@ class OpenAICompatibleClient:
             "max_tokens": self.max_tokens,
         }
         
-        timeout_obj = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(timeout=timeout_obj) as session:
-            async with session.post(
+        with stage("llm_wait", prompt_chars=len(prompt or "")):
+            async with get_http_pool().post(
                 f"{self.base_url}/chat/completions",
+                timeout=self.timeout,
                 headers=headers,
                 json=payload
             ) as resp:
@@ -263,8 +271,6 @@ class AnthropicClient:
     
     async def ainvoke(self, prompt: str) -> dict:
         """Async invoke Claude"""
-        import aiohttp
-        
         headers = {
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01",
@@ -281,10 +287,10 @@ class AnthropicClient:
         if not self.model.startswith("claude-3-5-sonnet"):
             payload["temperature"] = self.temperature
         
-        timeout_obj = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(timeout=timeout_obj) as session:
-            async with session.post(
+        with stage("llm_wait", prompt_chars=len(prompt or "")):
+            async with get_http_pool().post(
                 "https://api.anthropic.com/v1/messages",
+                timeout=self.timeout,
                 headers=headers,
                 json=payload
             ) as resp:
@@ -317,8 +323,6 @@ class GeminiClient:
     
     async def ainvoke(self, prompt: str) -> dict:
         """Async invoke Gemini"""
-        import aiohttp
-        
         # Gemini API endpoint
         url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent?key={self.api_key}"
         
@@ -330,9 +334,8 @@ class GeminiClient:
             }
         }
         
-        timeout_obj = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(timeout=timeout_obj) as session:
-            async with session.post(url, json=payload) as resp:
+        with stage("llm_wait", prompt_chars=len(prompt or "")):
+            async with get_http_pool().post(url, timeout=self.timeout, json=payload) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
                     raise Exception(f"Gemini API error {resp.status}: {error_text}")
@@ -397,13 +400,14 @@ class LiteLLMClient:
         import litellm
         
         try:
-            response = await litellm.acompletion(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                timeout=self.timeout,
-            )
+            with stage("llm_wait", prompt_chars=len(prompt or "")):
+                response = await litellm.acompletion(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    timeout=self.timeout,
+                )
             
             text = response.choices[0].message.content
             return {"text": text}
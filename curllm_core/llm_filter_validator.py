@@ -8,11 +8,187 @@ Uses LLM to validate products against semantic criteria that are hard to match w
 - Custom queries: "suitable for diabetics", "low-sodium", etc.
 
 LLM provides semantic understanding beyond pattern matching.
+
+``validate_batch`` packs as many products as fit a token budget into one
+structured prompt, parses the per-item verdicts leniently and only falls
+back to single-product prompts for items whose verdict could not be read.
+Verdicts are cached per (product text hash, criterion), so products judged
+in an earlier run are not sent to the LLM again.
+
+Usage:
+    validator = LLMFilterValidator(llm, run_logger)
+    results = await validator.validate_batch(products, ["gluten-free"], instruction)
+    kept = [r["product"] for r in results if r["passes"]]
 """
 
+import asyncio
+import hashlib
 import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+logger = logging.getLogger(__name__)
+
+_OBJECT_RE = re.compile(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", re.DOTALL)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def _as_bool(value: Any) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    if isinstance(value, str):
+        v = value.strip().lower()
+        if v in ("true", "yes", "pass", "passes", "tak", "1"):
+            return True
+        if v in ("false", "no", "fail", "fails", "nie", "0"):
+            return False
+    return None
+
+
+def _as_confidence(value: Any, default: float = 0.5) -> float:
+    try:
+        return max(0.0, min(1.0, float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_verdicts(response: str) -> List[Dict[str, Any]]:
+    """
+    Extract verdict objects from an LLM response.
+
+    Accepts a JSON array, an object wrapping one (``{"results": [...]}``),
+    fenced code blocks, and truncated or chatty output - in the last case
+    every complete ``{...}`` object is parsed on its own.
+    """
+    text = response.strip().replace("```json", "").replace("```", "")
+    start, end = text.find("["), text.rfind("]")
+    candidates = []
+    if start != -1 and end > start:
+        candidates.append(text[start:end + 1])
+    candidates.append(text)
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            data = data.get("results") or data.get("items") or data.get("products") or [data]
+        if isinstance(data, list):
+            return [d for d in data if isinstance(d, dict)]
+    verdicts = []
+    for match in _OBJECT_RE.finditer(text):
+        try:
+            obj = json.loads(match.group(0))
+        except ValueError:
+            continue
+        if isinstance(obj, dict) and ("id" in obj or "product_index" in obj):
+            verdicts.append(obj)
+    return verdicts
+
+
+def _default_cache_path() -> Path:
+    from curllm_core.llm_cache import _default_db_path
+    return _default_db_path().parent / "filter_verdicts.db"
+
+
+class VerdictCache:
+    """
+    Per-criterion verdict cache (memory + SQLite).
+
+    Keys are ``sha256(product text) + criterion``, so a product is judged
+    once per criterion no matter which instruction or batch it shows up in.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        self.db_path = Path(db_path) if db_path else _default_cache_path()
+        self.ttl = float(ttl_seconds if ttl_seconds is not None
+                         else os.getenv("CURLLM_FILTER_CACHE_TTL", str(30 * 24 * 3600)))
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def key(product_text: str, criterion: str) -> str:
+        digest = hashlib.sha256(product_text.encode("utf-8", errors="replace")).hexdigest()
+        return f"{digest}:{criterion.strip().lower()}"
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, verdict TEXT, created_at REAL)"
+            )
+        return self._conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached verdicts for the given keys (missing/expired keys are left out)"""
+        found = {}
+        with self._lock:
+            missing = []
+            for k in keys:
+                if k in self._memory:
+                    found[k] = self._memory[k]
+                else:
+                    missing.append(k)
+            if missing:
+                try:
+                    conn = self._db()
+                    cutoff = time.time() - self.ttl
+                    for i in range(0, len(missing), 500):
+                        chunk = missing[i:i + 500]
+                        rows = conn.execute(
+                            f"SELECT key, verdict FROM verdicts WHERE created_at >= ? "
+                            f"AND key IN ({','.join('?' * len(chunk))})",
+                            (cutoff, *chunk),
+                        )
+                        for k, verdict in rows:
+                            found[k] = self._memory[k] = json.loads(verdict)
+                except Exception as e:
+                    logger.debug(f"Verdict cache read failed: {e}")
+        return found
+
+    def put_many(self, verdicts: Dict[str, Dict[str, Any]]):
+        """Store verdicts"""
+        if not verdicts:
+            return
+        with self._lock:
+            self._memory.update(verdicts)
+            try:
+                conn = self._db()
+                now = time.time()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO verdicts(key, verdict, created_at) VALUES (?, ?, ?)",
+                        [(k, json.dumps(v, ensure_ascii=False), now) for k, v in verdicts.items()],
+                    )
+            except Exception as e:
+                logger.debug(f"Verdict cache write failed: {e}")
+
+
+_global_verdict_cache: Optional[VerdictCache] = None
+
+
+def get_verdict_cache() -> VerdictCache:
+    """Get or create the global verdict cache"""
+    global _global_verdict_cache
+    if _global_verdict_cache is None:
+        _global_verdict_cache = VerdictCache()
+    return _global_verdict_cache
+
 
 class LLMFilterValidator:
     """
@@ -25,9 +201,30 @@ class LLMFilterValidator:
     - Custom user requirements
     """
     
-    def __init__(self, llm_client, run_logger=None):
+    def __init__(
+        self,
+        llm_client,
+        run_logger=None,
+        cache: Optional[VerdictCache] = None,
+        batch_token_budget: Optional[int] = None,
+        max_batch_items: int = 25,
+    ):
+        """
+        Args:
+            llm_client: Client with ``ainvoke(prompt)``
+            run_logger: Optional RunLogger
+            cache: Verdict cache (default: global cache; disable with CURLLM_FILTER_CACHE=false)
+            batch_token_budget: Estimated tokens of product text per batched prompt
+                                (default CURLLM_FILTER_BATCH_TOKENS)
+            max_batch_items: Products per batched prompt at most
+        """
         self.llm = llm_client
         self.run_logger = run_logger
+        if cache is None and os.getenv("CURLLM_FILTER_CACHE", "true").lower() in ("true", "1", "yes"):
+            cache = get_verdict_cache()
+        self.cache = cache
+        self.batch_token_budget = int(batch_token_budget or os.getenv("CURLLM_FILTER_BATCH_TOKENS", "2000"))
+        self.max_batch_items = max(1, max_batch_items)
     
     def _log(self, msg: str, data: Any = None):
         """Log with structured data"""
@@ -137,36 +334,143 @@ JSON only:"""
         max_concurrent: int = 5
     ) -> List[Dict[str, Any]]:
         """
-        Validate multiple products (batch processing)
+        Validate multiple products with packed multi-item prompts
+        
+        Cached verdicts are used first; the remaining products are packed
+        into prompts of up to ``batch_token_budget`` tokens (at most
+        ``max_concurrent`` prompts in flight). Items the LLM did not return
+        a readable verdict for are validated one by one.
         
-        Returns list of validation results for each product.
+        Returns one result per product, in input order:
+            {"product_index", "passes", "confidence", "reasoning",
+             "criteria_check", "product", "source": cache|batch|single}
         """
-        results = []
+        if not products:
+            return []
+        texts = [self._format_product_text(p) for p in products]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(products)
         
-        # Process in batches to avoid overwhelming LLM
-        for i in range(0, len(products), max_concurrent):
-            batch = products[i:i+max_concurrent]
-            
-            batch_results = await self._validate_batch_internal(
-                batch, semantic_criteria, instruction
-            )
-            
-            results.extend(batch_results)
+        # 1. Cache
+        if self.cache and semantic_criteria:
+            keys = {(i, c): VerdictCache.key(texts[i], c) for i in range(len(products)) for c in semantic_criteria}
+            cached = await asyncio.to_thread(self.cache.get_many, list(set(keys.values())))
+            for i in range(len(products)):
+                checks = {c: cached.get(keys[(i, c)]) for c in semantic_criteria}
+                if all(checks.values()):
+                    results[i] = self._combine(i, products[i], checks, "cache")
+        
+        pending = [i for i, r in enumerate(results) if r is None]
+        cache_hits = len(products) - len(pending)
+        
+        # 2. Packed prompts
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        
+        async def _run_chunk(chunk: List[int]):
+            async with semaphore:
+                return chunk, await self._validate_chunk(chunk, texts, semantic_criteria, instruction)
         
+        chunks = self._pack(pending, texts)
+        unresolved = []
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for chunk, verdicts in await asyncio.gather(*(_run_chunk(c) for c in chunks)):
+            for i in chunk:
+                checks = verdicts.get(i)
+                if checks is None:
+                    unresolved.append(i)
+                    continue
+                results[i] = self._combine(i, products[i], checks, "batch")
+                fresh.update({VerdictCache.key(texts[i], c): v for c, v in checks.items()})
+        
+        # 3. Single-item fallback for unreadable verdicts
+        async def _run_single(i: int):
+            async with semaphore:
+                return i, await self.validate_product(products[i], semantic_criteria, instruction)
+        
+        for i, single in await asyncio.gather(*(_run_single(i) for i in unresolved)):
+            results[i] = {**single, "product_index": i, "product": products[i], "source": "single"}
+            checks = single.get("criteria_check") or {}
+            if "error" not in single and all(isinstance(checks.get(c), dict) for c in semantic_criteria):
+                normalized = {c: self._check(checks[c], single.get("confidence")) for c in semantic_criteria}
+                # Only readable verdicts are cached
+                if all(normalized.values()):
+                    fresh.update({VerdictCache.key(texts[i], c): v for c, v in normalized.items()})
+        
+        if self.cache and fresh:
+            await asyncio.to_thread(self.cache.put_many, fresh)
+        
+        self._log("🧠 LLM Batch Validation", {
+            "products": len(products),
+            "cached": cache_hits,
+            "prompts": len(chunks),
+            "single_fallbacks": len(unresolved),
+            "passed": sum(1 for r in results if r and r.get("passes")),
+        })
         return results
     
-    async def _validate_batch_internal(
+    def _pack(self, indices: List[int], texts: List[str]) -> List[List[int]]:
+        """Group products into prompts by estimated token budget"""
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        used = 0
+        for i in indices:
+            cost = _estimate_tokens(texts[i]) + 8
+            if current and (used + cost > self.batch_token_budget or len(current) >= self.max_batch_items):
+                chunks.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += cost
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    @staticmethod
+    def _check(raw: Any, default_confidence: Any = None) -> Optional[Dict[str, Any]]:
+        """Normalize one criterion verdict to {passes, confidence, reasoning} (None if unreadable)"""
+        if isinstance(raw, dict):
+            passes = _as_bool(raw.get("passes", raw.get("pass", raw.get("value"))))
+            if passes is None:
+                return None
+            return {
+                "passes": passes,
+                "confidence": _as_confidence(raw.get("confidence", default_confidence)),
+                "reasoning": str(raw.get("reasoning", "")),
+            }
+        passes = _as_bool(raw)
+        if passes is None:
+            return None
+        return {"passes": passes, "confidence": _as_confidence(default_confidence), "reasoning": ""}
+    
+    @staticmethod
+    def _combine(index: int, product: Dict[str, Any], checks: Dict[str, Dict[str, Any]], source: str) -> Dict[str, Any]:
+        """Overall result from per-criterion verdicts (passes only if all pass)"""
+        return {
+            "product_index": index,
+            "passes": all(c["passes"] for c in checks.values()),
+            "confidence": min((c["confidence"] for c in checks.values()), default=0.0),
+            "reasoning": "; ".join(f"{name}: {c['reasoning']}" for name, c in checks.items() if c.get("reasoning")),
+            "criteria_check": checks,
+            "product": product,
+            "source": source,
+        }
+    
+    async def _validate_chunk(
         self,
-        products: List[Dict[str, Any]],
+        chunk: List[int],
+        texts: List[str],
         semantic_criteria: List[str],
         instruction: str
-    ) -> List[Dict[str, Any]]:
-        """Validate a small batch of products in single LLM call"""
+    ) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """
+        Validate a group of products in a single LLM call
         
-        products_text = "\n\n".join([
-            f"PRODUCT {i+1}:\n{self._format_product_text(p)}"
-            for i, p in enumerate(products)
-        ])
+        Returns:
+            product index -> {criterion: verdict} for every item with a
+            readable verdict covering all criteria
+        """
+        products_text = "\n\n".join(
+            f"ITEM {n}:\n{texts[i]}" for n, i in enumerate(chunk, start=1)
+        )
+        criteria_example = ", ".join(f'"{c}": true' for c in semantic_criteria)
         
         prompt = f"""You are analyzing multiple products to validate if they meet specific criteria.
 
@@ -174,56 +478,50 @@ JSON only:"""
 
 USER INSTRUCTION: {instruction}
 
-SEMANTIC CRITERIA: {', '.join(semantic_criteria)}
+SEMANTIC CRITERIA: {json.dumps(semantic_criteria, ensure_ascii=False)}
 
-For each product, validate if it meets ALL criteria.
+For EACH item decide every criterion separately. Be conservative: if unsure, use false.
 
-Respond with JSON array:
+Respond with a JSON array containing exactly one object per item:
 [
-  {{
-    "product_index": 0,
-    "passes": <true/false>,
-    "confidence": <0.0-1.0>,
-    "reasoning": "<brief explanation>"
-  }},
+  {{"id": 1, "criteria": {{{criteria_example}}}, "confidence": <0.0-1.0>, "reasoning": "<brief>"}},
   ...
 ]
 
 JSON only:"""
-
+        
         try:
-            # Use ainvoke (SimpleOllama method)
             llm_response = await self.llm.ainvoke(prompt)
             response = llm_response.get('text', '') if isinstance(llm_response, dict) else str(llm_response)
-            
-            # Parse LLM response
-            results = json.loads(response.strip().replace("```json", "").replace("```", ""))
-            
-            # Match results to products
-            validated = []
-            for result in results:
-                idx = result.get('product_index', 0)
-                if idx < len(products):
-                    validated.append({
-                        **result,
-                        'product': products[idx]
-                    })
-            
-            return validated
-            
         except Exception as e:
             self._log(f"⚠️ Batch validation failed: {e}")
-            # Return all as failed
-            return [
-                {
-                    "product_index": i,
-                    "passes": False,
-                    "confidence": 0.0,
-                    "reasoning": "Batch validation failed",
-                    "error": str(e)
-                }
-                for i in range(len(products))
-            ]
+            return {}
+        
+        verdicts: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        lowered = {c.lower(): c for c in semantic_criteria}
+        for item in parse_verdicts(response):
+            try:
+                n = int(item.get("id", item.get("product_index")))
+            except (TypeError, ValueError):
+                continue
+            if not 1 <= n <= len(chunk):
+                continue
+            raw = item.get("criteria") or item.get("criteria_check") or {}
+            checks = {}
+            if isinstance(raw, dict):
+                for name, value in raw.items():
+                    criterion = lowered.get(str(name).strip().lower())
+                    check = self._check(value, item.get("confidence")) if criterion else None
+                    # Unreadable verdicts leave the item to the single-item path
+                    if check is not None:
+                        if not check["reasoning"]:
+                            check["reasoning"] = str(item.get("reasoning", ""))
+                        checks[criterion] = check
+            if len(semantic_criteria) == 1 and not checks and _as_bool(item.get("passes")) is not None:
+                checks[semantic_criteria[0]] = self._check(item, item.get("confidence"))
+            if len(checks) == len(semantic_criteria):
+                verdicts[chunk[n - 1]] = checks
+        return verdicts
     
     def _format_product_text(self, product: Dict[str, Any]) -> str:
         """Format product data for LLM analysis"""
@@ -6,6 +6,8 @@ from typing import Any, Dict
 
 from .logger import RunLogger
 from .config import config
+from .context_packer import CHARS_PER_TOKEN, pack_context
+from .llm_session import get_session
 
 async def generate_action(
     llm: Any,
@@ -23,20 +25,10 @@ async def generate_action(
     max_cap = max_cap if max_cap is not None else config.planner_max_cap
     
     adaptive_chars = min(max_chars + (step * growth_per_step), max_cap)
-    def _prune_nulls(obj):
-        if isinstance(obj, dict):
-            pruned = {k: _prune_nulls(v) for k, v in obj.items()}
-            return {k: v for k, v in pruned.items() if v is not None and not (isinstance(v, (list, dict)) and len(v) == 0)}
-        if isinstance(obj, list):
-            pruned_list = [_prune_nulls(x) for x in obj]
-            pruned_list = [x for x in pruned_list if x is not None and not (isinstance(x, (list, dict)) and len(x) == 0)]
-            return pruned_list
-        return obj
-    _context_json = json.dumps(_prune_nulls(page_context), indent=2)
-    _ctx_original_len = len(_context_json)
-    context_str = _context_json[:adaptive_chars]
-    _ctx_logged_len = len(context_str)
-    _ctx_truncated_by = max(0, _ctx_original_len - _ctx_logged_len)
+    budget_tokens = config.planner_context_tokens or adaptive_chars // CHARS_PER_TOKEN
+    packed = pack_context(page_context, instruction, budget_tokens)
+    context_str = packed.text
+    _ctx_omitted = ", ".join(f"{k} ({v})" for k, v in packed.dropped.items())
 
     th_summary = ""
     try:
@@ -180,13 +172,11 @@ async def generate_action(
         "Tool call format: {\"type\": \"tool\", \"tool_name\": \"xxx\", \"args\": {...}, \"reason\": \"...\"}\n"
     )
 
-    prompt_text = (
+    # Invariant for the whole run first, per-step part last: the model server
+    # then reuses the evaluated prefix instead of re-reading it every step
+    prompt_prefix = (
         "You are a browser automation expert. Analyze the current page and determine the next action.\n\n"
         f"Instruction: {instruction}\n"
-        f"Current Step: {step + 1}\n"
-        f"Page Context (truncated to {len(context_str)} chars): {context_str}\n\n"
-        f"{th_summary}"
-        f"{forms_context}"
         f"{product_context}\n"
         f"{offers_context}\n"
         f"{tools_desc}\n\n"
@@ -206,8 +196,17 @@ async def generate_action(
         "    \"extracted_data\": \"data if task is complete\",\n"
         "    \"reason\": \"brief explanation of your decision\"\n"
         "}\n\n"
+    )
+    prompt_delta = (
+        f"Current Step: {step + 1}\n"
+        f"Page Context (compact JSON, ~{packed.tokens} tokens"
+        f"{'; trimmed/omitted: ' + _ctx_omitted if _ctx_omitted else ''}): {context_str}\n\n"
+        f"{th_summary}"
+        f"{forms_context}\n"
         "Response (JSON only):"
     )
+    session = get_session(llm, prompt_prefix)
+    prompt_text = session.prompt(prompt_delta)
     if run_logger:
         try:
             _pl = int(os.getenv("CURLLM_LOG_PROMPT_CHARS", "25000") or 25000)
@@ -215,8 +214,9 @@ async def generate_action(
             _pl = 25000
         # Context usage and truncation details
         run_logger.log_text(
-            f"LLM Prompt (step {step + 1}) context_used={_ctx_logged_len} / context_original={_ctx_original_len} chars; "
-            f"truncated_by={_ctx_truncated_by}; limits: base={max_chars} (CURLLM_PLANNER_BASE_CHARS), "
+            f"LLM Prompt (step {step + 1}) context_used={packed.tokens} / context_original={packed.original_tokens} tokens "
+            f"(budget={budget_tokens}, profile={packed.kind}); omitted={_ctx_omitted or 'none'}; "
+            f"limits: base={max_chars} (CURLLM_PLANNER_BASE_CHARS), "
             f"growth_per_step={growth_per_step} (CURLLM_PLANNER_GROWTH_PER_STEP), max_cap={max_cap} (CURLLM_PLANNER_MAX_CAP)"
         )
         # Prompt logging stats
@@ -230,10 +230,17 @@ async def generate_action(
         run_logger.log_code("text", prompt_text[:_pl] + ("...[truncated]..." if _pt_truncated_by > 0 else ""))
     try:
         _t0 = time.time()
-        response = await llm.ainvoke(prompt_text)
+        response = await session.ainvoke(prompt_delta)
         try:
             if run_logger:
                 run_logger.log_kv("fn:llm.ainvoke_ms", str(int((time.time() - _t0) * 1000)))
+                _m = response.get("metrics") if isinstance(response, dict) else None
+                if _m:
+                    run_logger.log_text(
+                        f"LLM timing (step {step + 1}): prompt_eval={_m['prompt_eval_ms']:.0f}ms "
+                        f"({_m['prompt_tokens']} tok evaluated, prefix={len(prompt_prefix)} chars), "
+                        f"generation={_m['eval_ms']:.0f}ms ({_m['eval_tokens']} tok), load={_m['load_ms']:.0f}ms"
+                    )
         except Exception:
             pass
         text = response["text"] if isinstance(response, dict) and "text" in response else str(response)
@@ -0,0 +1,140 @@
+"""
+LLM Session - stable prompt prefix and prompt-eval accounting across agent steps
+
+An agent run calls the model once per step with a prompt that is mostly
+the same every time (role, instruction, tool descriptions, output format)
+plus a small per-step part (step number, page context, tool history).
+Ollama keeps the KV cache of the last prompt in its runner slot and only
+evaluates the tokens after the longest common prefix - but only if the
+invariant text really comes first, byte for byte, and the model stays
+loaded (``keep_alive``) with unchanged options.
+
+``InferenceSession`` holds that invariant prefix, sends ``prefix + delta``
+and aggregates the per-call metrics Ollama reports (evaluated prompt
+tokens, prompt-eval vs. generation time, model load time), so the effect
+of prefix reuse is visible per step and per run.
+
+Usage:
+    from curllm_core.llm_session import get_session
+
+    session = get_session(llm, prefix)          # same (llm, prefix) -> same session
+    result = await session.ainvoke(step_delta)  # {"text": ..., "metrics": {...}}
+    session.last                                # metrics of the latest call
+    session.get_stats()                         # {"calls", "prompt_tokens", "prompt_eval_ms", "eval_ms", ...}
+"""
+
+import hashlib
+import logging
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+METRIC_KEYS = ("prompt_tokens", "prompt_eval_ms", "eval_tokens", "eval_ms", "load_ms", "total_ms")
+MAX_SESSIONS_PER_CLIENT = 8
+
+
+class InferenceSession:
+    """
+    Prompt prefix + metrics accumulator over one LLM client.
+
+    Works with any client exposing ``ainvoke(prompt)``; metrics are only
+    collected from clients that return them (SimpleOllama).
+    """
+
+    def __init__(self, llm: Any, prefix: str = ""):
+        """
+        Args:
+            llm: LLM client with ``ainvoke``
+            prefix: Invariant leading part of every prompt in this session
+        """
+        self.llm = llm
+        self.prefix = prefix
+        self.last: Dict[str, float] = {}
+        self._calls = 0
+        self._measured = 0
+        self._totals: Dict[str, float] = {k: 0.0 for k in METRIC_KEYS}
+        self._first_prompt_tokens: Optional[int] = None
+
+    def prompt(self, delta: str) -> str:
+        """Full prompt for a step."""
+        return self.prefix + delta
+
+    async def ainvoke(self, delta: str) -> Any:
+        """Send ``prefix + delta`` and record the server metrics of the call."""
+        result = await self.llm.ainvoke(self.prompt(delta))
+        self._calls += 1
+        metrics = result.get("metrics") if isinstance(result, dict) else None
+        self.last = dict(metrics) if isinstance(metrics, dict) else {}
+        if self.last:
+            self._measured += 1
+            for key in METRIC_KEYS:
+                self._totals[key] += float(self.last.get(key) or 0)
+            if self._first_prompt_tokens is None:
+                self._first_prompt_tokens = int(self.last.get("prompt_tokens") or 0)
+            logger.debug(
+                "LLM call %d: prompt %d tok / %.0f ms, generation %d tok / %.0f ms",
+                self._calls, self.last.get("prompt_tokens", 0), self.last.get("prompt_eval_ms", 0),
+                self.last.get("eval_tokens", 0), self.last.get("eval_ms", 0),
+            )
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Aggregated metrics of the session.
+
+        Returns:
+            Totals per metric, the prompt-eval share of model time and the
+            average evaluated prompt tokens of follow-up calls relative to
+            the first (cold) call - well below 1.0 means the prefix was reused
+        """
+        t = self._totals
+        model_ms = t["prompt_eval_ms"] + t["eval_ms"]
+        follow_ups = self._measured - 1
+        reuse = None
+        if follow_ups > 0 and self._first_prompt_tokens:
+            avg_follow_up = (t["prompt_tokens"] - self._first_prompt_tokens) / follow_ups
+            reuse = round(avg_follow_up / self._first_prompt_tokens, 3)
+        return {
+            "calls": self._calls,
+            "measured_calls": self._measured,
+            "prefix_chars": len(self.prefix),
+            **{k: round(v, 1) for k, v in t.items()},
+            "prompt_eval_share": round(t["prompt_eval_ms"] / model_ms, 3) if model_ms else None,
+            "follow_up_prompt_ratio": reuse,
+        }
+
+
+_sessions: "weakref.WeakKeyDictionary[Any, OrderedDict[str, InferenceSession]]" = weakref.WeakKeyDictionary()
+
+
+def get_session(llm: Any, prefix: str) -> InferenceSession:
+    """
+    Session for this client and prefix, created on first use.
+
+    Sessions are kept per client (weakly, dropped with the client) for the
+    few most recent prefixes, so the steps of a run share one session.
+
+    Args:
+        llm: LLM client
+        prefix: Invariant prompt prefix
+
+    Returns:
+        InferenceSession
+    """
+    key = hashlib.sha1(prefix.encode("utf-8")).hexdigest()
+    try:
+        per_client = _sessions.setdefault(llm, OrderedDict())
+    except TypeError:
+        # Client type without weakref support: untracked session
+        return InferenceSession(llm, prefix)
+    session = per_client.get(key)
+    if session is None:
+        # Proxy, so the cached session does not keep its weak key alive
+        session = per_client[key] = InferenceSession(weakref.proxy(llm), prefix)
+        while len(per_client) > MAX_SESSIONS_PER_CLIENT:
+            per_client.popitem(last=False)
+    else:
+        per_client.move_to_end(key)
+    return session
@@ -250,14 +250,15 @@ class MultiCriteriaFilter:
                 "products_to_validate": len(current_products)
             })
             
-            # Validate with LLM
+            # Validate with LLM (packed prompts, cached verdicts)
             validated = []
-            for product in current_products:
-                validation = await self.llm_validator.validate_product(
-                    product,
-                    semantic_criteria,
-                    instruction
-                )
+            validations = await self.llm_validator.validate_batch(
+                current_products,
+                semantic_criteria,
+                instruction
+            )
+            for product, validation in zip(current_products, validations):
+                validation = {k: v for k, v in validation.items() if k != 'product'}
                 
                 if validation.get('passes', False):
                     product['llm_validation'] = validation
@@ -1,3 +1,4 @@
+import time
 from typing import Any, Dict, Optional, Tuple
 from urllib.parse import urlparse
 from pathlib import Path
@@ -28,14 +29,21 @@ async def open_page_with_prechecks(
 ) -> Tuple[Any, Path, bool, Optional[Dict[str, Any]]]:
     if url:
         page = await agent.browser.new_page()
+        # Navigation outcome (status, time, block page) - fed back into the proxy pool
+        navigation: Dict[str, Any] = result["meta"].setdefault("navigation", {})
+        nav_start = time.monotonic()
         try:
-            await page.goto(url)
+            response = await page.goto(url)
+            navigation["status"] = response.status if response is not None else None
+            navigation["ms"] = round((time.monotonic() - nav_start) * 1000, 1)
             try:
                 await page.wait_for_load_state("domcontentloaded")
                 await page.wait_for_load_state("networkidle")
             except Exception:
                 pass
         except Exception as e:
+            navigation["error"] = str(e)
+            navigation["ms"] = round((time.monotonic() - nav_start) * 1000, 1)
             # Diagnose URL issues and return early with structured error info
             diag = diagnose_url_issue(url)
             if run_logger:
@@ -99,7 +107,10 @@ async def open_page_with_prechecks(
     else:
         page = await agent.browser.new_page()
     try:
-        if await _is_block_page(page) and not stealth_mode:
+        blocked = await _is_block_page(page)
+        if blocked and url:
+            result["meta"].setdefault("navigation", {})["blocked"] = True
+        if blocked and not stealth_mode:
             if run_logger:
                 run_logger.log_text("Block page detected; retrying with stealth mode...")
             try:
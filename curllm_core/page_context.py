@@ -1,151 +1,417 @@
 #!/usr/bin/env python3
 import json
-from typing import Dict, Optional
-
-async def extract_page_context(page, include_dom: bool = False, dom_max_chars: int = 20000, include_iframes: bool = True, form_focused: bool = False) -> Dict:
-    # Build JavaScript code with conditional data collection based on form_focused
-    js_code = f"""
-        () => {{
-            const formFocused = {str(form_focused).lower()};
-            const safeText = (el) => {{ try {{ return (el && el.innerText) ? String(el.innerText) : ''; }} catch(e){{ return ''; }} }};
-            const safeAttr = (el, name) => {{ try {{ return (el && el.getAttribute) ? el.getAttribute(name) : null; }} catch(e){{ return null; }} }};
-            const bodyText = (() => {{ try {{ return (document.body && document.body.innerText) ? document.body.innerText : ''; }} catch(e){{ return ''; }} }})();
-            
-            const result = {{
-                title: document.title,
-                url: window.location.href,
-                forms: Array.from(document.forms || []).map(f => ({{
-                    id: (f && f.id) || undefined,
-                    action: (f && f.action) || undefined,
-                    fields: Array.from((f && f.elements) || []).map(e => ({{
-                        name: (e && e.name) || undefined,
-                        type: (e && e.type) || undefined,
-                        value: (e && e.value) || '',
-                        visible: !!(e && e.offsetParent !== null),
-                        required: !!(e && (e.required || e.getAttribute('aria-required') === 'true' || e.getAttribute('data-required') === 'true'))
-                    }}))
-                }}))
-            }};
-            
-            // Conditional data based on form_focused
-            if (formFocused) {{
-                // Form-focused: minimal context
-                result.text = ((bodyText||'').substring(0, 1000).trim() || undefined);
-                result.links = [];  // Skip links for form tasks
-                result.buttons = Array.from(document.querySelectorAll('button[type="submit"], button') || []).slice(0, 10).map(b => ({{
-                    text: (safeText(b).trim() || undefined)
-                }}));
-                result.headings = Array.from(document.querySelectorAll('h1, h2') || [])
-                    .filter(h => !!safeText(h).trim())
-                    .slice(0, 5)
-                    .map(h => ({{
-                        tag: (h && h.tagName ? h.tagName.toLowerCase() : undefined),
-                        text: safeText(h).trim()
-                    }}));
-            }} else {{
-                // Full context for non-form tasks
-                result.text = ((bodyText||'').substring(0, 5000).trim() || undefined);
-                result.links = Array.from(document.links || []).slice(0, 50).map(l => ({{
-                    href: (l && l.href) ? l.href : '',
-                    text: (safeText(l).trim() || undefined)
-                }}));
-                result.buttons = Array.from(document.querySelectorAll('button') || []).map(b => ({{
-                    text: (safeText(b).trim() || undefined),
-                    onclick: (b && b.onclick) ? 'has handler' : undefined
-                }}));
-                result.headings = Array.from(document.querySelectorAll('h1, h2, h3') || [])
-                    .filter(h => !!safeText(h).trim())
-                    .slice(0, 100)
-                    .map(h => ({{
-                        tag: (h && h.tagName ? h.tagName.toLowerCase() : undefined),
-                        text: safeText(h).trim(),
-                        id: (h && h.id) || undefined,
-                        class: (h && h.className) || undefined
-                    }}));
-                result.article_candidates = (() => {{
-                    try {{
-                        const anchors = Array.from(document.querySelectorAll('a[href]') || []);
-                        const pat = /(blog|post|wpis|article|artyk|news|aktualno)/i;
-                        return anchors.filter(a => {{
-                            const href = safeAttr(a, 'href') || '';
-                            const t = safeText(a).trim();
-                            if (!t) return false;
-                            try {{ return pat.test(href) || !!a.closest('article'); }} catch(e){{ return pat.test(href); }}
-                        }}).slice(0, 100).map(a => ({{ text: safeText(a).trim(), href: (a && a.href) ? a.href : '' }}));
-                    }} catch(e){{ return []; }}
-                }})();
-            }}
-            
-            return result;
-        }}
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from .stage_timer import timed_stage
+
+logger = logging.getLogger(__name__)
+
+# Walks an element subtree once and collects:
+#  - a JSON serialization of the tree, emitted incrementally and cut off as soon
+#    as the character budget would be exceeded (always well-formed: open
+#    objects/arrays are accounted for and closed),
+#  - up to `maxInteractive` interactive elements (in document order).
+# The walk stops as soon as both the budget and the interactive quota are used.
+_DOM_WALKER_JS = """
+const walkDom = (root, opts) => {
+  const SKIP = new Set(["script","style","meta","link","noscript"]);
+  const ATTRS = ["id","class","href","type","role","aria-label"];
+  const ISEL = ["a[href]","button","input","textarea","select","[role=button]","[onclick]"].join(",");
+  const J = JSON.stringify;
+  const budget = Math.max(0, opts.budget|0);
+  const maxInter = Math.max(0, opts.maxInteractive|0);
+  const parts = [];
+  const interactive = [];
+  let len = 0, closeLen = 0, nodes = 0, truncated = false;
+
+  const interItem = (el) => {
+    let text;
+    try { text = (el.innerText||"").trim()||undefined; } catch(e) { text = undefined; }
+    if (!opts.withAttrs) return {tag: el.tagName.toLowerCase(), text};
+    return {
+      tag: el.tagName.toLowerCase(),
+      text,
+      attrs: {
+        id: el.id||undefined,
+        class: el.className||undefined,
+        href: el.getAttribute("href")||undefined,
+        type: el.getAttribute("type")||undefined,
+        role: el.getAttribute("role")||undefined,
+        onclick: el.getAttribute("onclick")||undefined
+      }
+    };
+  };
+
+  const visit = (n, prefix) => {
+    if (!n || n.nodeType !== Node.ELEMENT_NODE) return false;
+    const tag = n.tagName.toLowerCase();
+    if (SKIP.has(tag)) return false;
+    if (interactive.length < maxInter) {
+      try { if (n.matches(ISEL)) interactive.push(interItem(n)); } catch(e) {}
+    }
+    let emitted = false;
+    if (!truncated) {
+      let text = "";
+      try {
+        // innerText forces layout; skip it for large containers whose text
+        // would be dropped anyway (> 200 chars).
+        const tc = n.textContent || "";
+        text = tc.length > 2000 ? "" : (n.innerText||"").trim();
+      } catch(e) { text = ""; }
+      if (text && text.length > 200) text = "";
+      let head = prefix + '{"tag":' + J(tag);
+      if (opts.withAttrs) {
+        const attrs = [];
+        for (const a of n.attributes) {
+          if (ATTRS.includes(a.name)) attrs.push(J(a.name) + ":" + J(a.value));
+        }
+        if (attrs.length) head += ',"attrs":{' + attrs.join(",") + "}";
+      }
+      if (text) head += ',"text":' + J(text);
+      const extra = prefix.length > 1 ? 1 : 0;  // opening a children array needs "]"
+      if (len + head.length + 1 + extra + closeLen <= budget) {
+        parts.push(head); len += head.length; closeLen += 1 + extra;
+        emitted = true; nodes++;
+      } else {
+        truncated = true;
+      }
+    }
+    if (!emitted && interactive.length >= maxInter) return false;
+    let arrayOpen = false;
+    for (const ch of n.children) {
+      if (truncated && interactive.length >= maxInter) break;
+      if (visit(ch, arrayOpen ? "," : ',"children":[')) arrayOpen = true;
+    }
+    if (emitted) {
+      if (arrayOpen) { parts.push("]"); len += 1; closeLen -= 1; }
+      parts.push("}"); len += 1; closeLen -= 1;
+    }
+    return emitted;
+  };
+
+  visit(root, "");
+  return {preview: parts.join(""), interactive, nodes, truncated};
+};
+"""
+
+# Splits the page into coarse regions (body children, unwrapping single
+# wrappers, splitting very large containers one level) and fingerprints each
+# one (FNV-1a over text, child count and form values). Only regions whose
+# fingerprint differs from `known` get a DOM preview; the character budget
+# is shared between them.
+_REGIONS_JS = """
+const collectRegions = (known, budget) => {
+  const SKIP = new Set(["script","style","meta","link","noscript","template"]);
+  const MAX_REGIONS = 60;
+  const fnv = (s) => {
+    let h = 0x811c9dc5;
+    for (let i = 0; i < s.length; i++) { h ^= s.charCodeAt(i); h = Math.imul(h, 0x01000193); }
+    return (h >>> 0).toString(16);
+  };
+  const kids = (el) => Array.from(el.children || []).filter(c => !SKIP.has(c.tagName.toLowerCase()));
+  const seenIds = new Set();
+  const idOf = (el, parentId, idx) => {
+    if (el.id && !seenIds.has(el.id)) { seenIds.add(el.id); return "#" + el.id; }
+    return parentId + ">" + el.tagName.toLowerCase() + ":" + idx;
+  };
+  const label = (el) => {
+    const aria = el.getAttribute("aria-label");
+    if (aria) return aria.slice(0, 80);
+    const h = el.querySelector("h1,h2,h3,legend,caption");
+    const t = ((h && h.textContent) || el.textContent || "").replace(/\\s+/g, " ").trim();
+    return t.slice(0, 80) || undefined;
+  };
+  if (!document.body) return [];
+  let level = kids(document.body).map((el, i) => [el, idOf(el, "body", i)]);
+  for (let d = 0; d < 5 && level.length === 1 && kids(level[0][0]).length; d++) {
+    const [el, id] = level[0];
+    level = kids(el).map((c, i) => [c, idOf(c, id, i)]);
+  }
+  const regions = [];
+  for (const [el, id] of level) {
+    const k = kids(el);
+    if (k.length > 1 && (el.textContent || "").length > 4000 && regions.length + k.length < MAX_REGIONS) {
+      k.forEach((c, i) => regions.push([c, idOf(c, id, i)]));
+    } else {
+      regions.push([el, id]);
+    }
+    if (regions.length >= MAX_REGIONS) break;
+  }
+  const out = [];
+  const changed = [];
+  for (const [el, id] of regions.slice(0, MAX_REGIONS)) {
+    let fp = el.tagName + "|" + el.childElementCount + "|" + (el.textContent || "");
+    for (const f of el.querySelectorAll("input,select,textarea")) {
+      fp += "|" + (f.name || "") + "=" + ((f.type === "checkbox" || f.type === "radio") ? f.checked : f.value);
+    }
+    const entry = {id, tag: el.tagName.toLowerCase(), hash: fnv(fp)};
+    if (known[id] !== entry.hash) changed.push([el, entry]);
+    out.push(entry);
+  }
+  const share = changed.length ? Math.floor(budget / changed.length) : 0;
+  for (const [el, entry] of changed) {
+    const w = walkDom(el, {budget: share, maxInteractive: 20, withAttrs: true});
+    entry.changed = true;
+    entry.label = label(el);
+    entry.text_chars = (el.textContent || "").length;
+    entry.preview = w.preview;
+    entry.interactive = w.interactive;
+    entry.nodes = w.nodes;
+    entry.truncated = w.truncated;
+  }
+  return out;
+};
+"""
+
+_PAGE_CONTEXT_JS = """
+(opts) => {
+    const formFocused = !!opts.formFocused;
+    const safeText = (el) => { try { return (el && el.innerText) ? String(el.innerText) : ''; } catch(e){ return ''; } };
+    const safeAttr = (el, name) => { try { return (el && el.getAttribute) ? el.getAttribute(name) : null; } catch(e){ return null; } };
+    const bodyText = (() => { try { return (document.body && document.body.innerText) ? document.body.innerText : ''; } catch(e){ return ''; } })();
+
+    const result = {
+        title: document.title,
+        url: window.location.href,
+        forms: Array.from(document.forms || []).map(f => ({
+            id: (f && f.id) || undefined,
+            action: (f && f.action) || undefined,
+            fields: Array.from((f && f.elements) || []).map(e => ({
+                name: (e && e.name) || undefined,
+                type: (e && e.type) || undefined,
+                value: (e && e.value) || '',
+                visible: !!(e && e.offsetParent !== null),
+                required: !!(e && (e.required || e.getAttribute('aria-required') === 'true' || e.getAttribute('data-required') === 'true'))
+            }))
+        }))
+    };
+
+    // Conditional data based on form_focused
+    if (formFocused) {
+        // Form-focused: minimal context
+        result.text = ((bodyText||'').substring(0, 1000).trim() || undefined);
+        result.links = [];  // Skip links for form tasks
+        result.buttons = Array.from(document.querySelectorAll('button[type="submit"], button') || []).slice(0, 10).map(b => ({
+            text: (safeText(b).trim() || undefined)
+        }));
+        result.headings = Array.from(document.querySelectorAll('h1, h2') || [])
+            .filter(h => !!safeText(h).trim())
+            .slice(0, 5)
+            .map(h => ({
+                tag: (h && h.tagName ? h.tagName.toLowerCase() : undefined),
+                text: safeText(h).trim()
+            }));
+    } else {
+        // Full context for non-form tasks
+        result.text = ((bodyText||'').substring(0, 5000).trim() || undefined);
+        result.links = Array.from(document.links || []).slice(0, 50).map(l => ({
+            href: (l && l.href) ? l.href : '',
+            text: (safeText(l).trim() || undefined)
+        }));
+        result.buttons = Array.from(document.querySelectorAll('button') || []).map(b => ({
+            text: (safeText(b).trim() || undefined),
+            onclick: (b && b.onclick) ? 'has handler' : undefined
+        }));
+        result.headings = Array.from(document.querySelectorAll('h1, h2, h3') || [])
+            .filter(h => !!safeText(h).trim())
+            .slice(0, 100)
+            .map(h => ({
+                tag: (h && h.tagName ? h.tagName.toLowerCase() : undefined),
+                text: safeText(h).trim(),
+                id: (h && h.id) || undefined,
+                class: (h && h.className) || undefined
+            }));
+        result.article_candidates = (() => {
+            try {
+                const anchors = Array.from(document.querySelectorAll('a[href]') || []);
+                const pat = /(blog|post|wpis|article|artyk|news|aktualno)/i;
+                return anchors.filter(a => {
+                    const href = safeAttr(a, 'href') || '';
+                    const t = safeText(a).trim();
+                    if (!t) return false;
+                    try { return pat.test(href) || !!a.closest('article'); } catch(e){ return pat.test(href); }
+                }).slice(0, 100).map(a => ({ text: safeText(a).trim(), href: (a && a.href) ? a.href : '' }));
+            } catch(e){ return []; }
+        })();
+    }
+
+    if (opts.includeDom && opts.regionsKnown) {
+        try {
+            result.__regions = collectRegions(opts.regionsKnown, opts.domMaxChars);
+        } catch(e) {
+            result.__regions = null;
+        }
+    } else if (opts.includeDom) {
+        try {
+            result.__dom = walkDom(document.body, {budget: opts.domMaxChars, maxInteractive: 40, withAttrs: true});
+        } catch(e) {
+            result.__dom = null;
+        }
+    }
+    return result;
+}
+""".replace("(opts) => {", "(opts) => {\n" + _DOM_WALKER_JS + _REGIONS_JS, 1)
+
+_FRAME_CONTEXT_JS = """
+(opts) => {
+""" + _DOM_WALKER_JS + """
+    return walkDom(document.body, {budget: opts.domMaxChars, maxInteractive: 20, withAttrs: false});
+}
+"""
+
+
+class IncrementalDomTracker:
+    """
+    Remembers region fingerprints between agent steps.
+
+    Passed to ``extract_page_context`` for one task run: the page then only
+    serializes regions whose fingerprint changed since the previous step,
+    and ``dom_preview`` carries those regions in full plus a one-line
+    summary (tag, label, size) of every unchanged region. Interactive
+    elements of unchanged regions are replayed from the last step where
+    they were seen, so ``interactive`` stays complete.
+    """
+
+    def __init__(self, max_interactive: int = 40):
+        self.max_interactive = max_interactive
+        self.regions: Dict[str, Dict[str, Any]] = {}
+        self.url: Optional[str] = None
+        self.steps = 0
+        self.last_stats: Dict[str, Any] = {}
+
+    def known(self) -> Dict[str, str]:
+        """Fingerprints to send to the page (region id -> hash)."""
+        return {rid: r["hash"] for rid, r in self.regions.items()}
+
+    def reset(self):
+        self.regions = {}
+
+    def apply(self, entries: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
         """
-    
-    base = await page.evaluate(js_code)
-    if include_dom:
-        try:
-            dom_tree = await page.evaluate(
-                """
-                () => {
-                  const SKIP = new Set(["script","style","meta","link","noscript"]);
-                  function ser(n){
-                    if(!n||n.nodeType!==Node.ELEMENT_NODE) return null;
-                    const tag=n.tagName.toLowerCase();
-                    if(SKIP.has(tag)) return null;
-                    const attrs={};
-                    for(const a of n.attributes){
-                      if(["id","class","href","type","role","aria-label"].includes(a.name)) attrs[a.name]=a.value;
-                    }
-                    let text="";
-                    try{ text=(n.innerText||"").trim(); }catch(e){ text=""; }
-                    if(text && text.length>200) text=undefined;
-                    const obj={tag, attrs:Object.keys(attrs).length?attrs:undefined, text:text||undefined};
-                    const children=[];
-                    for(const ch of n.children){ const c=ser(ch); if(c) children.push(c); }
-                    if(children.length) obj.children=children;
-                    return obj;
-                  }
-                  return ser(document.body);
+        Merge a page's region list into the tracker.
+
+        Returns:
+            Tuple of (incremental DOM view, merged interactive elements)
+        """
+        self.steps += 1
+        changed: List[Dict[str, Any]] = []
+        unchanged: List[Dict[str, Any]] = []
+        order: List[str] = []
+        for entry in entries:
+            rid = entry.get("id")
+            if not rid:
+                continue
+            order.append(rid)
+            if entry.get("changed") or rid not in self.regions:
+                try:
+                    dom = json.loads(entry.get("preview") or "null")
+                except Exception:
+                    dom = None
+                self.regions[rid] = {
+                    "hash": entry.get("hash"),
+                    "tag": entry.get("tag"),
+                    "label": entry.get("label"),
+                    "text_chars": entry.get("text_chars", 0),
+                    "interactive": entry.get("interactive") or [],
                 }
-                """
-            )
-        except Exception:
-            dom_tree = None
+                item = {"id": rid, "tag": entry.get("tag"), "label": entry.get("label"), "dom": dom}
+                if entry.get("truncated"):
+                    item["truncated"] = True
+                changed.append(item)
+            else:
+                r = self.regions[rid]
+                unchanged.append({
+                    "id": rid, "tag": r["tag"], "label": r["label"], "text_chars": r["text_chars"],
+                })
+        current = set(order)
+        removed = [rid for rid in self.regions if rid not in current]
+        for rid in removed:
+            del self.regions[rid]
+        interactive: List[Dict[str, Any]] = []
+        for rid in order:
+            interactive.extend(self.regions.get(rid, {}).get("interactive", []))
+        self.last_stats = {
+            "regions": len(order),
+            "regions_changed": len(changed),
+            "regions_unchanged": len(unchanged),
+            "regions_removed": len(removed),
+        }
+        view: Dict[str, Any] = {"changed": changed, "unchanged": unchanged}
+        if removed:
+            view["removed"] = removed
+        return view, interactive[: self.max_interactive]
+
+
+def _section_sizes(ctx: Dict[str, Any]) -> Dict[str, int]:
+    """Byte size of each top-level section as it would be sent to the LLM."""
+    sizes: Dict[str, int] = {}
+    for key, value in ctx.items():
         try:
-            interactive = await page.evaluate(
-                """
-                () => {
-                  const sel = ["a[href]","button","input","textarea","select","[role=button]","[onclick]"].join(",");
-                  const out=[];
-                  for(const el of document.querySelectorAll(sel)){
-                    out.push({
-                      tag: el.tagName.toLowerCase(),
-                      text: (()=>{ try{ return (el.innerText||"").trim()||undefined; }catch(e){ return undefined; } })(),
-                      attrs: {
-                        id: el.id||undefined,
-                        class: el.className||undefined,
-                        href: el.getAttribute("href")||undefined,
-                        type: el.getAttribute("type")||undefined,
-                        role: el.getAttribute("role")||undefined,
-                        onclick: el.getAttribute("onclick")||undefined
-                      }
-                    });
-                  }
-                  return out;
-                }
-                """
-            )
+            if isinstance(value, str):
+                sizes[key] = len(value.encode("utf-8"))
+            else:
+                sizes[key] = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
         except Exception:
-            interactive = []
+            continue
+    return sizes
+
+
+@timed_stage("context_extraction")
+async def extract_page_context(
+    page,
+    include_dom: bool = False,
+    dom_max_chars: int = 20000,
+    include_iframes: bool = True,
+    form_focused: bool = False,
+    stats: Optional[Dict[str, Any]] = None,
+    tracker: Optional[IncrementalDomTracker] = None,
+) -> Dict:
+    """
+    Collect the page context for the planner in a single evaluate round-trip.
+
+    With ``include_dom`` the DOM preview and interactive elements are gathered
+    in the same traversal, and the DOM preview stops growing once
+    ``dom_max_chars`` is reached (it is always well-formed JSON). Each child
+    frame costs one additional evaluate.
+
+    Args:
+        stats: Optional dict filled with ``section_bytes``, ``dom_nodes`` and
+               ``dom_truncated`` for logging.
+        tracker: Incremental mode: only regions changed since the tracker's
+                 previous step are serialized (see IncrementalDomTracker).
+    """
+    known = None
+    if tracker is not None and include_dom:
+        url = getattr(page, "url", None)
+        if isinstance(url, str) and url != tracker.url:
+            # Region ids are structural; start over on a different page
+            tracker.reset()
+            tracker.url = url
+        known = tracker.known()
+    base = await page.evaluate(_PAGE_CONTEXT_JS, {
+        "formFocused": bool(form_focused),
+        "includeDom": bool(include_dom),
+        "domMaxChars": max(0, int(dom_max_chars)),
+        "regionsKnown": known,
+    })
+    dom = base.pop("__dom", None) if isinstance(base, dict) else None
+    regions = base.pop("__regions", None) if isinstance(base, dict) else None
+    if include_dom and isinstance(regions, list):
+        view, interactive = tracker.apply(regions)
         if interactive:
-            _ilist = (interactive or [])[:40]
-            if _ilist:
-                base["interactive"] = _ilist
-        try:
-            dom_preview = json.dumps(dom_tree)[:max(0, int(dom_max_chars))]
-        except Exception:
-            dom_preview = None
-        if dom_preview:
-            base["dom_preview"] = dom_preview
+            base["interactive"] = interactive
+        base["dom_preview"] = json.dumps(view, ensure_ascii=False, separators=(",", ":"))
+        dom = {
+            "nodes": sum(int(e.get("nodes", 0) or 0) for e in regions),
+            "truncated": any(e.get("truncated") for e in regions),
+        }
+    elif include_dom and dom:
+        if dom.get("interactive"):
+            base["interactive"] = dom["interactive"]
+        if dom.get("preview"):
+            base["dom_preview"] = dom["preview"]
+    if include_dom:
         # Optionally capture iframes (CAPTCHA, consent UIs)
         if include_iframes:
             iframes = []
@@ -154,57 +420,43 @@ async def extract_page_context(page, include_dom: bool = False, dom_max_chars: i
                     if fr == page.main_frame:
                         continue
                     try:
-                        fdom = await fr.evaluate(
-                            """
-                            () => {
-                              const SKIP = new Set(["script","style","meta","link","noscript"]);
-                              function ser(n){
-                                if(!n||n.nodeType!==Node.ELEMENT_NODE) return null;
-                                const tag=n.tagName.toLowerCase();
-                                if(SKIP.has(tag)) return null;
-                                let text=(n.innerText||"").trim();
-                                if(text && text.length>200) text=undefined;
-                                const obj={tag, text:text||undefined};
-                                const children=[];
-                                for(const ch of n.children){ const c=ser(ch); if(c) children.push(c); }
-                                if(children.length) obj.children=children;
-                                return obj;
-                              }
-                              return ser(document.body);
-                            }
-                            """
-                        )
-                    except Exception:
-                        fdom = None
-                    try:
-                        finter = await fr.evaluate(
-                            """
-                            () => {
-                              const sel = ["a[href]","button","input","textarea","select","[role=button]","[onclick]"].join(",");
-                              const out=[];
-                              for(const el of document.querySelectorAll(sel)){
-                                out.push({tag: el.tagName.toLowerCase(), text: (el.innerText||"").trim()||undefined});
-                              }
-                              return out;
-                            }
-                            """
-                        )
+                        fres = await fr.evaluate(_FRAME_CONTEXT_JS, {"domMaxChars": max(0, int(dom_max_chars))})
                     except Exception:
-                        finter = []
+                        fres = None
+                    fdom = None
+                    finter = []
+                    if isinstance(fres, dict):
+                        try:
+                            fdom = json.loads(fres.get("preview") or "null")
+                        except Exception:
+                            fdom = None
+                        finter = fres.get("interactive") or []
                     try:
                         furl = fr.url
                     except Exception:
                         furl = None
                     if fdom or finter:
                         entry = {"dom": fdom}
-                        _fint = (finter or [])[:20]
-                        if _fint:
-                            entry["interactive"] = _fint
+                        if finter:
+                            entry["interactive"] = finter
                         if furl:
                             entry["url"] = furl
                         iframes.append(entry)
+                    if len(iframes) >= 5:
+                        break
             except Exception:
                 pass
             if iframes:
-                base["iframes"] = iframes[:5]
+                base["iframes"] = iframes
+    if stats is not None or logger.isEnabledFor(logging.DEBUG):
+        info = {
+            "section_bytes": _section_sizes(base),
+            "dom_nodes": (dom or {}).get("nodes", 0),
+            "dom_truncated": bool((dom or {}).get("truncated", False)),
+        }
+        if tracker is not None and tracker.last_stats:
+            info.update(tracker.last_stats)
+        if stats is not None:
+            stats.update(info)
+        logger.debug(f"page context sections: {info}")
     return base
@@ -0,0 +1,182 @@
+"""
+Page Library - preloaded in-page JS function library
+
+Analyzers used to ship their whole JS source with every ``page.evaluate``,
+so the browser parsed and compiled the same large scripts on each call.
+The page library bundles ``functions/js/extractors.js`` and
+``functions/js/analyzers.js`` (their ``FunctionRegistry``) into one versioned
+script that is installed once per browser context with ``add_init_script``.
+Python code then calls functions by name with a small argument payload;
+the page records call count and timing per function.
+
+If a page does not have the current bundle (context created elsewhere,
+or a document that predates installation) the bundle is injected on the
+first call, so calling code never has to care.
+
+Usage:
+    from curllm_core.page_library import install_page_library, call_page_function
+
+    await install_page_library(context)
+    stats = await call_page_function(page, "domStatistics")
+    clusters = await call_page_function(page, "clusterByStructure", {"selector": "li", "maxClusters": 5})
+    timings = await get_page_function_stats(page)   # {"domStatistics": {"calls": 1, "total_ms": ...}}
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LIBRARY_FILES = ("extractors.js", "analyzers.js")
+
+_RUNTIME_JS = """
+(() => {
+  const VERSION = "%(version)s";
+  if (globalThis.__curllm && globalThis.__curllm.version === VERSION) return;
+
+  // extractors.js exports to window/module when present; keep the page's globals clean
+  const FunctionRegistry = ((window, module) => {
+%(extractors)s
+    return FunctionRegistry;
+  })(undefined, undefined);
+
+  ((module) => {
+%(analyzers)s
+  })(undefined);
+
+  const timings = {};
+  const api = {
+    version: VERSION,
+    list() {
+      return FunctionRegistry.list();
+    },
+    call(name, args) {
+      const fn = FunctionRegistry.get(name);
+      if (!fn) throw new Error('Unknown page function: ' + name);
+      const t = timings[name] || (timings[name] = { calls: 0, errors: 0, total_ms: 0, max_ms: 0 });
+      const t0 = performance.now();
+      try {
+        return fn(args);
+      } catch (e) {
+        t.errors++;
+        throw e;
+      } finally {
+        const ms = performance.now() - t0;
+        t.calls++;
+        t.total_ms += ms;
+        if (ms > t.max_ms) t.max_ms = ms;
+      }
+    },
+    stats(reset) {
+      const out = JSON.parse(JSON.stringify(timings));
+      if (reset) for (const k of Object.keys(timings)) delete timings[k];
+      return out;
+    }
+  };
+  Object.defineProperty(globalThis, '__curllm', { value: api, configurable: true, enumerable: false });
+})();
+"""
+
+_CALL_JS = """([name, args, version]) => {
+  const lib = globalThis.__curllm;
+  if (!lib || lib.version !== version) return { missing: true };
+  return { value: lib.call(name, args) };
+}"""
+
+_STATS_JS = """([reset, version]) => {
+  const lib = globalThis.__curllm;
+  return lib && lib.version === version ? lib.stats(reset) : {};
+}"""
+
+_bundle: Optional[str] = None
+_version: Optional[str] = None
+
+
+def _js_dir() -> Path:
+    import functions
+    return Path(functions.__file__).resolve().parent / "js"
+
+
+def get_bundle() -> str:
+    """The versioned library script (built once per process)"""
+    global _bundle, _version
+    if _bundle is None:
+        sources = {}
+        digest = hashlib.sha256(_RUNTIME_JS.encode("utf-8"))
+        for filename in LIBRARY_FILES:
+            text = (_js_dir() / filename).read_text(encoding="utf-8")
+            digest.update(text.encode("utf-8"))
+            sources[filename.split(".")[0]] = text
+        _version = digest.hexdigest()[:12]
+        _bundle = _RUNTIME_JS % {"version": _version, **sources}
+    return _bundle
+
+
+def get_version() -> str:
+    """Version hash of the library bundle"""
+    get_bundle()
+    return _version
+
+
+async def install_page_library(context) -> bool:
+    """
+    Install the library into a browser context.
+
+    Registers the bundle as init script (every future document and frame)
+    and injects it into pages that are already open.
+
+    Returns:
+        True if installed (or already installed on this context)
+    """
+    version = get_version()
+    if getattr(context, "_curllm_page_library", None) == version:
+        return True
+    try:
+        await context.add_init_script(script=get_bundle())
+    except Exception as e:
+        logger.debug(f"Page library not installed: {e}")
+        return False
+    for page in list(getattr(context, "pages", []) or []):
+        try:
+            await page.evaluate(get_bundle())
+        except Exception:
+            pass
+    setattr(context, "_curllm_page_library", version)
+    return True
+
+
+async def call_page_function(page, name: str, args: Any = None) -> Any:
+    """
+    Call a library function in a page or frame.
+
+    Args:
+        page: Playwright page or frame
+        name: Registered function name (e.g. "domStatistics")
+        args: JSON-serializable argument passed to the function
+
+    Returns:
+        The function's return value; errors thrown in the page propagate
+        like any ``page.evaluate`` error
+    """
+    version = get_version()
+    out = await page.evaluate(_CALL_JS, [name, args, version])
+    if isinstance(out, dict) and out.get("missing"):
+        await page.evaluate(get_bundle())
+        out = await page.evaluate(_CALL_JS, [name, args, version])
+    return out.get("value") if isinstance(out, dict) else None
+
+
+async def get_page_function_stats(page, reset: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-function timing collected in the page since the document loaded.
+
+    Returns:
+        {name: {"calls", "errors", "total_ms", "max_ms"}}
+    """
+    try:
+        return await page.evaluate(_STATS_JS, [reset, get_version()]) or {}
+    except Exception as e:
+        logger.debug(f"Page function stats unavailable: {e}")
+        return {}
@@ -0,0 +1,400 @@
+"""
+Proxy Pool - health-scored proxy selection
+
+Keeps every known proxy with its success rate, latency EWMA and ban signals
+(403/429 responses, block/captcha pages). Proxies are chosen by weighted
+score instead of blind round-robin, a host keeps its proxy while it works,
+and failing or banned proxies are quarantined with exponential backoff so a
+dead entry does not cost a navigation timeout on every run. Lists are
+loaded and validated once per source; health state is persisted in batches.
+
+Usage:
+    from curllm_core.proxy_pool import get_proxy_pool
+
+    pool = get_proxy_pool()
+    servers = pool.source("public", loader=load_public_list, ttl=3600)
+    server = pool.choose("public", host="example.com")
+
+    # after navigating through it
+    pool.report(server, ok=True, latency_ms=840, status=200, host="example.com")
+    pool.report(server, ok=False, status=429, host="example.com")  # ban -> quarantine
+
+    print(pool.get_stats())  # proxies, healthy, quarantined, bans, ...
+"""
+
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+PROXY_SCHEMES = ("http", "https", "socks4", "socks5")
+BAN_STATUSES = (403, 407, 429)
+
+
+def validate_proxy(server: str) -> Optional[str]:
+    """
+    Normalize and validate a proxy URL.
+
+    Returns:
+        "scheme://[user:pass@]host[:port]" or None if the entry is unusable
+    """
+    s = (server or "").strip()
+    if not s or s.startswith("#"):
+        return None
+    if "://" not in s:
+        s = "http://" + s
+    try:
+        parsed = urlparse(s)
+        port = parsed.port
+    except ValueError:
+        return None
+    if parsed.scheme.lower() not in PROXY_SCHEMES or not parsed.hostname:
+        return None
+    if port is not None and not 0 < port < 65536:
+        return None
+    return s
+
+
+@dataclass
+class ProxyHealth:
+    """Health record of one proxy."""
+    server: str
+    successes: int = 0
+    failures: int = 0
+    bans: int = 0
+    consecutive_failures: int = 0
+    strikes: int = 0
+    latency_ewma_ms: Optional[float] = None
+    quarantined_until: float = 0.0
+    last_used: float = 0.0
+    last_error: Optional[str] = None
+
+    def is_quarantined(self, now: float) -> bool:
+        return self.quarantined_until > now
+
+    def score(self, latency_ref_ms: float) -> float:
+        """
+        Selection weight in (0, 1].
+
+        Success rate with a uniform prior (new proxies start at 0.5), scaled
+        down by latency and by recorded bans.
+        """
+        success_rate = (self.successes + 1) / (self.successes + self.failures + 2)
+        latency = latency_ref_ms if self.latency_ewma_ms is None else self.latency_ewma_ms
+        return success_rate * (latency_ref_ms / (latency_ref_ms + latency)) / (1 + self.bans)
+
+
+class ProxyPool:
+    """
+    Thread-safe pool of proxies grouped into named sources.
+
+    A source is a list of proxies ("public", "registry", a user-supplied
+    list); health is tracked per proxy server and shared between sources.
+    """
+
+    def __init__(
+        self,
+        state_file: Optional[Path] = None,
+        quarantine_seconds: float = 300.0,
+        max_quarantine_seconds: float = 3600.0,
+        fail_threshold: int = 2,
+        ewma_alpha: float = 0.3,
+        latency_ref_ms: float = 2000.0,
+        flush_seconds: float = 30.0,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialize proxy pool.
+
+        Args:
+            state_file: JSON file for health state (None = in-memory only)
+            quarantine_seconds: First quarantine period, doubled on each further strike
+            max_quarantine_seconds: Upper bound of a quarantine period
+            fail_threshold: Consecutive failures that quarantine a proxy (bans quarantine at once)
+            ewma_alpha: Weight of the newest latency sample
+            latency_ref_ms: Latency at which the latency factor of the score is 0.5
+            flush_seconds: Minimum interval between state writes (0 = write on every report)
+            rng: Random generator used for weighted selection
+        """
+        self.state_file = Path(state_file) if state_file else None
+        self.quarantine_seconds = quarantine_seconds
+        self.max_quarantine_seconds = max_quarantine_seconds
+        self.fail_threshold = max(1, fail_threshold)
+        self.ewma_alpha = ewma_alpha
+        self.latency_ref_ms = latency_ref_ms
+        self.flush_seconds = flush_seconds
+        self._rng = rng or random.Random()
+        self._lock = threading.RLock()
+        self._health: Dict[str, ProxyHealth] = {}
+        self._sources: Dict[str, List[str]] = {}
+        self._source_meta: Dict[str, Tuple[float, Hashable]] = {}
+        self._sticky: Dict[str, str] = {}
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._stats = {"choices": 0, "sticky_hits": 0, "quarantined": 0, "rejected_entries": 0, "flushes": 0}
+        self._load_state()
+
+    # ------------------------------------------------------------------
+    # Sources
+    # ------------------------------------------------------------------
+
+    def source(
+        self,
+        name: str,
+        loader: Callable[[], List[str]],
+        ttl: Optional[float] = None,
+        version: Hashable = None,
+    ) -> List[str]:
+        """
+        Get the validated proxy list of a source, loading it at most once.
+
+        Args:
+            name: Source name
+            loader: Returns raw proxy entries (called on first use and on reload)
+            ttl: Reload after this many seconds (None = never)
+            version: Reload whenever this value changes (e.g. a file mtime)
+
+        Returns:
+            Deduplicated list of valid proxy URLs
+        """
+        with self._lock:
+            meta = self._source_meta.get(name)
+            fresh = (
+                meta is not None
+                and meta[1] == version
+                and (ttl is None or time.monotonic() - meta[0] < ttl)
+            )
+            if fresh:
+                return self._sources[name]
+        raw = loader() or []
+        return self.set_source(name, raw, version=version)
+
+    def set_source(self, name: str, entries: List[str], version: Hashable = None) -> List[str]:
+        """Replace a source's proxy list with the valid, deduplicated ``entries``."""
+        servers: List[str] = []
+        rejected = 0
+        for entry in entries:
+            server = validate_proxy(str(entry))
+            if server is None:
+                rejected += 1
+            elif server not in servers:
+                servers.append(server)
+        with self._lock:
+            self._sources[name] = servers
+            self._source_meta[name] = (time.monotonic(), version)
+            self._stats["rejected_entries"] += rejected
+            for server in servers:
+                self._health.setdefault(server, ProxyHealth(server))
+        if rejected:
+            logger.info(f"Proxy source '{name}': {len(servers)} valid, {rejected} invalid entries skipped")
+        return servers
+
+    # ------------------------------------------------------------------
+    # Selection and feedback
+    # ------------------------------------------------------------------
+
+    def choose(self, source: str, host: Optional[str] = None) -> Optional[str]:
+        """
+        Pick a proxy from a source.
+
+        The proxy that last worked for ``host`` is reused while it is not
+        quarantined; otherwise healthy proxies are drawn with probability
+        proportional to their score. If every proxy is quarantined, the one
+        released soonest is returned.
+
+        Returns:
+            Proxy URL or None if the source is empty/unknown
+        """
+        now = time.time()
+        with self._lock:
+            servers = self._sources.get(source) or []
+            if not servers:
+                return None
+            self._stats["choices"] += 1
+            sticky_key = f"{source}|{host}" if host else None
+            sticky = self._sticky.get(sticky_key) if sticky_key else None
+            if sticky in servers and not self._health[sticky].is_quarantined(now):
+                self._stats["sticky_hits"] += 1
+                chosen = sticky
+            else:
+                healthy = [s for s in servers if not self._health[s].is_quarantined(now)]
+                if healthy:
+                    weights = [self._health[s].score(self.latency_ref_ms) for s in healthy]
+                    chosen = self._rng.choices(healthy, weights=weights, k=1)[0]
+                else:
+                    chosen = min(servers, key=lambda s: self._health[s].quarantined_until)
+                if sticky_key:
+                    self._sticky[sticky_key] = chosen
+            self._health[chosen].last_used = now
+            return chosen
+
+    def report(
+        self,
+        server: str,
+        ok: bool,
+        latency_ms: Optional[float] = None,
+        status: Optional[int] = None,
+        banned: bool = False,
+        error: Optional[str] = None,
+        host: Optional[str] = None,
+    ):
+        """
+        Record the outcome of a request made through a proxy.
+
+        Args:
+            server: Proxy URL as returned by ``choose``
+            ok: Whether the page loaded usably
+            latency_ms: Navigation time through the proxy
+            status: HTTP status of the main document (403/407/429 count as bans)
+            banned: Ban signal from content checks (block page, captcha wall)
+            error: Error message of a failed navigation
+            host: Target host; a failure drops the host's sticky binding
+        """
+        server = validate_proxy(server) or server
+        now = time.time()
+        with self._lock:
+            health = self._health.get(server)
+            if health is None:
+                return
+            banned = banned or status in BAN_STATUSES
+            if latency_ms is not None and latency_ms >= 0:
+                prev = health.latency_ewma_ms
+                health.latency_ewma_ms = (
+                    float(latency_ms) if prev is None else self.ewma_alpha * latency_ms + (1 - self.ewma_alpha) * prev
+                )
+            if ok and not banned:
+                health.successes += 1
+                health.consecutive_failures = 0
+                health.strikes = 0
+                health.last_error = None
+            else:
+                health.failures += 1
+                health.consecutive_failures += 1
+                health.last_error = error or (f"HTTP {status}" if status else "banned" if banned else "failed")
+                if banned:
+                    health.bans += 1
+                if banned or health.consecutive_failures >= self.fail_threshold:
+                    self._quarantine(health, now)
+                if host:
+                    for key in [k for k, v in self._sticky.items() if v == server and k.endswith(f"|{host}")]:
+                        del self._sticky[key]
+            self._dirty = True
+        self._maybe_flush()
+
+    def _quarantine(self, health: ProxyHealth, now: float):
+        health.strikes += 1
+        period = min(self.quarantine_seconds * 2 ** (health.strikes - 1), self.max_quarantine_seconds)
+        health.quarantined_until = now + period
+        health.consecutive_failures = 0
+        self._stats["quarantined"] += 1
+        logger.info(f"Proxy {health.server} quarantined for {period:.0f}s ({health.last_error})")
+
+    def knows(self, server: str) -> bool:
+        """Whether ``server`` belongs to any loaded source."""
+        with self._lock:
+            return (validate_proxy(server) or server) in self._health
+
+    def health(self, server: str) -> Optional[Dict[str, Any]]:
+        """Health record of a proxy as a dict (None if unknown)."""
+        with self._lock:
+            h = self._health.get(validate_proxy(server) or server)
+            return asdict(h) if h else None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load_state(self):
+        if not self.state_file or not self.state_file.exists():
+            return
+        try:
+            data = json.loads(self.state_file.read_text(encoding="utf-8"))
+            if data.get("version") != STATE_VERSION:
+                return
+            known = {f.name for f in fields(ProxyHealth)}
+            for server, record in (data.get("proxies") or {}).items():
+                record = {k: v for k, v in record.items() if k in known}
+                record["server"] = server
+                self._health[server] = ProxyHealth(**record)
+            self._sticky.update(data.get("sticky") or {})
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable proxy state {self.state_file}: {e}")
+
+    def _maybe_flush(self):
+        if self._dirty and time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        """Write health state to ``state_file`` if anything changed since the last write."""
+        if not self.state_file:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": STATE_VERSION,
+                "proxies": {s: {k: v for k, v in asdict(h).items() if k != "server"} for s, h in self._health.items()},
+                "sticky": dict(self._sticky),
+            }
+            self._dirty = False
+            self._last_flush = time.monotonic()
+            self._stats["flushes"] += 1
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            tmp.replace(self.state_file)
+        except Exception as e:
+            logger.warning(f"Could not persist proxy state: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        now = time.time()
+        with self._lock:
+            quarantined = sum(1 for h in self._health.values() if h.is_quarantined(now))
+            return {
+                **self._stats,
+                "proxies": len(self._health),
+                "healthy": len(self._health) - quarantined,
+                "quarantined_now": quarantined,
+                "bans": sum(h.bans for h in self._health.values()),
+                "sources": {name: len(servers) for name, servers in self._sources.items()},
+            }
+
+
+# Global pool instance
+_global_pool: Optional[ProxyPool] = None
+_global_lock = threading.Lock()
+
+
+def get_proxy_pool() -> ProxyPool:
+    """
+    Get or create the global proxy pool.
+
+    Settings come from ``config.proxy_quarantine_seconds``,
+    ``config.proxy_fail_threshold`` and ``config.proxy_state_flush_seconds``;
+    state lives in the workspace proxy directory.
+    """
+    global _global_pool
+    with _global_lock:
+        if _global_pool is None:
+            from .config import config
+            from .proxy import STATE_DIR
+            _global_pool = ProxyPool(
+                state_file=STATE_DIR / "pool_state.json",
+                quarantine_seconds=config.proxy_quarantine_seconds,
+                fail_threshold=config.proxy_fail_threshold,
+                flush_seconds=config.proxy_state_flush_seconds,
+            )
+            atexit.register(_global_pool.flush)
+        return _global_pool
@@ -4,206 +4,421 @@ Rate Limiter for Web Requests
 Implements per-domain rate limiting to avoid overloading servers
 and getting blocked.
 
+Each domain is a token bucket tracked with GCRA (generic cell rate
+algorithm): the only state is the domain's theoretical arrival time (TAT),
+so an acquire is a constant-time update. A bucket holds
+``requests_per_minute + burst_allowance`` tokens and refills at
+``requests_per_minute``. State lives in memory by default, or in a SQLite
+file shared by several worker processes so they respect one budget.
+
 Usage:
     from curllm_core.rate_limiter import RateLimiter, get_rate_limiter
-    
+
     limiter = RateLimiter(requests_per_minute=30)
     await limiter.wait_if_needed("example.com")
-    
+
     # Or use global limiter
     limiter = get_rate_limiter()
     await limiter.acquire("example.com")
+
+    # Scheduler-friendly: ask how long to wait instead of sleeping
+    wait = limiter.try_acquire("example.com")   # 0.0 = granted, else retry after `wait`s
+
+    # One budget across worker processes
+    limiter = RateLimiter(requests_per_minute=30,
+                          backend=SQLiteRateLimitBackend("/tmp/curllm-ratelimit.db"))
 """
 
 import asyncio
 import logging
+import math
+import os
+import sqlite3
+import threading
 import time
 from collections import defaultdict
-from typing import Dict, Optional
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
 
+class MemoryRateLimitBackend:
+    """In-process GCRA state: domain -> (tat, last_request_time)."""
+
+    def __init__(self):
+        self._state: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, domain: str, interval: float, tolerance: float, min_delay: float,
+               now: float, commit: bool) -> float:
+        """
+        Run one GCRA step for a domain.
+
+        Args:
+            domain: Domain key
+            interval: Seconds per token (60 / rpm)
+            tolerance: Burst tolerance in seconds ((capacity - 1) * interval)
+            min_delay: Minimum spacing between requests
+            now: Current wall-clock time
+            commit: Reserve a slot even if it lies in the future; otherwise
+                    only a slot available now is taken
+
+        Returns:
+            Seconds until the request may be sent (0.0 = now)
+        """
+        with self._lock:
+            tat, last = self._state.get(domain, (now, 0.0))
+            wait, new_state = _gcra(tat, last, interval, tolerance, min_delay, now)
+            if commit or wait <= 0:
+                self._state[domain] = new_state
+            return wait
+
+    def get(self, domain: str) -> Optional[Tuple[float, float]]:
+        return self._state.get(domain)
+
+    def set(self, domain: str, tat: float, last: float):
+        with self._lock:
+            self._state[domain] = (tat, last)
+
+    def delete(self, domain: Optional[str] = None):
+        with self._lock:
+            if domain is None:
+                self._state.clear()
+            else:
+                self._state.pop(domain, None)
+
+    def domains(self) -> List[str]:
+        return list(self._state)
+
+
+class SQLiteRateLimitBackend:
+    """
+    GCRA state in a SQLite file, shared by every process that opens it.
+
+    Each update is a single ``BEGIN IMMEDIATE`` transaction on one row, so
+    concurrent workers serialize on the database lock and never both take
+    the same slot.
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        """
+        Open (or create) the shared state file.
+
+        Args:
+            path: SQLite database path
+            timeout: Seconds to wait for the database lock
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "domain TEXT PRIMARY KEY, tat REAL NOT NULL, last REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def update(self, domain: str, interval: float, tolerance: float, min_delay: float,
+               now: float, commit: bool) -> float:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tat, last FROM rate_limits WHERE domain = ?", (domain,)
+            ).fetchone()
+            tat, last = row if row else (now, 0.0)
+            wait, (new_tat, new_last) = _gcra(tat, last, interval, tolerance, min_delay, now)
+            if commit or wait <= 0:
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits (domain, tat, last) VALUES (?, ?, ?)",
+                    (domain, new_tat, new_last),
+                )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, domain: str) -> Optional[Tuple[float, float]]:
+        row = self._conn().execute(
+            "SELECT tat, last FROM rate_limits WHERE domain = ?", (domain,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, domain: str, tat: float, last: float):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO rate_limits (domain, tat, last) VALUES (?, ?, ?)",
+            (domain, tat, last),
+        )
+
+    def delete(self, domain: Optional[str] = None):
+        if domain is None:
+            self._conn().execute("DELETE FROM rate_limits")
+        else:
+            self._conn().execute("DELETE FROM rate_limits WHERE domain = ?", (domain,))
+
+    def domains(self) -> List[str]:
+        return [r[0] for r in self._conn().execute("SELECT domain FROM rate_limits")]
+
+
+def _gcra(tat: float, last: float, interval: float, tolerance: float, min_delay: float,
+          now: float) -> Tuple[float, Tuple[float, float]]:
+    """One GCRA step: (seconds to wait, new (tat, last)) for a request at `now`."""
+    tat = max(tat, now)
+    allowed_at = max(now, tat - tolerance, last + min_delay)
+    new_tat = max(tat, allowed_at) + interval
+    return max(0.0, allowed_at - now), (new_tat, allowed_at)
+
+
+class _TimestampView(MutableMapping):
+    """
+    Compatibility view of the old ``domain_timestamps`` mapping.
+
+    Reading a domain returns one entry per token currently in use;
+    assigning a list of timestamps replays them into the bucket.
+    """
+
+    def __init__(self, limiter: "RateLimiter"):
+        self._limiter = limiter
+
+    def __getitem__(self, domain: str) -> List[float]:
+        return [time.time()] * self._limiter._tokens_in_use(domain)
+
+    def __setitem__(self, domain: str, timestamps: List[float]):
+        self._limiter._replay(domain, timestamps)
+
+    def __delitem__(self, domain: str):
+        self._limiter.backend.delete(domain)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._limiter.backend.domains())
+
+    def __len__(self) -> int:
+        return len(self._limiter.backend.domains())
+
+    def clear(self):
+        self._limiter.backend.delete()
+
+
 class RateLimiter:
     """
-    Per-domain rate limiter using sliding window.
-    
-    Tracks request timestamps per domain and enforces
-    a maximum requests-per-minute limit.
+    Per-domain rate limiter using a GCRA token bucket.
+
+    Each domain may send ``requests_per_minute + burst_allowance``
+    requests back to back, then one every ``60 / requests_per_minute``
+    seconds, and never two within ``default_delay`` seconds.
     """
-    
+
     def __init__(
         self,
         requests_per_minute: int = 30,
         burst_allowance: int = 5,
-        default_delay: float = 0.5
+        default_delay: float = 0.5,
+        backend=None,
     ):
         """
         Initialize rate limiter.
-        
+
         Args:
             requests_per_minute: Maximum requests per minute per domain
             burst_allowance: Extra requests allowed in burst
             default_delay: Minimum delay between requests (seconds)
+            backend: State backend (default: in-memory; use
+                     SQLiteRateLimitBackend to share across processes)
         """
         self.rpm = requests_per_minute
         self.burst = burst_allowance
         self.default_delay = default_delay
-        self.domain_timestamps: Dict[str, list] = defaultdict(list)
-        self.domain_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
-        self._last_request_time: Dict[str, float] = {}
-    
+        self.backend = backend or MemoryRateLimitBackend()
+        self.domain_limits: Dict[str, Tuple[int, int]] = {}
+        self.domain_timestamps = _TimestampView(self)
+
     def _extract_domain(self, url_or_domain: str) -> str:
         """Extract domain from URL or return as-is if already domain."""
         if url_or_domain.startswith(('http://', 'https://')):
             parsed = urlparse(url_or_domain)
             return parsed.netloc
         return url_or_domain
-    
-    def _cleanup_old_timestamps(self, domain: str, window_seconds: float = 60.0):
-        """Remove timestamps older than the sliding window."""
-        now = time.time()
-        cutoff = now - window_seconds
-        self.domain_timestamps[domain] = [
-            ts for ts in self.domain_timestamps[domain]
-            if ts > cutoff
-        ]
-    
+
+    def set_domain_limit(self, url_or_domain: str, requests_per_minute: Optional[int] = None,
+                         burst_allowance: Optional[int] = None):
+        """
+        Override rate and burst for one domain.
+
+        Args:
+            url_or_domain: URL or domain
+            requests_per_minute: Domain RPM (default: limiter RPM)
+            burst_allowance: Domain burst (default: limiter burst)
+        """
+        domain = self._extract_domain(url_or_domain)
+        self.domain_limits[domain] = (
+            requests_per_minute if requests_per_minute is not None else self.rpm,
+            burst_allowance if burst_allowance is not None else self.burst,
+        )
+
+    def _limits(self, domain: str) -> Tuple[int, int]:
+        """(rpm, burst) for a domain."""
+        return self.domain_limits.get(domain, (self.rpm, self.burst))
+
+    def _bucket(self, domain: str) -> Tuple[float, float, int]:
+        """(interval, tolerance, capacity) for a domain."""
+        rpm, burst = self._limits(domain)
+        interval = 60.0 / max(1, rpm)
+        capacity = max(1, rpm + burst)
+        return interval, (capacity - 1) * interval, capacity
+
+    def _tokens_in_use(self, domain: str) -> int:
+        state = self.backend.get(domain)
+        if not state:
+            return 0
+        interval, _, capacity = self._bucket(domain)
+        backlog = state[0] - time.time()
+        return min(capacity, max(0, math.ceil(backlog / interval - 1e-9)))
+
+    def _replay(self, domain: str, timestamps: List[float]):
+        """Rebuild bucket state as if requests had been made at `timestamps`."""
+        self.backend.delete(domain)
+        interval, _, _ = self._bucket(domain)
+        tat, last = 0.0, 0.0
+        for ts in sorted(timestamps):
+            tat = max(tat, ts) + interval
+            last = ts
+        if timestamps:
+            self.backend.set(domain, tat, last)
+
+    def reserve(self, url_or_domain: str) -> float:
+        """
+        Reserve the next slot for a domain without sleeping.
+
+        The slot is taken immediately, so the caller must send the request
+        after the returned delay.
+
+        Args:
+            url_or_domain: URL or domain
+
+        Returns:
+            Seconds to wait before sending (0.0 = send now)
+        """
+        domain = self._extract_domain(url_or_domain)
+        interval, tolerance, _ = self._bucket(domain)
+        return self.backend.update(domain, interval, tolerance, self.default_delay,
+                                   time.time(), commit=True)
+
+    def try_acquire(self, url_or_domain: str) -> float:
+        """
+        Take a slot only if one is available now.
+
+        Args:
+            url_or_domain: URL or domain
+
+        Returns:
+            0.0 if granted, otherwise seconds until a slot frees up
+            (nothing is reserved, so the scheduler can run other work)
+        """
+        domain = self._extract_domain(url_or_domain)
+        interval, tolerance, _ = self._bucket(domain)
+        return self.backend.update(domain, interval, tolerance, self.default_delay,
+                                   time.time(), commit=False)
+
     async def acquire(self, url_or_domain: str) -> float:
         """
         Acquire permission to make a request, waiting if necessary.
-        
+
         Args:
             url_or_domain: URL or domain to rate limit
-            
+
         Returns:
             Time waited in seconds
         """
-        domain = self._extract_domain(url_or_domain)
-        
-        async with self.domain_locks[domain]:
-            return await self._wait_if_needed_internal(domain)
-    
+        wait = self.reserve(url_or_domain)
+        if wait > 0:
+            domain = self._extract_domain(url_or_domain)
+            if wait > 1.0:
+                logger.info(f"Rate limit reached for {domain}. Waiting {wait:.1f}s...")
+            else:
+                logger.debug(f"Rate limiter waiting {wait:.2f}s for {domain}")
+            await asyncio.sleep(wait)
+        return wait
+
     async def wait_if_needed(self, url_or_domain: str) -> float:
         """
         Wait if rate limit would be exceeded.
-        
+
         Args:
             url_or_domain: URL or domain to check
-            
+
         Returns:
             Time waited in seconds
         """
         return await self.acquire(url_or_domain)
-    
-    async def _wait_if_needed_internal(self, domain: str) -> float:
-        """Internal wait logic (must be called with lock held)."""
-        now = time.time()
-        waited = 0.0
-        
-        # Clean up old timestamps
-        self._cleanup_old_timestamps(domain)
-        
-        # Check if we're at the limit
-        current_count = len(self.domain_timestamps[domain])
-        max_allowed = self.rpm + self.burst
-        
-        if current_count >= max_allowed:
-            # Calculate wait time based on oldest request
-            oldest = min(self.domain_timestamps[domain])
-            wait_time = oldest + 60.0 - now + 0.1  # +0.1s buffer
-            
-            if wait_time > 0:
-                logger.info(
-                    f"Rate limit reached for {domain} ({current_count} requests). "
-                    f"Waiting {wait_time:.1f}s..."
-                )
-                await asyncio.sleep(wait_time)
-                waited = wait_time
-                now = time.time()
-                self._cleanup_old_timestamps(domain)
-        
-        # Enforce minimum delay between requests
-        last_time = self._last_request_time.get(domain, 0)
-        time_since_last = now - last_time
-        
-        if time_since_last < self.default_delay:
-            delay = self.default_delay - time_since_last
-            await asyncio.sleep(delay)
-            waited += delay
-            now = time.time()
-        
-        # Record this request
-        self.domain_timestamps[domain].append(now)
-        self._last_request_time[domain] = now
-        
-        if waited > 0:
-            logger.debug(f"Rate limiter waited {waited:.2f}s for {domain}")
-        
-        return waited
-    
+
     def get_remaining_capacity(self, url_or_domain: str) -> int:
         """
         Get remaining request capacity for a domain.
-        
+
         Args:
             url_or_domain: URL or domain to check
-            
+
         Returns:
             Number of requests available before hitting limit
         """
         domain = self._extract_domain(url_or_domain)
-        self._cleanup_old_timestamps(domain)
-        current = len(self.domain_timestamps[domain])
-        return max(0, self.rpm + self.burst - current)
-    
+        _, _, capacity = self._bucket(domain)
+        return max(0, capacity - self._tokens_in_use(domain))
+
     def get_stats(self, url_or_domain: str) -> dict:
         """
         Get rate limiting stats for a domain.
-        
+
         Args:
             url_or_domain: URL or domain to check
-            
+
         Returns:
             Dictionary with stats
         """
         domain = self._extract_domain(url_or_domain)
-        self._cleanup_old_timestamps(domain)
-        
-        current = len(self.domain_timestamps[domain])
-        remaining = max(0, self.rpm + self.burst - current)
-        
-        # Calculate time until next slot opens
+        rpm, burst = self._limits(domain)
+        interval, tolerance, capacity = self._bucket(domain)
+        current = self._tokens_in_use(domain)
+        state = self.backend.get(domain)
+        # Time until the next token frees up when the bucket is empty
         reset_in = 0.0
-        if current >= self.rpm + self.burst and self.domain_timestamps[domain]:
-            oldest = min(self.domain_timestamps[domain])
-            reset_in = max(0, oldest + 60.0 - time.time())
-        
+        if state and current >= capacity:
+            reset_in = max(0.0, state[0] - tolerance - time.time())
+
         return {
             "domain": domain,
             "requests_in_window": current,
-            "limit": self.rpm,
-            "burst": self.burst,
-            "remaining": remaining,
+            "limit": rpm,
+            "burst": burst,
+            "remaining": max(0, capacity - current),
             "reset_in_seconds": round(reset_in, 1),
         }
-    
+
     def reset(self, url_or_domain: Optional[str] = None):
         """
         Reset rate limiting state.
-        
+
         Args:
             url_or_domain: Specific domain to reset, or None for all
         """
         if url_or_domain:
             domain = self._extract_domain(url_or_domain)
-            self.domain_timestamps[domain] = []
-            self._last_request_time.pop(domain, None)
+            self.backend.delete(domain)
             logger.debug(f"Rate limiter reset for {domain}")
         else:
-            self.domain_timestamps.clear()
-            self._last_request_time.clear()
+            self.backend.delete()
             logger.debug("Rate limiter reset for all domains")
 
 
@@ -232,6 +447,11 @@ class AdaptiveRateLimiter(RateLimiter):
         self.domain_errors: Dict[str, int] = defaultdict(int)
         self.domain_successes: Dict[str, int] = defaultdict(int)
     
+    def _limits(self, domain: str) -> Tuple[int, int]:
+        """Use the adapted RPM for the domain, if any."""
+        rpm, burst = super()._limits(domain)
+        return self.domain_rpm.get(domain, rpm), burst
+    
     def record_error(self, url_or_domain: str, status_code: Optional[int] = None):
         """
         Record an error response and potentially reduce rate.
@@ -295,30 +515,37 @@ _global_limiter: Optional[RateLimiter] = None
 
 def get_rate_limiter(
     requests_per_minute: int = 30,
-    adaptive: bool = False
+    adaptive: bool = False,
+    shared_db: Optional[str] = None,
 ) -> RateLimiter:
     """
     Get or create global rate limiter instance.
-    
+
     Args:
         requests_per_minute: RPM limit (only used on first call)
         adaptive: Use adaptive rate limiter
-    
+        shared_db: SQLite path for state shared across processes
+                   (default: CURLLM_RATE_LIMIT_DB, unset = in-memory)
+
     Returns:
         RateLimiter instance
     """
     global _global_limiter
-    
+
     if _global_limiter is None:
+        shared_db = shared_db or os.getenv("CURLLM_RATE_LIMIT_DB")
+        backend = SQLiteRateLimitBackend(shared_db) if shared_db else None
         if adaptive:
             _global_limiter = AdaptiveRateLimiter(
-                requests_per_minute=requests_per_minute
+                requests_per_minute=requests_per_minute,
+                backend=backend,
             )
         else:
             _global_limiter = RateLimiter(
-                requests_per_minute=requests_per_minute
+                requests_per_minute=requests_per_minute,
+                backend=backend,
             )
-    
+
     return _global_limiter
 
 
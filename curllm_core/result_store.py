@@ -2,10 +2,16 @@
 import os
 import json
 import hashlib
+import sqlite3
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+# Items are appended to JSONL segment files of at most this size
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+# Compaction rewrites segments once this share of their bytes is unreferenced
+COMPACT_DEAD_RATIO = 0.5
+
 
 def _ensure_base() -> Path:
     base = Path(os.getenv("CURLLM_WORKSPACE", "./workspace")) / "results"
@@ -63,33 +69,367 @@ def _store_dir_for(key: str) -> Path:
     return d
 
 
-def save_snapshot(key: str, result_obj: Any, keep_history: int = 10) -> Path:
-    d = _store_dir_for(key)
-    ts = datetime.now().strftime("%Y%m%d-%H%M%S")
-    p = d / f"{ts}.json"
-    try:
-        with open(p, "w", encoding="utf-8") as f:
-            json.dump({"timestamp": ts, "result": result_obj}, f, ensure_ascii=False, indent=2)
-        latest = d / "latest.json"
+def _item_hash(it: Any) -> str:
+    return hashlib.sha1(
+        json.dumps(it, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class ResultStore:
+    """
+    Append-only result history for one store key.
+
+    Items are written once per distinct content (sha1 of canonical JSON) to
+    JSONL segment files; a SQLite index maps hashes to (segment, offset,
+    length) and records, per run, the key fields in use and each item's
+    position, diff key and hash.
+    A run only appends items whose content is new, diffs compare per-item
+    hashes, and history is read item by item with seeks instead of loading
+    whole snapshots.
+
+    Usage:
+        store = ResultStore(_store_dir_for(key))
+        run_id = store.append_run(result_obj, key_fields=["href"])
+        prev = store.item_hashes(run_id)          # {item_key: hash}
+        for item in store.iter_items(run_id): ...
+        store.compact(keep_history=10)
+    """
+
+    def __init__(self, directory: Path):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.dir / "index.db"), timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY, segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL, length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,
+                count INTEGER NOT NULL, array_path TEXT, envelope TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS run_items (
+                run_id INTEGER NOT NULL, pos INTEGER NOT NULL,
+                item_key TEXT NOT NULL, hash TEXT NOT NULL,
+                PRIMARY KEY (run_id, pos)
+            );
+            CREATE INDEX IF NOT EXISTS idx_run_items_hash ON run_items (hash);
+            """
+        )
+        columns = {r[1] for r in self.conn.execute("PRAGMA table_info(runs)")}
+        if "key_fields" not in columns:
+            self.conn.execute("ALTER TABLE runs ADD COLUMN key_fields TEXT")
+
+    def close(self):
         try:
-            with open(latest, "w", encoding="utf-8") as f:
-                json.dump({"timestamp": ts, "result": result_obj}, f, ensure_ascii=False)
+            self.conn.close()
         except Exception:
             pass
-        files = sorted([x for x in d.glob("*.json") if x.name != "latest.json"], reverse=True)
-        if keep_history and keep_history > 0 and len(files) > keep_history:
-            for old in files[keep_history:]:
-                try:
-                    old.unlink()
-                except Exception:
-                    pass
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.dir / f"seg-{segment:06d}.jsonl"
+
+    def _segments(self) -> List[int]:
+        out = []
+        for p in self.dir.glob("seg-*.jsonl"):
+            try:
+                out.append(int(p.stem.split("-", 1)[1]))
+            except Exception:
+                continue
+        return sorted(out)
+
+    def latest_run(self) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT run_id, timestamp, count, key_fields FROM runs ORDER BY run_id DESC LIMIT 1"
+        ).fetchone()
+        if not row:
+            return None
+        return {"run_id": row[0], "timestamp": row[1], "count": row[2],
+                "key_fields": json.loads(row[3]) if row[3] else None}
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        return [
+            {"run_id": r[0], "timestamp": r[1], "count": r[2]}
+            for r in self.conn.execute("SELECT run_id, timestamp, count FROM runs ORDER BY run_id")
+        ]
+
+    def item_hashes(self, run_id: int) -> Dict[str, str]:
+        """Diff index of a run: item key -> content hash (last one wins, like diff())."""
+        return {
+            k: h for k, h in self.conn.execute(
+                "SELECT item_key, hash FROM run_items WHERE run_id = ? ORDER BY pos", (run_id,)
+            )
+        }
+
+    def read_blobs(self, hashes: List[str]) -> Dict[str, Any]:
+        """Load item bodies for the given hashes with one seek per item."""
+        locations: List[Tuple[str, int, int, int]] = []
+        wanted = list(dict.fromkeys(hashes))
+        for i in range(0, len(wanted), 500):
+            chunk = wanted[i:i + 500]
+            locations.extend(self.conn.execute(
+                f"SELECT hash, segment, offset, length FROM blobs WHERE hash IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ))
+        out: Dict[str, Any] = {}
+        handles: Dict[int, Any] = {}
+        try:
+            for h, segment, offset, length in sorted(locations, key=lambda r: (r[1], r[2])):
+                f = handles.get(segment)
+                if f is None:
+                    f = handles[segment] = open(self._segment_path(segment), "rb")
+                f.seek(offset)
+                out[h] = json.loads(f.read(length))["v"]
+        finally:
+            for f in handles.values():
+                f.close()
+        return out
+
+    def iter_items(self, run_id: int, batch: int = 1000) -> Iterator[Any]:
+        """Stream a run's items in their original order."""
+        pos = -1
+        while True:
+            rows = self.conn.execute(
+                "SELECT pos, hash FROM run_items WHERE run_id = ? AND pos > ? ORDER BY pos LIMIT ?",
+                (run_id, pos, batch),
+            ).fetchall()
+            if not rows:
+                return
+            bodies = self.read_blobs([h for _, h in rows])
+            for p, h in rows:
+                yield bodies[h]
+            pos = rows[-1][0]
+
+    def load_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Rebuild the stored {"timestamp", "result"} object of a run."""
+        row = self.conn.execute(
+            "SELECT timestamp, array_path, envelope FROM runs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if not row:
+            return None
+        ts, path_json, envelope = row
+        result = json.loads(envelope)
+        if path_json is not None:
+            result = _set_array(result, json.loads(path_json), list(self.iter_items(run_id)))
+        return {"timestamp": ts, "result": result}
+
+    def append_run(self, result_obj: Any, key_fields: Optional[List[str]],
+                   hashed: Optional[List[Tuple[str, str, Any]]] = None,
+                   timestamp: Optional[str] = None) -> int:
+        """
+        Record a run, appending only item contents not stored yet.
+
+        Args:
+            result_obj: Full result object
+            key_fields: Fields forming an item's diff key (None = the content hash)
+            hashed: Precomputed (item_key, hash, item) for the result's array
+            timestamp: Run timestamp (default now)
+
+        Returns:
+            New run id
+        """
+        path = _locate_array(result_obj)
+        items = _get_array(result_obj, path) if path is not None else []
+        if hashed is None:
+            hashed = []
+            for it in items:
+                h = _item_hash(it)
+                hashed.append((_key_for_item(it, key_fields) if key_fields is not None else h, h, it))
+        envelope = _set_array(result_obj, path, []) if path is not None else result_obj
+        ts = timestamp or datetime.now().strftime("%Y%m%d-%H%M%S")
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            known = set()
+            distinct = list(dict.fromkeys(h for _, h, _ in hashed))
+            for i in range(0, len(distinct), 500):
+                chunk = distinct[i:i + 500]
+                known.update(r[0] for r in self.conn.execute(
+                    f"SELECT hash FROM blobs WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            fresh = []
+            for _, h, it in hashed:
+                if h not in known:
+                    known.add(h)
+                    fresh.append((h, it))
+            if fresh:
+                self._append_blobs(fresh)
+            cur = self.conn.execute(
+                "INSERT INTO runs (timestamp, count, array_path, envelope, key_fields) VALUES (?, ?, ?, ?, ?)",
+                (ts, len(hashed), json.dumps(path) if path is not None else None,
+                 json.dumps(envelope, ensure_ascii=False, default=str),
+                 json.dumps(list(key_fields)) if key_fields is not None else None),
+            )
+            run_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO run_items (run_id, pos, item_key, hash) VALUES (?, ?, ?, ?)",
+                ((run_id, pos, k, h) for pos, (k, h, _) in enumerate(hashed)),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return run_id
+
+    def _append_blobs(self, blobs: List[Tuple[str, Any]]):
+        segments = self._segments()
+        segment = segments[-1] if segments else 1
+        path = self._segment_path(segment)
+        f = open(path, "ab")
+        try:
+            offset = f.tell()
+            rows = []
+            for h, it in blobs:
+                if offset >= SEGMENT_MAX_BYTES:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    f.close()
+                    segment += 1
+                    f = open(self._segment_path(segment), "ab")
+                    offset = f.tell()
+                line = json.dumps({"h": h, "v": it}, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+                f.write(line)
+                rows.append((h, segment, offset, len(line)))
+                offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            f.close()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO blobs (hash, segment, offset, length) VALUES (?, ?, ?, ?)", rows
+        )
+
+    def compact(self, keep_history: int = 10, force: bool = False) -> Dict[str, int]:
+        """
+        Drop runs beyond the newest `keep_history` and rewrite segments once
+        enough of their bytes are unreferenced (or when `force` is set).
+
+        Returns:
+            Counts of removed runs and blobs and the live/dead byte totals
+        """
+        stats = {"runs_removed": 0, "blobs_removed": 0, "live_bytes": 0, "dead_bytes": 0}
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if keep_history and keep_history > 0:
+                cutoff = self.conn.execute(
+                    "SELECT run_id FROM runs ORDER BY run_id DESC LIMIT 1 OFFSET ?", (keep_history - 1,)
+                ).fetchone()
+                if cutoff:
+                    stats["runs_removed"] = self.conn.execute(
+                        "DELETE FROM runs WHERE run_id < ?", (cutoff[0],)
+                    ).rowcount
+                    self.conn.execute("DELETE FROM run_items WHERE run_id < ?", (cutoff[0],))
+            rewrite = False
+            if not stats["runs_removed"] and not force:
+                # Appending never orphans blobs, so there is nothing to reclaim
+                self.conn.execute("COMMIT")
+                return stats
+            live_bytes, dead_bytes = self.conn.execute(
+                "SELECT COALESCE(SUM(CASE WHEN hash IN (SELECT hash FROM run_items) THEN length END), 0),"
+                "       COALESCE(SUM(CASE WHEN hash NOT IN (SELECT hash FROM run_items) THEN length END), 0)"
+                " FROM blobs"
+            ).fetchone()
+            stats["live_bytes"], stats["dead_bytes"] = live_bytes, dead_bytes
+            total = live_bytes + dead_bytes
+            rewrite = dead_bytes > 0 and (force or dead_bytes >= total * COMPACT_DEAD_RATIO)
+            old_segments = self._segments()
+            if rewrite:
+                stats["blobs_removed"] = self.conn.execute(
+                    "DELETE FROM blobs WHERE hash NOT IN (SELECT hash FROM run_items)"
+                ).rowcount
+                self._rewrite_segments((old_segments[-1] if old_segments else 0) + 1)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        if rewrite:
+            referenced = {r[0] for r in self.conn.execute("SELECT DISTINCT segment FROM blobs")}
+            for segment in old_segments:
+                if segment not in referenced:
+                    try:
+                        self._segment_path(segment).unlink()
+                    except Exception:
+                        pass
+        return stats
+
+    def _rewrite_segments(self, first_segment: int):
+        rows = self.conn.execute(
+            "SELECT hash, segment, offset, length FROM blobs ORDER BY segment, offset"
+        ).fetchall()
+        segment = first_segment
+        out = open(self._segment_path(segment), "wb")
+        handles: Dict[int, Any] = {}
+        moved = []
+        try:
+            offset = 0
+            for h, old_segment, old_offset, length in rows:
+                if offset >= SEGMENT_MAX_BYTES:
+                    out.flush()
+                    os.fsync(out.fileno())
+                    out.close()
+                    segment += 1
+                    out = open(self._segment_path(segment), "wb")
+                    offset = 0
+                src = handles.get(old_segment)
+                if src is None:
+                    src = handles[old_segment] = open(self._segment_path(old_segment), "rb")
+                src.seek(old_offset)
+                out.write(src.read(length))
+                moved.append((segment, offset, h))
+                offset += length
+            out.flush()
+            os.fsync(out.fileno())
+        finally:
+            out.close()
+            for f in handles.values():
+                f.close()
+        self.conn.executemany("UPDATE blobs SET segment = ?, offset = ? WHERE hash = ?", moved)
+
+
+def _legacy_snapshots(d: Path) -> List[Path]:
+    """Snapshot files written before the segment store, oldest first."""
+    files = sorted(x for x in d.glob("*.json") if x.name != "latest.json")
+    latest = d / "latest.json"
+    return files + [latest] if latest.exists() else files
+
+
+def _migrate_legacy(store: ResultStore, d: Path):
+    """
+    Import legacy snapshots into an empty store as runs, then delete them.
+
+    latest.json is only imported when no <ts>.json exists (it is a copy of
+    the newest one). Their key fields are unknown, so the next diff falls
+    back to content hashes. If the store already has runs the files are
+    stale and only deleted; on any error they are kept for load_latest.
+    """
+    files = _legacy_snapshots(d)
+    if not files:
+        return
+    try:
+        if store.latest_run() is None:
+            snapshots = files[:-1] if len(files) > 1 and files[-1].name == "latest.json" else files
+            for p in snapshots:
+                with open(p, "r", encoding="utf-8") as f:
+                    snap = json.load(f)
+                if isinstance(snap, dict):
+                    store.append_run(snap.get("result"), None, timestamp=snap.get("timestamp") or p.stem)
+        for p in files:
+            p.unlink()
     except Exception:
         pass
-    return p
 
 
-def load_latest(key: str) -> Optional[Dict[str, Any]]:
-    d = _store_dir_for(key)
+def _load_legacy_latest(d: Path) -> Optional[Dict[str, Any]]:
+    """Snapshots written before the segment store (latest.json / <ts>.json)."""
     latest = d / "latest.json"
     if latest.exists():
         try:
@@ -107,23 +447,112 @@ def load_latest(key: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-def _extract_array(res: Any) -> List[Any]:
+def _open_store(key: str) -> Tuple[Path, Optional[ResultStore]]:
+    d = _store_dir_for(key)
+    try:
+        store = ResultStore(d)
+    except Exception:
+        return d, None
+    _migrate_legacy(store, d)
+    return d, store
+
+
+def save_snapshot(key: str, result_obj: Any, keep_history: int = 10, key_fields: Optional[List[str]] = None) -> Path:
+    """
+    Append a result as a new run of the key's store.
+
+    Returns:
+        The store directory. Before the segment store this was the path of
+        the written ``<ts>.json`` snapshot; runs now live in its segments and
+        are read back with ``load_latest`` / ``iter_history_items``.
+    """
+    d, store = _open_store(key)
+    if store is None:
+        return d
+    try:
+        store.append_run(result_obj, key_fields or ["href", "title", "url"])
+        store.compact(keep_history)
+    except Exception:
+        pass
+    finally:
+        store.close()
+    return d
+
+
+def load_latest(key: str) -> Optional[Dict[str, Any]]:
+    d, store = _open_store(key)
+    if store is not None:
+        try:
+            run = store.latest_run()
+            if run:
+                return store.load_run(run["run_id"])
+        except Exception:
+            pass
+        finally:
+            store.close()
+    return _load_legacy_latest(d)
+
+
+def list_history(key: str) -> List[Dict[str, Any]]:
+    d, store = _open_store(key)
+    if store is None:
+        return []
+    try:
+        return store.list_runs()
+    finally:
+        store.close()
+
+
+def iter_history_items(key: str, run_id: Optional[int] = None) -> Iterator[Any]:
+    d, store = _open_store(key)
+    if store is None:
+        return
+    try:
+        if run_id is None:
+            run = store.latest_run()
+            if not run:
+                return
+            run_id = run["run_id"]
+        yield from store.iter_items(run_id)
+    finally:
+        store.close()
+
+
+def _locate_array(res: Any) -> Optional[List[str]]:
     if isinstance(res, dict):
         for k in ("links", "articles", "products"):
-            v = res.get(k)
-            if isinstance(v, list):
-                return v
+            if isinstance(res.get(k), list):
+                return [k]
         try:
             pg = res.get("page")
             if isinstance(pg, dict) and isinstance(pg.get("links"), list):
-                return pg.get("links")  # type: ignore[return-value]
+                return ["page", "links"]
         except Exception:
             pass
         if isinstance(res.get("result"), list):
-            return res.get("result")  # type: ignore[return-value]
+            return ["result"]
     if isinstance(res, list):
-        return res
-    return []
+        return []
+    return None
+
+
+def _get_array(res: Any, path: List[str]) -> List[Any]:
+    for k in path:
+        res = res[k]
+    return res
+
+
+def _set_array(res: Any, path: List[str], items: List[Any]) -> Any:
+    if not path:
+        return items
+    return {**res, path[0]: _set_array(res[path[0]], path[1:], items)}
+
+
+def _extract_array(res: Any) -> List[Any]:
+    path = _locate_array(res)
+    if path is None:
+        return []
+    return _get_array(res, path)
 
 
 def _key_for_item(it: Any, fields: List[str]) -> str:
@@ -139,30 +568,31 @@ def _key_for_item(it: Any, fields: List[str]) -> str:
     return json.dumps(it, ensure_ascii=False, sort_keys=True)
 
 
+def _diff_hashed(prev_hashes: Dict[str, str], curr: List[Tuple[str, str, Any]]) -> Tuple[List[Any], List[Tuple[str, Any]], List[str]]:
+    """Diff against a {key: hash} index; returns new items, (key, item) changes and removed keys."""
+    curr_map: Dict[str, Tuple[str, Any]] = {}
+    for k, h, it in curr:
+        curr_map[k] = (h, it)
+    new_items: List[Any] = []
+    changed: List[Tuple[str, Any]] = []
+    for k, (h, it) in curr_map.items():
+        ph = prev_hashes.get(k)
+        if ph is None:
+            new_items.append(it)
+        elif ph != h:
+            changed.append((k, it))
+    removed = [k for k in prev_hashes if k not in curr_map]
+    return new_items, changed, removed
+
+
 def diff(prev: List[Any], curr: List[Any], fields: List[str]) -> Tuple[List[Any], List[Tuple[Any, Any]], List[Any]]:
     prev_map = {}
     for it in prev:
         prev_map[_key_for_item(it, fields)] = it
-    curr_map = {}
-    for it in curr:
-        curr_map[_key_for_item(it, fields)] = it
-    new_items: List[Any] = []
-    changed: List[Tuple[Any, Any]] = []
-    for k, v in curr_map.items():
-        if k not in prev_map:
-            new_items.append(v)
-        else:
-            pv = prev_map[k]
-            try:
-                if json.dumps(pv, sort_keys=True, ensure_ascii=False) != json.dumps(v, sort_keys=True, ensure_ascii=False):
-                    changed.append((pv, v))
-            except Exception:
-                pass
-    removed: List[Any] = []
-    for k, v in prev_map.items():
-        if k not in curr_map:
-            removed.append(v)
-    return new_items, changed, removed
+    prev_hashes = {k: _item_hash(v) for k, v in prev_map.items()}
+    hashed = [(_key_for_item(it, fields), _item_hash(it), it) for it in curr]
+    new_items, changed, removed = _diff_hashed(prev_hashes, hashed)
+    return new_items, [(prev_map[k], v) for k, v in changed], [prev_map[k] for k in removed]
 
 
 def previous_for_context(url: Optional[str], instruction: Optional[str], result_key: Optional[str], key_fields: List[str]) -> Dict[str, Any]:
@@ -174,17 +604,42 @@ def previous_for_context(url: Optional[str], instruction: Optional[str], result_
     return {"key": key, "items": prev_list, "fields": key_fields}
 
 
+def _diff_against_store(store: Optional[ResultStore], d: Path, curr: List[Tuple[str, str, Any]], key_fields: List[str]):
+    """
+    Diff current items against the latest stored run, loading only changed/removed bodies.
+
+    If that run was keyed by other fields its item keys cannot be matched,
+    so items are compared by content hash: edits show up as removed + new.
+    """
+    run = store.latest_run() if store is not None else None
+    if run is None:
+        prev_obj = _load_legacy_latest(d)
+        prev_list = _extract_array(prev_obj.get("result")) if isinstance(prev_obj, dict) else []
+        new_items, changed, removed = diff(prev_list, [it for _, _, it in curr], key_fields)
+        return len(prev_list), new_items, changed, removed
+    prev_hashes = store.item_hashes(run["run_id"])
+    if run["key_fields"] != list(key_fields):
+        prev_hashes = {h: h for h in prev_hashes.values()}
+        curr = [(h, h, it) for _, h, it in curr]
+    new_items, changed_keys, removed_keys = _diff_hashed(prev_hashes, curr)
+    bodies = store.read_blobs([prev_hashes[k] for k, _ in changed_keys] + [prev_hashes[k] for k in removed_keys])
+    changed = [(bodies.get(prev_hashes[k]), it) for k, it in changed_keys]
+    removed = [bodies.get(prev_hashes[k]) for k in removed_keys]
+    return run["count"], new_items, changed, removed
+
+
 def apply_diff_and_store(url: Optional[str], instruction: Optional[str], result_key: Optional[str], result_obj: Any, key_fields: List[str], keep_history: int, mode: str) -> Tuple[Any, Dict[str, Any]]:
     key = compute_key(url, instruction, result_key)
-    prev_obj = load_latest(key)
-    prev_list: List[Any] = []
-    if isinstance(prev_obj, dict):
-        prev_list = _extract_array(prev_obj.get("result"))
+    d, store = _open_store(key)
     curr_list = _extract_array(result_obj)
-    new_items, changed_items, removed_items = diff(prev_list, curr_list, key_fields)
+    hashed = [(_key_for_item(it, key_fields), _item_hash(it), it) for it in curr_list]
+    try:
+        prev_count, new_items, changed_items, removed_items = _diff_against_store(store, d, hashed, key_fields)
+    except Exception:
+        prev_count, new_items, changed_items, removed_items = 0, [it for _, _, it in hashed], [], []
     meta = {
         "store_key": key,
-        "prev_count": len(prev_list),
+        "prev_count": prev_count,
         "curr_count": len(curr_list),
         "new_count": len(new_items),
         "changed_count": len(changed_items),
@@ -225,5 +680,12 @@ def apply_diff_and_store(url: Optional[str], instruction: Optional[str], result_
                 }
     except Exception:
         out_obj = result_obj
-    save_snapshot(key, result_obj, keep_history=keep_history)
+    if store is not None:
+        try:
+            store.append_run(result_obj, key_fields, hashed)
+            store.compact(keep_history)
+        except Exception:
+            pass
+        finally:
+            store.close()
     return out_obj, meta
@@ -28,6 +28,7 @@ from curllm_core.captcha_slider import attempt_slider_challenge
 from curllm_core.slider_plugin import try_external_slider_solver
 from curllm_core.result_store import previous_for_context as _previous_for_context
 from curllm_core.tool_retry import ToolRetryManager
+from curllm_core.page_context import IncrementalDomTracker
 from curllm_core.task_runner_tools import execute_tool as _execute_tool
 from curllm_core.task_runner_early import (
     smart_intent_check as _smart_intent_check,
@@ -319,13 +320,40 @@ async def run_task(
     except Exception:
         prev_ctx = None
 
-    # Try DSL Executor FIRST (uses knowledge base for best strategy)
+    # Race the read-only extractors concurrently; first valid result wins
+    raced: set = set()
+    if config.extractor_race_enabled and ("product" in lower_instr or "produkt" in lower_instr):
+        try:
+            from curllm_core.extraction_race import ExtractionRace
+            
+            race = ExtractionRace(
+                page,
+                instruction,
+                kb_path=config.dsl_knowledge_db if config.dsl_enabled else None,
+                run_logger=run_logger,
+                timeout=config.extractor_race_timeout,
+            )
+            outcome = await race.run(url or page.url)
+            raced = {name for name, r in race.racers.items() if r.get("status") != "cancelled"}
+            if outcome:
+                result["data"] = outcome.to_data()
+                await page.close()
+                return result
+        except Exception as e:
+            if run_logger:
+                run_logger.log_text(f"⚠️ Extraction race failed: {e}")
+
+    # Sequential extractor chain (opt-in, or as the race's fallback)
+    chain_enabled = config.extractor_chain_enabled or config.extractor_race_enabled
+
+    # Try DSL Executor FIRST (uses knowledge base for best strategy; racers that
+    # already ran on this page are not retried)
     dsl_keywords = ['product', 'produkt', 'extract', 'spec', 'parametr', 'techniczne', 'dane']
-    if config.dsl_enabled and any(kw in lower_instr for kw in dsl_keywords):
+    if chain_enabled and config.dsl_enabled and any(kw in lower_instr for kw in dsl_keywords):
         if run_logger:
             run_logger.log_text("📋 DSL Executor enabled - using knowledge base for optimal strategy")
         try:
-            from .dsl import DSLExecutor
+            from curllm_core.dsl import DSLExecutor
             
             dsl_executor = DSLExecutor(
                 page=page,
@@ -338,7 +366,8 @@ async def run_task(
             dsl_result = await dsl_executor.execute(
                 url=url or page.url,
                 instruction=instruction,
-                max_fallbacks=config.dsl_max_fallbacks
+                max_fallbacks=config.dsl_max_fallbacks,
+                skip_algorithms=sorted(raced)
             )
             
             if dsl_result.success and dsl_result.data:
@@ -380,11 +409,11 @@ async def run_task(
                 run_logger.log_text(f"⚠️ DSL Executor failed: {e}")
 
     # Try LLM-guided extractor (LLM makes atomic decisions)
-    if config.llm_guided_extractor_enabled and ("product" in lower_instr or "produkt" in lower_instr):
+    if chain_enabled and config.llm_guided_extractor_enabled and ("product" in lower_instr or "produkt" in lower_instr):
         if run_logger:
             run_logger.log_text("🤖 LLM-Guided Extractor enabled - LLM makes decisions at each atomic step")
         try:
-            from .llm_guided_extractor import llm_guided_extract
+            from curllm_core.llm_guided_extractor import llm_guided_extract
             
             result_data = await llm_guided_extract(instruction, page, executor.llm, run_logger)
             
@@ -402,12 +431,12 @@ async def run_task(
             if run_logger:
                 run_logger.log_text(f"⚠️ LLM-Guided Extractor failed: {e}")
     
-    # Try dynamic detector first (generic, adaptive)
-    if config.iterative_extractor_enabled and ("product" in lower_instr or "produkt" in lower_instr):
+    # Try dynamic detector first (generic, adaptive; skipped if it already lost the race)
+    if chain_enabled and config.iterative_extractor_enabled and "dynamic_detector" not in raced and ("product" in lower_instr or "produkt" in lower_instr):
         if run_logger:
             run_logger.log_text("🔍 Dynamic Detector enabled - adaptive pattern recognition")
         try:
-            from .dynamic_detector import dynamic_extract
+            from curllm_core.dynamic_detector import dynamic_extract
             
             result_data = await dynamic_extract(page, instruction, run_logger)
             
@@ -428,11 +457,11 @@ async def run_task(
                 run_logger.log_text(f"⚠️ Dynamic Detector failed: {e}")
     
     # Try iterative extractor second (pure JS, fast fallback)
-    if config.iterative_extractor_enabled and ("product" in lower_instr or "produkt" in lower_instr):
+    if chain_enabled and config.iterative_extractor_enabled and ("product" in lower_instr or "produkt" in lower_instr):
         if run_logger:
             run_logger.log_text("🔄 Iterative Extractor enabled - trying atomic DOM queries")
         try:
-            from .iterative_extractor import iterative_extract
+            from curllm_core.iterative_extractor import iterative_extract
             
             result_data = await iterative_extract(instruction, page, executor.llm, run_logger)
             
@@ -535,6 +564,8 @@ async def run_task(
     
     # Initialize Tool Retry Manager to prevent infinite loops
     retry_manager = ToolRetryManager(max_same_error=2)
+    # Incremental context: resend only DOM regions that changed between steps
+    dom_tracker = IncrementalDomTracker() if runtime.get("incremental_context") else None
     
     for step in range(config.max_steps):
         result["steps"] = step + 1
@@ -564,7 +595,7 @@ async def run_task(
             pass
 
         _t_pc = time.time()
-        page_context = await _step_page_context(executor, page, runtime, last_screenshot_path, last_visual_analysis, form_focused=is_form_task)
+        page_context = await _step_page_context(executor, page, runtime, last_screenshot_path, last_visual_analysis, form_focused=is_form_task, tracker=dom_tracker, run_logger=run_logger)
         try:
             run_logger.log_kv("fn:_extract_page_context_ms", str(int((time.time() - _t_pc) * 1000)))
         except Exception:
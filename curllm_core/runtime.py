@@ -37,6 +37,7 @@ DEFAULT_RUNTIME: Dict[str, Any] = {
     "include_dom_html": _env_bool("CURLLM_INCLUDE_DOM_HTML", True),
     "dom_max_chars": _env_int("CURLLM_DOM_MAX_CHARS", 60000),
     "dom_max_cap": _env_int("CURLLM_DOM_MAX_CAP", 60000),
+    "incremental_context": _env_bool("CURLLM_INCREMENTAL_CONTEXT", False),
     "smart_click": _env_bool("CURLLM_SMART_CLICK", True),
     "action_timeout_ms": _env_int("CURLLM_ACTION_TIMEOUT_MS", 22000),
     "wait_after_click_ms": _env_int("CURLLM_WAIT_AFTER_CLICK_MS", 1800),
@@ -2,18 +2,68 @@
 Screenshot utilities.
 
 Core capture functions are in curllm_core.streamware.components.screenshot
-This file adds organization/cleanup utilities.
+This file adds the step screenshot pipeline and organization/cleanup utilities.
+
+Step screenshots are captured as PNG bytes and handed to a small thread
+pool, which decodes them, compares a perceptual hash (256-bit dHash) with
+the previous frame of the same directory, and only then encodes
+(PNG/JPEG/WebP) and writes the file - the event loop driving the browser
+never waits on image encoding or disk. Frames perceptually identical to the
+previous one are not written; the previous frame's path is returned instead.
+Every frame is recorded in ``screenshots.jsonl`` next to the images.
+
+Usage:
+    path = await take_screenshot(page, step, target_dir=domain_dir)
+    path = await take_screenshot(page, step, target_dir=domain_dir, fmt="webp", mode="element", selector="form")
+    removed = apply_screenshot_retention(max_total_mb=500, max_age_days=7)
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import io
+import json
+import os
 import shutil
+import threading
+import time
 import logging
 
 from .config import config
 
 logger = logging.getLogger(__name__)
 
+FRAME_INDEX = "screenshots.jsonl"
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+IMAGE_MIMETYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp"}
+_EXTENSIONS = {"png": "png", "jpeg": "jpg", "jpg": "jpg", "webp": "webp"}
+_HASH_SIZE = 16  # dHash grid: 16x16 = 256 bits
+_RETENTION_INTERVAL = 600.0
+
+_encoder: Optional[ThreadPoolExecutor] = None
+_encoder_lock = threading.Lock()
+# target dir -> (dhash, image size, path) of its last written frame
+_last_frames: Dict[str, Tuple[int, Tuple[int, int], str]] = {}
+_dir_locks: Dict[str, threading.Lock] = {}
+_last_retention = 0.0
+
+
+def _get_encoder() -> ThreadPoolExecutor:
+    global _encoder
+    with _encoder_lock:
+        if _encoder is None:
+            _encoder = ThreadPoolExecutor(
+                max_workers=int(os.getenv("CURLLM_SCREENSHOT_WORKERS", "2")),
+                thread_name_prefix="screenshot-encode",
+            )
+        return _encoder
+
+
+def _dir_lock(key: str) -> threading.Lock:
+    with _encoder_lock:
+        return _dir_locks.setdefault(key, threading.Lock())
+
 
 # Lazy re-exports to avoid circular imports
 def capture_page(*args, **kwargs):
@@ -51,13 +101,184 @@ def get_run_screenshot_dir(domain: str, run_id: str) -> Path:
     return run_dir
 
 
-async def take_screenshot(page, step: int, target_dir: Optional[Path] = None) -> str:
-    """Take screenshot for a specific step."""
-    tdir = Path(target_dir) if target_dir else config.screenshot_dir
+def dhash(image, size: int = _HASH_SIZE) -> int:
+    """
+    Difference hash of a PIL image.
+
+    Args:
+        image: PIL image
+        size: Grid size (size*size bits)
+
+    Returns:
+        Hash as int; compare with ``hamming(a, b)``
+    """
+    from PIL import Image
+    gray = image.convert("L").resize((size + 1, size), Image.BILINEAR)
+    px = gray.tobytes()
+    bits = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (px[offset + col] > px[offset + col + 1])
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count("1")
+
+
+def _last_frame(tdir: Path) -> Optional[Tuple[int, Tuple[int, int], str]]:
+    """Last written frame of a directory (memory, else its frame index)"""
+    key = str(tdir)
+    if key in _last_frames:
+        return _last_frames[key]
+    index = tdir / FRAME_INDEX
+    if not index.exists():
+        return None
+    try:
+        with open(index, "rb") as f:
+            f.seek(max(0, index.stat().st_size - 4096))
+            lines = f.read().decode("utf-8", errors="replace").splitlines()
+        for line in reversed(lines):
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get("hash") and not rec.get("duplicate_of") and Path(rec["path"]).exists():
+                frame = (int(rec["hash"], 16), tuple(rec["size"]), rec["path"])
+                _last_frames[key] = frame
+                return frame
+    except OSError:
+        pass
+    return None
+
+
+def _encode_and_write(
+    png: bytes,
+    tdir: Path,
+    stem: str,
+    fmt: str,
+    quality: int,
+    dedup: bool,
+    max_distance: int,
+    step: Any,
+) -> str:
+    """Dedup, encode and write one frame (runs in the encoder pool)"""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(png))
+    image.load()
+    frame_hash = dhash(image)
+    with _dir_lock(str(tdir)):
+        previous = _last_frame(tdir) if dedup else None
+        record = {"step": step, "ts": time.time(), "hash": f"{frame_hash:064x}", "size": list(image.size)}
+        if previous and previous[1] == image.size and hamming(previous[0], frame_hash) <= max_distance:
+            record.update(path=previous[2], duplicate_of=previous[2], bytes=0)
+            _append_frame(tdir, record)
+            logger.debug(f"Screenshot step {step} identical to {previous[2]}, not written")
+            return previous[2]
+
+        path = tdir / f"{stem}.{_EXTENSIONS[fmt]}"
+        if fmt == "png":
+            data = png
+        else:
+            buf = io.BytesIO()
+            if fmt in ("jpeg", "jpg"):
+                image.convert("RGB").save(buf, "JPEG", quality=quality, optimize=True)
+            else:
+                image.save(buf, "WEBP", quality=quality, method=4)
+            data = buf.getvalue()
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        record.update(path=str(path), bytes=len(data))
+        _append_frame(tdir, record)
+        _last_frames[str(tdir)] = (frame_hash, image.size, str(path))
+        return str(path)
+
+
+def _append_frame(tdir: Path, record: Dict[str, Any]):
+    with open(tdir / FRAME_INDEX, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+async def capture_screenshot(
+    page,
+    target_dir: Path,
+    stem: str,
+    step: Any = None,
+    fmt: Optional[str] = None,
+    quality: Optional[int] = None,
+    mode: Optional[str] = None,
+    selector: Optional[str] = None,
+    clip: Optional[Dict[str, float]] = None,
+    dedup: Optional[bool] = None,
+    png: Optional[bytes] = None,
+) -> str:
+    """
+    Capture a screenshot through the pipeline.
+
+    Args:
+        page: Playwright page
+        target_dir: Output directory (frames are deduplicated per directory)
+        stem: File name without extension
+        step: Step number recorded in the frame index
+        fmt: png | jpeg | webp (default config.screenshot_format)
+        quality: JPEG/WebP quality (default config.screenshot_quality)
+        mode: viewport | full_page | element | clip (default config.screenshot_mode)
+        selector: Element selector for mode="element" (viewport if not found)
+        clip: {"x", "y", "width", "height"} for mode="clip"
+        dedup: Skip frames identical to the previous one (default config.screenshot_dedup)
+        png: Already captured PNG bytes to store instead of capturing again
+
+    Returns:
+        Path of the written frame, or of the previous frame if this one was a duplicate
+    """
+    fmt = (fmt or config.screenshot_format).lower()
+    if fmt not in _EXTENSIONS:
+        logger.warning(f"Unknown screenshot format {fmt!r}, using png")
+        fmt = "png"
+    mode = (mode or config.screenshot_mode).lower()
+    tdir = Path(target_dir)
     tdir.mkdir(parents=True, exist_ok=True)
-    filename = tdir / f"step_{step}_{datetime.now().timestamp()}.png"
-    await page.screenshot(path=str(filename))
-    return str(filename)
+
+    if png is None and mode == "element" and selector:
+        element = await page.query_selector(selector)
+        if element is not None:
+            png = await element.screenshot(type="png")
+    if png is None:
+        kwargs: Dict[str, Any] = {"type": "png", "full_page": mode == "full_page"}
+        if mode == "clip" and clip:
+            kwargs["clip"] = clip
+        png = await page.screenshot(**kwargs)
+
+    loop = asyncio.get_running_loop()
+    path = await loop.run_in_executor(
+        _get_encoder(),
+        _encode_and_write,
+        png,
+        tdir,
+        stem,
+        fmt,
+        int(quality if quality is not None else config.screenshot_quality),
+        config.screenshot_dedup if dedup is None else dedup,
+        config.screenshot_dedup_distance,
+        step,
+    )
+    _maybe_apply_retention()
+    return path
+
+
+async def take_screenshot(page, step: int, target_dir: Optional[Path] = None, **options) -> str:
+    """
+    Take screenshot for a specific step.
+
+    Extra keyword options (fmt, quality, mode, selector, clip, dedup, png) are
+    passed to ``capture_screenshot``.
+    """
+    tdir = Path(target_dir) if target_dir else config.screenshot_dir
+    return await capture_screenshot(page, tdir, f"step_{step}_{datetime.now().timestamp()}", step=step, **options)
 
 
 async def take_screenshot_organized(
@@ -65,7 +286,8 @@ async def take_screenshot_organized(
     step: int, 
     domain: str, 
     run_id: str,
-    debug_name: Optional[str] = None
+    debug_name: Optional[str] = None,
+    **options
 ) -> str:
     """
     Take screenshot with organized directory structure per run.
@@ -76,6 +298,7 @@ async def take_screenshot_organized(
         domain: Domain name
         run_id: Run identifier
         debug_name: Optional debug screenshot name (e.g., "before_submit")
+        **options: fmt, quality, mode, selector, clip, dedup (see ``capture_screenshot``)
         
     Returns:
         Path to saved screenshot
@@ -83,55 +306,163 @@ async def take_screenshot_organized(
     run_dir = get_run_screenshot_dir(domain, run_id)
     
     if debug_name:
-        filename = run_dir / f"debug_{debug_name}_{datetime.now().timestamp()}.png"
+        stem = f"debug_{debug_name}_{datetime.now().timestamp()}"
+        # Debug shots are taken on purpose, keep them even if nothing changed
+        options.setdefault("dedup", False)
     else:
-        filename = run_dir / f"step_{step}.png"
+        stem = f"step_{step}"
     
-    await page.screenshot(path=str(filename))
-    logger.debug(f"Screenshot saved: {filename}")
-    return str(filename)
+    path = await capture_screenshot(page, run_dir, stem, step=step, **options)
+    logger.debug(f"Screenshot saved: {path}")
+    return path
+
+
+def _maybe_apply_retention():
+    """Run the configured retention policy in the encoder pool, at most every 10 minutes"""
+    global _last_retention
+    if not (config.screenshot_max_total_mb or config.screenshot_max_age_days):
+        return
+    now = time.monotonic()
+    if _last_retention and now - _last_retention < _RETENTION_INTERVAL:
+        return
+    _last_retention = now
+    _get_encoder().submit(
+        apply_screenshot_retention,
+        max_total_mb=config.screenshot_max_total_mb or None,
+        max_age_days=config.screenshot_max_age_days or None,
+    )
 
 
-def cleanup_old_screenshots(max_age_days: int = 7) -> int:
+def _compact_frame_index(tdir: Path):
+    """Drop records of removed frames from a directory's screenshots.jsonl"""
+    index = tdir / FRAME_INDEX
+    with _dir_lock(str(tdir)):
+        try:
+            with open(index, encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        kept = []
+        for line in lines:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if Path(rec.get("duplicate_of") or rec.get("path") or "").is_file():
+                kept.append(line)
+        if len(kept) == len(lines):
+            return
+        try:
+            if not kept:
+                index.unlink()
+                return
+            tmp = index.with_name(index.name + ".tmp")
+            tmp.write_text("".join(kept), encoding="utf-8")
+            os.replace(tmp, index)
+        except OSError as e:
+            logger.warning(f"Failed to compact {index}: {e}")
+
+
+def _retention_units(base: Path):
+    """(mtime, size, path) of every run directory and loose image under base"""
+    units = []
+    for domain_dir in base.iterdir():
+        if not domain_dir.is_dir():
+            # Images written straight into the root (take_screenshot without target_dir)
+            try:
+                if domain_dir.is_file() and domain_dir.suffix.lower() in IMAGE_SUFFIXES:
+                    st = domain_dir.stat()
+                    units.append((st.st_mtime, st.st_size, domain_dir))
+            except OSError:
+                pass
+            continue
+        for entry in domain_dir.iterdir():
+            try:
+                if entry.is_dir() and entry.name.startswith("run-"):
+                    size = sum(f.stat().st_size for f in entry.rglob("*") if f.is_file())
+                    units.append((entry.stat().st_mtime, size, entry))
+                elif entry.is_file() and entry.suffix.lower() in IMAGE_SUFFIXES:
+                    st = entry.stat()
+                    units.append((st.st_mtime, st.st_size, entry))
+            except OSError:
+                continue
+    return units
+
+
+def apply_screenshot_retention(
+    max_total_mb: Optional[float] = None,
+    max_age_days: Optional[float] = None,
+    base_dir: Optional[Path] = None,
+) -> int:
     """
-    Remove screenshots older than max_age_days.
-    
+    Bound the screenshot directory by age and total size.
+
+    Units are run directories (``<domain>/run-*``) and loose images directly
+    in a domain directory or in the screenshot root. Units older than ``max_age_days`` are removed,
+    then the oldest remaining units until the total is within ``max_total_mb``.
+    Records of removed frames are dropped from the ``screenshots.jsonl``
+    of their directory, so they are no longer used for deduplication.
+
     Args:
-        max_age_days: Maximum age in days before deletion
-        
+        max_total_mb: Size budget in MB (None = unbounded)
+        max_age_days: Maximum age in days (None = no age limit)
+        base_dir: Screenshot root (default config.screenshot_dir)
+
     Returns:
-        Number of directories removed
+        Number of removed units
     """
-    base = Path(config.screenshot_dir)
+    base = Path(base_dir or config.screenshot_dir)
     if not base.exists():
         return 0
     
-    cutoff = datetime.now() - timedelta(days=max_age_days)
-    removed_count = 0
+    units = sorted(_retention_units(base), key=lambda u: u[0], reverse=True)
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).timestamp() if max_age_days else None
+    budget = max_total_mb * 1024 * 1024 if max_total_mb else None
     
-    # Find all run-* directories
-    for domain_dir in base.iterdir():
-        if not domain_dir.is_dir():
+    removed_count = 0
+    total = 0
+    touched = set()
+    for mtime, size, path in units:
+        total += size
+        expired = cutoff is not None and mtime < cutoff
+        over_budget = budget is not None and total > budget
+        if not (expired or over_budget):
             continue
-            
-        for run_dir in domain_dir.glob("run-*"):
-            if not run_dir.is_dir():
-                continue
-            
-            # Check directory modification time
-            mtime = datetime.fromtimestamp(run_dir.stat().st_mtime)
-            
-            if mtime < cutoff:
-                try:
-                    shutil.rmtree(run_dir)
-                    removed_count += 1
-                    logger.info(f"Removed old screenshot dir: {run_dir}")
-                except Exception as e:
-                    logger.warning(f"Failed to remove {run_dir}: {e}")
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+                touched.add(path.parent)
+            removed_count += 1
+            total -= size
+            logger.info(f"Removed old screenshots: {path}")
+        except Exception as e:
+            logger.warning(f"Failed to remove {path}: {e}")
     
+    for tdir in touched:
+        _compact_frame_index(tdir)
+    # Forget cached last frames that were deleted
+    for key, frame in list(_last_frames.items()):
+        if not Path(frame[2]).exists():
+            _last_frames.pop(key, None)
     return removed_count
 
 
+def cleanup_old_screenshots(max_age_days: int = 7, max_total_mb: Optional[float] = None) -> int:
+    """
+    Remove screenshots older than max_age_days (and beyond max_total_mb).
+    
+    Args:
+        max_age_days: Maximum age in days before deletion
+        max_total_mb: Optional size budget, see ``apply_screenshot_retention``
+        
+    Returns:
+        Number of run directories/images removed
+    """
+    return apply_screenshot_retention(max_total_mb=max_total_mb, max_age_days=max_age_days)
+
+
 def get_latest_run_screenshots(domain: str, limit: int = 5) -> list[Path]:
     """
     Get paths to the most recent run screenshot directories for a domain.
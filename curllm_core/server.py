@@ -6,10 +6,14 @@ import json
 from pathlib import Path
 from typing import List
 from .proxy import REGISTRY_JSON, REGISTRY_TXT
+from .proxy_pool import get_proxy_pool
 from flask_cors import CORS
 
 from .config import config
 from .executor import CurllmExecutor
+from .async_runner import get_async_runner, ServerBusyError
+from .job_api import jobs_bp, get_job_workers, start_job_workers as _start_job_workers, stop_job_workers
+from .job_queue import JobWorkerPool, get_job_queue
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -17,6 +21,7 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)
+app.register_blueprint(jobs_bp)
 
 executor = CurllmExecutor()
 
@@ -29,40 +34,55 @@ def health_check():
         "version": "1.0.0",
     })
 
+def _workflow_kwargs(data: dict) -> dict:
+    """Map an /api/execute (or job) body to executor.execute_workflow arguments."""
+    use_v1 = data.get('use_v1', False)  # Legacy v1 API (deprecated)
+    return dict(
+        instruction=data.get('data', ''),
+        url=data.get('url'),
+        visual_mode=data.get('visual_mode', False),
+        stealth_mode=data.get('stealth_mode', False),
+        captcha_solver=data.get('captcha_solver', False),
+        use_bql=data.get('use_bql', False),
+        headers=data.get('headers', {}),
+        proxy=data.get('proxy'),
+        session_id=data.get('session_id'),
+        wordpress_config=data.get('wordpress_config'),
+        use_v2=not use_v1,  # v2 is now default
+    )
+
 @app.route('/api/execute', methods=['POST'])
 def execute():
     data = request.get_json() or {}
-    instruction = data.get('data', '')
-    url = data.get('url')
-    visual_mode = data.get('visual_mode', False)
-    stealth_mode = data.get('stealth_mode', False)
-    captcha_solver = data.get('captcha_solver', False)
-    use_bql = data.get('use_bql', False)
-    use_v1 = data.get('use_v1', False)  # Legacy v1 API (deprecated)
-    use_v2 = not use_v1  # v2 is now default
-    headers = data.get('headers', {})
-    proxy = data.get('proxy')
-    session_id = data.get('session_id')
-    wordpress_config = data.get('wordpress_config')
+    kwargs = _workflow_kwargs(data)
+
+    def _workflow():
+        return executor.execute_workflow(**kwargs)
+
+    if config.server_mode == "async":
+        try:
+            return get_async_runner().run(_workflow)
+        except ServerBusyError as e:
+            resp = jsonify({
+                "success": False,
+                "error": str(e),
+                "queue_depth": e.queue_depth,
+                "retry_after": e.retry_after,
+            })
+            resp.status_code = 429
+            resp.headers["Retry-After"] = str(e.retry_after)
+            return resp
 
     def _run_in_new_loop():
         loop = asyncio.new_event_loop()
         try:
             asyncio.set_event_loop(loop)
-            return loop.run_until_complete(executor.execute_workflow(
-                instruction=instruction,
-                url=url,
-                visual_mode=visual_mode,
-                stealth_mode=stealth_mode,
-                captcha_solver=captcha_solver,
-                use_bql=use_bql,
-                headers=headers,
-                proxy=proxy,
-                session_id=session_id,
-                wordpress_config=wordpress_config,
-                use_v2=use_v2,
-            ))
+            return loop.run_until_complete(_workflow())
         finally:
+            try:
+                loop.run_until_complete(executor.aclose())
+            except Exception:
+                pass
             try:
                 loop.run_until_complete(asyncio.sleep(0))
             except Exception:
@@ -76,6 +96,48 @@ def execute():
     return _run_in_new_loop()
 
 
+@app.route('/api/server/stats', methods=['GET'])
+def server_stats():
+    workers = get_job_workers()
+    return jsonify({
+        "mode": config.server_mode,
+        "runner": get_async_runner().get_stats() if config.server_mode == "async" else None,
+        "browser_pool": _browser_pool_stats(),
+        "jobs": workers.get_stats() if workers else None,
+        "proxies": get_proxy_pool().get_stats(),
+    })
+
+
+# Durable job queue: POST /api/jobs returns at once, workers run jobs on the runner loop
+# (endpoints and worker lifecycle live in job_api, shared with curllm_server)
+async def _run_job(payload: dict):
+    return await executor.execute_workflow(**_workflow_kwargs(payload))
+
+
+def start_job_workers() -> JobWorkerPool | None:
+    """Start the job workers on the async runner loop (no-op without workers or async mode)."""
+    return _start_job_workers(_run_job)
+
+
+def _browser_pool_stats():
+    if not config.browser_pool_enabled:
+        return None
+    from .browser_pool import get_browser_pool
+    return get_browser_pool().get_stats()
+
+
+def drain_server(timeout: float | None = None) -> bool:
+    """Stop admitting jobs and wait for in-flight async jobs to finish."""
+    if config.server_mode != "async":
+        return True
+    # Running jobs that miss the deadline go back to the queue for the next start
+    stop_job_workers(timeout)
+    return get_async_runner().drain(
+        timeout=config.server_drain_timeout if timeout is None else timeout,
+        finalizer=executor.aclose,
+    )
+
+
 @app.route('/api/proxy/register', methods=['POST'])
 def proxy_register():
     try:
@@ -231,9 +293,10 @@ def list_models():
 def get_screenshot(filename):
     from flask import send_file
     from pathlib import Path
+    from .screenshots import IMAGE_MIMETYPES
     filepath = (config.screenshot_dir / filename)
     if filepath.exists():
-        return send_file(str(filepath), mimetype='image/png')
+        return send_file(str(filepath), mimetype=IMAGE_MIMETYPES.get(filepath.suffix.lower()))
     return jsonify({"error": "Screenshot not found"}), 404
 
 
@@ -250,4 +313,38 @@ def run_server():
     logger.info("Visual mode: Available")
     logger.info("Stealth mode: Available")
     logger.info(f"CAPTCHA solver: {'Enabled' if __import__('os').getenv('CAPTCHA_API_KEY') else 'Local OCR only'}")
-    app.run(host='0.0.0.0', port=config.api_port, debug=False, use_reloader=False)
+    if config.server_mode == "async":
+        runner = get_async_runner().start()
+        logger.info(f"Execution mode: async (concurrency={runner.max_concurrency}, queue={runner.max_queue})")
+        if config.browser_pool_enabled:
+            try:
+                from .browser_pool import get_browser_pool
+                runner.run(lambda: get_browser_pool().start(executor.stealth_config, config))
+                logger.info(f"Browser pool warmed: {get_browser_pool().get_stats()}")
+            except Exception as e:
+                logger.warning(f"Browser pool warm-up failed: {e}")
+        if start_job_workers():
+            logger.info(f"Job queue: {config.job_workers} workers on {get_job_queue().db_path}")
+        _install_drain_handlers()
+    else:
+        logger.info("Execution mode: loop per request")
+    app.run(host='0.0.0.0', port=config.api_port, debug=False, use_reloader=False, threaded=True)
+
+
+def _install_drain_handlers():
+    import atexit
+    import signal
+    import sys
+
+    atexit.register(drain_server)
+
+    def _on_sigterm(signum, frame):
+        logger.info("SIGTERM received, draining in-flight jobs...")
+        drain_server()
+        sys.exit(0)
+
+    try:
+        signal.signal(signal.SIGTERM, _on_sigterm)
+    except ValueError:
+        # Not in main thread (e.g. embedded); rely on atexit only
+        pass
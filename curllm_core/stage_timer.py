@@ -0,0 +1,151 @@
+"""
+Stage Timer - opt-in per-stage timing of a workflow run
+
+Hot paths are wrapped in named stages (browser_setup, page_open,
+context_extraction, llm_wait, extraction). Nothing is recorded unless a
+``StageRecorder`` is active in the current context, so production runs
+only pay for one context-variable lookup per stage.
+
+Stages nest: every stage reports its total time and its self time (total
+minus time spent in nested stages), so e.g. ``extraction`` self time is
+what the task runner spends outside page loads, context extraction and
+LLM calls. Counters (prompt sizes, ...) can be attached to a stage.
+
+The recorder follows asyncio tasks spawned inside the run (context
+variables are copied into new tasks), so concurrent runs each get their
+own numbers.
+
+Usage:
+    from curllm_core.stage_timer import StageRecorder, stage, timed_stage
+
+    with StageRecorder() as rec:
+        await executor.execute_workflow(instruction, url)
+    rec.summary()   # {"stages": {"page_open": {"count", "total_ms", "self_ms", "max_ms"}, ...},
+                    #  "counters": {"llm_wait.prompt_chars": 12345, ...}}
+
+    with stage("llm_wait", prompt_chars=len(prompt)):
+        ...
+
+    @timed_stage("context_extraction")
+    async def extract_page_context(page, ...): ...
+"""
+
+import functools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+_recorder: ContextVar[Optional["StageRecorder"]] = ContextVar("curllm_stage_recorder", default=None)
+_frame: ContextVar[Optional["_Frame"]] = ContextVar("curllm_stage_frame", default=None)
+
+
+class _Frame:
+    __slots__ = ("name", "child_ms")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.child_ms = 0.0
+
+
+class StageRecorder:
+    """Collects stage timings and counters for one run"""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._token = None
+
+    def __enter__(self) -> "StageRecorder":
+        self._token = _recorder.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _recorder.reset(self._token)
+        self._token = None
+        return False
+
+    def add(self, name: str, total_ms: float, self_ms: float):
+        """Record one finished stage"""
+        with self._lock:
+            s = self.stages.setdefault(name, {"count": 0, "total_ms": 0.0, "self_ms": 0.0, "max_ms": 0.0})
+            s["count"] += 1
+            s["total_ms"] += total_ms
+            s["self_ms"] += max(0.0, self_ms)
+            s["max_ms"] = max(s["max_ms"], total_ms)
+
+    def count(self, name: str, value: float = 1):
+        """Add to a counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        """Stages and counters with times rounded to 0.1 ms"""
+        with self._lock:
+            stages = {
+                name: {k: (round(v, 1) if k != "count" else int(v)) for k, v in s.items()}
+                for name, s in self.stages.items()
+            }
+            return {"stages": stages, "counters": dict(self.counters)}
+
+
+def current_recorder() -> Optional[StageRecorder]:
+    """The recorder active in this context, if any"""
+    return _recorder.get()
+
+
+class stage:
+    """
+    Time a block as a named stage (no-op without an active recorder).
+
+    Keyword arguments are added to counters named ``<stage>.<key>``.
+    """
+
+    __slots__ = ("name", "counters", "_rec", "_frame", "_token", "_t0")
+
+    def __init__(self, name: str, **counters: float):
+        self.name = name
+        self.counters = counters
+        self._rec = None
+
+    def __enter__(self):
+        rec = _recorder.get()
+        if rec is None:
+            return self
+        self._rec = rec
+        self._frame = _Frame(self.name)
+        self._token = _frame.set(self._frame)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        rec = self._rec
+        if rec is None:
+            return False
+        total_ms = (time.perf_counter() - self._t0) * 1000
+        _frame.reset(self._token)
+        parent = _frame.get()
+        if parent is not None:
+            parent.child_ms += total_ms
+        rec.add(self.name, total_ms, total_ms - self._frame.child_ms)
+        for key, value in self.counters.items():
+            rec.count(f"{self.name}.{key}", value)
+        self._rec = None
+        return False
+
+
+def timed_stage(name: str):
+    """Decorator timing every call of an async function as stage `name`"""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if _recorder.get() is None:
+                return await fn(*args, **kwargs)
+            with stage(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -21,13 +21,15 @@ from .helpers import (
     pipeline,
     metrics,
     batch_process,
+    BatchProcessor,
+    JSONLSink,
     describe_component,
     list_available_components
 )
 from .yaml_runner import YAMLFlowRunner, run_yaml_flow, validate_yaml_flow
 
-# Auto-register built-in components
-from .components import curllm, web, file, transform
+# Built-in components register on first lookup (see registry.BUILTIN_SCHEMES)
+from . import components
 
 __all__ = [
     # Core classes
@@ -64,6 +66,8 @@ __all__ = [
     "pipeline",
     "metrics",
     "batch_process",
+    "BatchProcessor",
+    "JSONLSink",
     "describe_component",
     "list_available_components",
     
@@ -15,37 +15,44 @@ Components:
 - dom_fix     - DOM analysis and fixes
 """
 
-from .curllm import CurLLMComponent, CurLLMStreamComponent
-from .web import WebComponent, HTTPComponent
-from .file import FileComponent
-from .transform import TransformComponent, JSONPathComponent
-from .decision import (
-    DOMAnalyzeComponent,
-    ActionPlanComponent,
-    ActionValidateComponent,
-    DecisionTreeComponent
-)
-from .dom_fix import (
-    DOMSnapshotComponent,
-    DOMDiffComponent,
-    DOMValidateComponent,
-    FieldMapperComponent
-)
+from curllm_core.lazy_imports import lazy_exports
 
-# New atomic components
-from . import form
-from . import extraction
-from . import navigation
-from . import captcha
-from . import screenshot
-from . import dom
-from . import bql
-from . import llm
-from . import vision
-from . import browser
-from . import page
-from . import data
-from . import config as config_component
+# Imported on first attribute access; URI schemes of the core components
+# register on first lookup (see registry.BUILTIN_SCHEMES)
+__getattr__, __dir__ = lazy_exports(__name__, {
+    # Core components
+    "CurLLMComponent": ".curllm:CurLLMComponent",
+    "CurLLMStreamComponent": ".curllm:CurLLMStreamComponent",
+    "WebComponent": ".web:WebComponent",
+    "HTTPComponent": ".web:HTTPComponent",
+    "FileComponent": ".file:FileComponent",
+    "TransformComponent": ".transform:TransformComponent",
+    "JSONPathComponent": ".transform:JSONPathComponent",
+    # Decision components
+    "DOMAnalyzeComponent": ".decision:DOMAnalyzeComponent",
+    "ActionPlanComponent": ".decision:ActionPlanComponent",
+    "ActionValidateComponent": ".decision:ActionValidateComponent",
+    "DecisionTreeComponent": ".decision:DecisionTreeComponent",
+    # DOM fix components
+    "DOMSnapshotComponent": ".dom_fix:DOMSnapshotComponent",
+    "DOMDiffComponent": ".dom_fix:DOMDiffComponent",
+    "DOMValidateComponent": ".dom_fix:DOMValidateComponent",
+    "FieldMapperComponent": ".dom_fix:FieldMapperComponent",
+    # New atomic components
+    "form": ".form",
+    "extraction": ".extraction",
+    "navigation": ".navigation",
+    "captcha": ".captcha",
+    "screenshot": ".screenshot",
+    "dom": ".dom",
+    "bql": ".bql",
+    "llm": ".llm",
+    "vision": ".vision",
+    "browser": ".browser",
+    "page": ".page",
+    "data": ".data",
+    "config_component": ".config",
+})
 
 __all__ = [
     # Core components
@@ -4,6 +4,9 @@ LLM Planner - Action planning using LLM.
 import json
 from typing import Any, Dict, Optional, List
 
+from curllm_core.config import config
+from curllm_core.context_packer import CHARS_PER_TOKEN, pack_context
+
 
 async def generate_action(
     llm: Any,
@@ -34,20 +37,10 @@ async def generate_action(
     # Adaptive context sizing
     adaptive_chars = min(max_chars + (step * growth_per_step), max_cap)
     
-    # Prune nulls from context
-    def _prune_nulls(obj):
-        if isinstance(obj, dict):
-            pruned = {k: _prune_nulls(v) for k, v in obj.items()}
-            return {k: v for k, v in pruned.items() 
-                    if v is not None and not (isinstance(v, (list, dict)) and len(v) == 0)}
-        if isinstance(obj, list):
-            pruned_list = [_prune_nulls(x) for x in obj]
-            return [x for x in pruned_list 
-                    if x is not None and not (isinstance(x, (list, dict)) and len(x) == 0)]
-        return obj
-    
-    context_json = json.dumps(_prune_nulls(page_context), indent=2)
-    context_str = context_json[:adaptive_chars]
+    # Pack the most task-relevant sections into the budget as valid JSON
+    budget_tokens = config.planner_context_tokens or adaptive_chars // CHARS_PER_TOKEN
+    packed = pack_context(page_context, instruction, budget_tokens)
+    context_str = packed.text
     
     # Build tool history summary
     th_summary = _build_tool_history_summary(page_context)
@@ -67,7 +60,7 @@ async def generate_action(
     # Log prompt
     if run_logger:
         run_logger.log_text(f"\n### Step {step} - LLM Action Planning\n")
-        run_logger.log_text(f"Context chars: {len(context_str)}")
+        run_logger.log_text(f"Context tokens: {packed.tokens}/{packed.original_tokens} (omitted: {packed.dropped or 'none'})")
     
     # Invoke LLM
     try:
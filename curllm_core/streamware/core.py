@@ -2,6 +2,7 @@
 Core component base classes
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Optional, Iterator, Dict
 from .uri import StreamwareURI
@@ -102,6 +103,26 @@ class Component(ABC):
         return Flow([self, other])
 
 
+async def run_component_async(component: Component, data: Any) -> Any:
+    """
+    Run a component without blocking the event loop
+
+    Components that override ``process_async`` are awaited directly;
+    synchronous components run ``process`` in the default thread pool so
+    several of them can make progress at the same time.
+
+    Args:
+        component: Component to run
+        data: Input data
+
+    Returns:
+        Component output
+    """
+    if type(component).process_async is not Component.process_async:
+        return await component.process_async(data)
+    return await asyncio.to_thread(component.process, data)
+
+
 class StreamComponent(Component):
     """
     Base class for streaming components
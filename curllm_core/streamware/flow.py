@@ -2,14 +2,51 @@
 Flow builder for composable pipelines
 """
 
-from typing import Any, List, Optional, Iterator, Union
-from .core import Component, StreamComponent
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Iterator, Sequence, Union
+from .core import Component, StreamComponent, run_component_async
 from .registry import create_component
 from .exceptions import ComponentError
 from ..diagnostics import get_logger
 
 logger = get_logger(__name__)
 
+# Marks the end of a stage's input queue
+_END = object()
+
+
+@dataclass
+class StageStats:
+    """Throughput and queue statistics for one stage of a concurrent flow."""
+
+    name: str
+    workers: int
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_time: float = 0.0
+    queue_depth_max: int = 0
+    queue_depth_total: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "errors": self.errors,
+            "busy_time": round(self.busy_time, 3),
+            "elapsed": round(elapsed, 3),
+            "throughput": round(self.items_in / elapsed, 2) if elapsed > 0 else 0.0,
+            "utilization": round(self.busy_time / (elapsed * self.workers), 3) if elapsed > 0 else 0.0,
+            "queue_depth_max": self.queue_depth_max,
+            "queue_depth_avg": round(self.queue_depth_total / self.items_in, 2) if self.items_in else 0.0,
+        }
 
 
 class Flow:
@@ -26,6 +63,11 @@ class Flow:
         # Streaming
         for item in flow("kafka://consume?topic=events") | "transform://json":
             process(item)
+
+        # Concurrent: 4 workers per stage, bounded queues between stages
+        async for item in pipeline.stream_async(items, workers=4, queue_size=16):
+            process(item)
+        print(pipeline.get_stats())
     """
     
     def __init__(self, components: Optional[List[Union[Component, str]]] = None):
@@ -38,6 +80,7 @@ class Flow:
         self.components: List[Component] = []
         self._input_data: Any = None
         self._diagnostics_enabled = False
+        self._stage_stats: List[StageStats] = []
         
         if components:
             for comp in components:
@@ -211,6 +254,247 @@ class Flow:
                 
         return data
         
+    async def stream_async(
+        self,
+        input_stream: Union[Iterable, AsyncIterator, None] = None,
+        workers: Union[int, Sequence[int]] = 4,
+        queue_size: int = 16,
+        ordered: bool = True,
+        on_error: str = "raise",
+    ) -> AsyncIterator:
+        """
+        Execute flow as a concurrent stream
+
+        Every stage runs its own workers and is connected to the next stage
+        by a bounded queue, so a slow stage applies backpressure instead of
+        buffering the whole input. Synchronous components run in threads;
+        components overriding ``process_async`` run on the event loop.
+        Stream components (e.g. ``split://``) may emit several items per
+        input, and components with ``aggregate = True`` (e.g. ``join://``)
+        consume every item on a single worker and emit only their final
+        result.
+
+        Args:
+            input_stream: Input items (sync or async iterable); defaults to
+                          the flow's input data as a single item
+            workers: Workers per stage, as one number or one per component
+            queue_size: Capacity of the queue in front of each stage
+            ordered: Emit results in input order (reordering is bounded by
+                     workers + queue_size items per stage)
+            on_error: "raise" to abort the flow, "skip" to drop failing items
+
+        Yields:
+            Processed data items
+
+        Raises:
+            ComponentError: If a component fails and on_error is "raise"
+        """
+        if on_error not in ("raise", "skip"):
+            raise ValueError(f"on_error must be 'raise' or 'skip', got {on_error!r}")
+        if not self.components:
+            return
+        if isinstance(workers, int):
+            workers = [workers] * len(self.components)
+        elif len(workers) != len(self.components):
+            raise ValueError(
+                f"workers has {len(workers)} entries for {len(self.components)} components"
+            )
+        if input_stream is None:
+            input_stream = [self._input_data]
+
+        queue_size = max(1, queue_size)
+        queues = [asyncio.Queue(maxsize=queue_size) for _ in range(len(self.components) + 1)]
+        self._stage_stats = []
+        tasks = [asyncio.create_task(self._feed(input_stream, queues[0]))]
+        for i, component in enumerate(self.components):
+            count = 1 if getattr(component, "aggregate", False) else max(1, int(workers[i]))
+            stats = StageStats(name=f"{i+1}:{component.__class__.__name__}", workers=count)
+            self._stage_stats.append(stats)
+            tasks.append(asyncio.create_task(self._run_stage(
+                i, component, queues[i], queues[i + 1], count, queue_size, ordered, on_error, stats
+            )))
+
+        if self._diagnostics_enabled:
+            logger.info(
+                f"Starting concurrent flow with {len(self.components)} components "
+                f"(workers={list(workers)}, queue_size={queue_size}, ordered={ordered})"
+            )
+
+        out = queues[-1]
+        try:
+            while True:
+                getter = asyncio.ensure_future(out.get())
+                done, _ = await asyncio.wait(
+                    tasks + [getter], return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter not in done:
+                    getter.cancel()
+                    for task in done:
+                        # A finished stage task only matters if it failed
+                        if task.exception() is not None:
+                            raise task.exception()
+                        tasks.remove(task)
+                    continue
+                entry = getter.result()
+                if entry is _END:
+                    break
+                yield entry[1]
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._diagnostics_enabled:
+                logger.info(f"Concurrent flow stats: {self.get_stats()}")
+
+    @staticmethod
+    async def _feed(input_stream: Union[Iterable, AsyncIterator], queue: asyncio.Queue):
+        index = 0
+        if hasattr(input_stream, "__aiter__"):
+            async for item in input_stream:
+                await queue.put((index, item))
+                index += 1
+        else:
+            for item in input_stream:
+                await queue.put((index, item))
+                index += 1
+        await queue.put(_END)
+
+    async def _run_stage(
+        self,
+        position: int,
+        component: Component,
+        inq: asyncio.Queue,
+        outq: asyncio.Queue,
+        workers: int,
+        queue_size: int,
+        ordered: bool,
+        on_error: str,
+        stats: StageStats,
+    ):
+        aggregate = getattr(component, "aggregate", False)
+        pending: Dict[int, List[Any]] = {}
+        state = {"next": 0, "out": 0, "last": None, "has_last": False}
+        emit_lock = asyncio.Lock()
+        # Limits how far ahead of the slowest in-flight item workers may run
+        window = asyncio.Semaphore(workers + queue_size) if ordered else None
+
+        async def emit(index: int, outputs: List[Any]):
+            async with emit_lock:
+                if not ordered:
+                    ready = [outputs]
+                else:
+                    pending[index] = outputs
+                    ready = []
+                    while state["next"] in pending:
+                        ready.append(pending.pop(state["next"]))
+                        state["next"] += 1
+                        window.release()
+                for batch in ready:
+                    for item in batch:
+                        if aggregate:
+                            state["last"], state["has_last"] = item, True
+                            continue
+                        await outq.put((state["out"], item))
+                        state["out"] += 1
+                        stats.items_out += 1
+
+        async def worker():
+            while True:
+                if window is not None:
+                    await window.acquire()
+                entry = await inq.get()
+                if entry is _END:
+                    await inq.put(_END)
+                    if window is not None:
+                        window.release()
+                    return
+                index, item = entry
+                stats.items_in += 1
+                depth = inq.qsize()
+                stats.queue_depth_total += depth
+                stats.queue_depth_max = max(stats.queue_depth_max, depth)
+                started = time.monotonic()
+                try:
+                    if isinstance(component, StreamComponent):
+                        outputs = await asyncio.to_thread(
+                            lambda: list(component.stream(iter([item])))
+                        )
+                    else:
+                        outputs = [await run_component_async(component, item)]
+                except Exception as e:
+                    stats.errors += 1
+                    logger.error(
+                        f"Error in component {component.__class__.__name__} "
+                        f"at position {position+1}: {e}"
+                    )
+                    if on_error == "raise":
+                        raise ComponentError(
+                            f"Concurrent flow failed at component {position+1} "
+                            f"({component.__class__.__name__}): {e}"
+                        ) from e
+                    outputs = []
+                finally:
+                    stats.busy_time += time.monotonic() - started
+                await emit(index, outputs)
+
+        worker_tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*worker_tasks)
+            if aggregate and state["has_last"]:
+                await outq.put((0, state["last"]))
+                stats.items_out += 1
+            await outq.put(_END)
+        finally:
+            stats.finished_at = time.monotonic()
+            for task in worker_tasks:
+                task.cancel()
+            await asyncio.gather(*worker_tasks, return_exceptions=True)
+
+    def run_concurrent(
+        self,
+        items: Optional[Iterable] = None,
+        workers: Union[int, Sequence[int]] = 4,
+        queue_size: int = 16,
+        ordered: bool = True,
+        on_error: str = "raise",
+    ) -> List[Any]:
+        """
+        Execute flow concurrently and collect all results
+
+        Synchronous wrapper around ``stream_async`` (must not be called from a
+        running event loop).
+
+        Args:
+            items: Input items (defaults to the flow's input data)
+            workers: Workers per stage, as one number or one per component
+            queue_size: Capacity of the queue in front of each stage
+            ordered: Keep results in input order
+            on_error: "raise" or "skip"
+
+        Returns:
+            List of final outputs
+        """
+        async def _collect():
+            return [
+                item async for item in self.stream_async(
+                    items, workers=workers, queue_size=queue_size,
+                    ordered=ordered, on_error=on_error,
+                )
+            ]
+
+        return asyncio.run(_collect())
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get per-stage statistics of the last concurrent run
+
+        Returns:
+            One dict per stage with item counts, throughput (items/sec),
+            worker utilization and queue depth
+        """
+        return [stats.to_dict() for stats in self._stage_stats]
+
     def add(self, component: Union[Component, str]) -> 'Flow':
         """
         Add component to flow
@@ -10,6 +10,6 @@ from .compose import compose
 from .retry import retry
 from .validate_data import validate_data
 from .metrics import Metrics
-from .batch_process import batch_process
+from .batch_process import batch_process, BatchProcessor, BatchCheckpoint, JSONLSink
 
-__all__ = ['enable_diagnostics', 'describe_component', 'list_available_components', 'pipeline', 'compose', 'retry', 'validate_data', 'Metrics', 'batch_process']
+__all__ = ['enable_diagnostics', 'describe_component', 'list_available_components', 'pipeline', 'compose', 'retry', 'validate_data', 'Metrics', 'batch_process', 'BatchProcessor', 'BatchCheckpoint', 'JSONLSink']
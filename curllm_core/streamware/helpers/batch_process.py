@@ -1,5 +1,12 @@
-from typing import Any, Dict, List, Callable
-import functools
+from typing import Any, Dict, Iterable, Iterator, List, Callable, Optional, Union
+import asyncio
+import inspect
+import itertools
+import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
 from ..flow import flow, Flow
 from ...diagnostics import get_logger
 
@@ -7,38 +14,348 @@ from ...diagnostics import get_logger
 logger = get_logger(__name__)
 
 
-def batch_process(items: List[Any], pipeline_uri: str, batch_size: int = 10) -> List[Any]:
+def _iter_batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to batch_size items without materializing the input"""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _run_batch(pipeline_uri: Union[str, Flow], batch: List[Any]) -> Any:
+    """Run one batch (module level so process pools can pickle it)"""
+    pipe = flow(pipeline_uri) if isinstance(pipeline_uri, str) else pipeline_uri
+    return pipe.run(batch)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class BatchCheckpoint:
+    """
+    Resumable record of completed batches
+
+    Stores a low-water mark (every batch below it is done) plus the
+    completed batch indices above it, so out-of-order completion stays
+    compact. The file is replaced atomically on every update.
+    """
+
+    def __init__(self, path: Union[str, Path], fingerprint: str = ""):
+        """
+        Load or start a checkpoint
+
+        Args:
+            path: Checkpoint JSON file
+            fingerprint: Identifies the pipeline and batch size; a checkpoint
+                         written for a different fingerprint is ignored
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.low_water = 0
+        self.done: set = set()
+        self.items_done = 0
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return
+        if data.get("fingerprint") != self.fingerprint:
+            logger.warning(f"Checkpoint {self.path} belongs to a different pipeline, starting over")
+            return
+        self.low_water = int(data.get("low_water", 0))
+        self.done = set(int(i) for i in data.get("done", []))
+        self.items_done = int(data.get("items_done", 0))
+        logger.info(f"Resuming from checkpoint {self.path}: {self.items_done} items done")
+
+    def is_done(self, index: int) -> bool:
+        """Check whether a batch was completed by a previous run"""
+        return index < self.low_water or index in self.done
+
+    def mark_done(self, index: int, item_count: int):
+        """Record a completed batch and persist the checkpoint"""
+        if self.is_done(index):
+            return
+        self.done.add(index)
+        self.items_done += item_count
+        while self.low_water in self.done:
+            self.done.remove(self.low_water)
+            self.low_water += 1
+        self.save()
+
+    def save(self):
+        """Atomically write the checkpoint file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({
+            "fingerprint": self.fingerprint,
+            "low_water": self.low_water,
+            "done": sorted(self.done),
+            "items_done": self.items_done,
+            "updated_at": time.time(),
+        }), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class JSONLSink:
+    """
+    Append batch results to a JSON Lines file as they finish
+
+    Each write is flushed and fsynced before returning, so results are on
+    disk before the checkpoint marks their batch as done.
+
+    Usage:
+        with JSONLSink("/tmp/results.jsonl") as sink:
+            BatchProcessor("curllm://browse", checkpoint_path="/tmp/run.ckpt").run(urls, sink)
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __call__(self, results: List[Any], batch_index: int):
+        for result in results:
+            self._file.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "JSONLSink":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+class BatchProcessor:
+    """
+    Concurrent batch engine for large item lists
+
+    Batches run on a thread pool (mode="async", driven by asyncio) or a
+    process pool (mode="process", the pipeline must be a URI string or a
+    picklable Flow). Results go to ``sink(results, batch_index)`` in
+    completion order as soon as a batch finishes, so memory stays bounded
+    by the number of in-flight batches. With ``checkpoint_path`` completed
+    batches are recorded after the sink call and skipped on the next run
+    (at-least-once: a crash between the two repeats that batch). Failed
+    batches are passed to the sink as error records and are retried on
+    resume.
+
+    Usage:
+        processor = BatchProcessor("curllm://browse", batch_size=10, workers=8,
+                                   checkpoint_path="/var/tmp/nightly.ckpt")
+        with JSONLSink("/var/tmp/nightly.jsonl") as sink:
+            stats = processor.run(urls, sink)
+        print(stats["items_per_sec"], stats["latency_p99"])
+    """
+
+    def __init__(
+        self,
+        pipeline_uri: Union[str, Flow],
+        batch_size: int = 10,
+        workers: int = 4,
+        mode: str = "async",
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        max_in_flight: Optional[int] = None,
+    ):
+        """
+        Initialize processor
+
+        Args:
+            pipeline_uri: Pipeline URI (a fresh Flow per batch) or Flow
+                          (shared by all batches)
+            batch_size: Items per batch
+            workers: Concurrent batches
+            mode: "async" (thread pool) or "process" (process pool)
+            checkpoint_path: Optional resumable checkpoint file
+            max_in_flight: Batches read ahead of completion (default: 2 * workers)
+        """
+        if mode not in ("async", "process"):
+            raise ValueError(f"mode must be 'async' or 'process', got {mode!r}")
+        self.pipeline_uri = pipeline_uri
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.mode = mode
+        self.checkpoint_path = checkpoint_path
+        self.max_in_flight = max(self.workers, max_in_flight or 2 * self.workers)
+        self._latencies: List[float] = []
+        self._stats: Dict[str, Any] = {}
+
+    def _fingerprint(self) -> str:
+        pipeline = self.pipeline_uri if isinstance(self.pipeline_uri, str) else repr(self.pipeline_uri)
+        return f"{pipeline}|batch_size={self.batch_size}"
+
+    def _new_executor(self) -> Executor:
+        if self.mode == "process":
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch")
+
+    def run(self, items: Iterable[Any], sink: Optional[Callable[[List[Any], int], Any]] = None) -> Dict[str, Any]:
+        """
+        Process all items
+
+        Args:
+            items: Items to process (any iterable; read lazily)
+            sink: Called with (results, batch_index) as batches finish
+
+        Returns:
+            Run statistics (see get_stats)
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.run_async(items, sink))
+        # Called from async code: drive the run on a helper thread's loop
+        with ThreadPoolExecutor(max_workers=1) as runner:
+            return runner.submit(asyncio.run, self.run_async(items, sink)).result()
+
+    async def run_async(
+        self, items: Iterable[Any], sink: Optional[Callable[[List[Any], int], Any]] = None
+    ) -> Dict[str, Any]:
+        """Async version of run; sink may also be a coroutine function"""
+        checkpoint = (
+            BatchCheckpoint(self.checkpoint_path, self._fingerprint())
+            if self.checkpoint_path else None
+        )
+        self._latencies = []
+        self._stats = {
+            "items": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "skipped_batches": 0,
+            "resumed_items": checkpoint.items_done if checkpoint else 0,
+        }
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        executor = self._new_executor()
+        in_flight: set = set()
+
+        async def _process(index: int, batch: List[Any]):
+            batch_started = time.monotonic()
+            ok = True
+            try:
+                result = await loop.run_in_executor(executor, _run_batch, self.pipeline_uri, batch)
+                results = result if isinstance(result, list) else [result]
+            except Exception as e:
+                ok = False
+                logger.error(f"Batch processing error at index {index * self.batch_size}: {e}")
+                results = [{"error": str(e), "batch_index": index * self.batch_size}]
+            self._latencies.append(time.monotonic() - batch_started)
+            if sink is not None:
+                written = sink(results, index)
+                if inspect.isawaitable(written):
+                    await written
+            self._stats["batches"] += 1
+            self._stats["items"] += len(batch)
+            if ok:
+                if checkpoint:
+                    checkpoint.mark_done(index, len(batch))
+            else:
+                self._stats["failed_batches"] += 1
+            if self._stats["batches"] % 100 == 0:
+                elapsed = time.monotonic() - started
+                logger.info(
+                    f"Batch progress: {self._stats['items']} items, "
+                    f"{self._stats['items'] / elapsed:.1f} items/s"
+                )
+
+        async def _wait_some(return_when=asyncio.FIRST_COMPLETED):
+            done, _ = await asyncio.wait(in_flight, return_when=return_when)
+            for task in done:
+                in_flight.discard(task)
+                task.result()
+
+        try:
+            for index, batch in enumerate(_iter_batches(items, self.batch_size)):
+                if checkpoint and checkpoint.is_done(index):
+                    self._stats["skipped_batches"] += 1
+                    continue
+                while len(in_flight) >= self.max_in_flight:
+                    await _wait_some()
+                in_flight.add(asyncio.create_task(_process(index, batch)))
+            if in_flight:
+                await _wait_some(asyncio.ALL_COMPLETED)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            executor.shutdown(wait=not in_flight, cancel_futures=bool(in_flight))
+            self._stats["elapsed"] = time.monotonic() - started
+
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of the last run
+
+        Returns:
+            Item/batch counts, items_per_sec and batch latency percentiles
+            (p50/p95/p99/max, seconds)
+        """
+        stats = dict(self._stats)
+        elapsed = stats.get("elapsed", 0.0)
+        latencies = sorted(self._latencies)
+        stats["elapsed"] = round(elapsed, 3)
+        stats["items_per_sec"] = round(stats.get("items", 0) / elapsed, 2) if elapsed > 0 else 0.0
+        stats["latency_p50"] = round(_percentile(latencies, 50), 3)
+        stats["latency_p95"] = round(_percentile(latencies, 95), 3)
+        stats["latency_p99"] = round(_percentile(latencies, 99), 3)
+        stats["latency_max"] = round(latencies[-1], 3) if latencies else 0.0
+        return stats
+
+
+def batch_process(
+    items: List[Any],
+    pipeline_uri: str,
+    batch_size: int = 10,
+    workers: int = 1,
+    mode: str = "async",
+    checkpoint_path: Optional[str] = None,
+) -> List[Any]:
     """
     Process items in batches through a pipeline
-    
+
     Args:
         items: List of items to process
         pipeline_uri: Pipeline URI or Flow
         batch_size: Batch size
-        
+        workers: Concurrent batches (see BatchProcessor)
+        mode: "async" (threads) or "process"
+        checkpoint_path: Optional resumable checkpoint file
+
     Returns:
-        List of results
+        List of results, in input order (batches skipped via the
+        checkpoint are not included; use BatchProcessor with a sink for
+        large runs)
     """
+    by_batch: Dict[int, List[Any]] = {}
+
+    def _collect(results: List[Any], batch_index: int):
+        by_batch[batch_index] = results
+
+    BatchProcessor(
+        pipeline_uri,
+        batch_size=batch_size,
+        workers=workers,
+        mode=mode,
+        checkpoint_path=checkpoint_path,
+    ).run(items, _collect)
+
     results = []
-    
-    for i in range(0, len(items), batch_size):
-        batch = items[i:i + batch_size]
-        
-        try:
-            if isinstance(pipeline_uri, str):
-                pipe = flow(pipeline_uri)
-            else:
-                pipe = pipeline_uri
-                
-            result = pipe.run(batch)
-            
-            if isinstance(result, list):
-                results.extend(result)
-            else:
-                results.append(result)
-                
-        except Exception as e:
-            logger.error(f"Batch processing error at index {i}: {e}")
-            results.append({"error": str(e), "batch_index": i})
-            
+    for index in sorted(by_batch):
+        results.extend(by_batch[index])
     return results
@@ -17,6 +17,9 @@ class JoinComponent(Component):
     
     input_mime = "application/json"
     output_mime = "application/json"
+
+    # Concurrent flows feed every item to one worker and keep the last result
+    aggregate = True
     
     def __init__(self, uri: StreamwareURI):
         super().__init__(uri)
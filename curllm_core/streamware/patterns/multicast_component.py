@@ -1,6 +1,8 @@
 from typing import Any, List, Callable, Optional, Iterator
+import asyncio
 import json
-from ..core import Component, StreamComponent
+from concurrent.futures import ThreadPoolExecutor
+from ..core import Component, StreamComponent, run_component_async
 from ..uri import StreamwareURI
 from ..registry import register, create_component
 from ..exceptions import ComponentError
@@ -15,33 +17,59 @@ class MulticastComponent(Component):
     Send data to multiple destinations
     
     URI format:
-        multicast://parallel?destinations=uri1,uri2,uri3
+        multicast://parallel?destinations=uri1,uri2,uri3&workers=2
+
+    Destinations run concurrently (``workers`` caps how many at once,
+    default: all); results keep the order of ``destinations``.
     """
     
     input_mime = "application/json"
     output_mime = "application/json"
     
     def process(self, data: Any) -> List[Any]:
-        """Send to all destinations and collect results"""
-        destinations = self.uri.get_param('destinations', [])
-        
-        if isinstance(destinations, str):
-            destinations = [d.strip() for d in destinations.split(',')]
-            
+        """Send to all destinations concurrently and collect results in order"""
+        destinations = self._destinations()
+        if not destinations:
+            logger.warning("Multicast has no destinations")
+            return [data]
+        if len(destinations) == 1:
+            return [self._send(destinations[0], data)]
+
+        max_workers = int(self.uri.get_param('workers', len(destinations)) or len(destinations))
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            return list(pool.map(lambda dest: self._send(dest, data), destinations))
+
+    async def process_async(self, data: Any) -> List[Any]:
+        """Send to all destinations on the running loop and collect results in order"""
+        destinations = self._destinations()
         if not destinations:
             logger.warning("Multicast has no destinations")
             return [data]
-            
-        results = []
-        
-        for dest_uri in destinations:
-            try:
-                component = create_component(dest_uri)
-                result = component.process(data)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Multicast destination {dest_uri} failed: {e}")
-                results.append({"error": str(e), "destination": dest_uri})
-                
-        return results
 
+        max_workers = int(self.uri.get_param('workers', len(destinations)) or len(destinations))
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def _send_async(dest_uri: str) -> Any:
+            async with semaphore:
+                try:
+                    return await run_component_async(create_component(dest_uri), data)
+                except Exception as e:
+                    logger.error(f"Multicast destination {dest_uri} failed: {e}")
+                    return {"error": str(e), "destination": dest_uri}
+
+        return list(await asyncio.gather(*(_send_async(d) for d in destinations)))
+
+    def _destinations(self) -> List[str]:
+        destinations = self.uri.get_param('destinations', [])
+        if isinstance(destinations, str):
+            destinations = [d.strip() for d in destinations.split(',')]
+        return [d for d in destinations if d]
+
+    @staticmethod
+    def _send(dest_uri: str, data: Any) -> Any:
+        try:
+            component = create_component(dest_uri)
+            return component.process(data)
+        except Exception as e:
+            logger.error(f"Multicast destination {dest_uri} failed: {e}")
+            return {"error": str(e), "destination": dest_uri}
@@ -2,6 +2,7 @@
 Component registry for dynamic component lookup
 """
 
+import importlib
 from typing import Dict, Type, Callable, List, Optional
 from .core import Component
 from .uri import StreamwareURI
@@ -13,6 +14,49 @@ logger = get_logger(__name__)
 # Global component registry
 _REGISTRY: Dict[str, Type[Component]] = {}
 
+# Built-in schemes -> module in streamware.components that registers them.
+# Imported on first lookup so ``import curllm_core.streamware`` stays cheap
+# (curllm:// pulls in the whole executor).
+BUILTIN_SCHEMES: Dict[str, str] = {
+    "curllm": "curllm",
+    "curllm-stream": "curllm",
+    "http": "web",
+    "https": "web",
+    "web": "web",
+    "file": "file",
+    "file-stream": "file",
+    "transform": "transform",
+    "jsonpath": "transform",
+    "csv": "transform",
+    "dom-analyze": "decision",
+    "action-plan": "decision",
+    "action-validate": "decision",
+    "decision-tree": "decision",
+    "dom-snapshot": "dom_fix",
+    "dom-diff": "dom_fix",
+    "dom-validate": "dom_fix",
+    "field-mapper": "dom_fix",
+}
+
+
+def _load_builtin(module: str) -> bool:
+    """Import a built-in component module (registering its schemes)."""
+    # Components registered by the user before the built-in was loaded keep precedence
+    registered = dict(_REGISTRY)
+    try:
+        importlib.import_module(f"{__package__}.components.{module}")
+        return True
+    except ImportError as e:
+        logger.warning(f"Built-in component module '{module}' unavailable: {e}")
+        return False
+    finally:
+        _REGISTRY.update(registered)
+
+
+def _load_builtins():
+    for module in dict.fromkeys(BUILTIN_SCHEMES.values()):
+        _load_builtin(module)
+
 
 def register(scheme: str) -> Callable:
     """
@@ -59,6 +103,8 @@ def get_component(scheme: str) -> Optional[Type[Component]]:
     Returns:
         Component class or None if not found
     """
+    if scheme not in _REGISTRY and scheme in BUILTIN_SCHEMES:
+        _load_builtin(BUILTIN_SCHEMES[scheme])
     return _REGISTRY.get(scheme)
 
 
@@ -94,6 +140,7 @@ def list_components() -> List[Dict[str, str]]:
     Returns:
         List of dicts with component info
     """
+    _load_builtins()
     components = []
     for scheme, component_class in _REGISTRY.items():
         components.append({
@@ -113,6 +160,7 @@ def list_schemes() -> List[str]:
     Returns:
         List of scheme names
     """
+    _load_builtins()
     return list(_REGISTRY.keys())
 
 
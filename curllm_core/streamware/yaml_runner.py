@@ -37,6 +37,15 @@ class YAMLFlowRunner:
           - component: "file://write"
             params:
               path: "/tmp/output.csv"
+
+    Optional concurrent execution (see ``Flow.stream_async``):
+        concurrency:
+          workers: 4        # default workers per step
+          queue_size: 16
+          ordered: true
+        steps:
+          - component: "curllm://extract"
+            workers: 8      # per-step override
     """
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -118,7 +127,7 @@ class YAMLFlowRunner:
                 
         # Add diagnostics if specified
         if spec.get('diagnostics', False):
-            pipeline = pipeline.with_diagnostics(trace=spec.get('trace', False))
+            pipeline = pipeline.with_diagnostics(True)
             
         # Add remaining steps
         for step in steps[1:]:
@@ -180,8 +189,41 @@ class YAMLFlowRunner:
         # Override input data if provided
         if input_data is not None:
             pipeline = pipeline.with_data(input_data)
+
+        if spec.get('concurrency'):
+            return self._run_concurrent(pipeline, spec)
             
         return pipeline.run()
+
+    def _run_concurrent(self, pipeline: Flow, spec: Dict[str, Any]) -> Any:
+        """
+        Execute flow with per-step workers and bounded queues
+
+        Args:
+            pipeline: Flow built from spec
+            spec: YAML flow specification with a 'concurrency' section
+
+        Returns:
+            Single final output, or a list when the flow emits several
+        """
+        concurrency = spec['concurrency']
+        if not isinstance(concurrency, dict):
+            concurrency = {'workers': int(concurrency)}
+        default_workers = int(concurrency.get('workers', 4))
+        workers = [int(step.get('workers', default_workers)) for step in spec['steps']]
+
+        results = pipeline.run_concurrent(
+            workers=workers,
+            queue_size=int(concurrency.get('queue_size', 16)),
+            ordered=bool(concurrency.get('ordered', True)),
+            on_error=concurrency.get('on_error', 'raise'),
+        )
+        for stage in pipeline.get_stats():
+            logger.info(
+                f"Stage {stage['name']}: {stage['items_in']} items, "
+                f"{stage['throughput']} items/s, queue max {stage['queue_depth_max']}"
+            )
+        return results[0] if len(results) == 1 else results
         
     def run_yaml_stream(self, path: str, input_stream: Any = None):
         """
@@ -15,6 +15,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from .config import config
 from .page_utils import auto_scroll as _auto_scroll, accept_cookies as _accept_cookies
 
 
@@ -39,7 +40,9 @@ async def step_visual(
     visual_analysis = None
     
     try:
-        screenshot_path = await executor._take_screenshot(page, step, target_dir=domain_dir)
+        # Capture once: the same PNG bytes are stored and analysed (no disk round-trip)
+        png = await page.screenshot(type="png", full_page=config.screenshot_mode == "full_page")
+        screenshot_path = await executor._take_screenshot(page, step, target_dir=domain_dir, png=png)
         if screenshot_path:
             result["screenshots"].append(screenshot_path)
             
@@ -47,7 +50,7 @@ async def step_visual(
             if hasattr(executor, '_analyze_screenshot'):
                 try:
                     visual_analysis = await executor._analyze_screenshot(
-                        screenshot_path, 
+                        png,
                         captcha_solver=captcha_solver
                     )
                     if run_logger and visual_analysis:
@@ -66,23 +69,46 @@ async def step_page_context(
     runtime: Dict[str, Any],
     last_screenshot_path: Optional[str],
     last_visual_analysis: Optional[Dict[str, Any]],
-    form_focused: bool = False
+    form_focused: bool = False,
+    tracker=None,
+    run_logger=None
 ) -> Dict[str, Any]:
     """
     Gather page context for LLM planning.
     
+    Args:
+        tracker: Optional IncrementalDomTracker; only DOM regions changed
+                 since the previous step are serialized
+    
     Returns:
         Dict with page context information
     """
     try:
-        context = await executor._get_page_context(
+        stats: Dict[str, Any] = {}
+        context = await executor._extract_page_context(
             page,
-            runtime=runtime,
-            screenshot_path=last_screenshot_path,
-            visual_analysis=last_visual_analysis,
-            form_focused=form_focused
+            include_dom=bool(runtime.get("include_dom_html")),
+            dom_max_chars=int(runtime.get("dom_max_chars", 20000) or 20000),
+            form_focused=form_focused,
+            stats=stats,
+            tracker=tracker
         )
-        return context or {}
+        context = context or {}
+        if last_visual_analysis:
+            context["visual_analysis"] = last_visual_analysis
+        if last_screenshot_path:
+            context["screenshot_path"] = last_screenshot_path
+        if run_logger and stats:
+            try:
+                run_logger.log_kv("page_context_bytes", str(sum(stats.get("section_bytes", {}).values())))
+                if "regions" in stats:
+                    run_logger.log_kv(
+                        "dom_regions_changed",
+                        f"{stats.get('regions_changed', 0)}/{stats.get('regions', 0)}"
+                    )
+            except Exception:
+                pass
+        return context
     except Exception as e:
         logger.debug(f"Page context failed: {e}")
         return {}
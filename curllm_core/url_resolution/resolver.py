@@ -1102,42 +1102,21 @@ Search term:"""
         base_url: str,
         search_term: str
     ) -> Optional[str]:
-        """Try to find relevant URL in sitemap"""
-        
-        parsed = urlparse(base_url)
-        sitemap_urls = [
-            f"{parsed.scheme}://{parsed.netloc}/sitemap.xml",
-            f"{parsed.scheme}://{parsed.netloc}/sitemap_index.xml",
-        ]
+        """Try to find relevant URL in the domain's cached sitemap index"""
+        from curllm_core.url_resolution.sitemap import get_sitemap_index
         
         keywords = self._extract_keywords(search_term)
+        if not keywords:
+            return None
         
-        for sitemap_url in sitemap_urls:
-            try:
-                # Fetch sitemap
-                import httpx
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    response = await client.get(sitemap_url)
-                    if response.status_code != 200:
-                        continue
-                    
-                    content = response.text
-                    
-                    # Extract URLs from sitemap
-                    urls = re.findall(r'<loc>([^<]+)</loc>', content)
-                    
-                    # Score URLs by keyword match
-                    for url in urls:
-                        url_lower = url.lower()
-                        for kw in keywords:
-                            if kw.lower() in url_lower:
-                                return url
-                    
-            except Exception as e:
-                logger.debug(f"Sitemap fetch failed: {e}")
-                continue
+        index = get_sitemap_index()
+        try:
+            await index.refresh(base_url)
+        except Exception as e:
+            logger.debug(f"Sitemap refresh failed: {e}")
         
-        return None
+        matches = index.search(urlparse(base_url).netloc, keywords, limit=1)
+        return matches[0][0] if matches else None
     
     async def _try_llm_resolver(self, goal: TaskGoal, original_url: str) -> Optional[str]:
         """
@@ -0,0 +1,453 @@
+"""
+Sitemap Index - streaming sitemap crawler with a cached per-domain URL index
+
+Sitemaps are discovered from robots.txt and the usual locations, fetched
+through the pooled HTTP session and parsed incrementally (constant memory,
+``.xml.gz`` supported), following nested sitemap indexes. Every sitemap's
+ETag/Last-Modified is stored and sent back on the next refresh, so unchanged
+files answer 304 instead of being downloaded again. URLs go into a small
+SQLite file per domain with a token index over their paths, which ranks
+URLs against instruction keywords without touching the network.
+
+Usage:
+    from curllm_core.url_resolution.sitemap import get_sitemap_index
+
+    index = get_sitemap_index()
+    await index.refresh("https://shop.example/")          # no-op while fresh
+    for url, score in index.search("shop.example", ["laptopy", "gaming"]):
+        print(score, url)
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+_INSERT_BATCH = 1000
+
+
+def _default_dir() -> Path:
+    configured = os.getenv("CURLLM_SITEMAP_DIR")
+    if configured:
+        return Path(configured)
+    return Path(os.getenv("CURLLM_WORKSPACE", "./workspace")) / "cache" / "sitemaps"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens (unicode letters/digits, 2+ chars)."""
+    return [t for t in _TOKEN_RE.findall(unquote(text or "").lower()) if len(t) >= 2]
+
+
+def _path_tokens(url: str) -> Tuple[List[str], List[str]]:
+    """Tokens of the whole path and of its last segment."""
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/")
+    last = path.rsplit("/", 1)[-1]
+    return tokenize(path + " " + parsed.query), tokenize(last)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+class SitemapIndex:
+    """
+    Per-domain sitemap cache and keyword index.
+
+    Args:
+        cache_dir: Directory for the per-domain SQLite files
+        ttl: Seconds a domain's index is used without any revalidation
+        max_urls: URLs kept per domain
+        max_sitemaps: Sitemap files fetched per refresh (nested indexes included)
+        max_depth: Nesting depth of sitemap indexes that is followed
+        timeout: Per-request timeout in seconds
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: float = 24 * 3600,
+        max_urls: int = 200_000,
+        max_sitemaps: int = 200,
+        max_depth: int = 3,
+        timeout: float = 15.0,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else _default_dir()
+        self.ttl = ttl
+        self.max_urls = max_urls
+        self.max_sitemaps = max_sitemaps
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self._conns: Dict[str, sqlite3.Connection] = {}
+        self._conn_lock = threading.Lock()
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _db(self, domain: str) -> sqlite3.Connection:
+        with self._conn_lock:
+            conn = self._conns.get(domain)
+            if conn is not None:
+                return conn
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            safe = re.sub(r"[^a-z0-9.-]", "_", domain.lower())
+            conn = sqlite3.connect(
+                str(self.cache_dir / f"{safe}.db"), timeout=30, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sitemaps (
+                    url TEXT PRIMARY KEY,
+                    parent TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL,
+                    url_count INTEGER DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS urls (
+                    id INTEGER PRIMARY KEY,
+                    loc TEXT UNIQUE NOT NULL,
+                    lastmod TEXT,
+                    source TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_urls_source ON urls(source);
+                CREATE TABLE IF NOT EXISTS postings (
+                    token TEXT NOT NULL,
+                    url_id INTEGER NOT NULL,
+                    last_segment INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_postings_token ON postings(token);
+                CREATE INDEX IF NOT EXISTS idx_postings_url ON postings(url_id);
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+            self._conns[domain] = conn
+            return conn
+
+    def _lock(self, domain: str) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        locks = self._locks.setdefault(loop, {})
+        if domain not in locks:
+            locks[domain] = asyncio.Lock()
+        return locks[domain]
+
+    def _meta(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def url_count(self, domain: str) -> int:
+        """Number of indexed URLs for a domain."""
+        return self._db(domain).execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def close(self):
+        """Close all domain databases."""
+        with self._conn_lock:
+            for conn in self._conns.values():
+                conn.close()
+            self._conns.clear()
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+    async def refresh(self, base_url: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Bring a domain's index up to date.
+
+        Within ``ttl`` of the last refresh nothing is fetched. After that
+        every known sitemap is revalidated with a conditional GET; only
+        changed files are downloaded and re-indexed. The refresh time is
+        only recorded when the site answered (200, 304 or 404), so a
+        refresh while the site is down is retried on the next call.
+
+        Returns:
+            Stats: fetched, not_modified, failed, urls (total indexed)
+        """
+        parsed = urlparse(base_url if "://" in base_url else f"https://{base_url}")
+        domain = parsed.netloc
+        origin = f"{parsed.scheme}://{domain}"
+        stats = {"domain": domain, "fetched": 0, "not_modified": 0, "failed": 0, "skipped": False}
+        async with self._lock(domain):
+            conn = self._db(domain)
+            refreshed = float(self._meta(conn, "refreshed_at") or 0)
+            if not force and time.time() - refreshed < self.ttl:
+                stats["skipped"] = True
+                stats["urls"] = self.url_count(domain)
+                return stats
+
+            from curllm_core.http_pool import get_http_pool
+            pool = get_http_pool()
+
+            roots = await self._discover_roots(pool, origin)
+            queue = deque((url, None, 0) for url in roots)
+            seen = set()
+            answered = False
+            while queue and len(seen) < self.max_sitemaps:
+                url, parent, depth = queue.popleft()
+                if url in seen:
+                    continue
+                seen.add(url)
+                try:
+                    status, children = await self._fetch_sitemap(pool, conn, url, parent)
+                except Exception as e:
+                    logger.debug(f"Sitemap fetch failed for {url}: {e}")
+                    stats["failed"] += 1
+                    continue
+                answered = answered or status in (200, 304, 404)
+                if status == 304:
+                    stats["not_modified"] += 1
+                elif status == 200:
+                    stats["fetched"] += 1
+                else:
+                    stats["failed"] += 1
+                if depth < self.max_depth:
+                    queue.extend((child, url, depth + 1) for child in children)
+
+            if answered:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta(key, value) VALUES ('refreshed_at', ?)", (str(time.time()),)
+                )
+            stats["urls"] = self.url_count(domain)
+        logger.debug(f"Sitemap refresh {domain}: {stats}")
+        return stats
+
+    async def _discover_roots(self, pool, origin: str) -> List[str]:
+        roots = []
+        try:
+            async with pool.get(f"{origin}/robots.txt", timeout=self.timeout) as resp:
+                if resp.status == 200:
+                    for line in (await resp.text(errors="replace")).splitlines():
+                        if line.lower().startswith("sitemap:"):
+                            roots.append(line.split(":", 1)[1].strip())
+        except Exception as e:
+            logger.debug(f"robots.txt fetch failed for {origin}: {e}")
+        for path in ("/sitemap.xml", "/sitemap_index.xml"):
+            url = origin + path
+            if url not in roots:
+                roots.append(url)
+        return roots
+
+    async def _fetch_sitemap(self, pool, conn: sqlite3.Connection, url: str, parent: Optional[str]):
+        """
+        Conditionally fetch and index one sitemap file.
+
+        Returns:
+            (HTTP status, child sitemap URLs)
+        """
+        row = conn.execute("SELECT etag, last_modified FROM sitemaps WHERE url = ?", (url,)).fetchone()
+        headers = {}
+        if row and row[0]:
+            headers["If-None-Match"] = row[0]
+        if row and row[1]:
+            headers["If-Modified-Since"] = row[1]
+
+        async with pool.get(url, timeout=self.timeout, headers=headers) as resp:
+            if resp.status == 304:
+                conn.execute("UPDATE sitemaps SET fetched_at = ? WHERE url = ?", (time.time(), url))
+                children = [r[0] for r in conn.execute("SELECT url FROM sitemaps WHERE parent = ?", (url,))]
+                return 304, children
+            if resp.status != 200:
+                return resp.status, []
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._drop_source(conn, url)
+                room = self.max_urls - conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+                children, count = await self._stream_into(conn, resp.content.iter_chunked(64 * 1024), url, room)
+                conn.execute("DELETE FROM sitemaps WHERE parent = ? AND url NOT IN (%s)" % ",".join("?" * len(children)),
+                             (url, *children))
+                for child in children:
+                    conn.execute(
+                        "INSERT INTO sitemaps(url, parent) VALUES (?, ?) ON CONFLICT(url) DO UPDATE SET parent = excluded.parent",
+                        (child, url),
+                    )
+                conn.execute(
+                    "INSERT INTO sitemaps(url, parent, etag, last_modified, fetched_at, url_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, "
+                    "last_modified = excluded.last_modified, fetched_at = excluded.fetched_at, "
+                    "url_count = excluded.url_count",
+                    (url, parent, etag, last_modified, time.time(), count),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return 200, children
+
+    def _drop_source(self, conn: sqlite3.Connection, source: str):
+        conn.execute("DELETE FROM postings WHERE url_id IN (SELECT id FROM urls WHERE source = ?)", (source,))
+        conn.execute("DELETE FROM urls WHERE source = ?", (source,))
+
+    async def _stream_into(self, conn: sqlite3.Connection, chunks, source: str, room: int) -> Tuple[List[str], int]:
+        """Incrementally parse (optionally gzipped) sitemap XML into the index."""
+        parser = ElementTree.XMLPullParser(events=("start", "end"))
+        decomp = None
+        first = True
+        root = None
+        children: List[str] = []
+        batch: List[Tuple[str, Optional[str]]] = []
+        count = 0
+
+        def _drain():
+            nonlocal root, count
+            for event, el in parser.read_events():
+                if event == "start":
+                    if root is None:
+                        root = el
+                    continue
+                tag = _local(el.tag)
+                if tag not in ("url", "sitemap"):
+                    continue
+                loc = lastmod = None
+                for child in el:
+                    name = _local(child.tag)
+                    if name == "loc":
+                        loc = (child.text or "").strip()
+                    elif name == "lastmod":
+                        lastmod = (child.text or "").strip() or None
+                if loc:
+                    if tag == "sitemap":
+                        children.append(loc)
+                    elif count < room:
+                        batch.append((loc, lastmod))
+                        count += 1
+                # Finished entries are not needed any more: keep memory flat
+                if root is not None:
+                    root.clear()
+                if len(batch) >= _INSERT_BATCH:
+                    self._insert(conn, batch, source)
+                    batch.clear()
+
+        async for chunk in chunks:
+            if first:
+                first = False
+                if chunk[:2] == b"\x1f\x8b":
+                    decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            parser.feed(decomp.decompress(chunk) if decomp else chunk)
+            _drain()
+        if decomp:
+            parser.feed(decomp.flush())
+        parser.close()
+        _drain()
+        if batch:
+            self._insert(conn, batch, source)
+        return children, count
+
+    def _insert(self, conn: sqlite3.Connection, batch: Iterable[Tuple[str, Optional[str]]], source: str):
+        postings = []
+        for loc, lastmod in batch:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO urls(loc, lastmod, source) VALUES (?, ?, ?)", (loc, lastmod, source)
+            )
+            if not cur.rowcount:
+                continue
+            url_id = cur.lastrowid
+            tokens, last = _path_tokens(loc)
+            last_set = set(last)
+            postings.extend((t, url_id, 1 if t in last_set else 0) for t in set(tokens))
+        conn.executemany("INSERT INTO postings(token, url_id, last_segment) VALUES (?, ?, ?)", postings)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def search(self, domain: str, keywords: Iterable[str], limit: int = 10,
+               per_token_limit: int = 20000) -> List[Tuple[str, float]]:
+        """
+        Rank indexed URLs of a domain against keywords.
+
+        Each keyword token scores 1.0 on an exact path-token match and 0.7
+        on a prefix match (tokens of 4+ chars, so "laptop" finds
+        "laptopy"); matches in the last path segment count 1.5x, and
+        deeper paths are slightly penalized.
+
+        Args:
+            domain: Domain or any URL on it
+
+        Returns:
+            List of (url, score), best first
+        """
+        if "/" in domain:
+            domain = urlparse(domain).netloc
+        query = []
+        for kw in keywords:
+            for t in tokenize(kw):
+                if t not in query:
+                    query.append(t)
+        if not query:
+            return []
+        conn = self._db(domain)
+        scores: Dict[int, Dict[str, float]] = {}
+        for qt in query:
+            if len(qt) >= 4:
+                rows = conn.execute(
+                    "SELECT url_id, token, last_segment FROM postings WHERE token >= ? AND token < ? LIMIT ?",
+                    (qt, qt + "\uffff", per_token_limit),
+                )
+            else:
+                rows = conn.execute(
+                    "SELECT url_id, token, last_segment FROM postings WHERE token = ? LIMIT ?",
+                    (qt, per_token_limit),
+                )
+            for url_id, token, last_segment in rows:
+                s = (1.0 if token == qt else 0.7) * (1.5 if last_segment else 1.0)
+                per_url = scores.setdefault(url_id, {})
+                per_url[qt] = max(per_url.get(qt, 0.0), s)
+        if not scores:
+            return []
+        totals = {url_id: sum(m.values()) for url_id, m in scores.items()}
+        best = sorted(totals, key=totals.get, reverse=True)[: max(limit * 5, 50)]
+        placeholders = ",".join("?" * len(best))
+        locs = dict(conn.execute(f"SELECT id, loc FROM urls WHERE id IN ({placeholders})", best))
+        ranked = []
+        for url_id in best:
+            loc = locs.get(url_id)
+            if not loc:
+                continue
+            depth = len([p for p in urlparse(loc).path.split("/") if p])
+            ranked.append((loc, round(totals[url_id] - 0.05 * depth, 3)))
+        ranked.sort(key=lambda x: x[1], reverse=True)
+        return ranked[:limit]
+
+    async def find(self, base_url: str, keywords: Iterable[str], limit: int = 10) -> List[Tuple[str, float]]:
+        """Refresh the domain if stale, then search it."""
+        try:
+            await self.refresh(base_url)
+        except Exception as e:
+            logger.debug(f"Sitemap refresh failed for {base_url}: {e}")
+        return self.search(urlparse(base_url).netloc, keywords, limit=limit)
+
+
+_global_index: Optional[SitemapIndex] = None
+
+
+def get_sitemap_index() -> SitemapIndex:
+    """
+    Get or create the global sitemap index.
+
+    Settings are read from CURLLM_SITEMAP_DIR, CURLLM_SITEMAP_TTL and
+    CURLLM_SITEMAP_MAX_URLS on first call.
+    """
+    global _global_index
+    if _global_index is None:
+        _global_index = SitemapIndex(
+            ttl=float(os.getenv("CURLLM_SITEMAP_TTL", str(24 * 3600))),
+            max_urls=int(os.getenv("CURLLM_SITEMAP_MAX_URLS", "200000")),
+        )
+    return _global_index
@@ -21,52 +21,45 @@ Architecture:
     - DSLExecutor: Executes DSL queries using atomic functions
 """
 
-# LLM-DSL core (the foundation)
-from curllm_core.llm_dsl import (
-    AtomicFunctions,
-    DSLQueryGenerator,
-    DSLExecutor as DSLQueryExecutor,
-)
+from curllm_core.lazy_imports import lazy_exports
 
-# LLM-driven form filling
-from curllm_core.form_fill_llm import (
-    llm_form_fill,
-    smart_form_fill,
-    FormFillResult,
-)
-
-# LLM-driven orchestrators
-from curllm_core.orchestrators.form_llm import LLMFormOrchestrator
-from curllm_core.orchestrators.auth_llm import LLMAuthOrchestrator
-from curllm_core.orchestrators.social_llm import LLMSocialOrchestrator
-from curllm_core.orchestrators.ecommerce_llm import LLMECommerceOrchestrator
-
-# LLM-driven extraction
-from curllm_core.extraction.extractor_llm import (
-    LLMExtractor,
-    llm_extract,
-    extract_with_llm,
-)
-
-# LLM-driven planning
-from curllm_core.hierarchical.planner_llm import (
-    LLMHierarchicalPlanner,
-    should_use_hierarchical_llm,
-    extract_strategic_context,
-)
-
-# LLM-driven DSL execution
-from curllm_core.dsl.executor_llm import (
-    LLMDSLExecutor,
-    LLMExecutionResult,
-)
-
-# LLM-driven URL resolution
-from curllm_core.url_resolution.goal_detector_llm import (
-    GoalDetectorHybrid,
-    GoalDetectionResult,
-    detect_navigation_goal,
-)
+# Orchestrators and extractors are imported on first use
+__getattr__, __dir__ = lazy_exports(__name__, {
+    # LLM-DSL core (the foundation)
+    'AtomicFunctions': 'curllm_core.llm_dsl:AtomicFunctions',
+    'DSLQueryGenerator': 'curllm_core.llm_dsl:DSLQueryGenerator',
+    'DSLQueryExecutor': 'curllm_core.llm_dsl:DSLExecutor',
+    
+    # LLM-driven form filling
+    'llm_form_fill': 'curllm_core.form_fill_llm:llm_form_fill',
+    'smart_form_fill': 'curllm_core.form_fill_llm:smart_form_fill',
+    'FormFillResult': 'curllm_core.form_fill_llm:FormFillResult',
+    
+    # LLM-driven orchestrators
+    'LLMFormOrchestrator': 'curllm_core.orchestrators.form_llm:LLMFormOrchestrator',
+    'LLMAuthOrchestrator': 'curllm_core.orchestrators.auth_llm:LLMAuthOrchestrator',
+    'LLMSocialOrchestrator': 'curllm_core.orchestrators.social_llm:LLMSocialOrchestrator',
+    'LLMECommerceOrchestrator': 'curllm_core.orchestrators.ecommerce_llm:LLMECommerceOrchestrator',
+    
+    # LLM-driven extraction
+    'LLMExtractor': 'curllm_core.extraction.extractor_llm:LLMExtractor',
+    'llm_extract': 'curllm_core.extraction.extractor_llm:llm_extract',
+    'extract_with_llm': 'curllm_core.extraction.extractor_llm:extract_with_llm',
+    
+    # LLM-driven planning
+    'LLMHierarchicalPlanner': 'curllm_core.hierarchical.planner_llm:LLMHierarchicalPlanner',
+    'should_use_hierarchical_llm': 'curllm_core.hierarchical.planner_llm:should_use_hierarchical_llm',
+    'extract_strategic_context': 'curllm_core.hierarchical.planner_llm:extract_strategic_context',
+    
+    # LLM-driven DSL execution
+    'LLMDSLExecutor': 'curllm_core.dsl.executor_llm:LLMDSLExecutor',
+    'LLMExecutionResult': 'curllm_core.dsl.executor_llm:LLMExecutionResult',
+    
+    # LLM-driven URL resolution
+    'GoalDetectorHybrid': 'curllm_core.url_resolution.goal_detector_llm:GoalDetectorHybrid',
+    'GoalDetectionResult': 'curllm_core.url_resolution.goal_detector_llm:GoalDetectionResult',
+    'detect_navigation_goal': 'curllm_core.url_resolution.goal_detector_llm:detect_navigation_goal',
+})
 
 __all__ = [
     # Core LLM-DSL
@@ -0,0 +1,359 @@
+"""
+Vision Pool - off-loop screenshot analysis
+
+Runs the OpenCV/NumPy work behind ``VisionAnalyzer`` and the sliding-puzzle
+solver in a process pool, so a coroutine only awaits the result instead of
+blocking the event loop for every other task. Screenshots are handed over as
+encoded bytes straight from Playwright (no disk round-trip), decoded once in
+the worker and downscaled when their longest side exceeds ``max_side``.
+
+Usage:
+    from curllm_core.vision_pool import get_vision_pool
+
+    png = await page.screenshot(type="png")
+    result = await get_vision_pool().analyze_page(png)
+    print(result["has_captcha"], result["num_forms"], result["timing"])
+
+    solution = await get_vision_pool().analyze_puzzle(png)  # None if nothing found
+
+    print(get_vision_pool().get_stats())  # submitted, rejected, avg_cv_ms, ...
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ImageInput = Union[bytes, bytearray, memoryview, str, Path]
+
+# Thresholds of the original full-resolution heuristics
+FORM_MIN_AREA = 5000
+CAPTCHA_NOISE_THRESHOLD = 30
+SPECTRUM_THRESHOLD = 100
+
+
+class VisionQueueFull(RuntimeError):
+    """Raised when more analyses are pending than the pool accepts."""
+
+
+# ---------------------------------------------------------------------------
+# Worker side: pure functions, picklable by reference
+# ---------------------------------------------------------------------------
+
+def decode_image(image: ImageInput) -> np.ndarray:
+    """Decode encoded image bytes (or read a file) into a grayscale array."""
+    if isinstance(image, (str, Path)):
+        image = Path(image).read_bytes()
+    gray = cv2.imdecode(np.frombuffer(bytes(image), dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise ValueError("could not decode image")
+    return gray
+
+
+def downscale(gray: np.ndarray, max_side: int) -> Tuple[np.ndarray, float]:
+    """
+    Shrink an image so its longest side is at most ``max_side``.
+
+    Returns:
+        (image, scale) where scale = new size / original size (1.0 if untouched)
+    """
+    longest = max(gray.shape[:2])
+    if max_side <= 0 or longest <= max_side:
+        return gray, 1.0
+    scale = max_side / longest
+    size = (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale)))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA), scale
+
+
+def captcha_noise_level(gray: np.ndarray) -> float:
+    """Mean per-pixel difference between the binarized image and its erode/dilate opening."""
+    _, thresh = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
+    kernel = np.ones((2, 2), np.uint8)
+    opened = cv2.dilate(cv2.erode(thresh, kernel, iterations=1), kernel, iterations=1)
+    diff = cv2.absdiff(thresh, opened)
+    return float(np.sum(diff, dtype=np.int64)) / (gray.shape[0] * gray.shape[1])
+
+
+def center_spectrum_mean(gray: np.ndarray, scale: float = 1.0) -> float:
+    """
+    Mean FFT magnitude of the 20x20 lowest-frequency window.
+
+    The low-frequency magnitudes of a downscaled image shrink with its pixel
+    count, so they are divided by ``scale ** 2`` to stay comparable with the
+    full-resolution threshold.
+    """
+    spectrum = np.abs(np.fft.fftshift(np.fft.fft2(gray)))
+    cy, cx = spectrum.shape[0] // 2, spectrum.shape[1] // 2
+    window = spectrum[max(cy - 10, 0):cy + 10, max(cx - 10, 0):cx + 10]
+    return float(window.mean()) / (scale * scale)
+
+
+def analyze_page_image(gray: np.ndarray, small: np.ndarray, scale: float) -> Dict[str, Any]:
+    """Page signals used by ``VisionAnalyzer``: captcha noise, large boxes, spectrum."""
+    edges = cv2.Canny(small, 50, 150)
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    min_area = FORM_MIN_AREA * scale * scale
+    return {
+        # Noise is a fine-detail signal: measured at full resolution (cheap, elementwise)
+        "has_captcha": captcha_noise_level(gray) > CAPTCHA_NOISE_THRESHOLD,
+        "num_forms": sum(1 for c in contours if cv2.contourArea(c) > min_area),
+        "has_images": center_spectrum_mean(small, scale) > SPECTRUM_THRESHOLD,
+    }
+
+
+def analyze_puzzle_image(gray: np.ndarray, small: np.ndarray, scale: float) -> Optional[Dict[str, Any]]:
+    """
+    Locate a sliding-puzzle piece and the gap it belongs in.
+
+    Coordinates are returned in original (full-resolution) pixels.
+    """
+    edges = cv2.Canny(small, 50, 150)
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    contours = sorted(contours, key=cv2.contourArea, reverse=True)[:2]
+    if len(contours) < 2:
+        return None
+    # First contour is the background, second the piece
+    x, y, w, h = cv2.boundingRect(contours[1])
+    if w == 0 or h == 0:
+        return None
+    template = small[y:y + h, x:x + w]
+    result = cv2.matchTemplate(small, template, cv2.TM_CCOEFF_NORMED)
+    _, _, _, max_loc = cv2.minMaxLoc(result)
+    return {
+        "type": "slide",
+        "distance": round((max_loc[0] - x) / scale),
+        "start_x": round(x / scale),
+        "start_y": round(y / scale),
+        "target_x": round(max_loc[0] / scale),
+        "target_y": round(max_loc[1] / scale),
+    }
+
+
+TASKS: Dict[str, Callable[[np.ndarray, np.ndarray, float], Any]] = {
+    "page": analyze_page_image,
+    "puzzle": analyze_puzzle_image,
+}
+
+
+def run_task(task: str, image: ImageInput, max_side: int, submitted_at: float) -> Dict[str, Any]:
+    """
+    Worker entry point: decode once, downscale, run ``TASKS[task]``.
+
+    Returns:
+        {"result": ..., "timing": {queue_ms, decode_ms, cv_ms, width, height, scale}}
+    """
+    started = time.time()
+    t0 = time.perf_counter()
+    gray = decode_image(image)
+    t1 = time.perf_counter()
+    small, scale = downscale(gray, max_side)
+    result = TASKS[task](gray, small, scale)
+    t2 = time.perf_counter()
+    return {
+        "result": result,
+        "timing": {
+            "queue_ms": round(max(0.0, started - submitted_at) * 1000, 2),
+            "decode_ms": round((t1 - t0) * 1000, 2),
+            "cv_ms": round((t2 - t1) * 1000, 2),
+            "width": int(gray.shape[1]),
+            "height": int(gray.shape[0]),
+            "scale": round(scale, 4),
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Loop side
+# ---------------------------------------------------------------------------
+
+class VisionPool:
+    """
+    Bounded process pool for screenshot analysis.
+
+    At most ``workers`` analyses run at once and ``max_queue`` more may wait;
+    beyond that ``run`` raises ``VisionQueueFull`` immediately instead of
+    letting screenshots pile up in memory. ``workers=0`` runs the analysis
+    in a single background thread (no subprocesses), still off the loop.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 8,
+        max_side: int = 1280,
+        start_method: str = "spawn",
+    ):
+        """
+        Initialize vision pool.
+
+        Args:
+            workers: Worker processes (0 = one background thread)
+            max_queue: Analyses allowed to wait for a free worker
+            max_side: Longest image side analysed; larger images are downscaled (0 = never)
+            start_method: multiprocessing start method for the workers
+        """
+        self.workers = max(0, workers)
+        self.max_queue = max(0, max_queue)
+        self.max_side = max_side
+        self.start_method = start_method
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats: Dict[str, float] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "queue_ms": 0.0,
+            "decode_ms": 0.0,
+            "cv_ms": 0.0,
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Analyses accepted at once (running + waiting)."""
+        return max(1, self.workers) + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vision")
+            return self._executor
+
+    async def run(self, task: str, image: ImageInput, max_side: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run one analysis task off the event loop.
+
+        Args:
+            task: Key of ``TASKS`` ("page" or "puzzle")
+            image: Encoded image bytes (PNG/JPEG/WebP) or a file path
+            max_side: Override of the pool's downscale limit
+
+        Returns:
+            {"result": ..., "timing": {...}} with timing in milliseconds
+
+        Raises:
+            VisionQueueFull: If ``capacity`` analyses are already pending
+            ValueError: If the image cannot be decoded
+        """
+        if task not in TASKS:
+            raise ValueError(f"unknown vision task: {task!r}")
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._stats["rejected"] += 1
+                raise VisionQueueFull(f"{self._pending} vision analyses pending (capacity {self.capacity})")
+            self._pending += 1
+            self._stats["submitted"] += 1
+
+        if isinstance(image, (bytearray, memoryview)):
+            image = bytes(image)
+        elif isinstance(image, Path):
+            image = str(image)
+        start = time.perf_counter()
+        try:
+            executor = self._get_executor()
+            future = executor.submit(
+                run_task, task, image, self.max_side if max_side is None else max_side, time.time()
+            )
+        except BaseException:
+            self._finish(None)
+            raise
+        # The slot is freed when the worker is done, even if the awaiting task was cancelled
+        future.add_done_callback(self._finish)
+        try:
+            out = await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise
+        timing = out["timing"]
+        timing["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return out
+
+    def _finish(self, future):
+        with self._lock:
+            self._pending -= 1
+            if future is None or future.cancelled() or future.exception() is not None:
+                self._stats["failed"] += 1
+                return
+            self._stats["completed"] += 1
+            timing = future.result()["timing"]
+            for key in ("queue_ms", "decode_ms", "cv_ms"):
+                self._stats[key] += timing[key]
+
+    def _reset(self, broken: Executor):
+        """Drop a broken process pool so the next call starts fresh workers."""
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False)
+        logger.warning("Vision worker pool broke; restarting on next analysis")
+
+    async def analyze_page(self, image: ImageInput) -> Dict[str, Any]:
+        """Page signals (has_captcha, num_forms, has_images) plus ``timing``."""
+        out = await self.run("page", image)
+        return {**out["result"], "timing": out["timing"]}
+
+    async def analyze_puzzle(self, image: ImageInput) -> Optional[Dict[str, Any]]:
+        """Sliding-puzzle solution with ``timing``, or None if no piece was found."""
+        out = await self.run("puzzle", image)
+        if out["result"] is None:
+            return None
+        return {**out["result"], "timing": out["timing"]}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics (totals and per-analysis averages in milliseconds)."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["pending"] = self._pending
+        done = stats["completed"] or 1
+        for key in ("queue_ms", "decode_ms", "cv_ms"):
+            stats[f"avg_{key}"] = round(stats[key] / done, 2)
+        stats.update(workers=self.workers, capacity=self.capacity, max_side=self.max_side)
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes (they are restarted lazily on the next call)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Global pool instance
+_global_pool: Optional[VisionPool] = None
+_global_lock = threading.Lock()
+
+
+def get_vision_pool() -> VisionPool:
+    """
+    Get or create the global vision pool.
+
+    Settings come from ``config.vision_workers``, ``config.vision_max_queue``
+    and ``config.vision_max_side``.
+    """
+    global _global_pool
+    with _global_lock:
+        if _global_pool is None:
+            from .config import config
+            _global_pool = VisionPool(
+                workers=config.vision_workers,
+                max_queue=config.vision_max_queue,
+                max_side=config.vision_max_side,
+            )
+        return _global_pool
@@ -7,17 +7,145 @@ Provides a unified interface for logging execution runs with:
 - Form summaries
 - Step-by-step logging
 - Configuration logging
+- Optional structured JSONL stream (one record per log call)
+
+Writes are buffered in memory and flushed by a shared background thread
+(every ``flush_interval`` seconds, or sooner once ``buffer_bytes`` are
+pending), so logging from async code never waits on disk. Headings go to a
+small TOC sidecar file and are stitched into the Navigation section once,
+in ``close()``/``finalize()``, or when the logger is garbage-collected or
+the interpreter exits without either being called.
 
 Migrated from curllm_core.logger for better modularity.
 """
 
+import json
 import os
 import re
+import shutil
+import threading
+import time
+import weakref
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 
+class _Flusher:
+    """Background thread flushing all open run-log buffers periodically"""
+
+    def __init__(self):
+        # Strong references: a buffer stays registered until its logger is
+        # closed or collected, so nothing buffered is dropped in between.
+        self._buffers: "set[_LogBuffer]" = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.interval = 1.0
+
+    def register(self, buffer: "_LogBuffer", flush_interval: float):
+        with self._lock:
+            self._buffers.add(buffer)
+            self.interval = min(self.interval, flush_interval)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="run-logger-flush", daemon=True)
+                self._thread.start()
+
+    def unregister(self, buffer: "_LogBuffer"):
+        with self._lock:
+            self._buffers.discard(buffer)
+
+    def wake(self):
+        self._wakeup.set()
+
+    def live(self) -> List["_LogBuffer"]:
+        with self._lock:
+            return list(self._buffers)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            for buffer in self.live():
+                try:
+                    buffer.flush()
+                except Exception:
+                    pass
+
+
+_flusher = _Flusher()
+
+
+class _LogBuffer:
+    """
+    Pending output and TOC stitching for one run log.
+
+    Kept separate from RunLogger so a ``weakref.finalize`` on the logger can
+    flush and stitch the log without holding the logger alive.
+    """
+
+    def __init__(self, path: Path, toc_path: Path, toc_offset: int, placeholder: str, buffer_bytes: int):
+        self.path = path
+        self.toc_path = toc_path
+        self.toc_offset = toc_offset
+        self.placeholder = placeholder
+        self.buffer_bytes = buffer_bytes
+        # Pending output per file, swapped out under _lock and written under _io_lock
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending: Dict[Path, List[str]] = {}
+        self._pending_size = 0
+        self.closed = False
+        self._toc_stitched = False
+
+    def enqueue(self, path: Path, text: str):
+        with self._lock:
+            self._pending.setdefault(path, []).append(text)
+            self._pending_size += len(text)
+            over = self._pending_size >= self.buffer_bytes
+        if self.closed:
+            self.flush()
+        elif over:
+            _flusher.wake()
+
+    def flush(self):
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._pending_size = 0
+            for path, chunks in pending.items():
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write("".join(chunks))
+
+    def close(self):
+        _flusher.unregister(self)
+        self.closed = True
+        self.flush()
+        if not self._toc_stitched:
+            self._toc_stitched = True
+            self._stitch_toc()
+
+    def _stitch_toc(self):
+        """Replace the TOC placeholder with the sidecar's entries (one streaming copy)"""
+        try:
+            toc_md = self.toc_path.read_text(encoding='utf-8').rstrip("\n") if self.toc_path.exists() else ""
+            toc_bytes = (toc_md or "(no sections yet)").encode('utf-8')
+            placeholder = self.placeholder.encode('utf-8')
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(self.path, 'rb') as src:
+                head = src.read(self.toc_offset + len(placeholder))
+                if head[self.toc_offset:] != placeholder:
+                    return
+                with open(tmp, 'wb') as dst:
+                    dst.write(head[:self.toc_offset])
+                    dst.write(toc_bytes)
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(tmp, self.path)
+            self.toc_path.unlink()
+        except Exception:
+            pass
+
+
 class RunLogger:
     """
     Markdown run logger for step-by-step diagnostics (with TOC and images).
@@ -39,6 +167,8 @@ class RunLogger:
             'values': {'email': 'test@example.com'},
             'validation': {'email': {'found': True, 'isEmpty': False}}
         })
+        
+        logger.finalize(success=True, duration_ms=1234)
     """
     
     def __init__(
@@ -47,7 +177,10 @@ class RunLogger:
         url: Optional[str],
         command_line: Optional[str] = None,
         log_dir: str = "./logs",
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        jsonl: Optional[bool] = None,
+        flush_interval: float = 1.0,
+        buffer_bytes: int = 64 * 1024,
     ):
         """
         Initialize the run logger.
@@ -58,33 +191,73 @@ class RunLogger:
             command_line: Full CLI command
             log_dir: Directory for log files
             session_id: Optional session ID (auto-generated if not provided)
+            jsonl: Also write run-<id>.jsonl with one record per log call
+                   (default: CURLLM_RUN_LOG_JSONL)
+            flush_interval: Seconds between background flushes
+            buffer_bytes: Pending bytes that trigger an early flush
         """
         self.session_id = session_id or datetime.now().strftime('%Y%m%d-%H%M%S')
         self.dir = Path(log_dir)
         self.dir.mkdir(parents=True, exist_ok=True)
         self.path = self.dir / f'run-{self.session_id}.md'
+        self.toc_path = self.dir / f'run-{self.session_id}.toc'
+        if jsonl is None:
+            jsonl = os.getenv("CURLLM_RUN_LOG_JSONL", "false").lower() in ("1", "true", "yes", "on")
+        self.jsonl_path: Optional[Path] = self.dir / f'run-{self.session_id}.jsonl' if jsonl else None
+        self.flush_interval = max(0.05, float(flush_interval))
+        self.buffer_bytes = max(0, int(buffer_bytes))
         
         # Internal TOC state
         self._toc_placeholder = "<!-- TOC_PLACEHOLDER -->"
         self._toc: List[tuple] = []  # (title, anchor)
         
+        header = f"# curllm Run Log ({self.session_id})\n\n## Navigation\n\n"
+        self._buffer = _LogBuffer(self.path, self.toc_path, len(header.encode('utf-8')),
+                                  self._toc_placeholder, self.buffer_bytes)
+        header += self._toc_placeholder + "\n\n"
+        # Command line, metadata
+        if command_line:
+            header += f"```bash\n{command_line}\n```\n\n"
+        if url:
+            header += f"- **URL**: {url}\n"
+        if instruction:
+            header += f"- **Instruction**: {instruction}\n\n"
         with open(self.path, 'w', encoding='utf-8') as f:
-            f.write(f"# curllm Run Log ({self.session_id})\n\n")
-            # Quick navigation (will be updated dynamically)
-            f.write("## Navigation\n\n")
-            f.write(self._toc_placeholder + "\n\n")
-            # Command line, metadata
-            if command_line:
-                f.write(f"```bash\n{command_line}\n```\n\n")
-            if url:
-                f.write(f"- **URL**: {url}\n")
-            if instruction:
-                f.write(f"- **Instruction**: {instruction}\n\n")
+            f.write(header)
+        for sidecar in (self.toc_path, self.jsonl_path):
+            if sidecar is not None:
+                sidecar.write_text("", encoding='utf-8')
+        self._record("start", instruction=instruction, url=url, command_line=command_line)
+        _flusher.register(self._buffer, self.flush_interval)
+        # Loggers dropped without close() still get flushed and stitched
+        self._finalizer = weakref.finalize(self, self._buffer.close)
+
+    def _enqueue(self, path: Path, text: str):
+        self._buffer.enqueue(path, text)
 
     def _write(self, text: str):
-        """Append text to log file"""
-        with open(self.path, 'a', encoding='utf-8') as f:
-            f.write(text)
+        """Append text to log file (buffered)"""
+        self._enqueue(self.path, text)
+
+    def _record(self, kind: str, **fields):
+        """Append a structured record to the JSONL stream (if enabled)"""
+        if self.jsonl_path is None:
+            return
+        rec = {"ts": round(time.time(), 3), "type": kind}
+        rec.update(fields)
+        try:
+            line = json.dumps(rec, ensure_ascii=False, default=str)
+        except Exception:
+            line = json.dumps({"ts": rec["ts"], "type": kind, "repr": repr(fields)}, ensure_ascii=False)
+        self._enqueue(self.jsonl_path, line + "\n")
+
+    def flush(self):
+        """Write all buffered output to disk"""
+        self._buffer.flush()
+
+    def close(self):
+        """Flush buffered output and stitch the TOC into the log (idempotent)"""
+        self._finalizer()
 
     def log_heading(self, text: str):
         """
@@ -96,24 +269,24 @@ class RunLogger:
         anchor = self._slugify(text)
         self._write("\n---\n\n")
         self._write(f"## {text}\n\n")
-        # Update TOC
-        try:
-            self._toc.append((text, anchor))
-            self._update_toc()
-        except Exception:
-            pass
+        self._toc.append((text, anchor))
+        self._enqueue(self.toc_path, f"- [{text}](#{anchor})\n")
+        self._record("heading", text=text, anchor=anchor)
 
     def log_text(self, text: str):
         """Log a paragraph of text"""
         self._write(f"{text}\n\n")
+        self._record("text", text=text)
 
     def log_kv(self, key: str, value: str):
         """Log a key-value pair"""
         self._write(f"- {key}: {value}\n")
+        self._record("kv", key=key, value=value)
 
     def log_code(self, lang: str, code: str):
         """Log a code block"""
         self._write(f"```{lang}\n{code}\n```\n\n")
+        self._record("code", lang=lang, code=code)
 
     def log_image(self, image_path: str, alt: str = ""):
         """
@@ -129,6 +302,7 @@ class RunLogger:
             rel = os.path.relpath(img.resolve(), start=self.dir.resolve())
             safe_alt = alt or img.name
             self._write(f"![{safe_alt}]({rel})\n\n")
+            self._record("image", path=str(image_path), alt=safe_alt)
         except Exception:
             self.log_text(f"Screenshot: {image_path}")
 
@@ -141,6 +315,10 @@ class RunLogger:
             rows: List of rows, each row is a list of cell values
             title: Optional title above the table
         """
+        self._record("table", title=title, headers=headers, rows=rows)
+        self._write_table(headers, rows, title)
+
+    def _write_table(self, headers: List[str], rows: List[List[str]], title: str = ""):
         if title:
             self._write(f"### {title}\n\n")
         
@@ -178,6 +356,7 @@ class RunLogger:
             form_data: Dictionary with form field information
                 Expected keys: 'fields', 'values', 'selectors', 'validation', 'result'
         """
+        self._record("form_summary", data=form_data)
         fields = form_data.get('fields', {})
         values = form_data.get('values', {})
         validation = form_data.get('validation', {})
@@ -215,7 +394,7 @@ class RunLogger:
                 
                 rows.append([field, display_value, display_selector, status])
             
-            self.log_table(headers, rows, "📝 Form Fields Summary")
+            self._write_table(headers, rows, "📝 Form Fields Summary")
         
         # Result summary
         result = form_data.get('result', {})
@@ -249,6 +428,8 @@ class RunLogger:
             duration_ms: Execution time in ms
             details: Optional details/error message
         """
+        self._record("step_result", step_index=step_index, step_type=step_type,
+                     success=success, duration_ms=duration_ms, details=details)
         status = "✅" if success else "❌"
         self._write(f"**Step {step_index + 1}:** {status} {step_type} ({duration_ms}ms)\n")
         if details:
@@ -257,20 +438,23 @@ class RunLogger:
 
     def log_json(self, data: Any, title: str = "Data"):
         """Log JSON data"""
-        import json
+        self._record("json", title=title, data=data)
         self._write(f"### {title}\n\n")
         self._write(f"```json\n{json.dumps(data, indent=2, ensure_ascii=False)}\n```\n\n")
 
     def log_success(self, message: str):
         """Log a success message"""
+        self._record("success", message=message)
         self._write(f"✅ **SUCCESS:** {message}\n\n")
 
     def log_error(self, message: str):
         """Log an error message"""
+        self._record("error", message=message)
         self._write(f"❌ **ERROR:** {message}\n\n")
 
     def log_warning(self, message: str):
         """Log a warning message"""
+        self._record("warning", message=message)
         self._write(f"⚠️ **WARNING:** {message}\n\n")
 
     def finalize(self, success: bool, duration_ms: int = 0, error: Optional[str] = None):
@@ -282,6 +466,7 @@ class RunLogger:
             duration_ms: Total execution time
             error: Error message if failed
         """
+        self._record("summary", success=success, duration_ms=duration_ms, error=error)
         self._write("\n---\n\n")
         self._write("## Summary\n\n")
         
@@ -293,6 +478,7 @@ class RunLogger:
             self._write(f"\n**Error:** {error}\n")
         
         self._write("\n")
+        self.close()
 
     # --- Helpers ---
     def _slugify(self, text: str) -> str:
@@ -302,22 +488,6 @@ class RunLogger:
         s = re.sub(r"\s+", "-", s)
         return s
 
-    def _update_toc(self):
-        """Update table of contents in the log file"""
-        try:
-            with open(self.path, 'r', encoding='utf-8') as fr:
-                content = fr.read()
-            if self._toc:
-                items = [f"- [{title}](#{self._slugify(title)})" for title, _ in self._toc]
-                toc_md = "\n".join(items)
-            else:
-                toc_md = "(no sections yet)"
-            content = content.replace(self._toc_placeholder, toc_md)
-            with open(self.path, 'w', encoding='utf-8') as fw:
-                fw.write(content)
-        except Exception:
-            pass
-
     @property
     def log_path(self) -> str:
         """Get the path to the log file"""
@@ -4,7 +4,7 @@ import logging
 import os
 
 from curllm_server.config import config
-from curllm_server.app import app
+from curllm_server.app import app, start_background_services
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +28,7 @@ def main():
         logger.info(f"Visual mode: Available")
         logger.info(f"Stealth mode: Available")
         logger.info(f"CAPTCHA solver: {'Enabled' if os.getenv('CAPTCHA_API_KEY') else 'Local OCR only'}")
+        start_background_services()
         app.run(host='0.0.0.0', port=config.api_port, debug=False, use_reloader=False)
 
 
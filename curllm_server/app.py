@@ -1,14 +1,18 @@
 """Flask application setup for curllm server"""
 
+import atexit
 import logging
+import signal
+import sys
 
 from flask import Flask
 from flask_cors import CORS
 
 from curllm_server.routes.health import health_bp
-from curllm_server.routes.execute import execute_bp
+from curllm_server.routes.execute import execute_bp, executor
 from curllm_server.routes.models import models_bp
 from curllm_server.routes.screenshot import screenshot_bp
+from curllm_server.routes.jobs import jobs_bp, start_job_workers, stop_job_workers
 
 # Configure logging
 logging.basicConfig(
@@ -24,3 +28,36 @@ app.register_blueprint(health_bp)
 app.register_blueprint(execute_bp)
 app.register_blueprint(models_bp)
 app.register_blueprint(screenshot_bp)
+app.register_blueprint(jobs_bp)
+
+
+def drain_server(timeout=None) -> bool:
+    """Stop the job workers and wait for in-flight async requests to finish"""
+    from curllm_core.async_runner import get_async_runner
+    from curllm_core.config import config as core_config
+
+    if core_config.server_mode != "async":
+        return True
+    # Running jobs that miss the deadline go back to the queue for the next start
+    stop_job_workers(timeout)
+    return get_async_runner().drain(
+        timeout=core_config.server_drain_timeout if timeout is None else timeout,
+        finalizer=executor.aclose,
+    )
+
+
+def start_background_services():
+    """Start the job workers (async mode) and drain them on exit or SIGTERM"""
+    if start_job_workers():
+        logging.getLogger(__name__).info("Job queue workers started")
+    atexit.register(drain_server)
+
+    def _on_sigterm(signum, frame):
+        drain_server()
+        sys.exit(0)
+
+    try:
+        signal.signal(signal.SIGTERM, _on_sigterm)
+    except ValueError:
+        # Not in main thread (e.g. embedded); rely on atexit only
+        pass
@@ -25,6 +25,8 @@ from curllm_server.logger.run_logger import RunLogger
 from curllm_core.config_logger import log_all_config
 from curllm_core.runtime import parse_runtime_from_instruction
 from curllm_core.executor import CurllmExecutor as CoreExecutor
+from curllm_core.http_pool import close_http_pool
+from curllm_core.screenshots import take_screenshot
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +74,10 @@ class CurllmExecutor:
             top_p=config.top_p,
         )
     
+    async def aclose(self):
+        """Release pooled LLM HTTP connections bound to the running event loop"""
+        await close_http_pool()
+    
     async def execute_workflow(
         self,
         instruction: str,
@@ -127,6 +133,7 @@ class CurllmExecutor:
             log_all_config(run_logger, visual_mode, stealth_mode, use_bql, runtime)
             run_logger.log_text("Error occurred (core executor):")
             run_logger.log_code("text", str(e))
+            run_logger.close()
             return {
                 "success": False,
                 "error": str(e),
@@ -213,10 +220,7 @@ class CurllmExecutor:
     async def _take_screenshot(self, page, step: int, target_dir: Optional[Path] = None) -> str:
         """Take and save screenshot"""
         tdir = Path(target_dir) if target_dir else config.screenshot_dir
-        tdir.mkdir(parents=True, exist_ok=True)
-        filename = tdir / f"step_{step}_{datetime.now().timestamp()}.png"
-        await page.screenshot(path=str(filename))
-        return str(filename)
+        return await take_screenshot(page, step, target_dir=tdir)
     
     async def _extract_page_context(self, page) -> Dict:
         """Extract page context for LLM (null-safe)."""
@@ -1,6 +1,6 @@
 """Simple Ollama client for async LLM calls"""
 
-import aiohttp
+from curllm_core.http_pool import get_http_pool
 
 
 class SimpleOllama:
@@ -32,8 +32,6 @@ class SimpleOllama:
             "stream": False,
             "options": self.options,
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{self.base_url}/api/generate", json=payload) as resp:
-                data = await resp.json()
+        data = await get_http_pool().post_json(f"{self.base_url}/api/generate", payload)
         text = data.get("response", "") if isinstance(data, dict) else str(data)
         return {"text": text}
@@ -4,6 +4,8 @@ import asyncio
 
 from flask import Blueprint, request, jsonify
 
+from curllm_core.async_runner import get_async_runner, ServerBusyError
+from curllm_core.config import config as core_config
 from curllm_server.executor.curllm_executor import CurllmExecutor
 
 execute_bp = Blueprint('execute', __name__)
@@ -26,23 +28,43 @@ def execute():
     use_bql = data.get('use_bql', False)
     headers = data.get('headers', {})
     
-    # Run async task in a fresh event loop per request to avoid loop state issues
+    def _workflow():
+        return executor.execute_workflow(
+            instruction=instruction,
+            url=url,
+            visual_mode=visual_mode,
+            stealth_mode=stealth_mode,
+            captcha_solver=captcha_solver,
+            use_bql=use_bql,
+            headers=headers
+        )
+    
+    # Async mode: run on the shared long-lived loop with bounded concurrency
+    if core_config.server_mode == "async":
+        try:
+            return jsonify(get_async_runner().run(_workflow))
+        except ServerBusyError as e:
+            resp = jsonify({
+                "success": False,
+                "error": str(e),
+                "queue_depth": e.queue_depth,
+                "retry_after": e.retry_after,
+            })
+            resp.status_code = 429
+            resp.headers["Retry-After"] = str(e.retry_after)
+            return resp
+    
+    # Legacy mode: run async task in a fresh event loop per request
     def _run_in_new_loop():
         loop = asyncio.new_event_loop()
         try:
             asyncio.set_event_loop(loop)
-            return loop.run_until_complete(
-                executor.execute_workflow(
-                    instruction=instruction,
-                    url=url,
-                    visual_mode=visual_mode,
-                    stealth_mode=stealth_mode,
-                    captcha_solver=captcha_solver,
-                    use_bql=use_bql,
-                    headers=headers
-                )
-            )
+            return loop.run_until_complete(_workflow())
         finally:
+            try:
+                loop.run_until_complete(executor.aclose())
+            except Exception:
+                pass
             try:
                 loop.run_until_complete(asyncio.sleep(0))
             except Exception:
@@ -0,0 +1,28 @@
+"""Job queue endpoints: submit now, poll or receive a webhook later
+
+The endpoints and worker lifecycle are shared with curllm_core.server
+(see curllm_core.job_api); this module only binds jobs to this app's executor.
+"""
+
+from curllm_core.job_api import jobs_bp, start_job_workers as _start_job_workers, stop_job_workers
+from curllm_server.routes.execute import executor
+
+
+async def _run_job(payload):
+    return await executor.execute_workflow(
+        instruction=payload.get('data', ''),
+        url=payload.get('url'),
+        visual_mode=payload.get('visual_mode', False),
+        stealth_mode=payload.get('stealth_mode', False),
+        captcha_solver=payload.get('captcha_solver', False),
+        use_bql=payload.get('use_bql', False),
+        headers=payload.get('headers', {}),
+    )
+
+
+def start_job_workers():
+    """Start the job workers for this app (no-op without workers or async mode)"""
+    return _start_job_workers(_run_job)
+
+
+__all__ = ['jobs_bp', 'start_job_workers', 'stop_job_workers']
@@ -2,6 +2,7 @@
 
 from flask import Blueprint, jsonify, send_file
 
+from curllm_core.screenshots import IMAGE_MIMETYPES
 from curllm_server.config import config
 
 screenshot_bp = Blueprint('screenshot', __name__)
@@ -12,5 +13,5 @@ def get_screenshot(filename):
     """Serve screenshot files"""
     filepath = config.screenshot_dir / filename
     if filepath.exists():
-        return send_file(str(filepath), mimetype='image/png')
+        return send_file(str(filepath), mimetype=IMAGE_MIMETYPES.get(filepath.suffix.lower()))
     return jsonify({"error": "Screenshot not found"}), 404
@@ -5,6 +5,7 @@ from datetime import datetime
 from flask import Blueprint, jsonify
 
 from curllm_web.config import LOGS_DIR, UPLOAD_FOLDER
+from curllm_web.utils.log_index import get_log_catalog
 
 health_bp = Blueprint('health', __name__)
 
@@ -15,6 +16,6 @@ def health():
     return jsonify({
         'status': 'ok',
         'timestamp': datetime.now().isoformat(),
-        'logs_count': len(list(LOGS_DIR.glob('run-*.md'))),
+        'logs_count': get_log_catalog(LOGS_DIR).count(),
         'uploads_count': len(list(UPLOAD_FOLDER.glob('*')))
     })
@@ -1,17 +1,35 @@
 """Logs routes - log file management"""
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, send_file
 
-from curllm_web.utils.log_utils import get_logs_list, read_log_content
+from curllm_web.config import LOGS_DIR
+from curllm_web.utils.log_index import get_log_catalog
+from curllm_web.utils.log_utils import read_log_content
 
 logs_bp = Blueprint('logs', __name__)
 
 
 @logs_bp.route('/api/logs', methods=['GET'])
 def get_logs():
-    """Get list of log files"""
-    logs = get_logs_list()
-    return jsonify({'logs': logs})
+    """
+    Get paginated list of log files.
+
+    Query params: page, per_page, domain, status (success|failed|unknown),
+    since/until (ISO dates), q (full-text search).
+    """
+    try:
+        result = get_log_catalog(LOGS_DIR).list(
+            page=request.args.get('page', 1, type=int),
+            per_page=request.args.get('per_page', 50, type=int),
+            domain=request.args.get('domain') or None,
+            status=request.args.get('status') or None,
+            since=request.args.get('since') or None,
+            until=request.args.get('until') or None,
+            query=request.args.get('q') or None,
+        )
+    except ValueError as e:
+        return jsonify({'error': f'Invalid filter: {e}'}), 400
+    return jsonify(result)
 
 
 @logs_bp.route('/api/logs/<filename>', methods=['GET'])
@@ -21,3 +39,29 @@ def get_log(filename):
     if content:
         return jsonify({'success': True, 'content': content, 'filename': filename})
     return jsonify({'error': 'Log file not found'}), 404
+
+
+@logs_bp.route('/api/logs/<filename>/tail', methods=['GET'])
+def tail_log(filename):
+    """
+    Get the end of a log, or the bytes after ``offset`` to follow a running log.
+
+    Query params: bytes (default 65536), offset
+    """
+    chunk = get_log_catalog(LOGS_DIR).read_tail(
+        filename,
+        max_bytes=min(request.args.get('bytes', 65536, type=int), 4 * 1024 * 1024),
+        offset=request.args.get('offset', type=int),
+    )
+    if chunk is None:
+        return jsonify({'error': 'Log file not found'}), 404
+    return jsonify({'success': True, **chunk})
+
+
+@logs_bp.route('/api/logs/<filename>/raw', methods=['GET'])
+def raw_log(filename):
+    """Stream a log file as text/markdown (supports HTTP Range requests)"""
+    log_path = get_log_catalog(LOGS_DIR).resolve(filename)
+    if log_path is None:
+        return jsonify({'error': 'Log file not found'}), 404
+    return send_file(log_path.resolve(), mimetype='text/markdown', conditional=True)
@@ -1,6 +1,7 @@
 """Utility functions module"""
 
 from curllm_web.utils.file_utils import allowed_file
+from curllm_web.utils.log_index import LogCatalog, get_log_catalog
 from curllm_web.utils.log_utils import get_logs_list, read_log_content
 
-__all__ = ['allowed_file', 'get_logs_list', 'read_log_content']
+__all__ = ['allowed_file', 'LogCatalog', 'get_log_catalog', 'get_logs_list', 'read_log_content']
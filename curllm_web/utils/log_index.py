@@ -0,0 +1,422 @@
+"""
+Log catalog - incrementally maintained index of run logs
+
+Listing ``run-*.md`` used to glob and stat every file and read whole logs on
+each request. The catalog keeps one SQLite row per log (session id, URL,
+domain, instruction, status, duration, size, mtime) plus a full-text index
+of its content. ``sync()`` is mtime driven: a directory scan compares
+``(mtime, size)`` with the stored row and only re-reads logs that were
+added or grew; scans are skipped entirely while the directory is unchanged
+and the last scan is younger than ``min_interval``.
+
+Usage:
+    from curllm_web.utils.log_index import get_log_catalog
+
+    catalog = get_log_catalog()
+    page = catalog.list(page=1, per_page=50, domain="example.com", status="failed")
+    hits = catalog.list(query="captcha")
+    chunk = catalog.read_tail("run-20240101-120000.md", max_bytes=65536)
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+LOG_NAME_RE = re.compile(r'^run-[\w.-]+\.md$')
+_URL_RE = re.compile(r'\*\*URL(?::\*\*|\*\*:)\s*(\S+)')
+_INSTRUCTION_RE = re.compile(r'\*\*Instruction(?::\*\*|\*\*:)\s*(.+)')
+_STATUS_RE = re.compile(r'\*\*Status:\*\*\s*(?:✅\s*)?(SUCCESS|(?:❌\s*)?FAILED)')
+_DURATION_RE = re.compile(r'\*\*Duration:\*\*\s*(\d+)\s*ms')
+_SESSION_TIME_RE = re.compile(r'(\d{8}-\d{6})')
+
+_HEAD_BYTES = 16 * 1024
+_TAIL_BYTES = 16 * 1024
+
+
+def _session_time(filename: str, mtime: float) -> float:
+    """Start time from a ``run-YYYYmmdd-HHMMSS`` name, else the file mtime"""
+    match = _SESSION_TIME_RE.search(filename)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), '%Y%m%d-%H%M%S').timestamp()
+        except ValueError:
+            pass
+    return mtime
+
+
+def _utf8_boundary(data: bytes) -> int:
+    """Length of ``data`` without a multi-byte character cut off at its end"""
+    i = len(data) - 1
+    while i >= 0 and i > len(data) - 4 and (data[i] & 0xC0) == 0x80:
+        i -= 1
+    if i < 0 or data[i] < 0xC0:
+        return len(data)
+    width = 2 if data[i] < 0xE0 else 3 if data[i] < 0xF0 else 4
+    return i if i + width > len(data) else len(data)
+
+
+def _parse_date(value: Optional[str]) -> Optional[float]:
+    """Timestamp of an ISO date/datetime string (None if empty)"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value).timestamp()
+
+
+class LogCatalog:
+    """
+    SQLite catalog of the run logs in one directory.
+
+    Args:
+        logs_dir: Directory holding ``run-*.md`` logs
+        db_path: Index database (default ``<logs_dir>/.log_index.db``)
+        min_interval: Seconds between directory scans while its mtime is unchanged
+        max_index_bytes: Bytes of each log fed to the full-text index
+    """
+
+    def __init__(
+        self,
+        logs_dir: Path,
+        db_path: Optional[Path] = None,
+        min_interval: float = 2.0,
+        max_index_bytes: int = 2 * 1024 * 1024,
+    ):
+        self.logs_dir = Path(logs_dir)
+        self.db_path = Path(db_path) if db_path else self.logs_dir / '.log_index.db'
+        self.min_interval = min_interval
+        self.max_index_bytes = max_index_bytes
+        self._lock = threading.RLock()
+        self._last_sync = 0.0
+        self._last_dir_mtime: Optional[int] = None
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY,
+                filename TEXT UNIQUE NOT NULL,
+                session_id TEXT,
+                url TEXT,
+                domain TEXT,
+                instruction TEXT,
+                status TEXT,
+                duration_ms INTEGER,
+                size INTEGER,
+                mtime_ns INTEGER,
+                started REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_logs_started ON logs(started);
+            CREATE INDEX IF NOT EXISTS idx_logs_domain ON logs(domain, started);
+            CREATE INDEX IF NOT EXISTS idx_logs_status ON logs(status, started);
+        """)
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS log_text USING fts5(body)"
+            )
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite without FTS5: plain table searched with LIKE
+            self._conn.execute("CREATE TABLE IF NOT EXISTS log_text (rowid INTEGER PRIMARY KEY, body TEXT)")
+            self.fts = False
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    def sync(self, force: bool = False) -> Dict[str, int]:
+        """
+        Bring the index up to date with the directory.
+
+        Returns:
+            Counts of added/updated/removed logs (all zero if the scan was skipped)
+        """
+        stats = {'added': 0, 'updated': 0, 'removed': 0}
+        with self._lock:
+            try:
+                dir_mtime = os.stat(self.logs_dir).st_mtime_ns
+            except FileNotFoundError:
+                return stats
+            now = time.monotonic()
+            if (not force and dir_mtime == self._last_dir_mtime
+                    and now - self._last_sync < self.min_interval):
+                return stats
+
+            known = {row['filename']: (row['mtime_ns'], row['size'])
+                     for row in self._conn.execute("SELECT filename, mtime_ns, size FROM logs")}
+            seen = set()
+            with os.scandir(self.logs_dir) as entries:
+                for entry in entries:
+                    if not LOG_NAME_RE.match(entry.name) or not entry.is_file():
+                        continue
+                    seen.add(entry.name)
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    previous = known.get(entry.name)
+                    if previous == (st.st_mtime_ns, st.st_size):
+                        continue
+                    try:
+                        self._index_file(entry.name, st)
+                    except OSError as e:
+                        logger.error(f"Error indexing log file {entry.name}: {e}")
+                        continue
+                    stats['updated' if previous else 'added'] += 1
+
+            removed = [name for name in known if name not in seen]
+            for name in removed:
+                row = self._conn.execute("SELECT id FROM logs WHERE filename = ?", (name,)).fetchone()
+                self._conn.execute("DELETE FROM log_text WHERE rowid = ?", (row['id'],))
+                self._conn.execute("DELETE FROM logs WHERE id = ?", (row['id'],))
+            stats['removed'] = len(removed)
+            self._conn.commit()
+            self._last_dir_mtime = dir_mtime
+            self._last_sync = now
+        if any(stats.values()):
+            logger.debug(f"Log catalog sync: {stats}")
+        return stats
+
+    def _index_file(self, filename: str, st: os.stat_result):
+        path = self.logs_dir / filename
+        with open(path, 'rb') as f:
+            body = f.read(self.max_index_bytes)
+            if st.st_size > self.max_index_bytes:
+                f.seek(max(self.max_index_bytes, st.st_size - _TAIL_BYTES))
+                tail = f.read()
+            else:
+                tail = body[-_TAIL_BYTES:]
+        head_text = body[:_HEAD_BYTES].decode('utf-8', errors='replace')
+        tail_text = tail.decode('utf-8', errors='replace')
+
+        url_match = _URL_RE.search(head_text)
+        url = url_match.group(1).strip('`') if url_match else None
+        instruction = _INSTRUCTION_RE.search(head_text)
+        # The run summary is at the end; curllm_logs sessions also put it in the header
+        statuses = _STATUS_RE.findall(tail_text) or _STATUS_RE.findall(head_text)
+        durations = _DURATION_RE.findall(tail_text) or _DURATION_RE.findall(head_text)
+        if statuses:
+            status = 'success' if statuses[-1] == 'SUCCESS' else 'failed'
+        else:
+            status = 'unknown'
+
+        self._conn.execute(
+            "INSERT INTO logs(filename, session_id, url, domain, instruction, status, "
+            "duration_ms, size, mtime_ns, started) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(filename) DO UPDATE SET url = excluded.url, domain = excluded.domain, "
+            "instruction = excluded.instruction, status = excluded.status, "
+            "duration_ms = excluded.duration_ms, size = excluded.size, "
+            "mtime_ns = excluded.mtime_ns, started = excluded.started",
+            (
+                filename,
+                filename[len('run-'):-len('.md')],
+                url,
+                urlparse(url).netloc.lower() if url else None,
+                instruction.group(1).strip() if instruction else None,
+                status,
+                int(durations[-1]) if durations else None,
+                st.st_size,
+                st.st_mtime_ns,
+                _session_time(filename, st.st_mtime),
+            ),
+        )
+        log_id = self._conn.execute("SELECT id FROM logs WHERE filename = ?", (filename,)).fetchone()['id']
+        self._conn.execute("DELETE FROM log_text WHERE rowid = ?", (log_id,))
+        self._conn.execute(
+            "INSERT INTO log_text(rowid, body) VALUES (?, ?)",
+            (log_id, body.decode('utf-8', errors='replace')),
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def count(self) -> int:
+        """Number of indexed logs"""
+        self.sync()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+
+    def list(
+        self,
+        page: int = 1,
+        per_page: Optional[int] = 50,
+        domain: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        query: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Paginated listing, newest first.
+
+        Args:
+            page: 1-based page number
+            per_page: Logs per page (capped at 500); None returns every
+                      matching log on a single page
+            domain: Exact domain (``www.`` optional)
+            status: success | failed | unknown
+            since: ISO date/datetime, inclusive
+            until: ISO date/datetime, exclusive
+            query: Full-text search over log content
+
+        Returns:
+            Dict with logs, total, page, per_page, pages
+        """
+        self.sync()
+        page = max(1, int(page))
+        if per_page is not None:
+            per_page = min(500, max(1, int(per_page)))
+        where, params = [], []
+        if domain:
+            domain = domain.lower()
+            bare = domain[4:] if domain.startswith('www.') else domain
+            where.append("l.domain IN (?, ?)")
+            params += [bare, f"www.{bare}"]
+        if status:
+            where.append("l.status = ?")
+            params.append(status.lower())
+        if since:
+            where.append("l.started >= ?")
+            params.append(_parse_date(since))
+        if until:
+            where.append("l.started < ?")
+            params.append(_parse_date(until))
+        join = ""
+        if query:
+            join = "JOIN log_text ON log_text.rowid = l.id"
+            if self.fts:
+                where.append("log_text MATCH ?")
+                params.append(self._fts_query(query))
+            else:
+                where.append("log_text.body LIKE ?")
+                params.append(f"%{query}%")
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM logs l {join} {clause}", params
+            ).fetchone()[0]
+            snippet = ", snippet(log_text, 0, '[', ']', '…', 12) AS snippet" if query and self.fts else ""
+            sql = f"SELECT l.*{snippet} FROM logs l {join} {clause} ORDER BY l.started DESC, l.filename DESC"
+            if per_page is None:
+                page = 1
+                rows = self._conn.execute(sql, params).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"{sql} LIMIT ? OFFSET ?", params + [per_page, (page - 1) * per_page]
+                ).fetchall()
+
+        logs = [self._row_to_dict(row) for row in rows]
+        if per_page is None:
+            per_page = max(1, total)
+        return {
+            'logs': logs,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': (total + per_page - 1) // per_page,
+        }
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Quote each term so user input cannot break FTS5 syntax"""
+        terms = [t.replace('"', '""') for t in query.split()]
+        return ' '.join(f'"{t}"' for t in terms) or '""'
+
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        data = {
+            'filename': row['filename'],
+            'path': str(self.logs_dir / row['filename']),
+            'size': row['size'],
+            'modified': datetime.fromtimestamp(row['mtime_ns'] / 1e9).strftime('%Y-%m-%d %H:%M:%S'),
+            'session_id': row['session_id'],
+            'url': row['url'],
+            'domain': row['domain'],
+            'instruction': row['instruction'],
+            'status': row['status'],
+            'duration_ms': row['duration_ms'],
+            'started': datetime.fromtimestamp(row['started']).strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        if 'snippet' in row.keys():
+            data['snippet'] = row['snippet']
+        return data
+
+    # ------------------------------------------------------------------
+    # Content access
+    # ------------------------------------------------------------------
+    def resolve(self, filename: str) -> Optional[Path]:
+        """Path of a log file, or None for unknown/invalid names"""
+        if not LOG_NAME_RE.match(filename or ''):
+            return None
+        path = self.logs_dir / filename
+        return path if path.is_file() else None
+
+    def read_tail(self, filename: str, max_bytes: int = 64 * 1024, offset: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Read part of a log without loading the whole file.
+
+        Without ``offset`` returns the last ``max_bytes`` (starting at a
+        line boundary); with ``offset`` returns up to ``max_bytes`` from
+        there, which lets a client follow a running log by passing back
+        ``next_offset``.
+
+        Returns:
+            Dict with content, offset, next_offset, size, eof - or None if not found
+        """
+        path = self.resolve(filename)
+        if path is None:
+            return None
+        max_bytes = max(1, int(max_bytes))
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if offset is None:
+                start = max(0, size - max_bytes)
+                f.seek(start)
+                data = f.read(max_bytes)
+                if start > 0:
+                    newline = data.find(b'\n')
+                    if newline != -1:
+                        start += newline + 1
+                        data = data[newline + 1:]
+            else:
+                start = min(max(0, int(offset)), size)
+                f.seek(start)
+                data = f.read(max_bytes)
+                if start + len(data) < size:
+                    data = data[:_utf8_boundary(data)] or data
+        next_offset = start + len(data)
+        return {
+            'filename': filename,
+            'content': data.decode('utf-8', errors='replace'),
+            'offset': start,
+            'next_offset': next_offset,
+            'size': size,
+            'eof': next_offset >= size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_catalogs: Dict[Path, LogCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_log_catalog(logs_dir: Optional[Path] = None) -> LogCatalog:
+    """Get or create the catalog for a logs directory (default LOGS_DIR)"""
+    if logs_dir is None:
+        from curllm_web.config import LOGS_DIR
+        logs_dir = LOGS_DIR
+    key = Path(logs_dir).resolve()
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = LogCatalog(key)
+        return _catalogs[key]
@@ -0,0 +1,559 @@
+/**
+ * Page Analyzers (JavaScript/Browser)
+ *
+ * Whole-page analysis functions used by the Python analyzers
+ * (dom_statistics, dom_toolkit clustering, iterative_extractor).
+ * They are part of the preloaded page library (see curllm_core/page_library.py)
+ * and are called by name with small argument payloads.
+ */
+
+const AnalyzerRegistry = (typeof FunctionRegistry !== 'undefined')
+    ? FunctionRegistry
+    : require('./extractors.js').FunctionRegistry;
+
+/**
+ * Element counts and text lengths per DOM depth
+ */
+function domDepthStats() {
+    const stats = {
+        depthMap: {},
+        textLengthByDepth: {}
+    };
+
+    function analyzeDepth(element, depth = 0) {
+        stats.depthMap[depth] = (stats.depthMap[depth] || 0) + 1;
+
+        // Text length statistics
+        const textLength = (element.textContent || '').trim().length;
+        if (!stats.textLengthByDepth[depth]) {
+            stats.textLengthByDepth[depth] = [];
+        }
+        if (textLength > 0 && textLength < 500) {
+            stats.textLengthByDepth[depth].push(textLength);
+        }
+
+        // Recurse
+        for (const child of element.children) {
+            analyzeDepth(child, depth + 1);
+        }
+    }
+
+    analyzeDepth(document.body);
+    return stats;
+}
+
+AnalyzerRegistry.register('domDepthStats', domDepthStats, {
+    category: 'analyzers',
+    description: 'Element counts and text lengths per DOM depth'
+});
+
+/**
+ * Price/link/image counts per DOM depth
+ */
+function domFeatureStats() {
+    const stats = {
+        prices: {},
+        links: {},
+        images: {}
+    };
+
+    function getDepth(element) {
+        let depth = 0;
+        let current = element;
+        while (current && current !== document.body) {
+            depth++;
+            current = current.parentElement;
+        }
+        return depth;
+    }
+
+    // Price patterns (no hard-coded selectors!)
+    const pricePattern = /\d+[,.]?\d*\s*(?:zł|PLN|€|\$)/;
+    document.querySelectorAll('*').forEach(el => {
+        const text = el.textContent || '';
+        if (text.match(pricePattern) && text.length < 100) {
+            const depth = getDepth(el);
+            stats.prices[depth] = (stats.prices[depth] || 0) + 1;
+        }
+    });
+
+    // Links
+    document.querySelectorAll('a[href]').forEach(el => {
+        const depth = getDepth(el);
+        stats.links[depth] = (stats.links[depth] || 0) + 1;
+    });
+
+    // Images
+    document.querySelectorAll('img[src]').forEach(el => {
+        const depth = getDepth(el);
+        stats.images[depth] = (stats.images[depth] || 0) + 1;
+    });
+
+    return stats;
+}
+
+AnalyzerRegistry.register('domFeatureStats', domFeatureStats, {
+    category: 'analyzers',
+    description: 'Price/link/image counts per DOM depth'
+});
+
+/**
+ * Frequency of first class names
+ */
+function domClassPatterns() {
+    const classFreq = {};
+
+    document.querySelectorAll('*').forEach(el => {
+        if (el.className && typeof el.className === 'string') {
+            const classes = el.className.split(' ').filter(c => c.length > 0);
+            const firstClass = classes[0];
+            if (firstClass) {
+                classFreq[firstClass] = (classFreq[firstClass] || 0) + 1;
+            }
+        }
+    });
+
+    return classFreq;
+}
+
+AnalyzerRegistry.register('domClassPatterns', domClassPatterns, {
+    category: 'analyzers',
+    description: 'Frequency of first class names'
+});
+
+/**
+ * All DOM statistics in one call
+ */
+function domStatistics() {
+    return {
+        depth: domDepthStats(),
+        features: domFeatureStats(),
+        classes: domClassPatterns()
+    };
+}
+
+AnalyzerRegistry.register('domStatistics', domStatistics, {
+    category: 'analyzers',
+    description: 'All DOM statistics in one call'
+});
+
+/**
+ * Cluster elements matching a selector by internal structure
+ * @param {Object} args - {selector, maxClusters}
+ * @returns {Object} Clusters with representative samples
+ */
+function clusterByStructure(args) {
+    const elements = document.querySelectorAll(args.selector);
+    if (elements.length === 0) return { found: false };
+
+    // Build feature vector for each element
+    const features = Array.from(elements).map(el => {
+        const childTags = {};
+        for (const child of el.children) {
+            const tag = child.tagName.toLowerCase();
+            childTags[tag] = (childTags[tag] || 0) + 1;
+        }
+
+        return {
+            element: el,
+            features: {
+                children_count: el.children.length,
+                text_length: (el.textContent || '').length,
+                has_link: !!el.querySelector('a[href]'),
+                has_image: !!el.querySelector('img'),
+                has_price: /\d+[,.]\d{2}/.test(el.textContent || ''),
+                child_tags: Object.keys(childTags).sort().join(','),
+                depth: (() => {
+                    let d = 0, c = el;
+                    while (c && c !== document.body) { d++; c = c.parentElement; }
+                    return d;
+                })()
+            }
+        };
+    });
+
+    // Simple clustering by feature signature
+    const clusters = new Map();
+
+    for (const item of features) {
+        // Create signature from key features
+        const sig = [
+            item.features.children_count > 5 ? 'many_children' : 'few_children',
+            item.features.text_length > 100 ? 'long_text' : 'short_text',
+            item.features.has_link ? 'has_link' : 'no_link',
+            item.features.has_image ? 'has_image' : 'no_image',
+            item.features.has_price ? 'has_price' : 'no_price',
+            item.features.child_tags
+        ].join('|');
+
+        if (!clusters.has(sig)) {
+            clusters.set(sig, {
+                signature: sig,
+                count: 0,
+                samples: [],
+                features: item.features
+            });
+        }
+
+        const cluster = clusters.get(sig);
+        cluster.count++;
+        if (cluster.samples.length < 3) {
+            cluster.samples.push({
+                text_preview: (item.element.textContent || '').slice(0, 100),
+                classes: typeof item.element.className === 'string' 
+                    ? item.element.className.split(' ').slice(0, 3).join(' ')
+                    : ''
+            });
+        }
+    }
+
+    // Sort clusters by size
+    const sortedClusters = Array.from(clusters.values())
+        .sort((a, b) => b.count - a.count)
+        .slice(0, args.maxClusters);
+
+    return {
+        found: true,
+        total_elements: elements.length,
+        cluster_count: clusters.size,
+        clusters: sortedClusters
+    };
+}
+
+AnalyzerRegistry.register('clusterByStructure', clusterByStructure, {
+    category: 'analyzers',
+    description: 'Cluster elements by structure'
+});
+
+/**
+ * Find elements structurally similar to a reference element
+ * @param {Object} args - {referenceSelector, threshold}
+ * @returns {Array} Similar elements, most similar first
+ */
+function findSimilarElements(args) {
+    const ref = document.querySelector(args.referenceSelector);
+    if (!ref) return [];
+
+    // Build reference features
+    const refFeatures = {
+        tag: ref.tagName,
+        children_count: ref.children.length,
+        text_length: (ref.textContent || '').length,
+        child_tags: Array.from(ref.children).map(c => c.tagName).sort().join(','),
+        has_link: !!ref.querySelector('a[href]'),
+        has_image: !!ref.querySelector('img')
+    };
+
+    // Score similarity function
+    const scoreSimilarity = (el) => {
+        let score = 0;
+        const maxScore = 6;
+
+        if (el.tagName === refFeatures.tag) score += 1;
+        if (Math.abs(el.children.length - refFeatures.children_count) <= 2) score += 1;
+
+        const textLenRatio = Math.min(
+            (el.textContent || '').length / refFeatures.text_length,
+            refFeatures.text_length / (el.textContent || '').length
+        );
+        if (textLenRatio > 0.5) score += 1;
+
+        const childTags = Array.from(el.children).map(c => c.tagName).sort().join(',');
+        if (childTags === refFeatures.child_tags) score += 1;
+
+        if (!!el.querySelector('a[href]') === refFeatures.has_link) score += 1;
+        if (!!el.querySelector('img') === refFeatures.has_image) score += 1;
+
+        return score / maxScore;
+    };
+
+    // Find similar elements
+    const similar = [];
+    const allElements = document.querySelectorAll(ref.tagName);
+
+    for (const el of allElements) {
+        if (el === ref) continue;
+
+        const similarity = scoreSimilarity(el);
+        if (similarity >= args.threshold) {
+            const cls = typeof el.className === 'string'
+                ? el.className.split(' ')[0]
+                : null;
+
+            similar.push({
+                selector: el.tagName.toLowerCase() + (cls ? '.' + cls : ''),
+                similarity: Math.round(similarity * 100) / 100,
+                text_preview: (el.textContent || '').slice(0, 80)
+            });
+        }
+    }
+
+    return similar.sort((a, b) => b.similarity - a.similarity).slice(0, 50);
+}
+
+AnalyzerRegistry.register('findSimilarElements', findSimilarElements, {
+    category: 'analyzers',
+    description: 'Find similar elements'
+});
+
+/**
+ * Group elements matching a selector by parent container
+ * @param {string} selector - CSS selector
+ * @returns {Array} Parent groups, largest first
+ */
+function groupByParent(selector) {
+    const elements = document.querySelectorAll(selector);
+    const byParent = new Map();
+
+    for (const el of elements) {
+        const parent = el.parentElement;
+        if (!parent) continue;
+
+        const parentCls = typeof parent.className === 'string'
+            ? parent.className.split(' ')[0]
+            : null;
+        const parentKey = parent.tagName.toLowerCase() + 
+            (parentCls ? '.' + parentCls : '');
+
+        if (!byParent.has(parentKey)) {
+            byParent.set(parentKey, {
+                parent_selector: parentKey,
+                count: 0,
+                sample_children: []
+            });
+        }
+
+        const group = byParent.get(parentKey);
+        group.count++;
+        if (group.sample_children.length < 2) {
+            group.sample_children.push(
+                (el.textContent || '').slice(0, 50)
+            );
+        }
+    }
+
+    return Array.from(byParent.values())
+        .sort((a, b) => b.count - a.count)
+        .slice(0, 15);
+}
+
+AnalyzerRegistry.register('groupByParent', groupByParent, {
+    category: 'analyzers',
+    description: 'Group elements by parent'
+});
+
+/**
+ * Fast page type indicators (prices, product links, list structure)
+ */
+function quickPageCheck() {
+    // Fast indicators check
+    const indicators = {
+        has_prices: false,
+        price_count: 0,
+        has_product_links: false,
+        product_link_count: 0,
+        has_list_structure: false,
+        has_add_to_cart: false,
+        has_price_images: false,
+        total_links: document.links.length,
+        page_type: 'unknown'
+    };
+
+    // Check for price patterns (fast regex) - TEXT prices
+    const pricePattern = /(\d+[\d\s]*(?:[\.,]\d{2})?)\s*(?:zł|PLN|€|\$|USD|EUR)/i;
+    const bodyText = document.body?.innerText || '';
+    const priceMatches = bodyText.match(new RegExp(pricePattern, 'g'));
+
+    if (priceMatches) {
+        indicators.has_prices = true;
+        indicators.price_count = priceMatches.length;
+    }
+
+    // Check for IMAGE-based prices (common in Polish shops like gral.pl)
+    // Pattern: img.php?im=cb_ or similar dynamic price images
+    const priceImages = document.querySelectorAll('img[src*="cen"], img[src*="price"], img[src*="cb_"], img[src*="cn_"]');
+    if (priceImages.length > 0) {
+        indicators.has_price_images = true;
+        indicators.price_count = Math.max(indicators.price_count, priceImages.length);
+        indicators.has_prices = true;
+    }
+
+    // Check for "Cena" labels near images
+    const cenaLabels = document.querySelectorAll('*');
+    let cenaCount = 0;
+    for (const el of cenaLabels) {
+        if (el.innerText && /cena\s*(brutto|netto)?:?/i.test(el.innerText) && el.innerText.length < 50) {
+            cenaCount++;
+        }
+    }
+    if (cenaCount >= 3) {
+        indicators.has_prices = true;
+        indicators.price_count = Math.max(indicators.price_count, cenaCount);
+    }
+
+    // Check for product-like links - multiple patterns
+    let productLinks = 0;
+    for (const link of document.links) {
+        const href = link.href || '';
+        const pathname = link.pathname || '';
+
+        // Pattern 1: /12345 or _12345 (numeric product IDs with .html)
+        if (/[_\/]\d{3,}\.html?$/i.test(pathname)) {
+            productLinks++;
+        }
+        // Pattern 1b: /123456789 (pure numeric ID, 6+ digits - ceneo.pl style)
+        else if (/^\/\d{6,}$/.test(pathname)) {
+            productLinks++;
+        }
+        // Pattern 1c: /offers/ID/ID (ceneo.pl offer links)
+        else if (/^\/offers\/\d+\/\d+/.test(pathname)) {
+            productLinks++;
+        }
+        // Pattern 2: /product/ or /produkt/ in URL
+        else if (/\/(product|produkt|item|towar)\//i.test(pathname)) {
+            productLinks++;
+        }
+        // Pattern 3: Name+Product+Name_ID.html (gral.pl style)
+        else if (/[A-Za-z]+\+[A-Za-z]+.*_\d+\.html$/i.test(pathname)) {
+            productLinks++;
+        }
+        // Pattern 4: ;123456 (ceneo.pl style - semicolon + numeric ID)
+        else if (/;\d{4,}/.test(pathname)) {
+            productLinks++;
+        }
+        // Pattern 5: /p/123456 or /i/123456 (common e-commerce pattern)
+        else if (/\/[pi]\/\d+/i.test(pathname)) {
+            productLinks++;
+        }
+    }
+    indicators.product_link_count = productLinks;
+    indicators.has_product_links = productLinks > 0;
+
+    // Check for "add to cart" buttons/links
+    const cartPatterns = ['koszyk', 'cart', 'dodaj', 'add', 'kupuj', 'buy'];
+    const buttons = document.querySelectorAll('button, a, input[type="submit"]');
+    let cartButtons = 0;
+    for (const btn of buttons) {
+        const text = (btn.innerText || btn.value || btn.title || '').toLowerCase();
+        if (cartPatterns.some(p => text.includes(p))) {
+            cartButtons++;
+        }
+    }
+    indicators.has_add_to_cart = cartButtons >= 3;
+
+    // Check for list structure (dynamic detection)
+    // Look for repeating elements with similar structure (not hard-coded selectors)
+    const allElements = document.querySelectorAll('*');
+    const classCount = {};
+
+    // Count elements with same class (potential list)
+    for (const el of allElements) {
+        if (el.className && typeof el.className === 'string') {
+            const firstClass = el.className.split(' ')[0];
+            if (firstClass && /^[a-zA-Z][a-zA-Z0-9_-]*$/.test(firstClass)) {
+                classCount[firstClass] = (classCount[firstClass] || 0) + 1;
+            }
+        }
+    }
+
+    // If any class appears 5+ times, likely a list structure
+    indicators.has_list_structure = Object.values(classCount).some(count => count >= 5);
+
+    // Check for REAL product containers (price + name together)
+    // Use dynamic link patterns - discovered from page structure
+    let realProductContainers = 0;
+    const potentialProducts = document.querySelectorAll('[class*="product"], [class*="item"], [class*="card"], [class*="box"], table tr');
+
+    // Dynamic link check - analyze actual URL patterns on page
+    const checkProductLink = (el) => {
+        const links = el.querySelectorAll('a[href]');
+        for (const link of links) {
+            const href = link.href || '';
+            // Check for common product URL patterns dynamically
+            if (/\/[pi]\/|product|produkt|item|towar|\.html$|_\d{4,}|[/]\d{4,}/.test(href)) {
+                return true;
+            }
+        }
+        return false;
+    };
+
+    // Dynamic price image check
+    const checkPriceImage = (el) => {
+        const imgs = el.querySelectorAll('img');
+        for (const img of imgs) {
+            const src = img.src || '';
+            if (/cb_|cena|price|_c\d|_p\d/i.test(src)) return true;
+        }
+        return false;
+    };
+
+    for (const el of potentialProducts) {
+        const text = el.textContent || '';
+        const hasName = text.length > 20 && text.length < 500;
+        const hasLink = checkProductLink(el);
+        const hasPriceInEl = /\d+[,.]\d{2}/.test(text) || checkPriceImage(el);
+        if (hasName && hasLink && hasPriceInEl) {
+            realProductContainers++;
+        }
+    }
+    indicators.real_product_containers = realProductContainers;
+
+    // Determine page type with smarter heuristics
+    const hasRealProducts = realProductContainers >= 3;
+    const hasProductGrid = realProductContainers >= 5;
+    const hasShopFeatures = indicators.has_add_to_cart && indicators.has_product_links;
+
+    // Check for cart/header prices (low count, no product structure)
+    const isCartOnly = indicators.price_count <= 2 && !hasRealProducts;
+
+    // Check URL patterns for product pages
+    const url = window.location.href.toLowerCase();
+    const pathname = window.location.pathname;
+    const isProductUrl = /\/(product|produkt|item|towar|prod_lista)s?/i.test(url) ||
+                         /[\?&](category|kategoria|cat|grp)[=]/i.test(url) ||
+                         /[_\/]\d{3,}\.html?$/i.test(pathname);
+    const isHomepage = pathname === '/' || pathname === '/index.html' || pathname === '/sklep.php';
+
+    // Decision tree - more conservative
+    if (hasProductGrid) {
+        // Found actual product containers
+        indicators.page_type = 'product_listing';
+    } else if (hasRealProducts && isProductUrl) {
+        indicators.page_type = 'product_listing';
+    } else if (isProductUrl && indicators.price_count >= 3) {
+        indicators.page_type = 'product_listing';
+    } else if (isHomepage && !hasRealProducts) {
+        // Homepage without real products - needs navigation
+        indicators.page_type = 'homepage_shop';
+        indicators.needs_navigation = true;
+    } else if (indicators.has_product_links && indicators.product_link_count >= 10 && !hasRealProducts) {
+        // Many category links but no products
+        indicators.page_type = 'category_index';
+        indicators.needs_navigation = true;
+    } else if (indicators.price_count > 0 && hasRealProducts) {
+        indicators.page_type = 'product_listing';
+    } else {
+        indicators.page_type = 'other';
+    }
+
+    return indicators;
+}
+
+AnalyzerRegistry.register('quickPageCheck', quickPageCheck, {
+    category: 'analyzers',
+    description: 'Quick page type check'
+});
+
+// Export for Node.js/testing
+if (typeof module !== 'undefined') {
+    module.exports = {
+        domDepthStats,
+        domFeatureStats,
+        domClassPatterns,
+        domStatistics,
+        clusterByStructure,
+        findSimilarElements,
+        groupByParent,
+        quickPageCheck,
+    };
+}
@@ -449,13 +449,106 @@ function displayResults(data, containerId = 'results-container') {
     if (containerId === 'results-container' && lastResult !== null) { updateExportPreview('html'); }
 }
 
+// Logs panel state: current page and filters sent to /api/logs
+const logsQuery = { page: 1, per_page: 50, q: '', domain: '', status: '' };
+// Bytes of a log shown at first; the full file is loaded on demand
+const LOG_TAIL_BYTES = 256 * 1024;
+
+// Filter bar above the logs list (created once)
+function ensureLogsToolbar(logsList) {
+    if (document.getElementById('logs-toolbar')) return;
+    const toolbar = document.createElement('div');
+    toolbar.id = 'logs-toolbar';
+    toolbar.className = 'space-y-2 mb-3';
+    toolbar.innerHTML = `
+        <input type="text" id="logs-filter-q" placeholder="Szukaj w logach..."
+               class="w-full px-3 py-2 border border-gray-300 rounded-lg text-sm focus:ring-2 focus:ring-blue-500 focus:border-transparent">
+        <div class="flex space-x-2">
+            <input type="text" id="logs-filter-domain" placeholder="Domena"
+                   class="flex-1 min-w-0 px-3 py-2 border border-gray-300 rounded-lg text-sm focus:ring-2 focus:ring-blue-500 focus:border-transparent">
+            <select id="logs-filter-status"
+                    class="px-3 py-2 border border-gray-300 rounded-lg text-sm focus:ring-2 focus:ring-blue-500 focus:border-transparent">
+                <option value="">Wszystkie</option>
+                <option value="success">Sukces</option>
+                <option value="failed">Błąd</option>
+                <option value="unknown">Nieznany</option>
+            </select>
+        </div>
+    `;
+    logsList.insertAdjacentElement('beforebegin', toolbar);
+
+    let debounce = null;
+    const apply = () => {
+        logsQuery.q = document.getElementById('logs-filter-q').value.trim();
+        logsQuery.domain = document.getElementById('logs-filter-domain').value.trim();
+        logsQuery.status = document.getElementById('logs-filter-status').value;
+        logsQuery.page = 1;
+        loadLogs();
+    };
+    ['logs-filter-q', 'logs-filter-domain'].forEach(id => {
+        document.getElementById(id).addEventListener('input', () => {
+            clearTimeout(debounce);
+            debounce = setTimeout(apply, 300);
+        });
+    });
+    document.getElementById('logs-filter-status').addEventListener('change', apply);
+
+    const pager = document.createElement('div');
+    pager.id = 'logs-pager';
+    pager.className = 'flex items-center justify-between mt-3 text-xs text-gray-500';
+    logsList.insertAdjacentElement('afterend', pager);
+}
+
+function renderLogsPager(data) {
+    const pager = document.getElementById('logs-pager');
+    if (!pager) return;
+    if (!data.total) {
+        pager.innerHTML = '';
+        return;
+    }
+    const pages = Math.max(1, data.pages);
+    const btn = 'px-2 py-1 rounded border border-gray-200 hover:bg-gray-50 disabled:opacity-40 disabled:cursor-not-allowed';
+    pager.innerHTML = `
+        <button class="${btn}" onclick="goToLogsPage(${data.page - 1})" ${data.page <= 1 ? 'disabled' : ''}>
+            <i class="fas fa-chevron-left"></i>
+        </button>
+        <span>Strona ${data.page} / ${pages} (${data.total} logów)</span>
+        <button class="${btn}" onclick="goToLogsPage(${data.page + 1})" ${data.page >= pages ? 'disabled' : ''}>
+            <i class="fas fa-chevron-right"></i>
+        </button>
+    `;
+}
+
+function goToLogsPage(page) {
+    logsQuery.page = Math.max(1, page);
+    loadLogs();
+}
+
 // Load logs
 async function loadLogs() {
     try {
-        const response = await fetch('/api/logs');
+        const logsList = document.getElementById('logs-list');
+        ensureLogsToolbar(logsList);
+
+        const params = new URLSearchParams();
+        Object.entries(logsQuery).forEach(([key, value]) => {
+            if (value !== '' && value != null) params.set(key, value);
+        });
+        const response = await fetch(`/api/logs?${params}`);
         const data = await response.json();
         
-        const logsList = document.getElementById('logs-list');
+        if (!response.ok) {
+            showNotification(data.error || 'Błąd ładowania logów', 'error');
+            return;
+        }
+        
+        // Page emptied since last load (e.g. logs deleted): go back one page
+        if (data.logs.length === 0 && data.page > 1 && data.total > 0) {
+            goToLogsPage(data.pages);
+            return;
+        }
+        
+        renderLogsPager(data);
         
         if (data.logs.length === 0) {
             logsList.innerHTML = `
@@ -471,8 +564,10 @@ async function loadLogs() {
             <button onclick="viewLog('${log.filename}')" 
                     class="w-full text-left p-3 rounded-lg hover:bg-gray-50 border border-gray-200 transition-colors">
                 <div class="font-medium text-sm text-gray-900 truncate">${log.filename}</div>
+                ${log.domain ? `<div class="text-xs text-gray-600 truncate">${escapeHtml(log.domain)}</div>` : ''}
                 <div class="text-xs text-gray-500 mt-1">${log.modified}</div>
                 <div class="text-xs text-gray-400">${formatFileSize(log.size)}</div>
+                ${log.snippet ? `<div class="text-xs text-gray-500 mt-1 truncate">${escapeHtml(log.snippet)}</div>` : ''}
             </button>
         `).join('');
     } catch (error) {
@@ -481,7 +576,31 @@ async function loadLogs() {
     }
 }
 
-// View specific log
+function renderLogMarkdown(viewer, content, notice = '') {
+    // Convert markdown to HTML
+    let html = marked.parse(content);
+    
+    // Fix image paths to use absolute URLs
+    html = html.replace(/src="([^"]+\.(?:png|jpe?g|webp))"/g, (match, path) => {
+        if (!path.startsWith('http') && !path.startsWith('/')) {
+            return `src="/screenshots/${path}"`;
+        }
+        return match;
+    });
+    
+    viewer.innerHTML = notice + html;
+}
+
+function renderLogError(viewer, message) {
+    viewer.innerHTML = `
+        <div class="bg-red-50 border border-red-200 rounded-lg p-4">
+            <i class="fas fa-exclamation-circle text-red-600 mr-2"></i>
+            <span class="text-red-800">${escapeHtml(message)}</span>
+        </div>
+    `;
+}
+
+// View specific log (only its end is fetched; large logs load fully on demand)
 async function viewLog(filename) {
     currentLogFile = filename;
     
@@ -494,38 +613,44 @@ async function viewLog(filename) {
     `;
     
     try {
-        const response = await fetch(`/api/logs/${filename}`);
+        const response = await fetch(`/api/logs/${encodeURIComponent(filename)}/tail?bytes=${LOG_TAIL_BYTES}`);
         const data = await response.json();
         
         if (data.success) {
-            // Convert markdown to HTML
-            let html = marked.parse(data.content);
-            
-            // Fix image paths to use absolute URLs
-            html = html.replace(/src="([^"]+\.png)"/g, (match, path) => {
-                if (!path.startsWith('http') && !path.startsWith('/')) {
-                    return `src="/screenshots/${path}"`;
-                }
-                return match;
-            });
-            
-            viewer.innerHTML = html;
+            let notice = '';
+            if (data.offset > 0) {
+                notice = `
+                    <div class="bg-yellow-50 border border-yellow-200 rounded-lg p-3 mb-4 text-sm text-yellow-800">
+                        <i class="fas fa-info-circle mr-2"></i>
+                        Pokazano ostatnie ${formatFileSize(data.size - data.offset)} z ${formatFileSize(data.size)}.
+                        <button onclick="viewFullLog('${filename}')" class="ml-2 underline hover:text-yellow-900">Pokaż cały log</button>
+                    </div>
+                `;
+            }
+            renderLogMarkdown(viewer, data.content, notice);
         } else {
-            viewer.innerHTML = `
-                <div class="bg-red-50 border border-red-200 rounded-lg p-4">
-                    <i class="fas fa-exclamation-circle text-red-600 mr-2"></i>
-                    <span class="text-red-800">Błąd ładowania logu</span>
-                </div>
-            `;
+            renderLogError(viewer, 'Błąd ładowania logu');
         }
     } catch (error) {
         console.error('Error viewing log:', error);
-        viewer.innerHTML = `
-            <div class="bg-red-50 border border-red-200 rounded-lg p-4">
-                <i class="fas fa-exclamation-circle text-red-600 mr-2"></i>
-                <span class="text-red-800">Błąd: ${escapeHtml(error.message)}</span>
-            </div>
-        `;
+        renderLogError(viewer, `Błąd: ${error.message}`);
+    }
+}
+
+async function viewFullLog(filename) {
+    const viewer = document.getElementById('log-viewer');
+    try {
+        const response = await fetch(`/api/logs/${encodeURIComponent(filename)}/raw`);
+        if (!response.ok) {
+            renderLogError(viewer, 'Błąd ładowania logu');
+            return;
+        }
+        if (currentLogFile === filename) {
+            renderLogMarkdown(viewer, await response.text());
+        }
+    } catch (error) {
+        console.error('Error viewing log:', error);
+        renderLogError(viewer, `Błąd: ${error.message}`);
     }
 }
 
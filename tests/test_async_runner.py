@@ -0,0 +1,71 @@
+"""Tests for the long-lived async job runner used by the API server."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from curllm_core.async_runner import AsyncJobRunner, ServerBusyError
+
+
+@pytest.fixture
+def runner():
+    r = AsyncJobRunner(max_concurrency=2, max_queue=1).start()
+    yield r
+    r.drain(timeout=5)
+
+
+def test_jobs_share_one_loop(runner):
+    async def job():
+        return id(asyncio.get_running_loop())
+
+    loops = {runner.run(job, timeout=5) for _ in range(3)}
+    assert len(loops) == 1
+    assert runner.get_stats()["completed"] == 3
+
+
+def test_concurrency_is_bounded(runner):
+    gate = threading.Event()
+    peak = {"running": 0, "max": 0}
+
+    async def job():
+        peak["running"] += 1
+        peak["max"] = max(peak["max"], peak["running"])
+        while not gate.is_set():
+            await asyncio.sleep(0.01)
+        peak["running"] -= 1
+        return True
+
+    futures = [runner.submit(job) for _ in range(3)]
+    deadline = time.monotonic() + 5
+    while runner.get_stats()["running"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # 2 running + 1 queued fills capacity, the next is rejected
+    with pytest.raises(ServerBusyError) as exc:
+        runner.submit(job)
+    assert exc.value.queue_depth >= 0
+    assert exc.value.retry_after >= 1
+    gate.set()
+    assert all(f.result(timeout=5) for f in futures)
+    assert peak["max"] == 2
+    assert runner.get_stats()["rejected"] == 1
+
+
+def test_drain_waits_for_inflight_and_rejects_new():
+    r = AsyncJobRunner(max_concurrency=1, max_queue=0).start()
+    finalized = []
+
+    async def slow():
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def finalizer():
+        finalized.append(True)
+
+    fut = r.submit(slow)
+    assert r.drain(timeout=5, finalizer=finalizer) is True
+    assert fut.result(timeout=1) == "done"
+    assert finalized == [True]
+    with pytest.raises(ServerBusyError):
+        r.submit(slow)
@@ -0,0 +1,97 @@
+"""
+Tests for the concurrent streamware batch engine
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from curllm_core.streamware import Component, register, batch_process, BatchProcessor, JSONLSink
+
+FAIL_ON = set()
+ACTIVE = {"now": 0, "peak": 0}
+_lock = threading.Lock()
+
+
+@register("batchdouble")
+class BatchDoubleComponent(Component):
+    def process(self, data):
+        with _lock:
+            ACTIVE["now"] += 1
+            ACTIVE["peak"] = max(ACTIVE["peak"], ACTIVE["now"])
+        try:
+            time.sleep(0.02)
+            if any(item in FAIL_ON for item in data):
+                raise ValueError("bad item")
+            return [item * 2 for item in data]
+        finally:
+            with _lock:
+                ACTIVE["now"] -= 1
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    FAIL_ON.clear()
+    ACTIVE.update(now=0, peak=0)
+
+
+def test_batch_process_keeps_input_order_with_workers():
+    results = batch_process(list(range(23)), "batchdouble://", batch_size=5, workers=4)
+    assert results == [i * 2 for i in range(23)]
+    assert ACTIVE["peak"] > 1
+
+
+def test_failed_batch_is_recorded_like_before():
+    FAIL_ON.add(7)
+    results = batch_process(list(range(10)), "batchdouble://", batch_size=5)
+    assert results[:5] == [0, 2, 4, 6, 8]
+    assert results[5]["batch_index"] == 5
+    assert "bad item" in results[5]["error"]
+
+
+def test_sink_stats_and_checkpoint_resume(tmp_path):
+    checkpoint = tmp_path / "run.ckpt"
+    out = tmp_path / "out.jsonl"
+    items = iter(range(40))
+    FAIL_ON.add(33)
+
+    processor = BatchProcessor("batchdouble://", batch_size=4, workers=3, checkpoint_path=checkpoint)
+    with JSONLSink(out) as sink:
+        stats = processor.run(items, sink)
+
+    assert stats["batches"] == 10
+    assert stats["failed_batches"] == 1
+    assert stats["items_per_sec"] > 0
+    assert 0 < stats["latency_p50"] <= stats["latency_p99"] <= stats["latency_max"]
+    saved = json.loads(checkpoint.read_text())
+    assert saved["items_done"] == 36
+
+    # Second run only retries the failed batch
+    FAIL_ON.clear()
+    with JSONLSink(out) as sink:
+        stats = processor.run(range(40), sink)
+    assert stats["skipped_batches"] == 9
+    assert stats["batches"] == 1
+    assert stats["resumed_items"] == 36
+
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted(v for v in lines if isinstance(v, int)) == [i * 2 for i in range(40)]
+
+
+def test_checkpoint_for_other_pipeline_is_ignored(tmp_path):
+    checkpoint = tmp_path / "run.ckpt"
+    BatchProcessor("batchdouble://", batch_size=4, checkpoint_path=checkpoint).run(range(8))
+    stats = BatchProcessor("batchdouble://", batch_size=2, checkpoint_path=checkpoint).run(range(8))
+    assert stats["skipped_batches"] == 0
+    assert stats["batches"] == 4
+
+
+def test_process_mode():
+    collected = {}
+    stats = BatchProcessor("batchdouble://", batch_size=3, workers=2, mode="process").run(
+        range(7), lambda results, index: collected.update({index: results})
+    )
+    assert stats["items"] == 7
+    assert [v for i in sorted(collected) for v in collected[i]] == [i * 2 for i in range(7)]
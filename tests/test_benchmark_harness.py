@@ -0,0 +1,110 @@
+"""Tests for the offline benchmark harness (servers, aggregation, baselines)."""
+
+import json
+
+import aiohttp
+import pytest
+
+from benchmarks.harness import (
+    FixtureServer,
+    MockLLMServer,
+    compare_reports,
+    format_report,
+    load_report,
+    load_scenarios,
+    save_report,
+    summarize_level,
+)
+
+
+def _job(ms, llm_ms=40.0, prompt=1000, ok=True):
+    return {
+        "ms": ms,
+        "ok": ok,
+        "error": None if ok else "boom",
+        "stages": {
+            "stages": {
+                "page_open": {"count": 1, "total_ms": 20.0, "self_ms": 20.0, "max_ms": 20.0},
+                "llm_wait": {"count": 2, "total_ms": llm_ms, "self_ms": llm_ms, "max_ms": llm_ms / 2},
+            },
+            "counters": {"llm_wait.prompt_chars": prompt},
+        },
+    }
+
+
+def test_scenarios_reference_existing_fixtures():
+    scenarios = load_scenarios()
+    assert {"products", "articles", "contact_form"} <= set(scenarios)
+    for scenario in scenarios.values():
+        fixture = FixtureServer().fixtures_dir / scenario["fixture"]
+        assert fixture.is_file()
+        assert scenario["match"] in fixture.read_text(encoding="utf-8")
+
+
+async def test_fixture_and_mock_llm_servers():
+    with FixtureServer() as site, MockLLMServer(base_latency_ms=1, ms_per_kchar=0) as llm:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{site.url}/products.html") as resp:
+                assert resp.status == 200
+                html = await resp.text()
+            async with session.get(f"{site.url}/../pyproject.toml") as resp:
+                assert resp.status == 404
+            async with session.post(f"{llm.url}/api/generate", json={"prompt": f"Page: {html[:400]}"}) as resp:
+                answer = json.loads((await resp.json())["response"])
+            async with session.post(f"{llm.url}/api/generate", json={"prompt": "unrelated"}) as resp:
+                default = json.loads((await resp.json())["response"])
+
+    assert answer == load_scenarios()["products"]["llm_response"]
+    assert default == MockLLMServer.DEFAULT_RESPONSE
+    assert site.requests["products.html"] == 1
+    assert llm.stats["requests"] == 2 and llm.stats["matched"] == {"products": 1}
+
+
+def test_summarize_level_means_and_percentiles():
+    jobs = [_job(100), _job(200), _job(300, ok=False)]
+    s = summarize_level(jobs, wall_s=1.5, peak_rss_mb=512.0)
+    assert s["jobs"] == 3 and s["ok"] == 2
+    assert s["jobs_per_sec"] == 2.0
+    assert s["latency_ms"]["p50"] == 200.0
+    assert s["stages"]["llm_wait"]["calls"] == 2.0
+    assert s["stages"]["llm_wait"]["self_ms"] == 40.0
+    assert s["prompt_chars"] == {"mean": 1000.0, "max": 1000}
+    assert s["unaccounted_ms"] == 140.0
+    assert s["errors"] == ["boom"]
+
+
+def test_compare_reports_flags_regressions_only(tmp_path):
+    def report(jobs, llm_ms, prompt):
+        level = summarize_level([_job(100, llm_ms, prompt)] * jobs, wall_s=1.0, peak_rss_mb=500.0)
+        return {"version": 1, "results": {"products": {"1": level}}}
+
+    baseline = report(4, 40.0, 1000)
+    path = save_report(baseline, tmp_path / "baselines" / "main.json")
+    assert load_report(path) == baseline
+
+    assert compare_reports(report(4, 44.0, 1000), baseline, tolerance=0.2) == []
+    regressions = compare_reports(report(2, 80.0, 1500), baseline, tolerance=0.2)
+    metrics = {r["metric"] for r in regressions}
+    assert metrics == {"jobs_per_sec", "prompt_chars.mean", "stages.llm_wait.self_ms"}
+    assert "products" in format_report(baseline)
+
+
+def test_load_report_rejects_unknown_version(tmp_path):
+    path = tmp_path / "old.json"
+    path.write_text(json.dumps({"version": 0}))
+    with pytest.raises(ValueError):
+        load_report(path)
+
+
+def test_cli_rejects_missing_baseline_before_running(tmp_path, monkeypatch, capsys):
+    import benchmarks.__main__ as cli
+
+    def _no_run(**kwargs):
+        raise AssertionError("benchmark ran despite a missing baseline")
+
+    monkeypatch.setattr(cli, "run_benchmark", _no_run)
+    missing = tmp_path / "baselines" / "main.json"
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["--baseline", str(missing)])
+    assert exc.value.code == 2
+    assert "--save-baseline" in capsys.readouterr().err
@@ -0,0 +1,118 @@
+"""Tests for the warm browser pool (Playwright replaced by fakes)."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import curllm_core.browser_pool as bp
+from curllm_core.browser_pool import BrowserPool
+
+
+class FakeContext:
+    def __init__(self):
+        self._handlers = []
+
+    def on(self, event, handler):
+        if event == "close":
+            self._handlers.append(handler)
+
+    async def close(self):
+        for h in self._handlers:
+            h(self)
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeStealth:
+    def get_chrome_args(self):
+        return ["--stealth"]
+
+
+CONFIG = SimpleNamespace(headless=True, proxy=None)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    launched = []
+
+    async def fake_launch(playwright, launch_args):
+        b = FakeBrowser()
+        launched.append((b, launch_args))
+        return b
+
+    async def fake_context(browser, *args, **kwargs):
+        return FakeContext()
+
+    async def fake_started(self):
+        self._loop = asyncio.get_running_loop()
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+    monkeypatch.setattr(bp, "launch_chromium", fake_launch)
+    monkeypatch.setattr(bp, "new_configured_context", fake_context)
+    monkeypatch.setattr(BrowserPool, "_ensure_started", fake_started)
+    p = BrowserPool(size=2, max_uses=3, max_memory_mb=0)
+    p.launched = launched
+    return p
+
+
+async def _use(pool, stealth=False, proxy=None):
+    ctx = await pool.new_context(stealth, "example.com", None, FakeStealth(), CONFIG, proxy, None)
+    await ctx.close()
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_warm_browser_is_reused(pool):
+    await pool.start(FakeStealth(), CONFIG, warm=1)
+    await _use(pool)
+    await _use(pool)
+    stats = pool.get_stats()
+    assert stats["launches"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 0
+    assert stats["active_contexts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_profiles_get_separate_browsers(pool):
+    await _use(pool, stealth=False)
+    await _use(pool, stealth=True)
+    await _use(pool, stealth=True)
+    stats = pool.get_stats()
+    assert stats["launches"] == 2
+    assert stats["misses"] == 2
+    assert stats["hits"] == 1
+    assert any("--stealth" in args["args"] for _, args in pool.launched)
+
+
+@pytest.mark.asyncio
+async def test_browser_recycled_after_max_uses(pool):
+    for _ in range(3):
+        await _use(pool)
+    first_browser = pool.launched[0][0]
+    assert first_browser.closed
+    assert pool.get_stats()["recycles"] == 1
+    await _use(pool)
+    assert pool.get_stats()["launches"] == 2
+
+
+@pytest.mark.asyncio
+async def test_idle_browsers_evicted_to_respect_size(pool):
+    await _use(pool, proxy="http://p1:8080")
+    await _use(pool, proxy="http://p2:8080")
+    await _use(pool, proxy="http://p3:8080")
+    stats = pool.get_stats()
+    assert stats["browsers"] == 2
+    assert stats["evictions"] == 1
+    assert pool.launched[0][0].closed
@@ -0,0 +1,115 @@
+"""Tests for the token-budgeted planner context packer."""
+
+import json
+
+from curllm_core.context_packer import estimate_tokens, pack_context, task_kind
+
+
+def _page():
+    return {
+        "title": "Shop",
+        "url": "https://shop.example/list",
+        "text": "Lorem ipsum dolor sit amet " * 200,
+        "headings": [{"tag": "h1", "text": "Products"}],
+        "links": [{"href": f"/p/{i}", "text": f"Product {i}"} for i in range(300)],
+        "forms": [{"id": "contact", "fields": [{"type": "email", "name": "email"}, {"type": "text", "name": "message"}]}],
+        "iframes": [],
+        "dom_preview": None,
+    }
+
+
+def test_task_kind():
+    assert task_kind("Fill the contact form") == "form"
+    assert task_kind("Wyciągnij produkty z cenami") == "extract"
+    assert task_kind("Go to the about page") == "navigate"
+    assert task_kind("Wypełnij formularza kontaktowego") == "form"
+    assert task_kind("Submitting the signup forms") == "form"
+
+
+def test_task_kind_matches_whole_words():
+    # "form" inside information/platform/performance/format is not a form task
+    assert task_kind("Extract product information with prices") == "extract"
+    assert task_kind("Find all products on the platform") == "extract"
+    assert task_kind("Get the performance table") == "navigate"
+    assert task_kind("Show the date format") == "navigate"
+
+
+def test_extract_phrasing_keeps_product_candidates():
+    page = _page()
+    page["product_candidates"] = [{"name": f"Laptop {i}", "price": 1000 + i} for i in range(20)]
+    packed = pack_context(page, "Extract product information with prices", budget_tokens=2000)
+    assert packed.kind == "extract"
+    assert "product_candidates" not in packed.dropped
+    assert len(json.loads(packed.text)["product_candidates"]) == 20
+
+
+def test_small_context_is_kept_whole_and_pruned():
+    packed = pack_context(_page(), "Go to the about page", budget_tokens=100_000)
+    data = json.loads(packed.text)
+    assert set(data) == {"url", "title", "text", "headings", "links", "forms"}
+    assert packed.dropped == {}
+    assert packed.tokens == packed.original_tokens
+
+
+def test_output_is_valid_json_within_budget():
+    for budget in (15, 40, 120, 500, 2000):
+        for instruction in ("fill the form", "extract product links", "open about"):
+            packed = pack_context(_page(), instruction, budget)
+            data = json.loads(packed.text)
+            assert packed.tokens <= budget
+            assert list(data)[:2] == ["url", "title"] or budget < 40
+
+
+def test_sections_ranked_by_task():
+    form = pack_context(_page(), "Fill the contact form", budget_tokens=200)
+    assert "forms" in json.loads(form.text)
+    assert form.dropped["links"]
+
+    extract = pack_context(_page(), "extract all product links", budget_tokens=600)
+    data = json.loads(extract.text)
+    assert 0 < len(data["links"]) < 300
+    assert data["links"][0] == {"href": "/p/0", "text": "Product 0"}
+    assert extract.dropped["links"].endswith("/300 items")
+    assert extract.dropped.get("forms") == "dropped"
+
+
+def test_custom_token_counter():
+    packed = pack_context(_page(), "extract links", budget_tokens=300, count_tokens=len)
+    assert len(packed.text) <= 300
+    assert packed.tokens == len(packed.text)
+    assert estimate_tokens("x" * 400) == 101
+
+
+def test_large_dict_is_trimmed_to_a_key_count():
+    import time
+
+    page = {"title": "Shop", "url": "https://shop.example/", "specs": {f"k{i}": "v" * 20 for i in range(3000)}}
+    started = time.monotonic()
+    packed = pack_context(page, "extract specs", budget_tokens=2000)
+    assert time.monotonic() - started < 0.5
+    assert packed.tokens <= 2000
+    kept = json.loads(packed.text)["specs"]
+    assert list(kept) == [f"k{i}" for i in range(len(kept))]
+    # The last kept member may be a shortened string
+    assert packed.dropped["specs"] in (f"{len(kept)}/3000 keys", f"{len(kept)}/3000 keys (values trimmed)")
+
+
+def test_streamware_planner_uses_configured_token_budget(monkeypatch):
+    import asyncio
+
+    from curllm_core.config import config
+    from curllm_core.streamware.components.llm import planner
+
+    class LLM:
+        async def ainvoke(self, prompt):
+            return {"text": '{"type": "complete"}'}
+
+    budgets = []
+    real_pack = planner.pack_context
+    monkeypatch.setattr(planner, "pack_context", lambda ctx, instr, budget: budgets.append(budget) or real_pack(ctx, instr, budget))
+
+    monkeypatch.setattr(config, "planner_context_tokens", 0)
+    asyncio.run(planner.generate_action(LLM(), "extract links", _page(), step=0, max_chars=8000))
+    monkeypatch.setattr(config, "planner_context_tokens", 750)
+    asyncio.run(planner.generate_action(LLM(), "extract links", _page(), step=0, max_chars=8000))
+    assert budgets == [2000, 750]
@@ -289,6 +289,94 @@ class TestKnowledgeBase:
             assert stats['total_executions'] >= 1
             assert stats['unique_domains'] >= 1
 
+    def test_deferred_records_are_batched_and_visible_to_reads(self):
+        from curllm_core.dsl import KnowledgeBase, StrategyRecord
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "test.db")
+            kb = KnowledgeBase(path)
+            for i in range(3):
+                assert kb.record_execution(StrategyRecord(
+                    url="https://shop.com/list",
+                    domain="",
+                    task="extract_products",
+                    algorithm="statistical_containers",
+                    selector="div.card",
+                    fields={},
+                    success=True,
+                    items_extracted=10 + i * 10,
+                    execution_time_ms=100
+                ), defer=True) is None
+            
+            # Nothing written yet; a second instance shares the queue
+            import sqlite3
+            with sqlite3.connect(path) as raw:
+                assert raw.execute("SELECT COUNT(*) FROM executions").fetchone()[0] == 0
+            best = KnowledgeBase(path).get_best_strategy("https://shop.com/other", "extract_products")
+            assert best['use_count'] == 3
+            assert kb.get_algorithm_rankings(domain="shop.com")[0]['avg_items'] == 20
+    
+    def test_cache_sees_local_and_external_writes(self):
+        from curllm_core.dsl import KnowledgeBase, StrategyRecord
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "test.db")
+            kb = KnowledgeBase(path)
+            
+            def record(success):
+                kb.record_execution(StrategyRecord(
+                    url="https://shop.com/list", domain="shop.com", task="extract",
+                    algorithm="pattern_detection", selector="li", fields={},
+                    success=success, items_extracted=5, execution_time_ms=50
+                ))
+            
+            record(True)
+            assert kb.get_best_strategy("https://shop.com/", "extract")['success_rate'] == 1.0
+            record(False)
+            assert kb.get_best_strategy("https://shop.com/", "extract")['success_rate'] == 0.5
+            
+            # Another process updating the file invalidates the cache
+            import sqlite3
+            with sqlite3.connect(path) as other:
+                other.execute("UPDATE strategies SET failure_count = 3")
+            assert kb.get_best_strategy("https://shop.com/", "extract", min_success_rate=0.0)['success_rate'] == 0.25
+            
+            conn = kb._db.conn
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+class TestDSLExecutor:
+    """Test DSL executor algorithm selection."""
+    
+    def test_skip_algorithms_are_not_retried(self):
+        import asyncio
+        from curllm_core.dsl import DSLExecutor
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = DSLExecutor(page=None, llm_client=None,
+                                   kb_path=os.path.join(tmpdir, "test.db"), dsl_dir=tmpdir)
+            tried = []
+            
+            async def fake_algorithm(algorithm, url, instruction, strategy):
+                tried.append(algorithm)
+                return None
+            
+            executor._execute_algorithm = fake_algorithm
+            asyncio.run(executor.execute(
+                "https://shop.com/list", "Find products",
+                skip_algorithms=["statistical_containers", "fallback_links"],
+            ))
+            assert tried
+            assert "statistical_containers" not in tried and "fallback_links" not in tried
+            
+            tried.clear()
+            result = asyncio.run(executor.execute(
+                "https://shop.com/list", "Find products",
+                skip_algorithms=list(DSLExecutor.ALGORITHMS),
+            ))
+            assert tried == []
+            assert not result.success
+
 
 class TestResultValidator:
     """Test result validation."""
@@ -0,0 +1,135 @@
+"""
+Tests for the concurrent extraction race (racers replaced by fakes)
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from curllm_core.dsl.knowledge_base import KnowledgeBase, StrategyRecord
+from curllm_core.extraction_race import ExtractionRace, RACE_TASK
+
+URL = "https://shop.example/list"
+PRODUCTS = [
+    {"name": "Laptop Pro 14", "price": 3999.0, "url": "https://shop.example/p/1"},
+    {"name": "Laptop Air 13", "price": 2999.0, "url": "https://shop.example/p/2"},
+    {"name": "Laptop Mini 11", "price": 1999.0, "url": "https://shop.example/p/3"},
+]
+
+
+def _racer(delay, result=None, error=None, log=None):
+    async def run(url):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append("cancelled")
+            raise
+        if error:
+            raise error
+        return result
+    return run
+
+
+def _race(runners, **kwargs):
+    race = ExtractionRace(page=None, instruction="Find products", strategies=list(runners), **kwargs)
+    race._runners = runners
+    return race
+
+
+@pytest.mark.asyncio
+async def test_first_valid_result_wins_and_rest_are_cancelled():
+    cancelled = []
+    race = _race({
+        "slow": _racer(1.0, (PRODUCTS, "div.slow"), log=cancelled),
+        "fast": _racer(0.01, (PRODUCTS, "div.card")),
+        "broken": _racer(0.0, error=RuntimeError("boom")),
+    })
+    started = time.monotonic()
+    outcome = await race.run(URL)
+
+    assert time.monotonic() - started < 0.5
+    assert outcome.strategy == "fast"
+    assert outcome.to_data()["count"] == 3
+    assert outcome.selector == "div.card"
+    assert race.racers["slow"]["status"] == "cancelled"
+    assert race.racers["broken"]["status"].startswith("error")
+    assert cancelled == ["cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_results_do_not_win():
+    junk = [{"text": "Cookie settings"}]
+    race = _race({
+        "junk": _racer(0.0, (junk, "div.junk")),
+        "empty": _racer(0.0, None),
+        "good": _racer(0.05, (PRODUCTS, "li.product")),
+    })
+    outcome = await race.run(URL)
+    assert outcome.strategy == "good"
+    assert race.racers["junk"]["status"] == "invalid"
+    assert race.racers["empty"]["status"] == "empty"
+
+
+@pytest.mark.asyncio
+async def test_no_winner_within_timeout():
+    race = _race({"slow": _racer(1.0, (PRODUCTS, ""))}, timeout=0.05)
+    assert await race.run(URL) is None
+    assert race.racers["slow"]["status"] == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_domain_policy_from_knowledge_base(tmp_path):
+    kb_path = str(tmp_path / "knowledge.db")
+    kb = KnowledgeBase(kb_path)
+
+    def record(algorithm, success):
+        kb.record_execution(StrategyRecord(
+            url=URL, domain="", task=RACE_TASK, algorithm=algorithm, selector="",
+            fields={}, success=success, items_extracted=0, execution_time_ms=10,
+        ))
+
+    for _ in range(3):
+        record("loser", False)
+    record("sometimes", False)
+    record("sometimes", True)
+    record("always", True)
+
+    race = _race({
+        "loser": _racer(0.0, None),
+        "fresh": _racer(0.0, None),
+        "sometimes": _racer(0.0, None),
+        "always": _racer(0.01, (PRODUCTS, "div.card")),
+    }, kb_path=kb_path)
+    assert race.select_strategies(URL) == ["always", "sometimes", "fresh"]
+    # Other domains have no history: everything races
+    assert race.select_strategies("https://other.example/") == ["loser", "fresh", "sometimes", "always"]
+
+    await race.run(URL)
+    rankings = {r["algorithm"]: r for r in kb.get_algorithm_rankings(domain="shop.example", task=RACE_TASK)}
+    assert rankings["always"]["total_success"] == 2
+    assert rankings["fresh"]["total_failure"] == 1
+
+
+@pytest.mark.asyncio
+async def test_knowledge_base_write_failures_are_reported(caplog):
+    class BrokenKB:
+        def get_algorithm_rankings(self, **kwargs):
+            return []
+
+        def record_execution(self, record, **kwargs):
+            raise TypeError("unexpected keyword argument")
+
+        def flush(self):
+            raise AttributeError("flush")
+
+    race = _race({"good": _racer(0.0, (PRODUCTS, "div.card"))})
+    race.kb = BrokenKB()
+    with caplog.at_level("WARNING", logger="curllm_core.extraction_race"):
+        outcome = await race.run(URL)
+
+    assert outcome.strategy == "good"
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("Failed to record race result for good" in m for m in messages)
+    assert any("Failed to write race results" in m for m in messages)
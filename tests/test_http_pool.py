@@ -0,0 +1,57 @@
+"""Tests for the pooled LLM HTTP session."""
+
+import pytest
+from aiohttp import web
+
+from curllm_core.http_pool import HTTPSessionPool
+from curllm_core.llm import SimpleOllama
+import curllm_core.llm as llm_module
+
+
+async def _start_fake_ollama():
+    async def generate(request):
+        body = await request.json()
+        return web.json_response({"response": f"echo:{body['prompt']}"})
+
+    app = web.Application()
+    app.router.add_post("/api/generate", generate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+@pytest.mark.asyncio
+async def test_simple_ollama_reuses_connection(monkeypatch):
+    pool = HTTPSessionPool(limit_per_host=2)
+    monkeypatch.setattr(llm_module, "get_http_pool", lambda: pool)
+    runner, base_url = await _start_fake_ollama()
+    try:
+        client = SimpleOllama(base_url, "test", 2048, 64, 0.1, 0.9, timeout=10)
+        for i in range(3):
+            out = await client.ainvoke(f"p{i}")
+            assert out == {"text": f"echo:p{i}"}
+        stats = pool.get_stats()
+        assert stats["requests"] == 3
+        assert stats["sessions_created"] == 1
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 2
+        assert stats["reuse_ratio"] > 0.6
+    finally:
+        await pool.close()
+        await runner.cleanup()
+    assert pool.get_stats()["open_sessions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_close_then_reopen_creates_new_session():
+    pool = HTTPSessionPool()
+    first = pool.get_session()
+    assert pool.get_session() is first
+    await pool.close()
+    assert first.closed
+    second = pool.get_session()
+    assert second is not first
+    await pool.close()
@@ -0,0 +1,60 @@
+"""Import-time budget: package imports must not pull in the heavy graph."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Generous wall-clock budget (ms) for a cold ``import <module>`` in a fresh interpreter
+BUDGET_MS = float(os.getenv("CURLLM_IMPORT_BUDGET_MS", "1500"))
+
+HEAVY = ["flask", "litellm", "playwright", "curllm_core.executor", "curllm_core.server", "curllm_core.v1", "curllm_core.v2"]
+
+PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+ms = (time.perf_counter() - t) * 1000
+print(json.dumps({{"ms": ms, "loaded": [m for m in {heavy!r} if m in sys.modules and m != "{module}"]}}))
+"""
+
+
+def _probe(module: str, heavy=HEAVY) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=heavy)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert out.returncode == 0, out.stderr
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["curllm_core", "curllm_core.v2", "curllm_core.streamware", "curllm_core.cli.flow"])
+def test_package_import_stays_lazy(module):
+    result = _probe(module)
+    assert result["loaded"] == []
+    assert result["ms"] < BUDGET_MS
+
+
+def test_executor_import_does_not_load_opencv():
+    # The vision pool (cv2/numpy) is only imported when a screenshot is analyzed
+    assert _probe("curllm_core.executor", heavy=["cv2", "numpy", "curllm_core.vision_pool"])["loaded"] == []
+
+
+def test_lazy_attributes_resolve_on_access():
+    import curllm_core
+    from curllm_core.streamware import components, get_component
+
+    assert "CurllmExecutor" in dir(curllm_core) and "v2" in dir(curllm_core)
+    assert isinstance(curllm_core.config, curllm_core.Config)
+    assert curllm_core.LLMConfig.__name__ == "LLMConfig"
+    assert components.FileComponent is get_component("file")
+    with pytest.raises(AttributeError):
+        curllm_core.does_not_exist
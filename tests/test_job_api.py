@@ -0,0 +1,77 @@
+"""Tests for the shared /api/jobs blueprint and job worker lifecycle."""
+
+import time
+
+import pytest
+from flask import Flask
+
+import curllm_core.job_api as job_api
+from curllm_core.async_runner import AsyncJobRunner
+from curllm_core.config import config
+from curllm_core.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    queue = JobQueue(db_path=str(tmp_path / "jobs.db"), max_per_domain=0, retry_backoff=0)
+    monkeypatch.setattr(job_api, "get_job_queue", lambda: queue)
+    monkeypatch.setattr(job_api, "_workers", None)
+    return queue
+
+
+@pytest.fixture
+def client(queue):
+    app = Flask(__name__)
+    app.register_blueprint(job_api.jobs_bp)
+    return app.test_client()
+
+
+def test_submit_poll_and_cancel(client):
+    resp = client.post("/api/jobs", json={"url": "https://a.com", "data": "extract"})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job_id"]
+    assert resp.headers["Location"] == f"/api/jobs/{job_id}"
+
+    assert client.get(f"/api/jobs/{job_id}").get_json()["status"] == "queued"
+    assert client.get(f"/api/jobs/{job_id}/result").status_code == 202
+    listing = client.get("/api/jobs").get_json()
+    assert listing["total"] == 1 and listing["workers"] is None
+
+    assert client.delete(f"/api/jobs/{job_id}").get_json()["status"] == "cancelled"
+    assert client.get(f"/api/jobs/{job_id}/result").status_code == 409
+    assert client.get("/api/jobs/missing").status_code == 404
+    assert client.post("/api/jobs", json={"jobs": []}).status_code == 400
+
+
+def test_workers_only_start_in_async_mode(queue, monkeypatch):
+    async def handler(payload):
+        return payload
+
+    monkeypatch.setattr(config, "server_mode", "loop_per_request")
+    assert job_api.start_job_workers(handler) is None
+    assert job_api.get_job_workers() is None
+
+
+def test_workers_resume_persisted_jobs_and_stop(queue, monkeypatch):
+    async def handler(payload):
+        return {"n": payload["n"]}
+
+    runner = AsyncJobRunner(max_concurrency=2, max_queue=2).start()
+    monkeypatch.setattr(job_api, "get_async_runner", lambda: runner)
+    monkeypatch.setattr(config, "server_mode", "async")
+    monkeypatch.setattr(config, "job_workers", 2)
+
+    # Queued before the workers exist, as after a restart
+    ids = queue.submit_many([{"url": f"https://d{i}.com", "n": i} for i in range(3)])
+    try:
+        workers = job_api.start_job_workers(handler)
+        assert workers is not None and job_api.start_job_workers(handler) is workers
+        deadline = time.time() + 10
+        while time.time() < deadline and not all(queue.get(i)["status"] == "succeeded" for i in ids):
+            time.sleep(0.05)
+        assert [queue.get(i, include_result=True)["result"]["n"] for i in ids] == [0, 1, 2]
+    finally:
+        assert job_api.stop_job_workers(timeout=5)
+        runner.drain(timeout=5)
+    assert job_api.get_job_workers() is None
+    assert job_api.stop_job_workers() is True
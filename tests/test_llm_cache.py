@@ -0,0 +1,94 @@
+"""Tests for the LLM prompt/response cache."""
+
+import asyncio
+
+import pytest
+
+from curllm_core.llm_cache import CachedLLMClient, LLMResponseCache, make_cache_key
+
+
+class FakeLLM:
+    def __init__(self, model="m1", temperature=0.3):
+        self.model = model
+        self.options = {"temperature": temperature}
+        self.calls = 0
+
+    async def ainvoke(self, prompt: str):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"text": f"answer:{prompt}"}
+
+    async def ainvoke_with_image(self, prompt: str, image_path: str):
+        return {"text": "image"}
+
+
+def test_key_depends_on_model_options_and_prompt():
+    base = make_cache_key("m", {"t": 0.1}, "p")
+    assert base == make_cache_key("m", {"t": 0.1}, "p")
+    assert base != make_cache_key("m2", {"t": 0.1}, "p")
+    assert base != make_cache_key("m", {"t": 0.2}, "p")
+    assert base != make_cache_key("m", {"t": 0.1}, "q")
+
+
+@pytest.mark.asyncio
+async def test_memory_hit_and_bypass(tmp_path):
+    fake = FakeLLM()
+    llm = CachedLLMClient(fake, LLMResponseCache(db_path=str(tmp_path / "c.db")))
+    first = await llm.ainvoke("hello")
+    second = await llm.ainvoke("hello")
+    assert first == second == {"text": "answer:hello"}
+    assert fake.calls == 1
+    await llm.ainvoke("hello", bypass_cache=True)
+    assert fake.calls == 2
+    stats = llm.cache.get_stats()
+    assert stats["memory_hits"] == 1
+    assert stats["bypassed"] == 1
+    assert stats["hit_rate"] == 0.5
+    # Non-cached methods pass through
+    assert (await llm.ainvoke_with_image("x", "y")) == {"text": "image"}
+    assert llm.model == "m1"
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_new_instance(tmp_path):
+    db = str(tmp_path / "c.db")
+    await CachedLLMClient(FakeLLM(), LLMResponseCache(db_path=db)).ainvoke("persist me")
+    fake = FakeLLM()
+    llm = CachedLLMClient(fake, LLMResponseCache(db_path=db))
+    assert await llm.ainvoke("persist me") == {"text": "answer:persist me"}
+    assert fake.calls == 0
+    assert llm.cache.get_stats()["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_different_model_misses(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "c.db"))
+    await CachedLLMClient(FakeLLM(model="a"), cache).ainvoke("p")
+    other = FakeLLM(model="b")
+    await CachedLLMClient(other, cache).ainvoke("p")
+    assert other.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_coalesce(tmp_path):
+    fake = FakeLLM()
+    llm = CachedLLMClient(fake, LLMResponseCache(use_disk=False))
+    results = await asyncio.gather(*[llm.ainvoke("same") for _ in range(5)])
+    assert all(r == {"text": "answer:same"} for r in results)
+    assert fake.calls == 1
+    assert llm.cache.get_stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_size_eviction(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "c.db"), memory_items=0, ttl_seconds=0.05)
+    await cache.put("k", {"text": "v"})
+    await asyncio.sleep(0.1)
+    assert await cache.get("k") is None
+
+    small = LLMResponseCache(db_path=str(tmp_path / "s.db"), memory_items=0, max_disk_mb=0.0001)
+    for i in range(5):
+        await small.put(f"k{i}", {"text": "x" * 40})
+    small.trim()
+    assert await small.get("k0") is None
+    assert await small.get("k4") is not None
@@ -0,0 +1,99 @@
+"""Tests for batched semantic validation with cached per-item verdicts."""
+
+import json
+import re
+
+import pytest
+
+from curllm_core.llm_filter_validator import LLMFilterValidator, VerdictCache, parse_verdicts
+
+
+class FakeLLM:
+    """Judges 'gluten-free' from the item text; can garble some items"""
+
+    def __init__(self, drop_ids=(), fenced=False, garble_ids=()):
+        self.prompts = []
+        self.drop_ids = set(drop_ids)
+        self.garble_ids = set(garble_ids)
+        self.fenced = fenced
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        if "ITEM 1:" not in prompt:
+            # Single-product prompt
+            passes = "bezglutenowy" in prompt.lower()
+            return {"text": json.dumps({
+                "passes": passes, "confidence": 0.7, "reasoning": "single",
+                "criteria_check": {"gluten-free": {"passes": passes, "confidence": 0.7, "reasoning": "single"}},
+            })}
+        items = re.findall(r"ITEM (\d+):\nName: ([^\n]+)", prompt)
+        out = []
+        for n, name in items:
+            if name in self.drop_ids:
+                continue
+            verdict = "maybe" if name in self.garble_ids else "bezglutenowy" in name.lower()
+            out.append({"id": int(n), "criteria": {"Gluten-Free": verdict},
+                        "confidence": 0.9, "reasoning": "batch"})
+        text = json.dumps(out)
+        return {"text": f"Sure! ```json\n{text}\n```" if self.fenced else text}
+
+
+def _products(n):
+    return [{"name": f"Makaron {'bezglutenowy ' if i % 2 else ''}{i}", "price": 5 + i} for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_batch_packs_products_and_keeps_order(tmp_path):
+    llm = FakeLLM(fenced=True)
+    validator = LLMFilterValidator(llm, cache=VerdictCache(tmp_path / "v.db"), batch_token_budget=60)
+    products = _products(10)
+    results = await validator.validate_batch(products, ["gluten-free"], "znajdź bezglutenowe")
+
+    assert 1 < len(llm.prompts) < 10
+    assert [r["product_index"] for r in results] == list(range(10))
+    assert [r["passes"] for r in results] == [bool(i % 2) for i in range(10)]
+    assert all(r["source"] == "batch" and r["product"] is products[i] for i, r in enumerate(results))
+
+
+@pytest.mark.asyncio
+async def test_unreadable_items_fall_back_and_verdicts_are_cached(tmp_path):
+    llm = FakeLLM(drop_ids={"Makaron bezglutenowy 3"})
+    cache_path = tmp_path / "v.db"
+    validator = LLMFilterValidator(llm, cache=VerdictCache(cache_path))
+    results = await validator.validate_batch(_products(5), ["gluten-free"], "x")
+
+    assert len(llm.prompts) == 2
+    assert results[3]["source"] == "single" and results[3]["passes"]
+    assert [r["passes"] for r in results] == [False, True, False, True, False]
+
+    # A new run (fresh process cache) reuses the stored verdicts
+    llm2 = FakeLLM()
+    again = await LLMFilterValidator(llm2, cache=VerdictCache(cache_path)).validate_batch(
+        _products(6), ["gluten-free"], "other instruction")
+    assert [r["source"] for r in again] == ["cache"] * 5 + ["batch"]
+    assert [r["passes"] for r in again] == [False, True, False, True, False, True]
+    assert len(llm2.prompts) == 1 and "ITEM 2:" not in llm2.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_unparseable_verdicts_go_to_single_path_and_are_not_cached_as_false(tmp_path):
+    cache_path = tmp_path / "v.db"
+    llm = FakeLLM(garble_ids={"Makaron bezglutenowy 1"})
+    results = await LLMFilterValidator(llm, cache=VerdictCache(cache_path)).validate_batch(
+        _products(3), ["gluten-free"], "x")
+
+    assert [r["source"] for r in results] == ["batch", "single", "batch"]
+    assert [r["passes"] for r in results] == [False, True, False]
+
+    # The cache holds the single-item verdict, not a False from the garbled batch answer
+    again = await LLMFilterValidator(FakeLLM(), cache=VerdictCache(cache_path)).validate_batch(
+        _products(3), ["gluten-free"], "x")
+    assert [r["source"] for r in again] == ["cache"] * 3
+    assert again[1]["passes"]
+
+
+def test_parse_verdicts_tolerates_noise():
+    assert parse_verdicts('{"results": [{"id": 1, "passes": true}]}') == [{"id": 1, "passes": True}]
+    truncated = 'Here: [{"id": 1, "criteria": {"vegan": true}}, {"id": 2, "criteria": {"vegan": fa'
+    assert parse_verdicts(truncated) == [{"id": 1, "criteria": {"vegan": True}}]
+    assert parse_verdicts("no json at all") == []
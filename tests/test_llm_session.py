@@ -0,0 +1,104 @@
+"""Tests for Ollama keep-alive/metrics and the prefix-stable planner session."""
+
+import pytest
+from aiohttp import web
+
+import curllm_core.llm as llm_module
+from curllm_core import llm_planner
+from curllm_core.http_pool import HTTPSessionPool
+from curllm_core.llm import SimpleOllama, ollama_metrics
+from curllm_core.llm_session import InferenceSession, get_session
+from curllm_core.stage_timer import StageRecorder
+
+
+async def _start_fake_ollama(requests):
+    async def generate(request):
+        body = await request.json()
+        requests.append(body)
+        # Emulate the runner's prefix cache: only the part after the previous prompt's common prefix is evaluated
+        prev = requests[-2]["prompt"] if len(requests) > 1 else ""
+        common = 0
+        while common < min(len(prev), len(body["prompt"])) and prev[common] == body["prompt"][common]:
+            common += 1
+        evaluated = (len(body["prompt"]) - common) // 4 + 1
+        return web.json_response({
+            "response": '{"type": "wait"}',
+            "prompt_eval_count": evaluated,
+            "prompt_eval_duration": evaluated * 1_000_000,
+            "eval_count": 8,
+            "eval_duration": 40_000_000,
+            "load_duration": 0 if len(requests) > 1 else 900_000_000,
+            "total_duration": 1,
+        })
+
+    app = web.Application()
+    app.router.add_post("/api/generate", generate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_ollama_metrics():
+    assert ollama_metrics({"response": "x"}) == {}
+    m = ollama_metrics({"prompt_eval_count": 100, "prompt_eval_duration": 250_000_000, "eval_count": 5, "eval_duration": 50_000_000})
+    assert m["prompt_tokens"] == 100 and m["prompt_eval_ms"] == 250 and m["eval_ms"] == 50 and m["load_ms"] == 0
+
+
+@pytest.mark.asyncio
+async def test_session_accounts_prompt_eval():
+    class FakeLLM:
+        def __init__(self):
+            self.prompts = []
+
+        async def ainvoke(self, prompt):
+            self.prompts.append(prompt)
+            tokens = 1000 if len(self.prompts) == 1 else 100
+            return {"text": "ok", "metrics": {"prompt_tokens": tokens, "prompt_eval_ms": tokens, "eval_tokens": 10, "eval_ms": 100}}
+
+    llm = FakeLLM()
+    session = InferenceSession(llm, prefix="PREFIX|")
+    for step in range(3):
+        await session.ainvoke(f"step {step}")
+    assert llm.prompts == ["PREFIX|step 0", "PREFIX|step 1", "PREFIX|step 2"]
+    stats = session.get_stats()
+    assert stats["calls"] == 3 and stats["prompt_tokens"] == 1200
+    assert stats["follow_up_prompt_ratio"] == 0.1
+    assert stats["prompt_eval_share"] == pytest.approx(1200 / 1500, abs=1e-3)
+
+    assert get_session(llm, "A") is get_session(llm, "A")
+    assert get_session(llm, "A") is not get_session(llm, "B")
+
+
+@pytest.mark.asyncio
+async def test_planner_keeps_prefix_stable_and_sends_keep_alive(monkeypatch):
+    requests = []
+    pool = HTTPSessionPool()
+    monkeypatch.setattr(llm_module, "get_http_pool", lambda: pool)
+    runner, base_url = await _start_fake_ollama(requests)
+    try:
+        client = SimpleOllama(base_url, "test", 2048, 64, 0.1, 0.9, timeout=10, keep_alive="30m")
+        instruction = "extract all links"
+        with StageRecorder() as rec:
+            for step in range(3):
+                ctx = {"url": "https://a.example", "links": [{"href": f"/p/{i}"} for i in range(step * 20)]}
+                action = await llm_planner.generate_action(client, instruction, ctx, step)
+                assert action == {"type": "wait"}
+    finally:
+        await pool.close()
+        await runner.cleanup()
+
+    assert all(r["keep_alive"] == "30m" for r in requests)
+    assert len({r["options"]["num_ctx"] for r in requests}) == 1
+    prompts = [r["prompt"] for r in requests]
+    prefix = prompts[0].split("Current Step:")[0]
+    assert len(prefix) > 1000
+    assert all(p.startswith(prefix) for p in prompts)
+
+    counters = rec.summary()["counters"]
+    assert counters["llm_wait.eval_tokens"] == 24
+    assert counters["llm_wait.load_ms"] == 900
+    # Follow-up steps only evaluate the per-step delta
+    assert counters["llm_wait.prompt_tokens"] < len(prompts[0]) // 4 + 2 * (len(prompts[2]) - len(prefix)) // 4 + 3
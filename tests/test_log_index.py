@@ -0,0 +1,119 @@
+"""Tests for the indexed run log catalog and logs API."""
+
+import os
+
+import pytest
+from flask import Flask
+
+import curllm_web.routes.logs as logs_routes
+import curllm_web.utils.log_utils as log_utils
+from curllm_logs.run_logger import RunLogger
+from curllm_web.utils.log_index import LogCatalog
+
+
+def _write_log(logs_dir, session_id, url, status="SUCCESS", body=""):
+    path = logs_dir / f"run-{session_id}.md"
+    icon = "✅" if status == "SUCCESS" else "❌"
+    path.write_text(
+        f"# curllm Run Log ({session_id})\n\n- **URL**: {url}\n- **Instruction**: find products\n\n"
+        f"{body}\n---\n\n## Summary\n\n**Status:** {icon} {status}\n**Duration:** 1200ms\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.fixture
+def logs_dir(tmp_path):
+    _write_log(tmp_path, "20240101-100000", "https://shop.example/laptopy", body="captcha detected")
+    _write_log(tmp_path, "20240102-100000", "https://www.shop.example/", status="FAILED")
+    _write_log(tmp_path, "20240203-100000", "https://other.example/")
+    logger = RunLogger("extract prices", "https://other.example/list", log_dir=str(tmp_path),
+                       session_id="20240204-090000")
+    logger.log_text("Price table parsed")
+    logger.finalize(success=False, duration_ms=321)
+    return tmp_path
+
+
+def test_listing_filters_and_pagination(logs_dir):
+    catalog = LogCatalog(logs_dir)
+    page = catalog.list(per_page=2)
+    assert page["total"] == 4 and page["pages"] == 2
+    assert [log["filename"] for log in page["logs"]] == ["run-20240204-090000.md", "run-20240203-100000.md"]
+    everything = catalog.list(per_page=None)
+    assert len(everything["logs"]) == 4 and everything["pages"] == 1
+
+    assert catalog.list(domain="shop.example")["total"] == 2
+    failed = catalog.list(status="failed")["logs"]
+    assert {log["session_id"] for log in failed} == {"20240102-100000", "20240204-090000"}
+    run_logger_entry = next(log for log in failed if log["session_id"] == "20240204-090000")
+    assert run_logger_entry["duration_ms"] == 321
+    assert run_logger_entry["instruction"] == "extract prices"
+    assert catalog.list(since="2024-02-01", until="2024-02-04")["total"] == 1
+
+    hits = catalog.list(query="captcha")["logs"]
+    assert [log["session_id"] for log in hits] == ["20240101-100000"]
+    assert "[captcha]" in hits[0]["snippet"]
+    assert catalog.list(query='bad "query')["total"] == 0
+
+
+def test_sync_is_incremental(logs_dir):
+    catalog = LogCatalog(logs_dir, min_interval=0)
+    assert catalog.sync()["added"] == 4
+    assert catalog.sync() == {"added": 0, "updated": 0, "removed": 0}
+
+    path = logs_dir / "run-20240203-100000.md"
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("late line about timeout\n")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    (logs_dir / "run-20240101-100000.md").unlink()
+    assert catalog.sync() == {"added": 0, "updated": 1, "removed": 1}
+    assert catalog.list(query="timeout")["total"] == 1
+
+    # The index survives a restart
+    catalog.close()
+    assert LogCatalog(logs_dir).sync() == {"added": 0, "updated": 0, "removed": 0}
+
+
+def test_read_tail_and_follow(logs_dir):
+    catalog = LogCatalog(logs_dir)
+    path = _write_log(logs_dir, "20240301-000000", "https://a.example/", body="\n".join(f"line {i} ż" for i in range(2000)))
+    size = path.stat().st_size
+
+    tail = catalog.read_tail(path.name, max_bytes=100)
+    assert tail["eof"] and tail["content"].endswith("**Duration:** 1200ms\n")
+    assert not tail["content"].startswith("ine")
+
+    chunks, offset = [], 0
+    while True:
+        chunk = catalog.read_tail(path.name, max_bytes=333, offset=offset)
+        chunks.append(chunk["content"])
+        offset = chunk["next_offset"]
+        if chunk["eof"]:
+            break
+    assert offset == size
+    assert "".join(chunks) == path.read_text(encoding="utf-8")
+    assert catalog.read_tail("../secret.md") is None
+
+
+def test_logs_api(logs_dir, monkeypatch):
+    monkeypatch.setattr(logs_routes, "LOGS_DIR", logs_dir)
+    monkeypatch.setattr(log_utils, "LOGS_DIR", logs_dir)
+    app = Flask(__name__)
+    app.register_blueprint(logs_routes.logs_bp)
+    client = app.test_client()
+
+    data = client.get("/api/logs?per_page=1&page=2&status=success").get_json()
+    assert data["total"] == 2 and data["page"] == 2
+    assert data["logs"][0]["filename"] == "run-20240101-100000.md"
+    assert client.get("/api/logs?since=not-a-date").status_code == 400
+
+    assert client.get("/api/logs/run-20240101-100000.md").get_json()["success"]
+    assert client.get("/api/logs/run-missing.md").status_code == 404
+
+    tail = client.get("/api/logs/run-20240101-100000.md/tail?bytes=40").get_json()
+    assert tail["eof"] and "1200ms" in tail["content"]
+
+    raw = client.get("/api/logs/run-20240101-100000.md/raw", headers={"Range": "bytes=0-15"})
+    assert raw.status_code == 206
+    assert raw.data == b"# curllm Run Log"
+    raw.close()
@@ -0,0 +1,208 @@
+"""Tests for single-pass page context extraction (page replaced by a fake)."""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from curllm_core.page_context import _DOM_WALKER_JS, IncrementalDomTracker, extract_page_context
+
+
+class FakeFrame:
+    def __init__(self, result, url="https://frame.example/"):
+        self.result = result
+        self.url = url
+        self.calls = 0
+
+    async def evaluate(self, script, arg=None):
+        self.calls += 1
+        return self.result
+
+
+class FakePage:
+    def __init__(self, base, frames=()):
+        self.base = base
+        self.main_frame = object()
+        self.frames = [self.main_frame, *frames]
+        self.calls = []
+
+    async def evaluate(self, script, arg=None):
+        self.calls.append(arg)
+        return json.loads(json.dumps(self.base))
+
+
+BASE = {
+    "title": "Shop",
+    "url": "https://shop.example/",
+    "forms": [],
+    "links": [{"href": "https://shop.example/a", "text": "A"}],
+}
+
+
+@pytest.mark.asyncio
+async def test_without_dom_uses_one_evaluate():
+    page = FakePage(BASE)
+    stats = {}
+    ctx = await extract_page_context(page, include_dom=False, stats=stats)
+    assert len(page.calls) == 1
+    assert page.calls[0]["includeDom"] is False
+    assert "dom_preview" not in ctx and "interactive" not in ctx
+    assert stats["section_bytes"]["links"] > 0
+
+
+@pytest.mark.asyncio
+async def test_dom_sections_come_from_the_same_evaluate():
+    preview = json.dumps({"tag": "body", "children": [{"tag": "a", "text": "A"}]})
+    base = dict(BASE, __dom={
+        "preview": preview,
+        "interactive": [{"tag": "a", "text": "A"}],
+        "nodes": 2,
+        "truncated": True,
+    })
+    frame = FakeFrame({"preview": '{"tag":"body"}', "interactive": [{"tag": "button"}]})
+    page = FakePage(base, frames=[frame])
+    stats = {}
+    ctx = await extract_page_context(page, include_dom=True, dom_max_chars=123, stats=stats)
+    assert len(page.calls) == 1
+    assert page.calls[0]["domMaxChars"] == 123
+    assert "__dom" not in ctx
+    assert ctx["dom_preview"] == preview
+    assert ctx["interactive"] == [{"tag": "a", "text": "A"}]
+    assert frame.calls == 1
+    assert ctx["iframes"] == [{
+        "dom": {"tag": "body"},
+        "interactive": [{"tag": "button"}],
+        "url": "https://frame.example/",
+    }]
+    assert stats["dom_nodes"] == 2
+    assert stats["dom_truncated"] is True
+    assert stats["section_bytes"]["dom_preview"] == len(preview)
+
+
+def _region(rid, h, changed=True, interactive=()):
+    entry = {"id": rid, "hash": h, "tag": "div", "label": rid, "text_chars": 10, "changed": changed}
+    if changed:
+        entry.update(preview=json.dumps({"tag": "div", "text": rid}), interactive=list(interactive), nodes=3)
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_incremental_context_sends_only_changed_regions():
+    tracker = IncrementalDomTracker()
+    page = FakePage(dict(BASE, __regions=[
+        _region("#nav", "h1", interactive=[{"tag": "a", "text": "Home"}]),
+        _region("#main", "h2", interactive=[{"tag": "button", "text": "Buy"}]),
+    ]))
+    ctx = await extract_page_context(page, include_dom=True, include_iframes=False, tracker=tracker)
+    assert page.calls[0]["regionsKnown"] == {}
+    view = json.loads(ctx["dom_preview"])
+    assert [r["id"] for r in view["changed"]] == ["#nav", "#main"]
+    assert view["changed"][0]["dom"] == {"tag": "div", "text": "#nav"}
+
+    # Second step: nav unchanged, main re-rendered
+    page.base = dict(BASE, __regions=[
+        _region("#nav", "h1", changed=False),
+        _region("#main", "h3", interactive=[{"tag": "button", "text": "Checkout"}]),
+    ])
+    stats = {}
+    ctx = await extract_page_context(page, include_dom=True, include_iframes=False, stats=stats, tracker=tracker)
+    assert page.calls[1]["regionsKnown"] == {"#nav": "h1", "#main": "h2"}
+    view = json.loads(ctx["dom_preview"])
+    assert [r["id"] for r in view["changed"]] == ["#main"]
+    assert view["unchanged"] == [{"id": "#nav", "tag": "div", "label": "#nav", "text_chars": 10}]
+    assert ctx["interactive"] == [{"tag": "a", "text": "Home"}, {"tag": "button", "text": "Checkout"}]
+    assert stats["regions_changed"] == 1 and stats["regions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_incremental_tracker_drops_removed_regions_and_resets_on_navigation():
+    tracker = IncrementalDomTracker()
+    page = FakePage(dict(BASE, __regions=[_region("#a", "1"), _region("#b", "2")]))
+    page.url = "https://shop.example/"
+    await extract_page_context(page, include_dom=True, include_iframes=False, tracker=tracker)
+
+    page.base = dict(BASE, __regions=[_region("#a", "1", changed=False)])
+    ctx = await extract_page_context(page, include_dom=True, include_iframes=False, tracker=tracker)
+    assert json.loads(ctx["dom_preview"])["removed"] == ["#b"]
+    assert tracker.known() == {"#a": "1"}
+
+    page.url = "https://shop.example/cart"
+    page.base = dict(BASE, __regions=[_region("#a", "9")])
+    await extract_page_context(page, include_dom=True, include_iframes=False, tracker=tracker)
+    assert page.calls[-1]["regionsKnown"] == {}
+
+
+# Just enough of the DOM for walkDom: elements with attributes, text,
+# children and matches() for the simple selectors in its interactive list
+_MINI_DOM_JS = """
+globalThis.Node = {ELEMENT_NODE: 1};
+class El {
+  constructor(tag, attrs = {}, text = "", children = []) {
+    this.nodeType = 1; this.tagName = tag.toUpperCase();
+    this._attrs = attrs; this._text = text; this.children = children;
+  }
+  get id() { return this._attrs.id || ""; }
+  get className() { return this._attrs.class || ""; }
+  get attributes() { return Object.entries(this._attrs).map(([name, value]) => ({name, value})); }
+  getAttribute(name) { return name in this._attrs ? this._attrs[name] : null; }
+  get textContent() { return this._text + this.children.map(c => c.textContent).join(""); }
+  get innerText() { return this.textContent; }
+  matches(selectors) {
+    return selectors.split(",").some(sel => {
+      const m = /^([a-z]*)(?:\\[([a-z-]+)(?:=([^\\]]+))?\\])?$/.exec(sel.trim());
+      if (!m) return false;
+      const [, tag, attr, value] = m;
+      if (tag && tag !== this.tagName.toLowerCase()) return false;
+      if (attr && !(attr in this._attrs)) return false;
+      return !value || this._attrs[attr] === value;
+    });
+  }
+}
+"""
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node not available")
+def test_dom_walker_respects_budget_and_interactive_cap(tmp_path):
+    script = tmp_path / "walk.js"
+    script.write_text(
+        _MINI_DOM_JS + _DOM_WALKER_JS + """
+const sections = [];
+for (let i = 0; i < 300; i++) {
+  sections.push(new El("section", {class: "card"}, "", [
+    new El("h2", {}, "Product " + i),
+    new El("script", {}, "track(" + i + ")"),
+    new El("a", {href: "/p/" + i, class: "link"}, "Details " + i),
+    new El("button", {type: "button"}, "Buy " + i),
+  ]));
+}
+const body = new El("body", {}, "", [new El("main", {id: "main"}, "", sections)]);
+const out = {};
+for (const budget of [0, 50, 2000]) out[budget] = walkDom(body, {budget, maxInteractive: 10, withAttrs: true});
+out.full = walkDom(body, {budget: 10000000, maxInteractive: 1000, withAttrs: false});
+console.log(JSON.stringify(out));
+""",
+        encoding="utf-8",
+    )
+    out = json.loads(subprocess.run(["node", str(script)], capture_output=True, text=True, check=True).stdout)
+
+    def count(node):
+        return 1 + sum(count(c) for c in node.get("children", []))
+
+    for budget in ("50", "2000"):
+        walk = out[budget]
+        assert walk["truncated"] is True
+        assert len(walk["preview"]) <= int(budget)
+        tree = json.loads(walk["preview"])
+        assert tree["tag"] == "body" and walk["nodes"] == count(tree)
+        # The interactive quota is still filled after the preview budget ran out
+        assert len(walk["interactive"]) == 10
+        assert walk["interactive"][0] == {"tag": "a", "text": "Details 0", "attrs": {"class": "link", "href": "/p/0"}}
+        assert walk["interactive"][1]["attrs"]["type"] == "button"
+    assert out["0"]["preview"] == "" and out["0"]["nodes"] == 0 and len(out["0"]["interactive"]) == 10
+
+    full = out["full"]
+    tree = json.loads(full["preview"])
+    assert full["truncated"] is False and full["nodes"] == count(tree) == 2 + 300 * 4
+    assert "script" not in full["preview"]
+    assert len(full["interactive"]) == 600 and set(full["interactive"][0]) == {"tag", "text"}
@@ -0,0 +1,110 @@
+"""Tests for the preloaded in-page JS function library."""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from curllm_core import page_library
+from curllm_core.page_library import (
+    call_page_function, get_bundle, get_page_function_stats, get_version, install_page_library,
+)
+from curllm_core.dom_statistics import DOMStatistics
+
+
+class FakeLibraryPage:
+    """Page stand-in that understands the library protocol"""
+
+    def __init__(self, functions, installed=False):
+        self.functions = functions
+        self.installed = installed
+        self.scripts = []
+
+    async def evaluate(self, script, arg=None):
+        self.scripts.append(script)
+        if script == get_bundle():
+            self.installed = True
+            return None
+        if script == page_library._CALL_JS:
+            name, args, version = arg
+            if not self.installed or version != get_version():
+                return {"missing": True}
+            return {"value": self.functions[name](args)}
+        if script == page_library._STATS_JS:
+            return {"domStatistics": {"calls": 1}} if self.installed else {}
+        raise AssertionError("unexpected script")
+
+
+class FakeContext:
+    def __init__(self, pages):
+        self.pages = pages
+        self.init_scripts = []
+
+    async def add_init_script(self, script=None, path=None):
+        self.init_scripts.append(script)
+
+
+@pytest.mark.asyncio
+async def test_call_injects_bundle_once_then_sends_only_name_and_args():
+    page = FakeLibraryPage({"groupByParent": lambda sel: [{"parent_selector": "ul", "count": 3, "sel": sel}]})
+    first = await call_page_function(page, "groupByParent", "li")
+    second = await call_page_function(page, "groupByParent", "li")
+    assert first == second == [{"parent_selector": "ul", "count": 3, "sel": "li"}]
+    assert page.scripts.count(get_bundle()) == 1
+    assert page.scripts[-1] == page_library._CALL_JS
+    assert await get_page_function_stats(page) == {"domStatistics": {"calls": 1}}
+
+
+@pytest.mark.asyncio
+async def test_install_registers_init_script_and_covers_open_pages():
+    page = FakeLibraryPage({})
+    context = FakeContext([page])
+    assert await install_page_library(context)
+    assert await install_page_library(context)
+    assert context.init_scripts == [get_bundle()]
+    assert page.installed
+
+
+@pytest.mark.asyncio
+async def test_dom_statistics_uses_single_library_call():
+    result = {
+        "depth": {"depthMap": {"0": 1, "3": 12}, "textLengthByDepth": {"3": [20, 22, 21]}},
+        "features": {"prices": {"3": 10}, "links": {"3": 10}, "images": {"2": 4}},
+        "classes": {"product": 10},
+    }
+    page = FakeLibraryPage({"domStatistics": lambda _: result}, installed=True)
+    stats = await DOMStatistics().analyze_dom_tree(page)
+    assert len(page.scripts) == 1
+    assert stats["optimal_depths"]["price_peak_depth"] == 3
+    assert stats["feature_distribution"]["images"] == {2: 4}
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node not available")
+def test_bundle_runs_and_keeps_page_globals_clean(tmp_path):
+    script = tmp_path / "check.js"
+    script.write_text(
+        get_bundle() + get_bundle() + """
+const lib = globalThis.__curllm;
+const out = {
+  version: lib.version,
+  names: lib.list(),
+  price: lib.call('extractPrice', 'Cena 1 299,00 zł'),
+  leaked: ['FunctionRegistry', 'extractPrice', 'AnalyzerRegistry'].filter(n => n in globalThis),
+  enumerable: Object.keys(globalThis).includes('__curllm'),
+};
+try { lib.call('missing'); } catch (e) { out.error = e.message; }
+out.stats = lib.stats(true);
+out.after = lib.stats();
+console.log(JSON.stringify(out));
+""",
+        encoding="utf-8",
+    )
+    out = json.loads(subprocess.run(["node", str(script)], capture_output=True, text=True, check=True).stdout)
+    assert out["version"] == get_version()
+    assert {"extractPrice", "domStatistics", "clusterByStructure", "quickPageCheck"} <= set(out["names"])
+    assert out["price"] == 1299.0
+    assert out["leaked"] == [] and out["enumerable"] is False
+    assert out["error"] == "Unknown page function: missing"
+    assert out["stats"]["extractPrice"]["calls"] == 1
+    assert out["after"] == {}
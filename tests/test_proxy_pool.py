@@ -0,0 +1,140 @@
+"""Tests for the health-scored proxy pool and resolve_proxy integration."""
+
+import json
+import random
+import time
+from collections import Counter
+
+from curllm_core import proxy as proxy_mod
+from curllm_core import proxy_pool as pool_mod
+from curllm_core.proxy_pool import ProxyPool, validate_proxy
+
+A, B, C = "http://10.0.0.1:8080", "http://10.0.0.2:8080", "http://10.0.0.3:8080"
+
+
+def _pool(tmp_path=None, **kwargs):
+    kwargs.setdefault("rng", random.Random(1))
+    return ProxyPool(state_file=tmp_path / "state.json" if tmp_path else None, **kwargs)
+
+
+def test_validate_proxy():
+    assert validate_proxy("10.0.0.1:3128") == "http://10.0.0.1:3128"
+    assert validate_proxy("socks5://user:pw@proxy.example:1080") == "socks5://user:pw@proxy.example:1080"
+    for bad in ("", "# comment", "ftp://10.0.0.1:21", "http://:8080", "http://10.0.0.1:99999"):
+        assert validate_proxy(bad) is None
+
+
+def test_source_loads_once_and_skips_invalid_entries():
+    pool = _pool()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [A, A, "not a proxy://x", B]
+
+    assert pool.source("public", loader) == [A, B]
+    assert pool.source("public", loader) == [A, B]
+    assert pool.source("public", loader, version=2) == [A, B]
+    assert len(calls) == 2
+    assert pool.get_stats()["rejected_entries"] == 2
+
+
+def test_selection_prefers_healthy_fast_proxies():
+    pool = _pool()
+    pool.set_source("s", [A, B])
+    for _ in range(10):
+        pool.report(A, ok=True, latency_ms=300)
+        pool.report(B, ok=True, latency_ms=6000)
+    pool.report(B, ok=False)
+    picks = Counter(pool.choose("s") for _ in range(500))
+    assert picks[A] > 3 * picks[B]
+
+
+def test_ban_quarantines_and_host_stickiness():
+    pool = _pool(quarantine_seconds=60)
+    pool.set_source("s", [A, B, C])
+    first = pool.choose("s", host="shop.example")
+    pool.report(first, ok=True, latency_ms=500, status=200, host="shop.example")
+    assert all(pool.choose("s", host="shop.example") == first for _ in range(20))
+
+    pool.report(first, ok=False, status=429, host="shop.example")
+    health = pool.health(first)
+    assert health["bans"] == 1 and health["quarantined_until"] > 0
+    assert all(pool.choose("s", host="shop.example") != first for _ in range(50))
+    assert pool.get_stats()["quarantined_now"] == 1
+
+
+def test_consecutive_failures_quarantine_with_backoff():
+    pool = _pool(quarantine_seconds=10, fail_threshold=2)
+    pool.set_source("s", [A])
+    pool.report(A, ok=False, error="timeout")
+    assert pool.health(A)["quarantined_until"] == 0
+    pool.report(A, ok=False, error="timeout")
+    assert 5 < pool.health(A)["quarantined_until"] - time.time() <= 10
+    pool.report(A, ok=False)
+    pool.report(A, ok=False)
+    assert 15 < pool.health(A)["quarantined_until"] - time.time() <= 20
+    # Everything quarantined: still returns the proxy released soonest
+    assert pool.choose("s") == A
+
+
+def test_state_is_flushed_in_batches_and_reloaded(tmp_path):
+    pool = _pool(tmp_path, flush_seconds=3600)
+    pool.set_source("s", [A])
+    pool.report(A, ok=True, latency_ms=200)
+    state = tmp_path / "state.json"
+    assert not state.exists()
+    pool.flush()
+    data = json.loads(state.read_text())
+    assert data["proxies"][A]["successes"] == 1
+
+    reloaded = _pool(tmp_path)
+    reloaded.set_source("s", [A])
+    assert reloaded.health(A)["latency_ewma_ms"] == 200
+
+
+def test_resolve_proxy_uses_pool_and_reports_outcome(tmp_path, monkeypatch):
+    pool = _pool(tmp_path, flush_seconds=3600)
+    monkeypatch.setattr(pool_mod, "_global_pool", pool)
+    monkeypatch.setattr(proxy_mod, "_load_public_list", lambda: [A, B])
+
+    chosen = proxy_mod.resolve_proxy({"rotate": "public"}, rotation_key="shop.example")
+    assert chosen["server"] in (A, B)
+    proxy_mod.report_proxy_outcome(chosen, {"status": 403, "ms": 900}, host="shop.example")
+    assert pool.health(chosen["server"])["bans"] == 1
+    other = proxy_mod.resolve_proxy({"rotate": "public"}, rotation_key="shop.example")
+    assert other["server"] != chosen["server"]
+
+    listed = proxy_mod.resolve_proxy({"rotate": True, "list": ["10.1.1.1:3128"]})
+    assert listed == {"server": "http://10.1.1.1:3128"}
+    # Static proxies are not pooled and not reported
+    proxy_mod.report_proxy_outcome({"server": "http://corp:3128"}, {"error": "boom"})
+    assert pool.health("http://corp:3128") is None
+
+
+def test_block_page_counts_as_failure_not_ban(tmp_path, monkeypatch):
+    pool = _pool(tmp_path, flush_seconds=3600)
+    monkeypatch.setattr(pool_mod, "_global_pool", pool)
+    pool.set_source("s", [A])
+
+    proxy_mod.report_proxy_outcome({"server": A}, {"status": 200, "blocked": True})
+    health = pool.health(A)
+    assert health["bans"] == 0 and health["failures"] == 1
+    assert health["last_error"] == "block page"
+    assert health["quarantined_until"] == 0
+
+    # Repeated block pages still quarantine it at fail_threshold
+    proxy_mod.report_proxy_outcome({"server": A}, {"status": 200, "blocked": True})
+    assert pool.health(A)["quarantined_until"] > 0
+
+
+def test_round_robin_strategy_batches_state_writes(tmp_path, monkeypatch):
+    mgr = proxy_mod.ProxyStateManager(tmp_path / "rotation.json", flush_seconds=3600)
+    monkeypatch.setattr(proxy_mod, "_state_manager", mgr)
+    monkeypatch.setattr(pool_mod, "_global_pool", _pool())
+    cfg = {"rotate": True, "list": [A, B, C], "strategy": "round_robin"}
+    picks = [proxy_mod.resolve_proxy(cfg)["server"] for _ in range(4)]
+    assert picks == [A, B, C, A]
+    assert not (tmp_path / "rotation.json").exists()
+    mgr.flush()
+    assert len(json.loads((tmp_path / "rotation.json").read_text())) == 1
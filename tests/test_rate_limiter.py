@@ -9,6 +9,7 @@ pytestmark = pytest.mark.asyncio
 from curllm_core.rate_limiter import (
     RateLimiter,
     AdaptiveRateLimiter,
+    SQLiteRateLimitBackend,
     get_rate_limiter,
     reset_global_limiter,
 )
@@ -113,6 +114,64 @@ class TestRateLimiter:
         assert len(limiter.domain_timestamps) == 0
 
 
+class TestTokenBucket:
+    """Test GCRA bucket behaviour and the scheduler-facing API."""
+    
+    def test_burst_then_rate(self):
+        """Capacity is rpm + burst, then one token per 60/rpm seconds."""
+        limiter = RateLimiter(requests_per_minute=2, burst_allowance=1, default_delay=0)
+        
+        waits = [limiter.reserve("example.com") for _ in range(5)]
+        
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(30.0, abs=0.1)
+        assert waits[4] == pytest.approx(60.0, abs=0.1)
+        assert limiter.get_remaining_capacity("example.com") == 0
+    
+    def test_try_acquire_does_not_reserve(self):
+        """try_acquire reports the wait without taking a slot."""
+        limiter = RateLimiter(requests_per_minute=1, burst_allowance=0, default_delay=0)
+        
+        assert limiter.try_acquire("example.com") == 0.0
+        wait = limiter.try_acquire("example.com")
+        assert 59.9 < wait <= 60.0
+        assert limiter.try_acquire("example.com") == pytest.approx(wait, abs=0.05)
+        assert limiter.get_stats("example.com")["requests_in_window"] == 1
+    
+    def test_default_delay_spacing(self):
+        """Slots are spaced by default_delay even with tokens left."""
+        limiter = RateLimiter(requests_per_minute=600, default_delay=0.2)
+        
+        assert limiter.reserve("example.com") == 0.0
+        assert limiter.reserve("example.com") == pytest.approx(0.2, abs=0.02)
+        assert limiter.reserve("example.com") == pytest.approx(0.4, abs=0.02)
+    
+    def test_per_domain_burst(self):
+        """Domain overrides change that domain's bucket only."""
+        limiter = RateLimiter(requests_per_minute=1, burst_allowance=0, default_delay=0)
+        limiter.set_domain_limit("https://api.example.com/x", burst_allowance=4)
+        
+        assert [limiter.try_acquire("api.example.com") for _ in range(5)] == [0.0] * 5
+        assert limiter.try_acquire("other.com") == 0.0
+        assert limiter.try_acquire("other.com") > 0
+    
+    def test_sqlite_backend_shares_budget(self, tmp_path):
+        """Two limiters on one SQLite file draw from the same bucket."""
+        db = str(tmp_path / "limits.db")
+        first = RateLimiter(requests_per_minute=1, burst_allowance=1,
+                            default_delay=0, backend=SQLiteRateLimitBackend(db))
+        second = RateLimiter(requests_per_minute=1, burst_allowance=1,
+                             default_delay=0, backend=SQLiteRateLimitBackend(db))
+        
+        assert first.try_acquire("example.com") == 0.0
+        assert second.try_acquire("example.com") == 0.0
+        assert first.try_acquire("example.com") > 0
+        assert second.get_remaining_capacity("example.com") == 0
+        
+        second.reset("example.com")
+        assert first.get_remaining_capacity("example.com") == 2
+
+
 class TestAdaptiveRateLimiter:
     """Test the AdaptiveRateLimiter class."""
     
@@ -158,6 +217,15 @@ class TestAdaptiveRateLimiter:
         # Rate should increase
         assert limiter.domain_rpm["example.com"] > 10
     
+    def test_adapted_rate_is_enforced(self):
+        """Backed-off RPM applies to acquire."""
+        limiter = AdaptiveRateLimiter(requests_per_minute=2, min_rpm=1,
+                                      burst_allowance=0, default_delay=0)
+        limiter.record_error("example.com", status_code=429)
+        
+        assert limiter.reserve("example.com") == 0.0
+        assert limiter.reserve("example.com") == pytest.approx(60.0, abs=0.1)
+    
     def test_rate_does_not_exceed_initial(self):
         """Rate should not exceed initial value."""
         limiter = AdaptiveRateLimiter(
@@ -41,3 +41,98 @@ def test_previous_for_context_reads_latest(tmp_path: Path, monkeypatch):
         assert prev["key"] == key
         assert prev["fields"] == ["href"]
         assert any(it["href"] == "https://x/a" for it in prev["items"])  # type: ignore[index]
+
+
+def _products(n, changed=()):
+    return {"products": [
+        {"url": f"https://x/p{i}", "price": i * 2 if i in changed else i} for i in range(n)
+    ]}
+
+
+def test_apply_diff_uses_stored_hashes(tmp_path: Path, monkeypatch):
+    from curllm_core.result_store import apply_diff_and_store, load_latest
+
+    monkeypatch.setenv("CURLLM_WORKSPACE", str(tmp_path))
+    out, meta = apply_diff_and_store(None, None, "shop", _products(5), ["url"], 10, "delta")
+    assert meta["new_count"] == 5 and meta["prev_count"] == 0
+
+    curr = _products(6, changed={2})
+    curr["products"].pop(0)
+    out, meta = apply_diff_and_store(None, None, "shop", curr, ["url"], 10, "delta")
+    assert meta["prev_count"] == 5
+    assert [it["url"] for it in out["new"]] == ["https://x/p5"]
+    assert out["changed"] == [{"previous": {"url": "https://x/p2", "price": 2},
+                               "current": {"url": "https://x/p2", "price": 4}}]
+    assert out["removed"] == [{"url": "https://x/p0", "price": 0}]
+    assert load_latest("shop")["result"] == curr
+
+
+def test_store_appends_only_new_content_and_streams_history(tmp_path: Path):
+    from curllm_core.result_store import ResultStore
+
+    with ResultStore(tmp_path / "k") as store:
+        first = store.append_run(_products(100), ["url"])
+        size = sum(p.stat().st_size for p in (tmp_path / "k").glob("seg-*.jsonl"))
+        second = store.append_run(_products(100, changed={7}), ["url"])
+        grown = sum(p.stat().st_size for p in (tmp_path / "k").glob("seg-*.jsonl")) - size
+        assert 0 < grown < size / 50
+
+        assert [r["run_id"] for r in store.list_runs()] == [first, second]
+        items = list(store.iter_items(first, batch=7))
+        assert len(items) == 100 and items[7]["price"] == 7
+        assert store.load_run(second)["result"]["products"][7]["price"] == 14
+
+
+def test_compaction_keeps_history_and_reclaims_space(tmp_path: Path):
+    from curllm_core.result_store import ResultStore
+
+    with ResultStore(tmp_path / "k") as store:
+        for run in range(4):
+            store.append_run({"products": [{"url": f"u{i}", "run": run} for i in range(20)]}, ["url"])
+        stats = store.compact(keep_history=2)
+        assert stats["runs_removed"] == 2
+        assert stats["blobs_removed"] == 40
+        runs = store.list_runs()
+        assert len(runs) == 2
+        assert store.load_run(runs[0]["run_id"])["result"]["products"][0] == {"url": "u0", "run": 2}
+        assert len(list((tmp_path / "k").glob("seg-*.jsonl"))) == 1
+
+
+def test_diff_falls_back_to_content_when_key_fields_differ(tmp_path: Path, monkeypatch):
+    from curllm_core.result_store import apply_diff_and_store
+
+    monkeypatch.setenv("CURLLM_WORKSPACE", str(tmp_path))
+    # Stored with the default href/title/url key: p1 is keyed "||https://x/p1"
+    assert save_snapshot("shop", _products(3)) == tmp_path / "results" / "shop"
+
+    out, meta = apply_diff_and_store(None, None, "shop", _products(3, changed={1}), ["url"], 10, "delta")
+    assert meta["prev_count"] == 3
+    assert out["changed"] == []
+    assert out["new"] == [{"url": "https://x/p1", "price": 2}]
+    assert out["removed"] == [{"url": "https://x/p1", "price": 1}]
+
+    # Same key fields as the stored run: matched by key again
+    out, _ = apply_diff_and_store(None, None, "shop", _products(3), ["url"], 10, "delta")
+    assert out["new"] == [] and out["removed"] == []
+    assert len(out["changed"]) == 1
+
+
+def test_legacy_snapshots_are_migrated_into_the_store(tmp_path: Path, monkeypatch):
+    from curllm_core.result_store import list_history, load_latest
+
+    monkeypatch.setenv("CURLLM_WORKSPACE", str(tmp_path))
+    d = tmp_path / "results" / "old"
+    d.mkdir(parents=True)
+    for ts, n in (("20250101-000000", 1), ("20250102-000000", 2)):
+        snap = json.dumps({"timestamp": ts, "result": _products(n)})
+        (d / f"{ts}.json").write_text(snap, encoding="utf-8")
+    (d / "latest.json").write_text(snap, encoding="utf-8")
+
+    assert load_latest("old") == {"timestamp": "20250102-000000", "result": _products(2)}
+    assert [r["timestamp"] for r in list_history("old")] == ["20250101-000000", "20250102-000000"]
+    assert list(d.glob("*.json")) == []
+
+    # A legacy file reappearing next to existing runs is stale and dropped
+    (d / "latest.json").write_text(json.dumps({"result": _products(9)}), encoding="utf-8")
+    assert load_latest("old")["result"] == _products(2)
+    assert not (d / "latest.json").exists()
@@ -0,0 +1,80 @@
+"""
+Tests for the buffered markdown RunLogger
+"""
+
+import json
+import time
+
+from curllm_logs import RunLogger
+
+
+def test_writes_are_buffered_until_flush(tmp_path):
+    run_logger = RunLogger("Find products", "https://shop.example/", log_dir=str(tmp_path),
+                           session_id="buf", flush_interval=60)
+    run_logger.log_text("hello")
+    assert "hello" not in run_logger.path.read_text()
+
+    run_logger.flush()
+    assert "hello\n\n" in run_logger.path.read_text()
+    run_logger.close()
+
+
+def test_toc_is_stitched_on_finalize(tmp_path):
+    run_logger = RunLogger("Fill form", "https://example.com/contact", command_line="curllm x",
+                           log_dir=str(tmp_path), session_id="toc")
+    run_logger.log_heading("Step 1")
+    run_logger.log_kv("selector", "#email")
+    run_logger.log_heading("Step 2")
+    run_logger.log_table(["a", "b"], [["1", "2"]])
+    run_logger.finalize(success=True, duration_ms=42)
+
+    content = run_logger.path.read_text()
+    nav = content.split("## Navigation\n\n", 1)[1]
+    assert nav.startswith("- [Step 1](#step-1)\n- [Step 2](#step-2)\n\n```bash\ncurllm x")
+    assert "TOC_PLACEHOLDER" not in content
+    assert content.index("- selector: #email") < content.index("## Step 2") < content.index("**Duration:** 42ms")
+    assert not run_logger.toc_path.exists()
+
+    # Closing twice does not touch the file again
+    run_logger.close()
+    assert run_logger.path.read_text() == content
+
+
+def test_jsonl_stream(tmp_path):
+    run_logger = RunLogger("Extract", None, log_dir=str(tmp_path), session_id="js", jsonl=True)
+    run_logger.log_heading("Step 1")
+    run_logger.log_json({"items": [1, 2]}, title="Result")
+    run_logger.log_error("boom")
+    run_logger.close()
+
+    records = [json.loads(line) for line in run_logger.jsonl_path.read_text().splitlines()]
+    assert [r["type"] for r in records] == ["start", "heading", "json", "error"]
+    assert records[2]["data"] == {"items": [1, 2]}
+    assert records[3]["message"] == "boom"
+
+
+def test_large_output_is_flushed_in_background(tmp_path):
+    run_logger = RunLogger("Big", None, log_dir=str(tmp_path), session_id="big",
+                           flush_interval=60, buffer_bytes=1000)
+    run_logger.log_code("json", "x" * 5000)
+    deadline = time.time() + 2
+    while "xxxxx" not in run_logger.path.read_text() and time.time() < deadline:
+        time.sleep(0.01)
+    assert "x" * 5000 in run_logger.path.read_text()
+    run_logger.close()
+
+
+def test_unclosed_logger_is_flushed_and_stitched_when_collected(tmp_path):
+    import gc
+
+    run_logger = RunLogger("Dropped", None, log_dir=str(tmp_path), session_id="gc", flush_interval=60)
+    run_logger.log_heading("Step 1")
+    run_logger.log_text("never closed")
+    path, toc_path = run_logger.path, run_logger.toc_path
+    del run_logger
+    gc.collect()
+
+    content = path.read_text()
+    assert "never closed" in content
+    assert content.split("## Navigation\n\n", 1)[1].startswith("- [Step 1](#step-1)")
+    assert not toc_path.exists()
@@ -203,3 +203,145 @@ def test_run_directory_naming(temp_screenshot_dir):
     # Should contain run- prefix
     assert run_dir.name.startswith("run-")
     assert run_id in run_dir.name
+
+
+class FakeScreenshotPage:
+    """Page stand-in returning PNG bytes of the current image"""
+
+    def __init__(self, image):
+        self.image = image
+        self.calls = []
+
+    async def screenshot(self, **kwargs):
+        import io
+        self.calls.append(kwargs)
+        buf = io.BytesIO()
+        self.image.save(buf, "PNG")
+        return buf.getvalue()
+
+    async def query_selector(self, selector):
+        return None
+
+
+def _gradient(shift=0):
+    from PIL import Image
+    img = Image.new("RGB", (320, 200))
+    img.putdata([((x * 3 + shift) % 256, y, (x + y) % 256) for y in range(200) for x in range(320)])
+    return img
+
+
+@pytest.mark.asyncio
+async def test_take_screenshot_skips_identical_frames(temp_screenshot_dir):
+    import json
+    from curllm_core.screenshots import take_screenshot, FRAME_INDEX
+
+    page = FakeScreenshotPage(_gradient())
+    first = await take_screenshot(page, 1, target_dir=temp_screenshot_dir, fmt="jpeg", quality=60)
+    second = await take_screenshot(page, 2, target_dir=temp_screenshot_dir, fmt="jpeg", quality=60)
+    page.image = _gradient(shift=90)
+    third = await take_screenshot(page, 3, target_dir=temp_screenshot_dir, fmt="webp")
+
+    assert first.endswith(".jpg") and Path(first).read_bytes()[:2] == b"\xff\xd8"
+    assert second == first
+    assert third.endswith(".webp") and third != first
+    assert sorted(p.suffix for p in temp_screenshot_dir.iterdir() if p.suffix != ".jsonl") == [".jpg", ".webp"]
+    frames = [json.loads(line) for line in (temp_screenshot_dir / FRAME_INDEX).read_text().splitlines()]
+    assert [f["step"] for f in frames] == [1, 2, 3]
+    assert frames[1]["duplicate_of"] == first
+    assert page.calls[0] == {"type": "png", "full_page": False}
+
+
+@pytest.mark.asyncio
+async def test_dedup_state_is_read_back_from_frame_index(temp_screenshot_dir):
+    import curllm_core.screenshots as screenshots
+
+    page = FakeScreenshotPage(_gradient())
+    first = await screenshots.take_screenshot(page, 1, target_dir=temp_screenshot_dir)
+    screenshots._last_frames.clear()
+    assert await screenshots.take_screenshot(page, 2, target_dir=temp_screenshot_dir) == first
+    # Organized debug shots are always written
+    debug = await screenshots.take_screenshot_organized(page, 3, "www.example.com", "20251125-081436", debug_name="x")
+    assert Path(debug).exists() and debug.endswith(".png")
+
+
+def test_retention_enforces_size_budget(temp_screenshot_dir):
+    import os
+    from curllm_core.screenshots import apply_screenshot_retention
+
+    now = datetime.now().timestamp()
+    run_dirs = []
+    for i in range(4):
+        run_dir = get_run_screenshot_dir("www.example.com", f"20251125-08{i:02d}00")
+        (run_dir / "step_0.png").write_bytes(b"x" * 400 * 1024)
+        os.utime(run_dir, (now - 100 * (4 - i), now - 100 * (4 - i)))
+        run_dirs.append(run_dir)
+    loose = temp_screenshot_dir / "www.example.com" / "step_0_1.png"
+    loose.write_bytes(b"x" * 1024)
+    os.utime(loose, (now - 1000, now - 1000))
+
+    # Newest first: two runs fit, the small old image still fits after them
+    removed = apply_screenshot_retention(max_total_mb=1)
+    assert removed == 2
+    assert [d.exists() for d in run_dirs] == [False, False, True, True]
+    assert loose.exists()
+
+    assert apply_screenshot_retention(max_age_days=500 / 86400) == 1
+    assert not loose.exists() and run_dirs[2].exists()
+
+
+def test_retention_prunes_images_in_screenshot_root(temp_screenshot_dir):
+    import os
+    from curllm_core.screenshots import apply_screenshot_retention
+
+    now = datetime.now().timestamp()
+    old = temp_screenshot_dir / "step_0_1700000000.png"
+    fresh = temp_screenshot_dir / "step_1_1700000100.png"
+    notes = temp_screenshot_dir / "README.txt"
+    for path in (old, fresh, notes):
+        path.write_bytes(b"x" * 1024)
+    os.utime(old, (now - 1000, now - 1000))
+    os.utime(notes, (now - 1000, now - 1000))
+
+    assert apply_screenshot_retention(max_age_days=500 / 86400) == 1
+    assert not old.exists() and fresh.exists() and notes.exists()
+
+
+def test_retention_compacts_frame_index(temp_screenshot_dir):
+    import json
+    import os
+    from curllm_core.screenshots import FRAME_INDEX, apply_screenshot_retention
+
+    now = datetime.now().timestamp()
+    domain_dir = temp_screenshot_dir / "www.example.com"
+    domain_dir.mkdir()
+    old, fresh = domain_dir / "step_0_1.png", domain_dir / "step_1_2.png"
+    for path in (old, fresh):
+        path.write_bytes(b"x" * 1024)
+    os.utime(old, (now - 1000, now - 1000))
+    records = [
+        {"step": 0, "path": str(old), "hash": "a"},
+        {"step": 1, "path": str(old), "duplicate_of": str(old), "hash": "a"},
+        {"step": 2, "path": str(fresh), "hash": "b"},
+    ]
+    index = domain_dir / FRAME_INDEX
+    index.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+    assert apply_screenshot_retention(max_age_days=500 / 86400) == 1
+    assert [json.loads(line)["step"] for line in index.read_text().splitlines()] == [2]
+
+    fresh.unlink()
+    (domain_dir / "step_2_3.png").write_bytes(b"x")
+    os.utime(domain_dir / "step_2_3.png", (now - 1000, now - 1000))
+    apply_screenshot_retention(max_age_days=500 / 86400)
+    assert not index.exists()
+
+
+def test_screenshot_endpoint_serves_format_mimetype(temp_screenshot_dir):
+    from curllm_core.server import app
+
+    (temp_screenshot_dir / "shot.webp").write_bytes(b"RIFF0000WEBP")
+    (temp_screenshot_dir / "shot.jpg").write_bytes(b"\xff\xd8\xff")
+    client = app.test_client()
+    assert client.get("/api/screenshot/shot.webp").mimetype == "image/webp"
+    assert client.get("/api/screenshot/shot.jpg").mimetype == "image/jpeg"
+    assert client.get("/api/screenshot/missing.png").status_code == 404
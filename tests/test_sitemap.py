@@ -0,0 +1,157 @@
+"""Tests for the streaming sitemap index."""
+
+import gzip
+
+import pytest
+from aiohttp import web
+
+import curllm_core.http_pool as http_pool
+from curllm_core.http_pool import HTTPSessionPool
+from curllm_core.url_resolution.sitemap import SitemapIndex, tokenize
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(base, paths):
+    body = "".join(f"<url><loc>{base}{p}</loc><lastmod>2024-01-01</lastmod></url>" for p in paths)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{body}</urlset>'
+
+
+async def _start_site(hits, state=None):
+    state = {} if state is None else state
+
+    @web.middleware
+    async def outage(request, handler):
+        if state.get("down"):
+            hits.append(f"{request.path} 503")
+            return web.Response(status=503)
+        return await handler(request)
+
+    async def robots(request):
+        hits.append("/robots.txt")
+        return web.Response(text=f"User-agent: *\nSitemap: {state['base']}/main-index.xml\n")
+
+    async def index(request):
+        hits.append("/main-index.xml")
+        base = state["base"]
+        body = (f'<sitemapindex {NS}><sitemap><loc>{base}/products.xml.gz</loc></sitemap>'
+                f'<sitemap><loc>{base}/nested-index.xml</loc></sitemap></sitemapindex>')
+        return web.Response(text=body, content_type="application/xml")
+
+    async def nested(request):
+        hits.append("/nested-index.xml")
+        return web.Response(text=f'<sitemapindex {NS}><sitemap><loc>{state["base"]}/pages.xml</loc></sitemap></sitemapindex>',
+                            content_type="application/xml")
+
+    async def products(request):
+        hits.append("/products.xml.gz")
+        paths = [f"/produkt/item-{i}" for i in range(500)] + ["/kategoria/laptopy-gaming", "/kategoria/laptopy/akcesoria"]
+        return web.Response(body=gzip.compress(_urlset(state["base"], paths).encode()),
+                            content_type="application/octet-stream")
+
+    async def pages(request):
+        etag = '"pages-v1"'
+        if request.headers.get("If-None-Match") == etag:
+            hits.append("/pages.xml 304")
+            return web.Response(status=304)
+        hits.append("/pages.xml")
+        return web.Response(text=_urlset(state["base"], ["/kontakt", "/blog/laptop-poradnik"]),
+                            content_type="application/xml", headers={"ETag": etag})
+
+    app = web.Application(middlewares=[outage])
+    app.router.add_get("/robots.txt", robots)
+    app.router.add_get("/main-index.xml", index)
+    app.router.add_get("/nested-index.xml", nested)
+    app.router.add_get("/products.xml.gz", products)
+    app.router.add_get("/pages.xml", pages)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    state["base"] = f"http://127.0.0.1:{port}"
+    return runner, state["base"]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = HTTPSessionPool()
+    monkeypatch.setattr(http_pool, "get_http_pool", lambda: pool)
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_refresh_follows_nested_and_gzip_sitemaps(tmp_path, pool):
+    hits = []
+    runner, base = await _start_site(hits)
+    try:
+        index = SitemapIndex(cache_dir=tmp_path)
+        stats = await index.refresh(base)
+        assert stats["fetched"] == 4
+        assert index.url_count(stats["domain"]) == 504
+
+        best = index.search(base, ["laptopy", "gaming"], limit=3)
+        assert best[0][0] == f"{base}/kategoria/laptopy-gaming"
+        # Prefix match: "laptop" finds "laptopy" paths too
+        found = [url for url, _ in index.search(base, ["laptop"], limit=10)]
+        assert f"{base}/blog/laptop-poradnik" in found
+        assert f"{base}/kategoria/laptopy/akcesoria" in found
+        assert index.search(base, ["nonexistent"]) == []
+    finally:
+        await pool.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_fresh_index_skips_network_and_stale_uses_conditional_get(tmp_path, pool):
+    hits = []
+    runner, base = await _start_site(hits)
+    try:
+        index = SitemapIndex(cache_dir=tmp_path)
+        await index.refresh(base)
+        hits.clear()
+
+        assert (await index.refresh(base))["skipped"]
+        assert hits == []
+
+        stats = await index.refresh(base, force=True)
+        assert "/pages.xml 304" in hits
+        assert "/pages.xml" not in hits
+        assert stats["not_modified"] == 1
+        # URLs of the unchanged sitemap stay indexed
+        assert index.search(base, ["kontakt"])[0][0] == f"{base}/kontakt"
+        assert stats["urls"] == 504
+
+        # A new instance reuses the on-disk index
+        reopened = SitemapIndex(cache_dir=tmp_path)
+        assert reopened.search(base, ["gaming"])[0][0] == f"{base}/kategoria/laptopy-gaming"
+    finally:
+        await pool.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_refresh_during_outage_is_retried_on_next_call(tmp_path, pool):
+    hits = []
+    state = {"down": True}
+    runner, base = await _start_site(hits, state)
+    try:
+        index = SitemapIndex(cache_dir=tmp_path)
+        stats = await index.refresh(base)
+        assert stats["fetched"] == 0 and stats["failed"] > 0
+        assert stats["urls"] == 0
+
+        # The site is back: the failed refresh must not count as fresh
+        state["down"] = False
+        stats = await index.refresh(base)
+        assert not stats["skipped"]
+        assert stats["fetched"] == 4
+        assert stats["urls"] == 504
+        assert (await index.refresh(base))["skipped"]
+    finally:
+        await pool.close()
+        await runner.cleanup()
+
+
+def test_tokenize_handles_unicode_and_encoding():
+    assert tokenize("/kategoria/%C5%BCel-do-w%C5%82os%C3%B3w") == ["kategoria", "żel", "do", "włosów"]
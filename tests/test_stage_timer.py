@@ -0,0 +1,56 @@
+"""Tests for opt-in per-stage timing."""
+
+import asyncio
+
+from curllm_core.stage_timer import StageRecorder, current_recorder, stage, timed_stage
+
+
+def test_stage_is_noop_without_recorder():
+    assert current_recorder() is None
+    with stage("page_open", prompt_chars=10):
+        pass
+    assert current_recorder() is None
+
+
+async def test_nested_stages_report_self_time():
+    @timed_stage("context_extraction")
+    async def extract():
+        await asyncio.sleep(0.02)
+        return "ctx"
+
+    with StageRecorder() as rec:
+        with stage("extraction"):
+            assert await extract() == "ctx"
+            with stage("llm_wait", prompt_chars=1200):
+                await asyncio.sleep(0.03)
+            await asyncio.sleep(0.01)
+
+    s = rec.summary()
+    stages = s["stages"]
+    assert stages["context_extraction"]["count"] == 1
+    assert stages["llm_wait"]["total_ms"] >= 25
+    assert stages["extraction"]["total_ms"] >= 55
+    # Self time excludes the nested stages
+    assert stages["extraction"]["self_ms"] < stages["extraction"]["total_ms"] - 40
+    assert s["counters"] == {"llm_wait.prompt_chars": 1200}
+
+
+async def test_concurrent_runs_are_isolated():
+    async def run(n):
+        with StageRecorder() as rec:
+            for _ in range(n):
+                with stage("llm_wait"):
+                    await asyncio.sleep(0.005)
+        return rec.summary()["stages"]["llm_wait"]["count"]
+
+    assert await asyncio.gather(run(1), run(3), run(2)) == [1, 3, 2]
+
+
+async def test_recorder_follows_spawned_tasks():
+    async def racer():
+        with stage("extraction"):
+            await asyncio.sleep(0.005)
+
+    with StageRecorder() as rec:
+        await asyncio.gather(*(asyncio.ensure_future(racer()) for _ in range(3)))
+    assert rec.summary()["stages"]["extraction"]["count"] == 3
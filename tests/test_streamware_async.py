@@ -0,0 +1,125 @@
+"""
+Tests for concurrent Streamware flow execution
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from curllm_core.streamware import Component, ComponentError, Flow, StreamwareURI, register, split, join
+from curllm_core.streamware.patterns import MulticastComponent
+
+
+class SlowDouble(Component):
+    """Blocking component that tracks how many calls overlap"""
+
+    def __init__(self, uri=None, delay=0.05):
+        super().__init__(uri or StreamwareURI("slowdouble://"))
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def process(self, data):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        # Later items finish first so ordering has to be restored
+        time.sleep(self.delay / (1 + data) if isinstance(data, int) else self.delay)
+        with self._lock:
+            self.active -= 1
+        return data * 2
+
+
+class AsyncAddOne(Component):
+    async def process_async(self, data):
+        await asyncio.sleep(0.01)
+        return data + 1
+
+    def process(self, data):
+        return data + 1
+
+
+class FailOn(Component):
+    def __init__(self, bad):
+        super().__init__(StreamwareURI("failon://"))
+        self.bad = bad
+
+    def process(self, data):
+        if data == self.bad:
+            raise ValueError("boom")
+        return data
+
+
+def test_stages_run_workers_concurrently_and_keep_order():
+    slow = SlowDouble()
+    pipeline = Flow([slow, AsyncAddOne(StreamwareURI("addone://"))])
+
+    started = time.monotonic()
+    results = pipeline.run_concurrent(range(8), workers=4, queue_size=2)
+    elapsed = time.monotonic() - started
+
+    assert results == [i * 2 + 1 for i in range(8)]
+    assert slow.peak > 1
+    assert elapsed < 8 * 0.05
+
+    stats = pipeline.get_stats()
+    assert [s["items_in"] for s in stats] == [8, 8]
+    assert stats[0]["workers"] == 4
+    assert stats[0]["queue_depth_max"] <= 2
+    assert stats[0]["throughput"] > 0
+
+
+def test_unordered_output_contains_every_item():
+    results = Flow([SlowDouble()]).run_concurrent(range(6), workers=3, ordered=False)
+    assert sorted(results) == [i * 2 for i in range(6)]
+
+
+def test_error_raises_or_skips():
+    with pytest.raises(ComponentError, match="component 1"):
+        Flow([FailOn(2)]).run_concurrent(range(5), workers=2)
+
+    pipeline = Flow([FailOn(2)])
+    assert pipeline.run_concurrent(range(5), workers=2, on_error="skip") == [0, 1, 3, 4]
+    assert pipeline.get_stats()[0]["errors"] == 1
+
+
+def test_split_fans_out_and_join_aggregates():
+    pipeline = Flow([split("$.items[*]"), SlowDouble(delay=0.01), join()])
+    pipeline = pipeline.with_data({"items": [1, 2, 3]})
+
+    assert pipeline.run_concurrent(workers=3) == [[2, 4, 6]]
+    stats = pipeline.get_stats()
+    assert stats[1]["items_in"] == 3
+    assert stats[2]["workers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_async_accepts_async_iterables():
+    async def source():
+        for i in range(3):
+            yield i
+
+    pipeline = Flow([AsyncAddOne(StreamwareURI("addone://"))])
+    assert [item async for item in pipeline.stream_async(source(), workers=2)] == [1, 2, 3]
+
+
+def test_multicast_destinations_run_concurrently():
+    calls = []
+
+    @register("sleepy")
+    class SleepyComponent(Component):
+        def process(self, data):
+            calls.append(threading.get_ident())
+            time.sleep(0.05)
+            return {"from": self.uri.operation, "data": data}
+
+    component = MulticastComponent(StreamwareURI("multicast://parallel?destinations=sleepy://a,sleepy://b,sleepy://c"))
+    started = time.monotonic()
+    results = component.process(1)
+
+    assert [r["from"] for r in results] == ["a", "b", "c"]
+    assert time.monotonic() - started < 0.15
+    assert asyncio.run(component.process_async(2))[2] == {"from": "c", "data": 2}
@@ -0,0 +1,107 @@
+"""Tests for the off-loop vision analysis pool."""
+
+import asyncio
+
+import cv2
+import numpy as np
+import pytest
+
+from curllm_core.vision import VisionAnalyzer
+from curllm_core.vision_pool import (
+    VisionPool,
+    VisionQueueFull,
+    analyze_page_image,
+    center_spectrum_mean,
+    downscale,
+)
+
+
+def _png(img: np.ndarray) -> bytes:
+    ok, buf = cv2.imencode(".png", img)
+    assert ok
+    return buf.tobytes()
+
+
+def _page(width=1600, height=1000) -> np.ndarray:
+    img = np.full((height, width), 255, np.uint8)
+    cv2.rectangle(img, (100, 100), (700, 500), 0, 3)
+    cv2.rectangle(img, (900, 200), (1400, 800), 0, 3)
+    return img
+
+
+def _puzzle() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    img = rng.integers(60, 120, (200, 400), dtype=np.uint8)
+    img = cv2.GaussianBlur(img, (9, 9), 0)
+    piece = np.full((40, 40), 250, np.uint8)
+    img[80:120, 20:60] = piece
+    img[80:120, 260:300] = piece
+    return img
+
+
+def test_downscale_keeps_small_images():
+    img = _page(800, 600)
+    same, scale = downscale(img, 1280)
+    assert same is img and scale == 1.0
+    small, scale = downscale(_page(2560, 1600), 1280)
+    assert small.shape == (800, 1280) and scale == 0.5
+
+
+def test_downscaled_signals_match_full_resolution():
+    img = _page()
+    full = analyze_page_image(img, img, 1.0)
+    small, scale = downscale(img, 800)
+    reduced = analyze_page_image(img, small, scale)
+    assert reduced == full
+    assert full["num_forms"] == 2
+    ratio = center_spectrum_mean(small, scale) / center_spectrum_mean(img)
+    assert 0.9 < ratio < 1.1
+
+
+async def test_thread_pool_analyzes_bytes_and_paths(tmp_path):
+    pool = VisionPool(workers=0, max_side=800)
+    try:
+        png = _png(_page())
+        result = await VisionAnalyzer(pool).analyze(png)
+        assert result["num_forms"] == 2
+        assert result["timing"]["scale"] == 0.5 and result["timing"]["width"] == 1600
+        path = tmp_path / "shot.png"
+        path.write_bytes(png)
+        from_path = await pool.analyze_page(path)
+        assert from_path["num_forms"] == result["num_forms"]
+
+        with pytest.raises(ValueError):
+            await pool.analyze_page(b"not an image")
+        stats = pool.get_stats()
+        assert stats["completed"] == 2 and stats["failed"] == 1 and stats["pending"] == 0
+    finally:
+        pool.shutdown()
+
+
+async def test_process_pool_solves_puzzle_in_original_pixels():
+    pool = VisionPool(workers=1, start_method="fork", max_side=200)
+    try:
+        solution = await pool.analyze_puzzle(_png(_puzzle()))
+    finally:
+        pool.shutdown()
+    assert solution["type"] == "slide"
+    assert abs(solution["target_x"] - 260) <= 4
+    assert abs(solution["distance"] - (solution["target_x"] - solution["start_x"])) <= 1
+    assert solution["timing"]["scale"] == 0.5
+
+
+async def test_queue_is_bounded_and_slots_are_released():
+    pool = VisionPool(workers=0, max_queue=1)
+    png = _png(_page(4000, 3000))
+    try:
+        first = asyncio.ensure_future(pool.analyze_page(png))
+        second = asyncio.ensure_future(pool.analyze_page(png))
+        await asyncio.sleep(0)
+        with pytest.raises(VisionQueueFull):
+            await pool.analyze_page(png)
+        await asyncio.gather(first, second)
+        assert (await pool.analyze_page(png))["num_forms"] == 2
+    finally:
+        pool.shutdown()
+    stats = pool.get_stats()
+    assert stats["rejected"] == 1 and stats["completed"] == 3 and stats["pending"] == 0